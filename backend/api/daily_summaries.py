@@ -11,8 +11,11 @@ import logging
 from datetime import date
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+import psycopg2.errors
+
+from .services.request_log import get_request_log_writer, insert_rows
+from .utils.db_pool import get_db_connection as get_pooled_connection
 
 logger = logging.getLogger(__name__)
 
@@ -90,11 +93,8 @@ class DailyStats:
 
 
 def get_db_connection():
-    """Get database connection."""
-    return psycopg2.connect(
-        os.getenv('DATABASE_URL'),
-        cursor_factory=RealDictCursor
-    )
+    """Get a pooled database connection (close() returns it to the pool)."""
+    return get_pooled_connection()
 
 
 def aggregate_feedback_stats(summary_date: date) -> Optional[FeedbackSummary]:
@@ -566,6 +566,14 @@ def get_summary_by_date(
         conn.close()
 
 
+RAG_REQUEST_COLUMNS = (
+    'request_type', 'query_text', 'request_id', 'session_id', 'style',
+    'results_count', 'input_tokens', 'output_tokens', 'cost_usd', 'latency_ms',
+    'success', 'error_message', 'rag_profile_id', 'rag_profile_name', 'tenant_id',
+    'source_app',
+)
+
+
 def log_rag_request(
     request_type: str,
     query_text: str,
@@ -588,6 +596,8 @@ def log_rag_request(
     Log a RAG request for daily aggregation.
 
     This is a fire-and-forget operation - errors are logged but not raised.
+    While the API's write-behind writer is running the row is queued and
+    written in bulk; otherwise it is inserted synchronously.
 
     Args:
         request_type: 'search' or 'answer'
@@ -607,41 +617,26 @@ def log_rag_request(
         tenant_id: Tenant ID for multi-tenant support
         source_app: Source application (e.g., 'main_app', 'tuning_dashboard', 'discord_bot')
     """
+    row = (
+        request_type, query_text[:2000], request_id, session_id, style,
+        results_count, input_tokens, output_tokens, cost_usd, latency_ms,
+        success, error_message, rag_profile_id, rag_profile_name, tenant_id,
+        source_app or 'unknown',
+    )
+    writer = get_request_log_writer()
+    if writer.running:
+        writer.submit('rag_requests', RAG_REQUEST_COLUMNS, row)
+        return
+
     try:
         conn = get_db_connection()
         try:
-            with conn.cursor() as cur:
-                # Check if rag_requests table exists
-                cur.execute("""
-                    SELECT EXISTS (
-                        SELECT FROM information_schema.tables 
-                        WHERE table_schema = 'public' 
-                        AND table_name = 'rag_requests'
-                    )
-                """)
-                table_exists = cur.fetchone()['exists']
-                
-                if not table_exists:
-                    logger.debug("rag_requests table does not exist, skipping log")
-                    return
-                
-                cur.execute("""
-                    INSERT INTO rag_requests (
-                        request_type, query_text, request_id, session_id, style,
-                        results_count, input_tokens, output_tokens, cost_usd, latency_ms,
-                        success, error_message, rag_profile_id, rag_profile_name, tenant_id,
-                        source_app
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, [
-                    request_type, query_text[:2000], request_id, session_id, style,
-                    results_count, input_tokens, output_tokens, cost_usd, latency_ms,
-                    success, error_message, rag_profile_id, rag_profile_name, tenant_id,
-                    source_app or 'unknown'
-                ])
-                conn.commit()
-                logger.debug(f"Logged RAG request: type={request_type}, source={source_app}, profile={rag_profile_name}")
+            insert_rows(conn, 'rag_requests', RAG_REQUEST_COLUMNS, [row])
+            logger.debug(f"Logged RAG request: type={request_type}, source={source_app}, profile={rag_profile_name}")
         finally:
             conn.close()
+    except psycopg2.errors.UndefinedTable:
+        logger.debug("rag_requests table does not exist, skipping log")
     except Exception as e:
         # Log but don't raise - this is non-critical
         # Include more context for debugging
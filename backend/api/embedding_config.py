@@ -286,9 +286,20 @@ def model_name_to_key(model_name: str) -> str:
 
 
 def clear_config_cache():
-    """Clear the configuration cache (useful for testing)"""
+    """
+    Clear the configuration cache (useful for testing, or after switching models).
+    
+    Also drops cached query embeddings, which belong to the previous model.
+    """
     global _embedding_config_cache
     _embedding_config_cache = None
+    
+    try:
+        from .utils.query_embedding_cache import clear_query_embedding_cache
+    except ImportError:
+        # Loaded outside the api package (standalone scripts) - no query cache there
+        return
+    clear_query_embedding_cache()
 
 
 # =============================================================================
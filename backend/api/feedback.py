@@ -11,14 +11,16 @@ import os
 import logging
 from datetime import datetime, date
 from typing import Optional, List, Literal
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from pydantic import BaseModel, Field
 import psycopg2
-from psycopg2.extras import RealDictCursor
+import psycopg2.extras
 
+from .services.request_log import get_request_log_writer, insert_rows
 from .tuning import require_tuning_auth
+from .utils.db_pool import get_db_connection as get_pooled_connection
 from .utils.request_id import get_request_id, get_session_id
 
 logger = logging.getLogger(__name__)
@@ -99,21 +101,25 @@ class AiRequestCreate(BaseModel):
 # =============================================================================
 
 def get_db_connection():
-    """Get database connection."""
-    database_url = os.getenv("DATABASE_URL", "")
-    if not database_url:
+    """Get a pooled database connection (close() returns it to the pool)."""
+    if not os.getenv("DATABASE_URL", ""):
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    if database_url.startswith("postgres://"):
-        database_url = database_url.replace("postgres://", "postgresql://", 1)
-    
-    return psycopg2.connect(database_url, cursor_factory=RealDictCursor)
+    return get_pooled_connection()
 
 
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
+AI_REQUEST_COLUMNS = (
+    'user_id', 'request_type', 'input_text', 'output_text', 'model_name',
+    'rag_profile_id', 'custom_instruction_id', 'search_config_id',
+    'request_id', 'session_id', 'input_tokens', 'output_tokens',
+    'cost_usd', 'latency_ms', 'success', 'error_message', 'metadata', 'id',
+)
+
+
 def log_ai_request(
     request_type: str,
     input_text: str,
@@ -136,48 +142,49 @@ def log_ai_request(
     """
     Log an AI request to the database.
     
+    The ai_request_id is generated here, so it can be returned to the client
+    before the row is written: while the API's write-behind writer is running
+    the row is queued and written in bulk, otherwise it is inserted
+    synchronously.
+    
     Returns the ai_request_id (UUID string) on success, None on failure.
     This is a fire-and-forget operation - errors are logged but not raised.
     """
+    ai_request_id = str(uuid4())
+    row = (
+        user_id,
+        request_type,
+        input_text[:10000] if input_text else None,  # Truncate if too long
+        output_text[:50000] if output_text else None,  # Truncate if too long
+        model_name,
+        rag_profile_id,
+        custom_instruction_id,
+        search_config_id,
+        request_id,
+        session_id,
+        input_tokens,
+        output_tokens,
+        cost_usd,
+        latency_ms,
+        success,
+        error_message[:500] if error_message else None,
+        psycopg2.extras.Json(metadata) if metadata else None,
+        ai_request_id,
+    )
+    
+    writer = get_request_log_writer()
+    if writer.running:
+        if not writer.submit('ai_requests', AI_REQUEST_COLUMNS, row):
+            return None
+        logger.debug(f"Queued AI request: type={request_type}, id={ai_request_id}")
+        return ai_request_id
+    
     try:
         conn = get_db_connection()
         try:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO ai_requests (
-                        user_id, request_type, input_text, output_text, model_name,
-                        rag_profile_id, custom_instruction_id, search_config_id,
-                        request_id, session_id, input_tokens, output_tokens,
-                        cost_usd, latency_ms, success, error_message, metadata
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                    )
-                    RETURNING id
-                """, [
-                    user_id,
-                    request_type,
-                    input_text[:10000] if input_text else None,  # Truncate if too long
-                    output_text[:50000] if output_text else None,  # Truncate if too long
-                    model_name,
-                    rag_profile_id,
-                    custom_instruction_id,
-                    search_config_id,
-                    request_id,
-                    session_id,
-                    input_tokens,
-                    output_tokens,
-                    cost_usd,
-                    latency_ms,
-                    success,
-                    error_message[:500] if error_message else None,
-                    psycopg2.extras.Json(metadata) if metadata else None,
-                ])
-                result = cur.fetchone()
-                conn.commit()
-                
-                ai_request_id = str(result['id']) if result else None
-                logger.info(f"Logged AI request: type={request_type}, id={ai_request_id}")
-                return ai_request_id
+            insert_rows(conn, 'ai_requests', AI_REQUEST_COLUMNS, [row])
+            logger.info(f"Logged AI request: type={request_type}, id={ai_request_id}")
+            return ai_request_id
         finally:
             conn.close()
     except Exception as e:
@@ -191,6 +198,13 @@ def get_ai_request_metadata(ai_request_id: str) -> Optional[dict]:
     
     Returns dict with model_name, rag_profile_id, custom_instruction_id, search_config_id, request_type.
     """
+    # Feedback can arrive before the write-behind writer has flushed the row
+    pending = get_request_log_writer().pending_row('ai_requests', 'id', ai_request_id)
+    if pending is not None:
+        return {key: pending[key] for key in (
+            'model_name', 'rag_profile_id', 'custom_instruction_id', 'search_config_id', 'request_type'
+        )}
+    
     try:
         conn = get_db_connection()
         try:
@@ -218,7 +232,7 @@ def get_ai_request_metadata(ai_request_id: str) -> Optional[dict]:
 
 @router.post("", response_model=FeedbackResponse)
 @router.post("/", response_model=FeedbackResponse)
-async def create_feedback(feedback: FeedbackCreate, request: Request):
+def create_feedback(feedback: FeedbackCreate, request: Request):
     """
     Create a feedback event.
     
@@ -291,7 +305,7 @@ async def create_feedback(feedback: FeedbackCreate, request: Request):
 
 @router.get("", response_model=FeedbackListResponse, dependencies=[Depends(require_tuning_auth)])
 @router.get("/", response_model=FeedbackListResponse, dependencies=[Depends(require_tuning_auth)])
-async def list_feedback(
+def list_feedback(
     target_type: Optional[str] = Query(None, description="Filter by target type"),
     rating: Optional[int] = Query(None, description="Filter by rating"),
     model_name: Optional[str] = Query(None, description="Filter by model name (in metadata)"),
@@ -418,7 +432,7 @@ async def list_feedback(
 
 
 @router.get("/stats", dependencies=[Depends(require_tuning_auth)])
-async def get_feedback_stats(
+def get_feedback_stats(
     from_date: Optional[str] = Query(None, description="Filter from date (YYYY-MM-DD)"),
     to_date: Optional[str] = Query(None, description="Filter to date (YYYY-MM-DD)"),
 ):
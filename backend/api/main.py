@@ -6,29 +6,74 @@ Multi-source transcript processing with admin interface
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.concurrency import run_in_threadpool
 import asyncio
 import zipfile
 import io
 import json
+import re
 import os
 import logging
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Callable
 from datetime import datetime
 import uuid
 
 # Import utilities
 import time
 from .utils.dsn_mask import mask_dsn_password
+from .utils.metrics import (
+    OPENMETRICS_CONTENT_TYPE,
+    PROMETHEUS_CONTENT_TYPE,
+    SEARCH_503,
+    observe_stage_ms,
+    render_metrics,
+)
 from .utils.request_id import RequestIDMiddleware, get_request_id, get_session_id, log_prefix, setup_request_id_logging
-from .utils.cache import TTLCache, get_endpoint_cache
+from .utils.db_pool import (
+    init_db_pool,
+    close_db_pool,
+    get_pool_stats,
+    register_connection_hook,
+    get_db_connection as get_pooled_connection,
+)
+from .utils.query_embedding_cache import (
+    get_cached_query_embedding,
+    get_query_embedding_cache_stats,
+    lookup_query_embedding,
+    normalize_query,
+    store_query_embedding,
+)
+from .utils.hybrid_search import lexical_search, reciprocal_rank_fusion
+from .utils.storage_catalog import get_storage_catalog, invalidate_storage_catalog
+from .utils.readiness import (
+    MODEL_FAILED,
+    MODEL_LAZY,
+    MODEL_LOADED,
+    check_readiness,
+    get_db_prober,
+    get_model_state,
+    mark_model_loaded,
+    set_model_state,
+)
+from .utils.single_flight import SingleFlight
+from .utils.answer_cache import (
+    get_answer_cache_access_tracker,
+    get_answer_cache_stats,
+    lookup_hot_answer,
+    record_lookup,
+    store_hot_answer,
+)
 from .utils.metadata_cache import (
     get_cached_embedding_stats,
+    invalidate_embedding_stats,
     get_cached_search_config,
-    invalidate_search_config,
     get_cached_embedding_catalog,
+    get_cached_rag_profile,
+    get_cached_custom_instructions,
+    get_cached_system_prompt,
 )
 
 # Setup request ID logging
@@ -38,22 +83,34 @@ logger = logging.getLogger(__name__)
 
 from dataclasses import dataclass
 from pydantic import BaseModel
-from sqlalchemy import create_engine, text
-from sqlalchemy.pool import StaticPool
-import psycopg2
-from psycopg2.extras import RealDictCursor
 
 # Import our existing processors
 import sys
 backend_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(backend_path)
 from scripts.process_srt_files import SRTProcessor
-from scripts.common.database_upsert import DatabaseUpserter
-from scripts.common.transcript_common import TranscriptSegment
 from scripts.common.embeddings import EmbeddingGenerator, resolve_embedding_config
+from scripts.embedding_storage import ann_search_settings_sql
+from scripts.common.pgvector_adapter import Vector, register_vector
+from services.embedding_batcher import EmbeddingMicroBatcher, EMBED_BATCH_ENABLED
+
+# Every pooled connection registers the pgvector types once, on connect
+register_connection_hook(register_vector)
 
 # Import tuning router and search config helper
-from .tuning import router as tuning_router, get_search_config_from_db, SearchConfigDB, get_rag_profile_from_db, RagProfile
+from .services.openai_client import (
+    chat_completion,
+    close_openai_client,
+    get_openai_client,
+    get_openai_client_stats,
+    init_openai_client,
+    stream_chat_completion,
+)
+from .services.rerank_stage import rerank_results
+from .services.context_packing import Excerpt, get_token_counter, pack_context, warm_token_encodings
+from .services.request_log import get_request_log_writer
+from .services.answer_cache_maintenance import get_answer_cache_compactor
+from .tuning import router as tuning_router, SearchConfigDB
 
 # Import Discord auth router
 from .routers.auth_discord import router as discord_auth_router
@@ -78,21 +135,17 @@ from .model_catalog import (
     validate_rag_model_key,
     model_max_context,
     model_supports_json_mode,
+    model_tokenizer,
     find_model_with_capability,
 )
 
 # Import embedding config helpers
 from .embedding_config import (
     get_active_model_key as get_active_embedding_model_key,
-    get_model_dimensions,
     use_normalized_storage,
     use_fallback_read,
-    get_model_list as get_embedding_model_list,
-    load_embedding_config,
     is_answer_cache_enabled,
-    resolve_embedding_model_config,
     get_segment_table_for_model,
-    get_answer_cache_table_for_model,
 )
 
 app = FastAPI(
@@ -176,6 +229,35 @@ async def startup_event():
     if db_url:
         masked_url = mask_dsn_password(db_url)
         logger.info(f"📦 Database: {masked_url}")
+        # Open the shared connection pool (warm connections are non-fatal)
+        init_db_pool()
+    
+    # Start the query-embedding micro-batcher on this event loop
+    if EMBED_BATCH_ENABLED:
+        await _embedding_batcher.start()
+    
+    # Shared AsyncOpenAI client (keep-alive pool reused across requests)
+    init_openai_client()
+    
+    # Write-behind writer for rag_requests / ai_requests logging
+    await get_request_log_writer().start()
+    await get_answer_cache_access_tracker().start()
+    
+    # Embedding table catalog for the search path, warmed for the active model
+    if db_url:
+        await get_storage_catalog().start([get_active_model_key()])
+        # Background SELECT 1 so /readyz and /health never touch the DB themselves
+        await get_db_prober().start()
+    
+    # Periodic expiry/compaction of answer_cache
+    if db_url and is_answer_cache_enabled():
+        await get_answer_cache_compactor().start()
+    
+    # Load tiktoken encodings for context packing (may download BPE files)
+    try:
+        await run_in_threadpool(warm_token_encodings)
+    except Exception as e:
+        logger.warning(f"Tokenizer warmup failed, encodings will load on first answer: {e}")
     
     # Log resolved embedding configuration
     config = resolve_embedding_config()
@@ -195,6 +277,7 @@ async def startup_event():
     
     if skip_warmup:
         logger.info("⏭️  Skipping embedding model warmup (SKIP_WARMUP=true)")
+        set_model_state(MODEL_LAZY)
         return
     
     logger.info("🚀 Warming up embedding model on startup...")
@@ -214,11 +297,27 @@ async def startup_event():
         logger.exception("❌ Embedding warmup failed (out of memory)")
         logger.info("💡 Model will load on first request (~20-25s delay)")
         logger.info("💡 To fix: upgrade Render plan or set SKIP_WARMUP=true")
+        set_model_state(MODEL_FAILED)
     except Exception:
         logger.exception("❌ Embedding warmup failed")
         logger.info("💡 Model will load on first request instead")
+        set_model_state(MODEL_FAILED)
     else:
         logger.info("✅ Embedding model warmed up successfully")
+        mark_model_loaded()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks and close pooled database connections on shutdown."""
+    await _embedding_batcher.stop()
+    await get_storage_catalog().stop()
+    await get_db_prober().stop()
+    await get_answer_cache_compactor().stop()
+    await get_request_log_writer().stop()  # Flushes queued log rows
+    await get_answer_cache_access_tracker().stop()  # Writes pending hit counts
+    await close_openai_client()
+    close_db_pool()
 
 # =============================================================================
 # Security Configuration
@@ -236,6 +335,10 @@ INTERNAL_API_KEY = os.getenv("INTERNAL_API_KEY")
 if not INTERNAL_API_KEY:
     logger.warning("⚠️  INTERNAL_API_KEY not set - RAG endpoints are publicly accessible (dev mode)")
 
+# METRICS_API_KEY: Bearer token for the Prometheus scraper on /metrics.
+# Falls back to ADMIN_API_KEY so the scraper needn't hold admin rights once set.
+METRICS_API_KEY = os.getenv("METRICS_API_KEY")
+
 security = HTTPBearer(auto_error=False)
 
 # Background job tracking
@@ -264,6 +367,77 @@ def get_embedding_generator():
     return _embedding_generator
 
 
+def _encode_batch(texts: List[str]):
+    embeddings = get_embedding_generator().generate_embeddings(texts)
+    mark_model_loaded()
+    return embeddings
+
+
+# Coalesces concurrent query embeddings into one encode call (started on app startup)
+_embedding_batcher = EmbeddingMicroBatcher(_encode_batch)
+
+
+def _generate_one_embedding(text: str):
+    return _embedding_batcher.embed_sync(text)
+
+
+def embed_query(query: str):
+    """
+    Embed a search query, reusing cached vectors for repeated questions.
+    
+    Keyed on (active model key, normalized query). Blocking on a cache miss -
+    call via run_in_threadpool from async handlers, or use embed_query_async.
+    
+    Returns:
+        Read-only float32 embedding, or None if the generator returned nothing
+    """
+    return get_cached_query_embedding(get_active_model_key(), query, _generate_one_embedding)
+
+
+async def embed_query_async(query: str):
+    """
+    Async embed_query: cache hits return immediately, misses go through the
+    micro-batcher without tying up a threadpool worker.
+    """
+    if not EMBED_BATCH_ENABLED:
+        return await run_in_threadpool(embed_query, query)
+    model_key = get_active_model_key()
+    cached = lookup_query_embedding(model_key, query)
+    if cached is not None:
+        return cached
+    return store_query_embedding(model_key, query, await _embedding_batcher.embed(query))
+
+
+def embed_queries(queries: List[str]) -> List[Optional[Any]]:
+    """
+    Embed several queries, encoding all cache misses in one generate_embeddings call.
+    
+    Queries that normalize to the same text are encoded once. Blocking -
+    call via run_in_threadpool.
+    
+    Returns:
+        One read-only float32 embedding (or None) per query, in input order
+    """
+    model_key = get_active_model_key()
+    embeddings = [lookup_query_embedding(model_key, q) for q in queries]
+    misses: Dict[str, str] = {}
+    for query, embedding in zip(queries, embeddings):
+        if embedding is None:
+            misses.setdefault(normalize_query(query), query)
+    if misses:
+        texts = list(misses.values())
+        encoded = _encode_batch(texts)
+        computed = {
+            normalize_query(text): store_query_embedding(model_key, text, vector)
+            for text, vector in zip(texts, encoded)
+        }
+        embeddings = [
+            e if e is not None else computed.get(normalize_query(q))
+            for q, e in zip(queries, embeddings)
+        ]
+    return embeddings
+
+
 def check_db_embedding_consistency():
     """
     Check that the configured embedding dimensions match what's in the database.
@@ -309,15 +483,13 @@ def check_db_embedding_consistency():
         cur.close()
         conn.close()
         
-        if not sample or not sample['embedding']:
+        if not sample or sample['embedding'] is None:
             _db_embedding_check_done = True
             return True, "No embeddings in database yet"
         
-        # Determine actual dimensions
+        # Determine actual dimensions (the pgvector typecaster yields an ndarray)
         embedding = sample['embedding']
-        if isinstance(embedding, (list, tuple)):
-            actual_dim = len(embedding)
-        elif hasattr(embedding, '__len__') and not isinstance(embedding, str):
+        if hasattr(embedding, '__len__') and not isinstance(embedding, str):
             actual_dim = len(embedding)
         else:
             # Parse as string '[0.1, 0.2, ...]'
@@ -358,89 +530,120 @@ def get_active_model_key():
 
 
 def semantic_search_with_fallback(cur, query_embedding, model_key: str, top_k: int, 
-                                   min_similarity: float = 0.0) -> Tuple[List[Dict], str]:
+                                   min_similarity: float = 0.0,
+                                   query_text: Optional[str] = None) -> Tuple[List[Dict], str]:
     """
     Perform semantic search with fallback from normalized to legacy storage.
     
     Uses table-per-dimension architecture: queries segment_embeddings_{dim} table
     based on the model's configured segment_table.
     
+    When search_config.hybrid_enabled is set and query_text is given, full-text
+    matches are fused with the vector results by reciprocal rank (weights from
+    the tuning dashboard).
+    
     Args:
         cur: Database cursor
         query_embedding: Query embedding vector (list or numpy array)
         model_key: Embedding model key
         top_k: Number of results to return
         min_similarity: Minimum similarity threshold (0-1)
+        query_text: Raw query, enables hybrid lexical + vector retrieval
         
     Returns:
         Tuple of (results list, source string indicating which storage was used)
     """
-    embedding_list = query_embedding.tolist() if hasattr(query_embedding, 'tolist') else query_embedding
-    embedding_str = str(embedding_list)
+    # Sent once per query as a float32 literal and referenced via the q CTE
+    query_vector = Vector(query_embedding)
     
     results = []
     source = "none"
     
+    # Per-query ANN recall settings from the tuning dashboard (transaction-local),
+    # sent in the same execute as the vector query
+    search_cfg = None
+    settings_sql, settings_params = '', []
+    try:
+        search_cfg = get_cached_search_config()
+        settings_sql, settings_params = ann_search_settings_sql(
+            search_cfg.ivfflat_probes, search_cfg.hnsw_ef_search, top_k
+        )
+    except Exception as e:
+        logger.warning(f"Could not apply ANN search settings: {e}")
+    
+    def fuse_lexical(vector_results, segment_table=None):
+        if not (query_text and search_cfg is not None and search_cfg.hybrid_enabled):
+            return vector_results, False
+        try:
+            lexical_results = lexical_search(
+                cur, query_text, top_k, query_vector,
+                segment_table=segment_table, model_key=model_key,
+            )
+        except Exception as e:
+            logger.warning(f"Lexical search failed, using vector results only: {e}")
+            return vector_results, False
+        fused = reciprocal_rank_fusion(
+            [vector_results, lexical_results],
+            [search_cfg.hybrid_vector_weight, search_cfg.hybrid_lexical_weight],
+            k=search_cfg.rrf_k,
+            top_k=top_k,
+        )
+        logger.info(
+            f"hybrid_fusion: vector={len(vector_results)} lexical={len(lexical_results)} fused={len(fused)}"
+        )
+        return fused, True
+    
     # Try normalized storage first if enabled
     if use_normalized_storage():
         try:
             # Get the table name for this model (table-per-dimension architecture)
             segment_table = get_segment_table_for_model(model_key)
             
-            # Check if the dimension-specific table exists
-            cur.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_schema = 'public' 
-                    AND table_name = %s
-                )
-            """, [segment_table])
-            table_exists = cur.fetchone()[0]
-            
-            if table_exists:
-                # Check if there are embeddings for this model
-                cur.execute(f"""
-                    SELECT COUNT(*) FROM {segment_table} 
-                    WHERE model_key = %s
-                """, [model_key])
-                count = cur.fetchone()[0]
+            # Table existence and size come from the in-process storage
+            # catalog (refreshed in the background), not per-query SQL.
+            # Row counts are per table, so a table holding only other models
+            # of the same dimension just returns no rows and falls through.
+            entry = get_storage_catalog().get(model_key)
+            if entry is not None and entry.has_segment_embeddings:
+                # Use normalized storage with dynamic table name
+                cur.execute(settings_sql + f"""
+                    WITH q AS (SELECT %s::vector AS v)
+                    SELECT 
+                        seg.id,
+                        s.id as source_id,
+                        s.source_id as video_id,
+                        s.title,
+                        seg.text,
+                        seg.start_sec as start_time_seconds,
+                        seg.end_sec as end_time_seconds,
+                        s.published_at,
+                        s.source_type,
+                        1 - (se.embedding <=> q.v) as similarity
+                    FROM q
+                    CROSS JOIN {segment_table} se
+                    JOIN segments seg ON se.segment_id = seg.id
+                    JOIN sources s ON seg.source_id = s.id
+                    WHERE se.model_key = %s 
+                      AND 1 - (se.embedding <=> q.v) >= %s
+                    ORDER BY se.embedding <=> q.v
+                    LIMIT %s
+                """, settings_params + [query_vector, model_key, min_similarity, top_k])
+                
+                results = cur.fetchall()
+                if results:
+                    source = f"{segment_table}:{model_key}"
+                    logger.info(f"embedding_read_source: source={segment_table} model={model_key} results={len(results)}")
+                    results, hybrid = fuse_lexical(results, segment_table)
+                    return results, f"hybrid:{source}" if hybrid else source
                 
-                if count > 0:
-                    # Use normalized storage with dynamic table name
-                    cur.execute(f"""
-                        SELECT 
-                            seg.id,
-                            s.id as source_id,
-                            s.source_id as video_id,
-                            s.title,
-                            seg.text,
-                            seg.start_sec as start_time_seconds,
-                            seg.end_sec as end_time_seconds,
-                            s.published_at,
-                            s.source_type,
-                            1 - (se.embedding <=> %s::vector) as similarity
-                        FROM {segment_table} se
-                        JOIN segments seg ON se.segment_id = seg.id
-                        JOIN sources s ON seg.source_id = s.id
-                        WHERE se.model_key = %s 
-                          AND 1 - (se.embedding <=> %s::vector) >= %s
-                        ORDER BY se.embedding <=> %s::vector
-                        LIMIT %s
-                    """, [embedding_str, model_key, embedding_str, min_similarity, embedding_str, top_k])
-                    
-                    results = cur.fetchall()
-                    if results:
-                        source = f"{segment_table}:{model_key}"
-                        logger.info(f"embedding_read_source: source={segment_table} model={model_key} results={len(results)}")
-                        return results, source
-                    
         except Exception as e:
             logger.warning(f"Normalized storage search failed, falling back to legacy: {e}")
     
     # Fallback to legacy storage if enabled or if normalized failed
     if use_fallback_read() or not use_normalized_storage():
         try:
-            cur.execute("""
+            cur.execute(settings_sql + """
+                WITH q AS (SELECT %s::vector AS v)
                 SELECT 
                     seg.id,
                     s.id as source_id,
@@ -451,20 +654,24 @@ def semantic_search_with_fallback(cur, query_embedding, model_key: str, top_k: i
                     seg.end_sec as end_time_seconds,
                     s.published_at,
                     s.source_type,
-                    1 - (seg.embedding <=> %s::vector) as similarity
-                FROM segments seg
+                    1 - (seg.embedding <=> q.v) as similarity
+                FROM q
+                CROSS JOIN segments seg
                 JOIN sources s ON seg.source_id = s.id
                 WHERE seg.embedding IS NOT NULL
-                  AND 1 - (seg.embedding <=> %s::vector) >= %s
-                ORDER BY seg.embedding <=> %s::vector
+                  AND 1 - (seg.embedding <=> q.v) >= %s
+                ORDER BY seg.embedding <=> q.v
                 LIMIT %s
-            """, [embedding_str, embedding_str, min_similarity, embedding_str, top_k])
+            """, settings_params + [query_vector, min_similarity, top_k])
             
             results = cur.fetchall()
             if results:
                 source = "segments.embedding"
                 # Log embedding read source for debugging/monitoring
                 logger.info(f"embedding_read_source: source=segments_legacy model={model_key} results={len(results)}")
+                results, hybrid = fuse_lexical(results)
+                if hybrid:
+                    source = f"hybrid:{source}"
                 
         except Exception as e:
             logger.error(f"Legacy storage search failed: {e}")
@@ -565,11 +772,38 @@ def get_available_embedding_models():
         return []
 
 def get_db_connection():
-    """Get database connection"""
-    return psycopg2.connect(
-        os.getenv('DATABASE_URL'),
-        cursor_factory=RealDictCursor
-    )
+    """Get a pooled database connection (close() returns it to the pool)"""
+    return get_pooled_connection()
+
+
+def _fetch_all(query: str, params: List[Any], search_config: Optional[SearchConfigDB] = None,
+               top_k: Optional[int] = None, stage: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Run a read-only query on a pooled connection and return all rows.
+    
+    If search_config is given, its ANN recall settings (ivfflat.probes /
+    hnsw.ef_search) are applied to this transaction only, prepended to the
+    query so both go in one round trip. If stage is given,
+    the query time (excluding connection checkout) is recorded under it.
+    
+    Blocking - call via run_in_threadpool from async handlers.
+    """
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cur:
+            t_query_start = time.perf_counter()
+            if search_config is not None:
+                settings_sql, settings_params = ann_search_settings_sql(
+                    search_config.ivfflat_probes, search_config.hnsw_ef_search, top_k
+                )
+                query, params = settings_sql + query, settings_params + list(params)
+            cur.execute(query, params)
+            rows = cur.fetchall()
+            if stage is not None:
+                observe_stage_ms(stage, (time.perf_counter() - t_query_start) * 1000)
+            return rows
+    finally:
+        conn.close()
 
 class JobStatus(BaseModel):
     job_id: str
@@ -603,6 +837,7 @@ class SearchResult(BaseModel):
     published_at: str
     source_type: str
     similarity: float
+    rerank_score: Optional[float] = None
 
 class SearchResponse(BaseModel):
     results: List[SearchResult]
@@ -610,6 +845,18 @@ class SearchResponse(BaseModel):
     total_results: int
     embedding_dimensions: int
 
+class BatchSearchRequest(BaseModel):
+    queries: List[str]
+    top_k: Optional[int] = None  # Per query; if None, use database config
+    min_similarity: Optional[float] = None  # If None, use database config
+    rerank: Optional[bool] = None  # If None, use database config
+
+class BatchSearchResponse(BaseModel):
+    results: List[SearchResponse]  # One per query, in request order
+    total_queries: int
+    embedding_dimensions: int
+    timings: Dict[str, float]  # embed_ms, search_ms, rerank_ms, total_ms for the whole batch
+
 class AnswerRequest(BaseModel):
     query: str
     style: Optional[str] = 'concise'
@@ -661,12 +908,37 @@ async def root():
     """Root endpoint"""
     return {"status": "ok", "service": "Ask Dr Chaffee API"}
 
+@app.get("/livez")
+@app.head("/livez")
+async def liveness_check():
+    """Liveness probe: the process is up and the event loop is serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+def readiness_check():
+    """
+    Readiness probe - reads cached state only, never touches the DB or model.
+
+    Ready when the embedding model isn't still loading, the background DB
+    ping succeeded recently and the connection pool isn't saturated.
+    Returns: 200 if ready, 503 otherwise
+    """
+    readiness = check_readiness(get_pool_stats())
+    return JSONResponse(
+        content={"status": "ready" if readiness["ready"] else "not_ready", "checks": readiness["checks"]},
+        status_code=200 if readiness["ready"] else 503,
+    )
+
+
 @app.get("/health")
-async def health_check():
+def health_check():
     """
     Health check endpoint for production monitoring
-    Checks: Database connection, embedding service readiness
+    Checks: Database (background ping), embedding model state
     Returns: 200 OK if healthy, 503 if degraded
+
+    Reads cached state like /readyz; use /livez and /readyz for probes.
     """
     health_status = {
         "status": "ok",
@@ -674,39 +946,85 @@ async def health_check():
         "timestamp": datetime.now().isoformat(),
         "checks": {}
     }
+    readiness = check_readiness(get_pool_stats())
     
-    # Check 1: Database connection
-    try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT 1")
-        cur.fetchone()
-        cur.close()
-        conn.close()
+    # Check 1: Database connection (last background ping)
+    if readiness["checks"]["database"]["ok"]:
         health_status["checks"]["database"] = "ok"
-    except Exception as e:
-        logger.error(f"Database health check failed: {e}")
+    else:
         health_status["checks"]["database"] = "degraded"
         health_status["status"] = "degraded"
     
-    # Check 2: Embedding service readiness
-    try:
-        generator = get_embedding_generator()
-        # Quick test embedding (should be fast if model is loaded)
-        _ = generator.generate_embeddings(["health check"])
+    # Check 2: Embedding model state (lazy/loading models load on first request)
+    model_state = get_model_state()
+    if model_state == MODEL_LOADED:
         health_status["checks"]["embeddings"] = "ok"
-    except Exception as e:
-        logger.error(f"Embedding service health check failed: {e}")
+    elif model_state == MODEL_FAILED:
         health_status["checks"]["embeddings"] = "degraded"
         health_status["status"] = "degraded"
+    else:
+        health_status["checks"]["embeddings"] = model_state
+    
+    health_status["readiness"] = {
+        "ready": readiness["ready"],
+        **readiness["checks"],
+        "db_prober": get_db_prober().stats(),
+    }
+    
+    # Pool and cache metrics (informational, never degrade status on their own)
+    health_status["db_pool"] = get_pool_stats()
+    health_status["query_embedding_cache"] = get_query_embedding_cache_stats()
+    health_status["embedding_batcher"] = _embedding_batcher.stats()
+    health_status["openai_client"] = get_openai_client_stats()
+    health_status["storage_catalog"] = get_storage_catalog().stats()
+    health_status["request_log"] = get_request_log_writer().stats()
+    health_status["answer_cache"] = {
+        **get_answer_cache_stats(),
+        "compaction": get_answer_cache_compactor().stats(),
+    }
+    health_status["single_flight"] = {
+        "search": _search_flights.stats(),
+        "answer": _answer_flights.stats(),
+    }
     
     # Return 503 if degraded, 200 if ok
     status_code = 503 if health_status["status"] == "degraded" else 200
     return JSONResponse(content=health_status, status_code=status_code)
 
 
+async def verify_metrics_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Verify the scraper token for /metrics.
+    Requires: Authorization: Bearer <METRICS_API_KEY> (ADMIN_API_KEY if unset)
+    """
+    expected = METRICS_API_KEY or ADMIN_API_KEY
+    if not expected:
+        raise HTTPException(
+            status_code=503,
+            detail="Metrics not configured. Set METRICS_API_KEY or ADMIN_API_KEY environment variable."
+        )
+    if not credentials or credentials.credentials != expected:
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return credentials.credentials
+
+
+@app.get("/metrics", dependencies=[Depends(verify_metrics_token)])
+def metrics(request: Request):
+    """
+    Prometheus metrics for this worker: per-stage latency histograms, HTTP
+    request durations, cache hit/miss, search 503 reasons and pool waits.
+    
+    Scrapers that accept OpenMetrics get request-ID exemplars on histogram buckets.
+    """
+    openmetrics = 'application/openmetrics-text' in request.headers.get('accept', '')
+    return Response(
+        content=render_metrics(openmetrics=openmetrics),
+        media_type=OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE,
+    )
+
+
 @app.get("/debug/embedding-health", dependencies=[Depends(verify_internal_api_key)])
-async def debug_embedding_health():
+def debug_embedding_health():
     """
     Debug endpoint to verify embedding configuration alignment.
     
@@ -793,7 +1111,7 @@ async def debug_embedding_health():
 
 
 @app.get("/api/test-db")
-async def test_db():
+def test_db():
     """Test database connection"""
     try:
         conn = get_db_connection()
@@ -809,7 +1127,7 @@ async def test_db():
 
 @app.get("/stats", dependencies=[Depends(verify_internal_api_key)])
 @app.get("/api/stats", dependencies=[Depends(verify_internal_api_key)])
-async def get_stats():
+def get_stats():
     """
     Get database statistics for segments and embeddings.
     Returns counts and embedding coverage metrics.
@@ -879,8 +1197,129 @@ async def search_post(request: SearchRequest):
     """POST endpoint for search (alternative path)"""
     return await semantic_search(request)
 
+# Identical concurrent requests share one computation (trending questions)
+_search_flights = SingleFlight('search')
+_answer_flights = SingleFlight('answer')
+
+# Upper bound on queries per /api/search/batch request
+SEARCH_BATCH_MAX_QUERIES = int(os.getenv('SEARCH_BATCH_MAX_QUERIES', '20'))
+
+
+def _search_config_key() -> tuple:
+    return tuple(sorted(get_cached_search_config().dict().items()))
+
+
+def _search_flight_key(request: SearchRequest) -> Optional[tuple]:
+    """Single-flight key for /api/search, or None to skip coalescing."""
+    try:
+        config_key = _search_config_key()
+    except Exception as e:
+        logger.debug(f"Search single-flight disabled for request: {e}")
+        return None
+    return (
+        normalize_query(request.query), request.top_k, request.min_similarity,
+        request.rerank, config_key,
+    )
+
+
+async def _resolve_search_model() -> Tuple[str, int]:
+    """
+    Pick the embedding model to search with: the most common model in the
+    database, which must also be in the embedding catalog.
+    
+    Returns:
+        Tuple of (model key, dimensions)
+    
+    Raises:
+        HTTPException(503): No embeddings, or the model isn't configured
+    """
+    # Get embedding stats from cache (60s TTL)
+    logger.debug(f"{log_prefix()} Fetching embedding stats from cache...")
+    available_models = await run_in_threadpool(get_cached_embedding_stats)
+    if not available_models:
+        SEARCH_503.inc(reason='no_embeddings')
+        logger.error(
+            f"{log_prefix()} Search 503: no embeddings in database",
+            extra={"search_503_reason": "no_embeddings"}
+        )
+        raise HTTPException(
+            status_code=503, 
+            detail="No embeddings found in database. Please run ingestion first."
+        )
+    
+    # Use the first available model (most common one)
+    db_model = available_models[0]
+    model_key = db_model['model_key']
+    expected_dim = db_model['dimensions']
+    logger.debug(f"{log_prefix()} Using model: {model_key} ({expected_dim} dims)")
+    
+    # Load embedding catalog from cache (300s TTL)
+    config = get_cached_embedding_catalog()
+    
+    # Check if model exists in config
+    if model_key not in config['models']:
+        available_keys = list(config['models'].keys())
+        SEARCH_503.inc(reason='model_not_in_config')
+        logger.error(
+            f"{log_prefix()} Search 503: model not in config",
+            extra={
+                "search_503_reason": "model_not_in_config",
+                "db_model_key": model_key,
+                "config_model_keys": available_keys,
+            }
+        )
+        raise HTTPException(
+            status_code=503,
+            detail=f"Model '{model_key}' not found in config. Available: {available_keys}"
+        )
+    
+    return model_key, expected_dim
+
+
+def _to_search_result(row: Dict[str, Any]) -> SearchResult:
+    """Convert a segment search row to the API response model."""
+    return SearchResult(
+        id=row['id'],
+        video_id=row['video_id'],
+        title=row['title'],
+        text=row['text'],
+        url=row['url'] or '',
+        start_time_seconds=float(row['start_time_seconds']),
+        end_time_seconds=float(row['end_time_seconds']),
+        published_at=row['published_at'].isoformat() if row['published_at'] else '',
+        source_type=row['source_type'],
+        similarity=float(row['similarity']),
+        rerank_score=row.get('rerank_score'),
+    )
+
+
+async def _log_request(log_fn: Callable[..., Any], **kwargs) -> Any:
+    """
+    Call log_rag_request / log_ai_request from an async handler.
+    
+    With the write-behind writer running they only queue the row; otherwise
+    they INSERT synchronously, so run them off the event loop.
+    """
+    if get_request_log_writer().running:
+        return log_fn(**kwargs)
+    return await run_in_threadpool(log_fn, **kwargs)
+
+
 @app.post("/api/search", response_model=SearchResponse, dependencies=[Depends(verify_internal_api_key)])
 async def semantic_search(request: SearchRequest):
+    """
+    Semantic search, coalescing identical in-flight requests.
+    
+    See _semantic_search for the pipeline.
+    """
+    key = await run_in_threadpool(_search_flight_key, request)
+    response, shared = await _search_flights.do(key, lambda: _semantic_search(request))
+    if shared:
+        logger.info(f"{log_prefix()} SearchCoalesced: query={request.query[:50]!r}")
+    return response
+
+
+async def _semantic_search(request: SearchRequest):
     """
     Semantic search with optional reranking
     
@@ -888,7 +1327,8 @@ async def semantic_search(request: SearchRequest):
     2. Detect available embeddings in database - CACHED
     3. Generate query embedding with matching model (IN-PROCESS, no HTTP call)
     4. Search database using vector similarity
-    5. Optionally rerank results for better quality
+    5. Optionally rerank results for better quality (cross-encoder, within
+       RERANK_TIME_BUDGET_MS; falls back to vector order on timeout/error)
     
     EMBEDDING FLOW:
     - Embeddings are generated IN-PROCESS by EmbeddingGenerator class
@@ -908,63 +1348,30 @@ async def semantic_search(request: SearchRequest):
     t_start = time.perf_counter()
     
     try:
-        # Load search config from cache (60s TTL)
-        db_config = get_cached_search_config()
+        # Load search config from cache (60s TTL; DB hit on miss runs off the event loop)
+        db_config = await run_in_threadpool(get_cached_search_config)
         
         # Use request values if provided, otherwise use database config
         top_k = request.top_k if request.top_k is not None else db_config.top_k
         min_similarity = request.min_similarity if request.min_similarity is not None else db_config.min_similarity
         use_rerank = request.rerank if request.rerank is not None else db_config.enable_reranker
+        # Reranking scores a wider candidate pool; an explicit top_k sets the
+        # response size, otherwise return_top_k caps it
+        fetch_k = max(top_k, db_config.rerank_top_k) if use_rerank else top_k
+        return_k = top_k if request.top_k is not None else min(top_k, db_config.return_top_k)
         
         logger.info(f"{log_prefix()} Search: query={request.query[:50]!r} top_k={top_k} min_sim={min_similarity:.2f} rerank={use_rerank}")
         
-        # Get embedding stats from cache (60s TTL)
-        logger.debug(f"{log_prefix()} Fetching embedding stats from cache...")
-        available_models = get_cached_embedding_stats()
-        if not available_models:
-            logger.error(
-                f"{log_prefix()} Search 503: no embeddings in database",
-                extra={"search_503_reason": "no_embeddings"}
-            )
-            raise HTTPException(
-                status_code=503, 
-                detail="No embeddings found in database. Please run ingestion first."
-            )
-        
-        # Use the first available model (most common one)
-        db_model = available_models[0]
-        model_key = db_model['model_key']
-        expected_dim = db_model['dimensions']
-        logger.debug(f"{log_prefix()} Using model: {model_key} ({expected_dim} dims)")
+        model_key, expected_dim = await _resolve_search_model()
         
-        # Load embedding catalog from cache (300s TTL)
-        config = get_cached_embedding_catalog()
-        
-        # Check if model exists in config
-        if model_key not in config['models']:
-            available_keys = list(config['models'].keys())
-            logger.error(
-                f"{log_prefix()} Search 503: model not in config",
-                extra={
-                    "search_503_reason": "model_not_in_config",
-                    "db_model_key": model_key,
-                    "config_model_keys": available_keys,
-                }
-            )
-            raise HTTPException(
-                status_code=503,
-                detail=f"Model '{model_key}' not found in config. Available: {available_keys}"
-            )
-        
-        model_config = config['models'][model_key]
         
         # Generate query embedding with the singleton generator (IN-PROCESS, no HTTP call)
         t_embed_start = time.perf_counter()
         logger.debug(f"{log_prefix()} Generating embedding in-process...")
         try:
-            generator = get_embedding_generator()
-            embeddings = generator.generate_embeddings([request.query])
+            query_embedding = await embed_query_async(request.query)
         except Exception as embed_err:
+            SEARCH_503.inc(reason='embedding_exception')
             logger.exception(
                 f"{log_prefix()} Search 503: embedding generation exception",
                 extra={
@@ -977,20 +1384,22 @@ async def semantic_search(request: SearchRequest):
                 detail=f"Embedding generation failed: {str(embed_err)[:200]}"
             )
         t_embed_ms = (time.perf_counter() - t_embed_start) * 1000
+        observe_stage_ms('embed', t_embed_ms)
         
-        if not embeddings or len(embeddings) == 0:
+        if query_embedding is None:
+            SEARCH_503.inc(reason='embedding_empty')
             logger.error(
                 f"{log_prefix()} Search 503: embedding generator returned empty",
                 extra={"search_503_reason": "embedding_empty"}
             )
             raise HTTPException(status_code=503, detail="Embedding generation returned empty result")
         
-        query_embedding = embeddings[0]
         embedding_dim = len(query_embedding)
         logger.debug(f"{log_prefix()} Generated embedding: {embedding_dim} dims in {t_embed_ms:.1f}ms")
         
         # Verify dimensions match
         if embedding_dim != expected_dim:
+            SEARCH_503.inc(reason='dim_mismatch')
             logger.error(
                 f"{log_prefix()} Search 503: dimension mismatch",
                 extra={
@@ -1005,16 +1414,15 @@ async def semantic_search(request: SearchRequest):
                 detail=f"Dimension mismatch: generated={embedding_dim}, database={expected_dim} for model {model_key}"
             )
         
-        # Convert embedding to list
-        embedding_list = query_embedding.tolist() if hasattr(query_embedding, 'tolist') else query_embedding
-        
-        # Connect to database and execute vector search
+        # Execute vector search on a pooled connection (off the event loop)
         t_search_start = time.perf_counter()
-        conn = get_db_connection()
-        cur = conn.cursor()
         
-        # Use legacy embedding column (segments.embedding)
+        # Use legacy embedding column (segments.embedding).
+        # The query vector is bound once and referenced through the q CTE;
+        # ORDER BY must be the bare <=> distance (not the similarity alias)
+        # for the planner to use the cosine ANN index.
         search_query = """
+            WITH q AS (SELECT %s::vector AS v)
             SELECT 
                 seg.id,
                 s.source_id as video_id,
@@ -1025,68 +1433,55 @@ async def semantic_search(request: SearchRequest):
                 s.published_at,
                 s.source_type,
                 s.url,
-                1 - (seg.embedding <=> %s::vector) as similarity
-            FROM segments seg
+                1 - (seg.embedding <=> q.v) as similarity
+            FROM q
+            CROSS JOIN segments seg
             JOIN sources s ON seg.source_id = s.id
             WHERE seg.embedding IS NOT NULL
-              AND 1 - (seg.embedding <=> %s::vector) >= %s
-            ORDER BY similarity DESC
+              AND 1 - (seg.embedding <=> q.v) >= %s
+            ORDER BY seg.embedding <=> q.v
             LIMIT %s
         """
         query_params = [
-            str(embedding_list),
-            str(embedding_list),
+            Vector(query_embedding),
             min_similarity,
-            top_k
+            fetch_k
         ]
         
-        # Execute query with appropriate parameters
-        cur.execute(search_query, query_params)
-        
-        results = cur.fetchall()
-        cur.close()
-        conn.close()
+        results = await run_in_threadpool(
+            _fetch_all, search_query, query_params, db_config, fetch_k, stage='vector_query'
+        )
         t_search_ms = (time.perf_counter() - t_search_start) * 1000
         
-        # Optional reranking
-        if use_rerank and len(results) > 0:
-            query_lower = request.query.lower()
-            query_words = set(query_lower.split())
-            
-            for result in results:
-                text_lower = result['text'].lower()
-                keyword_matches = sum(1 for word in query_words if word in text_lower)
-                keyword_boost = min(0.1, keyword_matches * 0.02)
-                result['similarity'] = min(1.0, result['similarity'] + keyword_boost)
-            
-            results = sorted(results, key=lambda x: x['similarity'], reverse=True)
+        # Optional reranking (vector order on timeout/error)
+        rerank = await rerank_results(
+            request.query,
+            results,
+            rerank_top_k=db_config.rerank_top_k,
+            return_top_k=return_k,
+            enabled=use_rerank,
+        )
+        results = rerank.results
+        if rerank.status not in ('off', 'empty'):
+            observe_stage_ms('rerank', rerank.rerank_ms)
         
         # Convert to response format
-        search_results = [
-            SearchResult(
-                id=r['id'],
-                video_id=r['video_id'],
-                title=r['title'],
-                text=r['text'],
-                url=r['url'] or '',
-                start_time_seconds=float(r['start_time_seconds']),
-                end_time_seconds=float(r['end_time_seconds']),
-                published_at=r['published_at'].isoformat() if r['published_at'] else '',
-                source_type=r['source_type'],
-                similarity=float(r['similarity'])
-            )
-            for r in results
-        ]
+        t_serialize_start = time.perf_counter()
+        search_results = [_to_search_result(r) for r in results]
+        observe_stage_ms('serialize', (time.perf_counter() - t_serialize_start) * 1000)
         
         # Log latency metrics
         t_total_ms = (time.perf_counter() - t_start) * 1000
         logger.info(
             f"{log_prefix()} SearchComplete: results={len(search_results)} model={model_key} "
-            f"embed_ms={t_embed_ms:.1f} search_ms={t_search_ms:.1f} total_ms={t_total_ms:.1f}"
+            f"embed_ms={t_embed_ms:.1f} search_ms={t_search_ms:.1f} "
+            f"rerank={rerank.status} rerank_candidates={rerank.candidates} rerank_ms={rerank.rerank_ms:.1f} "
+            f"total_ms={t_total_ms:.1f}"
         )
         
         # Log search request for daily summaries (fire-and-forget)
-        log_rag_request(
+        await _log_request(
+            log_rag_request,
             request_type='search',
             query_text=request.query,
             request_id=get_request_id(),
@@ -1109,7 +1504,8 @@ async def semantic_search(request: SearchRequest):
         logger.error(f"{log_prefix()} SearchFailed: error={str(e)} total_ms={t_total_ms:.1f}", exc_info=True)
         
         # Log failed search for daily summaries
-        log_rag_request(
+        await _log_request(
+            log_rag_request,
             request_type='search',
             query_text=request.query,
             request_id=get_request_id(),
@@ -1122,9 +1518,183 @@ async def semantic_search(request: SearchRequest):
         
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
+# Per-query nearest neighbours for every query vector in one statement.
+# LATERAL keeps ORDER BY distance LIMIT k per query so each probe can use
+# the cosine ANN index, exactly like the single-query search.
+BATCH_SEARCH_QUERY = """
+    WITH q AS (
+        SELECT t.ord, t.v
+        FROM unnest(%s::int[], %s::vector[]) AS t(ord, v)
+    )
+    SELECT q.ord, hit.*
+    FROM q
+    CROSS JOIN LATERAL (
+        SELECT 
+            seg.id,
+            s.source_id as video_id,
+            s.title,
+            seg.text,
+            seg.start_sec as start_time_seconds,
+            seg.end_sec as end_time_seconds,
+            s.published_at,
+            s.source_type,
+            s.url,
+            1 - (seg.embedding <=> q.v) as similarity
+        FROM segments seg
+        JOIN sources s ON seg.source_id = s.id
+        WHERE seg.embedding IS NOT NULL
+          AND 1 - (seg.embedding <=> q.v) >= %s
+        ORDER BY seg.embedding <=> q.v
+        LIMIT %s
+    ) hit
+    ORDER BY q.ord, hit.similarity DESC
+"""
+
+
+@app.post("/api/search/batch", response_model=BatchSearchResponse, dependencies=[Depends(verify_internal_api_key)])
+async def semantic_search_batch(request: BatchSearchRequest):
+    """
+    Semantic search for several queries at once (suggested questions, A/B
+    comparisons in the tuning dashboard).
+    
+    Same settings and result shape as /api/search per query, but all cache
+    misses are embedded in one generate_embeddings call and all queries are
+    searched in a single SQL round-trip. Reranking (if enabled) runs per
+    query with the rerank stage's usual budget and fallback.
+    """
+    t_start = time.perf_counter()
+    queries = request.queries
+    if not queries:
+        raise HTTPException(status_code=400, detail="queries must not be empty")
+    if len(queries) > SEARCH_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many queries: {len(queries)} (max {SEARCH_BATCH_MAX_QUERIES})"
+        )
+    
+    try:
+        db_config = await run_in_threadpool(get_cached_search_config)
+        top_k = request.top_k if request.top_k is not None else db_config.top_k
+        min_similarity = request.min_similarity if request.min_similarity is not None else db_config.min_similarity
+        use_rerank = request.rerank if request.rerank is not None else db_config.enable_reranker
+        fetch_k = max(top_k, db_config.rerank_top_k) if use_rerank else top_k
+        return_k = top_k if request.top_k is not None else min(top_k, db_config.return_top_k)
+        
+        logger.info(f"{log_prefix()} SearchBatch: queries={len(queries)} top_k={top_k} min_sim={min_similarity:.2f} rerank={use_rerank}")
+        
+        model_key, expected_dim = await _resolve_search_model()
+        
+        t_embed_start = time.perf_counter()
+        try:
+            embeddings = await run_in_threadpool(embed_queries, queries)
+        except Exception as embed_err:
+            SEARCH_503.inc(reason='embedding_exception')
+            logger.exception(
+                f"{log_prefix()} SearchBatch 503: embedding generation exception",
+                extra={"search_503_reason": "embedding_exception", "error": str(embed_err)[:200]}
+            )
+            raise HTTPException(status_code=503, detail=f"Embedding generation failed: {str(embed_err)[:200]}")
+        t_embed_ms = (time.perf_counter() - t_embed_start) * 1000
+        observe_stage_ms('embed', t_embed_ms)
+        
+        if any(e is None for e in embeddings):
+            SEARCH_503.inc(reason='embedding_empty')
+            raise HTTPException(status_code=503, detail="Embedding generation returned empty result")
+        bad_dims = {len(e) for e in embeddings} - {expected_dim}
+        if bad_dims:
+            SEARCH_503.inc(reason='dim_mismatch')
+            raise HTTPException(
+                status_code=503,
+                detail=f"Dimension mismatch: generated={sorted(bad_dims)}, database={expected_dim} for model {model_key}"
+            )
+        
+        t_search_start = time.perf_counter()
+        rows = await run_in_threadpool(
+            _fetch_all,
+            BATCH_SEARCH_QUERY,
+            [list(range(len(queries))), [Vector(e) for e in embeddings], min_similarity, fetch_k],
+            db_config,
+            fetch_k,
+            stage='vector_query',
+        )
+        t_search_ms = (time.perf_counter() - t_search_start) * 1000
+        
+        per_query: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        for row in rows:
+            per_query[row['ord']].append(row)
+        
+        t_rerank_start = time.perf_counter()
+        # Sequential: the reranker scores one job at a time, and concurrent
+        # jobs past RERANK_MAX_INFLIGHT would just fall back to vector order
+        reranked = []
+        for query, results in zip(queries, per_query):
+            reranked.append(await rerank_results(
+                query, results,
+                rerank_top_k=db_config.rerank_top_k,
+                return_top_k=return_k,
+                enabled=use_rerank,
+            ))
+        t_rerank_ms = (time.perf_counter() - t_rerank_start) * 1000
+        for rerank in reranked:
+            if rerank.status not in ('off', 'empty'):
+                observe_stage_ms('rerank', rerank.rerank_ms)
+        
+        t_serialize_start = time.perf_counter()
+        responses = []
+        for query, rerank in zip(queries, reranked):
+            search_results = [_to_search_result(r) for r in rerank.results]
+            responses.append(SearchResponse(
+                results=search_results,
+                query=query,
+                total_results=len(search_results),
+                embedding_dimensions=expected_dim,
+            ))
+        observe_stage_ms('serialize', (time.perf_counter() - t_serialize_start) * 1000)
+        
+        t_total_ms = (time.perf_counter() - t_start) * 1000
+        logger.info(
+            f"{log_prefix()} SearchBatchComplete: queries={len(queries)} "
+            f"results={sum(r.total_results for r in responses)} model={model_key} "
+            f"embed_ms={t_embed_ms:.1f} search_ms={t_search_ms:.1f} rerank_ms={t_rerank_ms:.1f} "
+            f"total_ms={t_total_ms:.1f}"
+        )
+        
+        # One rag_requests row per query, so daily search counts stay comparable
+        for response in responses:
+            await _log_request(
+                log_rag_request,
+                request_type='search',
+                query_text=response.query,
+                request_id=get_request_id(),
+                session_id=get_session_id(),
+                results_count=response.total_results,
+                latency_ms=t_total_ms,
+                success=True,
+                source_app='main_app',
+            )
+        
+        return BatchSearchResponse(
+            results=responses,
+            total_queries=len(queries),
+            embedding_dimensions=expected_dim,
+            timings={
+                "embed_ms": round(t_embed_ms, 1),
+                "search_ms": round(t_search_ms, 1),
+                "rerank_ms": round(t_rerank_ms, 1),
+                "total_ms": round(t_total_ms, 1),
+            },
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        t_total_ms = (time.perf_counter() - t_start) * 1000
+        logger.error(f"{log_prefix()} SearchBatchFailed: error={str(e)} total_ms={t_total_ms:.1f}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Batch search failed: {str(e)}")
+
 @app.post("/embed", dependencies=[Depends(verify_internal_api_key)])
 @app.post("/api/embed", dependencies=[Depends(verify_internal_api_key)])
-async def generate_embedding(request: dict):
+def generate_embedding(request: dict):
     """Generate embedding for a text"""
     import logging
     logger = logging.getLogger(__name__)
@@ -1159,6 +1729,34 @@ def _format_timestamp(seconds: float) -> str:
     return f"{total_minutes}:{secs:02d}"
 
 
+def _render_excerpt(index: int, excerpt: Excerpt) -> str:
+    """Format a packed excerpt for the answer prompt as [n] with video info."""
+    first = excerpt.segments[0]
+    date = first.published_at[:10] if first.published_at else "unknown"
+    time_range = _format_timestamp(excerpt.start)
+    if len(excerpt.segments) > 1:
+        time_range += f"-{_format_timestamp(excerpt.end)}"
+    return f'[{index}] Video: {first.title or "Untitled"}\n    Date: {date}\n    Time: {time_range}\n    Text: "{excerpt.text}"'
+
+
+def _excerpt_source_chunk(excerpt: Excerpt) -> Dict[str, Any]:
+    """Citation source for a packed excerpt; links to where the excerpt starts."""
+    first = excerpt.segments[0]
+    video_id = first.url.split('v=')[-1].split('&')[0] if 'youtube.com' in first.url else first.id
+    return {
+        "index": excerpt.index,  # Citation number used in the prompt
+        "id": first.id,
+        "segment_ids": [s.id for s in excerpt.segments],
+        "video_id": video_id,
+        "title": first.title,
+        "url": first.url,
+        "start_time": first.start_time_seconds,
+        "timestamp": _format_timestamp(first.start_time_seconds),
+        "similarity": round(max(s.similarity for s in excerpt.segments), 3),
+        "published_at": first.published_at
+    }
+
+
 # =============================================================================
 # CORE_SYSTEM_PROMPT - Non-negotiable identity & safety rules (hardcoded)
 # =============================================================================
@@ -1205,7 +1803,7 @@ def resolve_custom_instructions() -> ResolvedCustomInstructions:
         return ResolvedCustomInstructions(instruction_id=None, name=None, text="", length=0)
     
     try:
-        conn = psycopg2.connect(database_url, cursor_factory=RealDictCursor)
+        conn = get_db_connection()
         cur = conn.cursor()
         
         cur.execute("""
@@ -1248,6 +1846,10 @@ def _build_chaffee_system_prompt(style: str, include_custom: bool = True) -> tup
     4. RAG Profile retrieval_hints (citation rules)
     5. Custom instructions (user fine-tuning layer)
     
+    The profile and custom instructions come from the metadata cache, and the
+    assembled prompt is cached per (profile id, version, instruction id, style),
+    so warm requests make no DB round-trips. Tuning endpoints invalidate both.
+    
     Args:
         style: Answer style ('concise' or 'detailed')
         include_custom: If True, append active custom instructions from database
@@ -1255,11 +1857,9 @@ def _build_chaffee_system_prompt(style: str, include_custom: bool = True) -> tup
     Returns:
         Tuple of (complete system prompt, profile metadata dict, resolved custom instructions)
     """
-    # Load RAG profile from database
-    profile = get_rag_profile_from_db()
+    # Load RAG profile (cached, invalidated by tuning endpoints)
+    profile = get_cached_rag_profile()
     
-    # Determine profile source for logging
-    profile_source = "database" if profile.id else "fallback"
     auto_select = getattr(profile, 'auto_select_model', False)
     
     profile_meta = {
@@ -1269,62 +1869,75 @@ def _build_chaffee_system_prompt(style: str, include_custom: bool = True) -> tup
         'model_name': profile.model_name,
         'temperature': profile.temperature,
         'auto_select_model': auto_select,
+        'max_context_tokens': profile.max_context_tokens,
     }
     
-    # Log RAG profile resolution
-    logger.info(
-        "RAGProfileResolved: profile_id=%s, profile_name=%s, profile_version=%s, "
-        "source=%s, auto_select=%s, summarizer_model=%s",
-        profile_meta['id'] or "none",
-        profile.name,
-        profile.version,
-        profile_source,
-        auto_select,
-        profile.model_name,
-    )
-    
-    # Start with core system prompt (non-negotiable)
-    prompt_parts = [CORE_SYSTEM_PROMPT]
-    
-    # Add RAG profile sections
-    if profile.base_instructions and profile.base_instructions.strip():
-        prompt_parts.append(f"\n{profile.base_instructions.strip()}")
-    
-    if profile.style_instructions and profile.style_instructions.strip():
-        prompt_parts.append(f"\n{profile.style_instructions.strip()}")
-    
-    if profile.retrieval_hints and profile.retrieval_hints.strip():
-        prompt_parts.append(f"\n{profile.retrieval_hints.strip()}")
-    
     # Resolve custom instructions
     resolved_instructions = ResolvedCustomInstructions(instruction_id=None, name=None, text="", length=0)
-    
     if include_custom:
-        resolved_instructions = resolve_custom_instructions()
-        
-        # Log custom instructions resolution
+        resolved_instructions = get_cached_custom_instructions()
+    
+    def assemble() -> str:
+        # Log RAG profile resolution (once per profile/instruction version)
         logger.info(
-            "CustomInstructionsResolved: instruction_id=%s, name=%s, chars=%d",
-            resolved_instructions.instruction_id or "none",
-            resolved_instructions.name or "none",
-            resolved_instructions.length,
+            "RAGProfileResolved: profile_id=%s, profile_name=%s, profile_version=%s, "
+            "source=%s, auto_select=%s, summarizer_model=%s",
+            profile_meta['id'] or "none",
+            profile.name,
+            profile.version,
+            "database" if profile.id else "fallback",
+            auto_select,
+            profile.model_name,
         )
         
-        if resolved_instructions.text:
-            prompt_parts.append(f"\n## Additional Custom Instructions\n\n{resolved_instructions.text}")
+        # Start with core system prompt (non-negotiable)
+        prompt_parts = [CORE_SYSTEM_PROMPT]
+        
+        # Add RAG profile sections
+        if profile.base_instructions and profile.base_instructions.strip():
+            prompt_parts.append(f"\n{profile.base_instructions.strip()}")
+        
+        if profile.style_instructions and profile.style_instructions.strip():
+            prompt_parts.append(f"\n{profile.style_instructions.strip()}")
+        
+        if profile.retrieval_hints and profile.retrieval_hints.strip():
+            prompt_parts.append(f"\n{profile.retrieval_hints.strip()}")
+        
+        if include_custom:
+            logger.info(
+                "CustomInstructionsResolved: instruction_id=%s, name=%s, chars=%d",
+                resolved_instructions.instruction_id or "none",
+                resolved_instructions.name or "none",
+                resolved_instructions.length,
+            )
+            if resolved_instructions.text:
+                prompt_parts.append(f"\n## Additional Custom Instructions\n\n{resolved_instructions.text}")
+        
+        return "\n".join(prompt_parts)
     
-    final_prompt = "\n".join(prompt_parts)
+    # Profile edits bump rag_profiles.version; instruction edits keep their id,
+    # so the instruction text hash stands in for its version
+    cache_key = (
+        profile_meta['id'],
+        profile.version,
+        resolved_instructions.instruction_id,
+        hash(resolved_instructions.text),
+        style,
+        include_custom,
+    )
+    final_prompt, cached = get_cached_system_prompt(cache_key, assemble)
     
     # Log final system prompt composition
     logger.info(
         "SystemPrompt: profile_id=%s, profile_name=%s, version=%s, "
-        "instruction_id=%s, instructions_len=%d, total_len=%d",
+        "instruction_id=%s, instructions_len=%d, total_len=%d, cached=%s",
         profile_meta['id'] or "none",
         profile.name,
         profile.version,
         resolved_instructions.instruction_id or "none",
         resolved_instructions.length,
         len(final_prompt),
+        cached,
     )
     
     return final_prompt, profile_meta, resolved_instructions
@@ -1405,9 +2018,447 @@ def _build_chaffee_user_prompt(query: str, excerpts: str, style: str) -> str:
 - MEET THE WORD COUNT: {min_words}+ words is mandatory"""
 
 
+@dataclass
+class _AnswerContext:
+    """Everything needed to call the summarizer and post-process its answer."""
+    query: str
+    style: str
+    t_start: float
+    model: str
+    temperature: float
+    max_tokens: int
+    system_prompt: str
+    user_prompt: str
+    source_chunks: List[Dict[str, Any]]
+    profile_meta: Dict[str, Any]
+    resolved_instructions: Any
+
+
+def _get_openai_client():
+    """Get the shared AsyncOpenAI client, or raise 503 if it can't be configured."""
+    if not os.getenv('OPENAI_API_KEY'):
+        logger.error("OPENAI_API_KEY not configured")
+        raise HTTPException(status_code=503, detail="OpenAI API key not configured")
+    
+    client = get_openai_client()
+    if client is None:
+        raise HTTPException(status_code=503, detail="OpenAI library not available")
+    return client
+
+
+async def _prepare_answer(request: AnswerRequest, t_start: float) -> _AnswerContext:
+    """
+    Retrieval and prompt assembly shared by /api/answer and /api/answer/stream.
+    
+    Searches with the DB config, packs the clips into numbered excerpts
+    within the profile's token budget, builds the prompts, then selects the
+    summarizer model.
+    """
+    # Load search config from cache (60s TTL)
+    search_cfg = await run_in_threadpool(get_cached_search_config)
+    
+    # Get parameters - use request values if provided, otherwise use DB config
+    style = request.style or 'concise'
+    # top_k controls how many candidates to fetch from vector search
+    initial_top_k = request.top_k if request.top_k is not None else search_cfg.top_k
+    # return_top_k controls how many clips are actually used in the LLM prompt
+    clips_for_answer = search_cfg.return_top_k
+    min_similarity = search_cfg.min_similarity
+    max_tokens = 3500 if style == 'detailed' else 1400
+    
+    logger.info(
+        f"{log_prefix()} Answer: query={request.query[:50]!r} style={style} "
+        f"top_k={initial_top_k} clips={clips_for_answer} rerank={search_cfg.enable_reranker}"
+    )
+    
+    # Step 1: Get relevant segments using semantic search
+    # Pass the full config to semantic_search so it uses DB settings
+    search_request = SearchRequest(
+        query=request.query, 
+        top_k=initial_top_k,
+        min_similarity=min_similarity,
+        rerank=search_cfg.enable_reranker
+    )
+    search_response = await semantic_search(search_request)
+    
+    if not search_response.results:
+        raise HTTPException(status_code=404, detail="No relevant information found")
+    
+    t_prompt_start = time.perf_counter()
+    
+    # Step 2: Build curated prompts (includes custom instructions from DB)
+    system_prompt, profile_meta, resolved_instructions = await run_in_threadpool(
+        _build_chaffee_system_prompt, style, include_custom=True
+    )
+    profile_model = profile_meta.get('model_name')
+    
+    # Step 3: Pack results into numbered excerpts within the profile's token budget
+    # return_top_k ("Number of clips to use in answer") caps the segments used;
+    # contiguous segments of one video share an excerpt
+    packing_model = profile_model if profile_model and validate_rag_model_key(profile_model) else get_default_rag_model_key()
+    count_tokens = await run_in_threadpool(get_token_counter, packing_model)
+    system_tokens = count_tokens(system_prompt)
+    prompt_overhead = system_tokens + count_tokens(_build_chaffee_user_prompt(request.query, "", style))
+    context_budget = min(
+        profile_meta.get('max_context_tokens') or 8000,
+        model_max_context(packing_model) - prompt_overhead - max_tokens,
+    )
+    total_candidates = len(search_response.results)
+    packed = pack_context(
+        search_response.results,
+        render=_render_excerpt,
+        count_tokens=count_tokens,
+        budget_tokens=context_budget,
+        max_segments=clips_for_answer,
+    )
+    source_chunks = [_excerpt_source_chunk(excerpt) for excerpt in packed.excerpts]
+    
+    user_prompt = _build_chaffee_user_prompt(request.query, packed.text, style)
+    logger.info(
+        f"{log_prefix()} ContextPacked: candidates={total_candidates} segments={packed.segments_used} "
+        f"excerpts={len(packed.excerpts)} merged={packed.merged} dropped={packed.dropped} "
+        f"tokens={packed.tokens}/{context_budget} tokenizer={model_tokenizer(packing_model)}"
+    )
+
+    # Model selection priority:
+    # 1. Auto-select if profile.auto_select_model == True
+    # 2. RAG profile model_name (if valid in catalog)
+    # 3. SUMMARIZER_MODEL env var
+    # 4. OPENAI_MODEL env var
+    # 5. Default from catalog
+    model_source = "catalog_default"
+    auto_select = profile_meta.get('auto_select_model', False)
+    
+    # Context length for auto-selection
+    estimated_context_tokens = system_tokens + count_tokens(user_prompt)
+    
+    if auto_select:
+        # Auto model selection logic
+        original_model = profile_model if profile_model and validate_rag_model_key(profile_model) else get_default_rag_model_key()
+        model = original_model
+        model_source = "auto"
+        
+        # Check 1: Context window upgrade
+        current_max_context = model_max_context(model)
+        if estimated_context_tokens > current_max_context * 0.8:  # 80% threshold
+            # Need a larger context model
+            upgraded = find_model_with_capability(
+                required_context=estimated_context_tokens,
+                require_json_mode=True
+            )
+            if upgraded and upgraded != model:
+                logger.info(f"Auto-select: upgrading from {model} to {upgraded} for larger context ({estimated_context_tokens} tokens)")
+                model = upgraded
+        
+        # Check 2: JSON mode requirement (we always need it for structured output)
+        if not model_supports_json_mode(model):
+            upgraded = find_model_with_capability(
+                required_context=estimated_context_tokens,
+                require_json_mode=True
+            )
+            if upgraded:
+                logger.info(f"Auto-select: upgrading from {model} to {upgraded} for JSON mode support")
+                model = upgraded
+        
+        # Check 3: Cheap/fast downgrade for small contexts
+        if estimated_context_tokens < 4000:  # Small context
+            cheaper = find_model_with_capability(
+                required_context=estimated_context_tokens,
+                require_json_mode=True,
+                prefer_cheap=True,
+                prefer_fast=True
+            )
+            if cheaper and cheaper != model:
+                # Only downgrade if the cheaper model is recommended
+                cheaper_info = get_rag_model(cheaper)
+                if cheaper_info and cheaper_info.get('recommended', False):
+                    logger.info(f"Auto-select: downgrading from {model} to {cheaper} for small context ({estimated_context_tokens} tokens)")
+                    model = cheaper
+    elif profile_model and validate_rag_model_key(profile_model):
+        model = profile_model
+        model_source = "profile"
+    elif profile_model:
+        # Profile has invalid model, log warning and fall back
+        logger.warning(
+            f"RAG profile '{profile_meta.get('name')}' has invalid model_name '{profile_model}', "
+            f"falling back to default. Valid models: {', '.join(get_rag_model_keys())}"
+        )
+        model = os.getenv('SUMMARIZER_MODEL') or os.getenv('OPENAI_MODEL') or get_default_rag_model_key()
+        model_source = "fallback"
+    elif os.getenv('SUMMARIZER_MODEL'):
+        model = os.getenv('SUMMARIZER_MODEL')
+        model_source = "env"
+    elif os.getenv('OPENAI_MODEL'):
+        model = os.getenv('OPENAI_MODEL')
+        model_source = "env"
+    else:
+        model = get_default_rag_model_key()
+        model_source = "catalog_default"
+    
+    temperature = profile_meta.get('temperature') or float(os.getenv('SUMMARIZER_TEMPERATURE', '0.3'))
+    
+    # Get model info from catalog for max_tokens cap
+    model_info = get_rag_model(model)
+    if model_info:
+        catalog_max_tokens = model_info.get('max_tokens', 128000)
+        # Cap max_tokens to min of profile setting and catalog limit
+        profile_max_context = profile_meta.get('max_context_tokens', 8000)
+        effective_max_tokens = min(max_tokens, catalog_max_tokens)
+    else:
+        effective_max_tokens = max_tokens
+    
+    # Log summarizer model and profile being used
+    logger.info(
+        "SummarizerCall: model=%s, source=%s, profile_id=%s, profile_version=%s, "
+        "instruction_id=%s, auto_select=%s, temperature=%.2f, est_tokens=%d, clips=%d",
+        model,
+        model_source,
+        profile_meta.get('id') or "none",
+        profile_meta.get('version', 0),
+        resolved_instructions.instruction_id or "none",
+        auto_select,
+        temperature,
+        estimated_context_tokens,
+        packed.segments_used
+    )
+    
+    # Optional debug preview of system prompt (controlled by env var)
+    if os.getenv('LOG_SUMMARIZER_PREVIEW', 'false').lower() in ('1', 'true', 'yes'):
+        preview = system_prompt[:1500].replace("\n", "\\n")
+        logger.debug(
+            "SummarizerPayloadPreview: system_prompt_preview=\"%s\" (len=%d)",
+            preview,
+            len(system_prompt),
+        )
+    
+    observe_stage_ms('prompt_build', (time.perf_counter() - t_prompt_start) * 1000)
+    
+    return _AnswerContext(
+        query=request.query,
+        style=style,
+        t_start=t_start,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        source_chunks=source_chunks,
+        profile_meta=profile_meta,
+        resolved_instructions=resolved_instructions,
+    )
+
+
+async def _complete_answer(ctx: _AnswerContext, content: str, input_tokens: int,
+                           output_tokens: int, t_llm_ms: float) -> Dict[str, Any]:
+    """
+    Parse the summarizer output, map citations and log the request.
+    
+    Shared by /api/answer and /api/answer/stream so both return the same
+    payload and write the same rag_requests / ai_requests rows.
+    """
+    style = ctx.style
+    model = ctx.model
+    source_chunks = ctx.source_chunks
+    profile_meta = ctx.profile_meta
+    resolved_instructions = ctx.resolved_instructions
+    t_start = ctx.t_start
+    
+    # Calculate cost (gpt-4o-mini pricing)
+    # gpt-4o-mini: $0.15/1M input, $0.60/1M output
+    cost = (input_tokens * 0.00015 + output_tokens * 0.0006) / 1000
+    
+    logger.info(
+        f"{log_prefix()} LLMComplete: model={model} in_tokens={input_tokens} out_tokens={output_tokens} "
+        f"cost=${cost:.4f} llm_ms={t_llm_ms:.1f}"
+    )
+    
+    # Parse JSON response and map citations
+    t_serialize_start = time.perf_counter()
+    try:
+        # Handle potential code fences
+        json_content = content
+        json_match = content.find('```')
+        if json_match != -1:
+            # Extract JSON from code fence
+            start = content.find('{')
+            end = content.rfind('}') + 1
+            if start != -1 and end > start:
+                json_content = content[start:end]
+        
+        parsed = json.loads(json_content)
+        
+        # Validate word count
+        word_count = len(parsed.get('answer', '').split())
+        min_words = 900 if style == 'detailed' else 350
+        logger.info(f"Generated answer: {word_count} words (min: {min_words})")
+        
+        if word_count < min_words * 0.5:
+            logger.warning(f"Answer is severely short: {word_count} words")
+            parsed['notes'] = (parsed.get('notes') or '') + f" [Warning: Only {word_count} words]"
+        
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse OpenAI response as JSON: {content[:500]}")
+        # Fallback: return raw content as answer
+        parsed = {
+            "answer": content,
+            "citations_used": [],
+            "confidence": 0.7,
+            "notes": "Response was not valid JSON, returning raw text"
+        }
+    
+    # Build structured citations from citations_used indices
+    citations_used = parsed.get('citations_used', [])
+    structured_citations = []
+    
+    # Create a lookup dict for source chunks by index
+    chunks_by_index = {chunk['index']: chunk for chunk in source_chunks}
+    
+    for citation_idx in citations_used:
+        if citation_idx in chunks_by_index:
+            chunk = chunks_by_index[citation_idx]
+            structured_citations.append({
+                "index": citation_idx,
+                "video_id": chunk['video_id'],
+                "title": chunk.get('title') or 'Untitled Video',
+                "t_start_s": chunk['start_time'],
+                "clip_time": chunk['timestamp'],
+                "published_at": chunk.get('published_at') or None
+            })
+    
+    observe_stage_ms('serialize', (time.perf_counter() - t_serialize_start) * 1000)
+    
+    # Log total latency metrics
+    t_total_ms = (time.perf_counter() - t_start) * 1000
+    logger.info(
+        f"{log_prefix()} AnswerComplete: citations={len(structured_citations)} cost=${cost:.4f} "
+        f"llm_ms={t_llm_ms:.1f} total_ms={t_total_ms:.1f} profile={profile_meta.get('name', 'unknown')}"
+    )
+    
+    # Log request for daily summaries (fire-and-forget)
+    await _log_request(
+        log_rag_request,
+        request_type='answer',
+        query_text=ctx.query,
+        request_id=get_request_id(),
+        session_id=get_session_id(),
+        style=style,
+        results_count=len(structured_citations),
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cost_usd=cost,
+        latency_ms=t_total_ms,
+        success=True,
+        rag_profile_id=profile_meta.get('id'),
+        rag_profile_name=profile_meta.get('name'),
+        source_app='main_app',
+    )
+    
+    # Log AI request for feedback system (returns ai_request_id)
+    ai_request_id = await _log_request(
+        log_ai_request,
+        request_type='qa',
+        input_text=ctx.query,
+        output_text=parsed.get('answer', ''),
+        model_name=model,
+        rag_profile_id=str(profile_meta.get('id')) if profile_meta.get('id') else None,
+        custom_instruction_id=resolved_instructions.instruction_id,
+        request_id=get_request_id(),
+        session_id=get_session_id(),
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cost_usd=cost,
+        latency_ms=t_total_ms,
+        success=True,
+        metadata={
+            'style': style,
+            'citations_count': len(structured_citations),
+            'chunks_used': len(source_chunks),
+            'confidence': parsed.get('confidence', 0.8),
+        }
+    )
+    
+    return {
+        "answer": parsed.get('answer', ''),
+        "answer_md": parsed.get('answer', ''),  # Alias for frontend compatibility
+        "citations": structured_citations,
+        "confidence": parsed.get('confidence', 0.8),
+        "notes": parsed.get('notes'),
+        "sources": source_chunks,
+        "query": ctx.query,
+        "style": style,
+        "chunks_used": len(source_chunks),
+        "cost_usd": cost,
+        "used_chunk_ids": [chunks_by_index.get(idx, {}).get('id', '') for idx in citations_used if idx in chunks_by_index],
+        "rag_profile": {
+            "id": profile_meta.get('id'),
+            "name": profile_meta.get('name'),
+            "version": profile_meta.get('version')
+        },
+        "ai_request_id": ai_request_id,  # For feedback system
+    }
+
+
+async def _log_answer_failure(query: str, style: Optional[str], t_start: float, error: Exception) -> None:
+    """Log a failed answer request (AnswerFailed + rag_requests row)."""
+    t_total_ms = (time.perf_counter() - t_start) * 1000
+    logger.error(f"{log_prefix()} AnswerFailed: error={str(error)} total_ms={t_total_ms:.1f}", exc_info=True)
+    
+    # Log failed request for daily summaries
+    await _log_request(
+        log_rag_request,
+        request_type='answer',
+        query_text=query,
+        request_id=get_request_id(),
+        session_id=get_session_id(),
+        style=style,
+        latency_ms=t_total_ms,
+        success=False,
+        error_message=str(error)[:500],
+        source_app='main_app',
+    )
+
+
+def _answer_flight_key(request: AnswerRequest) -> Optional[tuple]:
+    """
+    Single-flight key for /api/answer, or None to skip coalescing.
+    
+    Covers everything that shapes the answer: normalized query, style,
+    top_k, RAG profile version, custom instructions and search config.
+    """
+    try:
+        profile = get_cached_rag_profile()
+        instructions = get_cached_custom_instructions()
+        config_key = _search_config_key()
+    except Exception as e:
+        logger.debug(f"Answer single-flight disabled for request: {e}")
+        return None
+    return (
+        normalize_query(request.query),
+        getattr(request, 'style', None) or 'concise',
+        request.top_k,
+        profile.id, profile.version,
+        instructions.instruction_id, hash(instructions.text),
+        config_key,
+    )
+
+
 @app.post("/answer", dependencies=[Depends(verify_internal_api_key)])
 @app.post("/api/answer", dependencies=[Depends(verify_internal_api_key)])
 async def answer_question(request: AnswerRequest):
+    """
+    Answer a question, coalescing identical in-flight requests.
+    
+    Concurrent duplicates await the first request's computation and get the
+    same response (including its ai_request_id). See _answer_question.
+    """
+    key = await run_in_threadpool(_answer_flight_key, request)
+    result, shared = await _answer_flights.do(key, lambda: _answer_question(request))
+    if shared:
+        logger.info(f"{log_prefix()} AnswerCoalesced: query={request.query[:50]!r}")
+    return result
+
+
+async def _answer_question(request: AnswerRequest):
     """
     Generate AI-powered answer using RAG with OpenAI and curated Chaffee persona.
     
@@ -1416,372 +2467,210 @@ async def answer_question(request: AnswerRequest):
     - LLM call (OpenAI summarization)
     - Total request duration
     """
-    import json
-    
     # Start timing
     t_start = time.perf_counter()
     
     try:
-        # Load search config from cache (60s TTL)
-        search_cfg = get_cached_search_config()
-        
-        # Get parameters - use request values if provided, otherwise use DB config
-        style = request.style or 'concise'
-        # top_k controls how many candidates to fetch from vector search
-        initial_top_k = request.top_k if request.top_k is not None else search_cfg.top_k
-        # return_top_k controls how many clips are actually used in the LLM prompt
-        clips_for_answer = search_cfg.return_top_k
-        min_similarity = search_cfg.min_similarity
-        max_tokens = 3500 if style == 'detailed' else 1400
-        
-        logger.info(
-            f"{log_prefix()} Answer: query={request.query[:50]!r} style={style} "
-            f"top_k={initial_top_k} clips={clips_for_answer} rerank={search_cfg.enable_reranker}"
-        )
-        
-        # Step 1: Get relevant segments using semantic search
-        # Pass the full config to semantic_search so it uses DB settings
-        search_request = SearchRequest(
-            query=request.query, 
-            top_k=initial_top_k,
-            min_similarity=min_similarity,
-            rerank=search_cfg.enable_reranker
-        )
-        search_response = await semantic_search(search_request)
-        
-        if not search_response.results:
-            raise HTTPException(status_code=404, detail="No relevant information found")
-        
-        # Step 2: Limit results to clips_for_answer (return_top_k from tuning dashboard)
-        # This is the key setting: "Number of clips to use in answer"
-        total_candidates = len(search_response.results)
-        results_for_llm = search_response.results[:clips_for_answer]
-        
-        # Step 3: Build RAG context in the curated format
-        # Format: numbered excerpts [1], [2], etc. with video info
-        excerpt_parts = []
-        source_chunks = []
-        
-        for idx, result in enumerate(results_for_llm, start=1):
-            video_id = result.url.split('v=')[-1].split('&')[0] if 'youtube.com' in result.url else result.id
-            timestamp = _format_timestamp(result.start_time_seconds)
-            date = result.published_at[:10] if result.published_at else "unknown"
-            
-            # Use numbered format for cleaner citations
-            excerpt_parts.append(
-                f'[{idx}] Video: {result.title or "Untitled"}\n    Date: {date}\n    Time: {timestamp}\n    Text: "{result.text}"'
-            )
-            source_chunks.append({
-                "index": idx,  # Add index for citation mapping
-                "id": result.id,
-                "video_id": video_id,
-                "title": result.title,
-                "url": result.url,
-                "start_time": result.start_time_seconds,
-                "timestamp": timestamp,
-                "similarity": round(result.similarity, 3),
-                "published_at": result.published_at
-            })
-        
-        excerpts = "\n\n".join(excerpt_parts)
-        
-        # Step 4: Build curated prompts (includes custom instructions from DB)
-        system_prompt, profile_meta, resolved_instructions = _build_chaffee_system_prompt(style, include_custom=True)
-        user_prompt = _build_chaffee_user_prompt(request.query, excerpts, style)
+        ctx = await _prepare_answer(request, t_start)
         
         # Step 5: Query OpenAI
-        openai_api_key = os.getenv('OPENAI_API_KEY')
-        if not openai_api_key:
-            logger.error("OPENAI_API_KEY not configured")
-            raise HTTPException(status_code=503, detail="OpenAI API key not configured")
-        
-        try:
-            from openai import OpenAI
-            client = OpenAI(api_key=openai_api_key)
-        except ImportError as e:
-            logger.error(f"Failed to import OpenAI: {e}")
-            raise HTTPException(status_code=503, detail="OpenAI library not available")
-        
-        # Model selection priority:
-        # 1. Auto-select if profile.auto_select_model == True
-        # 2. RAG profile model_name (if valid in catalog)
-        # 3. SUMMARIZER_MODEL env var
-        # 4. OPENAI_MODEL env var
-        # 5. Default from catalog
-        model_source = "catalog_default"
-        profile_model = profile_meta.get('model_name')
-        auto_select = profile_meta.get('auto_select_model', False)
-        
-        # Estimate context length for auto-selection
-        estimated_context_tokens = len(system_prompt) // 4 + len(user_prompt) // 4  # Rough estimate
-        
-        if auto_select:
-            # Auto model selection logic
-            original_model = profile_model if profile_model and validate_rag_model_key(profile_model) else get_default_rag_model_key()
-            model = original_model
-            model_source = "auto"
-            
-            # Check 1: Context window upgrade
-            current_max_context = model_max_context(model)
-            if estimated_context_tokens > current_max_context * 0.8:  # 80% threshold
-                # Need a larger context model
-                upgraded = find_model_with_capability(
-                    required_context=estimated_context_tokens,
-                    require_json_mode=True
-                )
-                if upgraded and upgraded != model:
-                    logger.info(f"Auto-select: upgrading from {model} to {upgraded} for larger context ({estimated_context_tokens} tokens)")
-                    model = upgraded
-            
-            # Check 2: JSON mode requirement (we always need it for structured output)
-            if not model_supports_json_mode(model):
-                upgraded = find_model_with_capability(
-                    required_context=estimated_context_tokens,
-                    require_json_mode=True
-                )
-                if upgraded:
-                    logger.info(f"Auto-select: upgrading from {model} to {upgraded} for JSON mode support")
-                    model = upgraded
-            
-            # Check 3: Cheap/fast downgrade for small contexts
-            if estimated_context_tokens < 4000:  # Small context
-                cheaper = find_model_with_capability(
-                    required_context=estimated_context_tokens,
-                    require_json_mode=True,
-                    prefer_cheap=True,
-                    prefer_fast=True
-                )
-                if cheaper and cheaper != model:
-                    # Only downgrade if the cheaper model is recommended
-                    cheaper_info = get_rag_model(cheaper)
-                    if cheaper_info and cheaper_info.get('recommended', False):
-                        logger.info(f"Auto-select: downgrading from {model} to {cheaper} for small context ({estimated_context_tokens} tokens)")
-                        model = cheaper
-        elif profile_model and validate_rag_model_key(profile_model):
-            model = profile_model
-            model_source = "profile"
-        elif profile_model:
-            # Profile has invalid model, log warning and fall back
-            logger.warning(
-                f"RAG profile '{profile_meta.get('name')}' has invalid model_name '{profile_model}', "
-                f"falling back to default. Valid models: {', '.join(get_rag_model_keys())}"
-            )
-            model = os.getenv('SUMMARIZER_MODEL') or os.getenv('OPENAI_MODEL') or get_default_rag_model_key()
-            model_source = "fallback"
-        elif os.getenv('SUMMARIZER_MODEL'):
-            model = os.getenv('SUMMARIZER_MODEL')
-            model_source = "env"
-        elif os.getenv('OPENAI_MODEL'):
-            model = os.getenv('OPENAI_MODEL')
-            model_source = "env"
-        else:
-            model = get_default_rag_model_key()
-            model_source = "catalog_default"
-        
-        temperature = profile_meta.get('temperature') or float(os.getenv('SUMMARIZER_TEMPERATURE', '0.3'))
-        
-        # Get model info from catalog for max_tokens cap
-        model_info = get_rag_model(model)
-        if model_info:
-            catalog_max_tokens = model_info.get('max_tokens', 128000)
-            # Cap max_tokens to min of profile setting and catalog limit
-            profile_max_context = profile_meta.get('max_context_tokens', 8000)
-            effective_max_tokens = min(max_tokens, catalog_max_tokens)
-        else:
-            effective_max_tokens = max_tokens
-        
-        # Log summarizer model and profile being used
-        logger.info(
-            "SummarizerCall: model=%s, source=%s, profile_id=%s, profile_version=%s, "
-            "instruction_id=%s, auto_select=%s, temperature=%.2f, est_tokens=%d, clips=%d",
-            model,
-            model_source,
-            profile_meta.get('id') or "none",
-            profile_meta.get('version', 0),
-            resolved_instructions.instruction_id or "none",
-            auto_select,
-            temperature,
-            estimated_context_tokens,
-            len(results_for_llm)
-        )
-        
-        # Optional debug preview of system prompt (controlled by env var)
-        if os.getenv('LOG_SUMMARIZER_PREVIEW', 'false').lower() in ('1', 'true', 'yes'):
-            preview = system_prompt[:1500].replace("\n", "\\n")
-            logger.debug(
-                "SummarizerPayloadPreview: system_prompt_preview=\"%s\" (len=%d)",
-                preview,
-                len(system_prompt),
-            )
+        client = _get_openai_client()
         
         # Time the LLM call
         t_llm_start = time.perf_counter()
-        response = client.chat.completions.create(
-            model=model,
+        response = await chat_completion(
+            client,
+            model=ctx.model,
             messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
+                {"role": "system", "content": ctx.system_prompt},
+                {"role": "user", "content": ctx.user_prompt}
             ],
-            max_tokens=max_tokens,
-            temperature=temperature,  # Configurable via tuning dashboard
+            max_tokens=ctx.max_tokens,
+            temperature=ctx.temperature,  # Configurable via tuning dashboard
             response_format={"type": "json_object"}  # Ensure JSON output
         )
         t_llm_ms = (time.perf_counter() - t_llm_start) * 1000
-        
-        content = response.choices[0].message.content
-        
-        # Calculate cost (gpt-4o-mini pricing)
-        input_tokens = response.usage.prompt_tokens
-        output_tokens = response.usage.completion_tokens
-        # gpt-4o-mini: $0.15/1M input, $0.60/1M output
-        cost = (input_tokens * 0.00015 + output_tokens * 0.0006) / 1000
-        
-        logger.info(
-            f"{log_prefix()} LLMComplete: model={model} in_tokens={input_tokens} out_tokens={output_tokens} "
-            f"cost=${cost:.4f} llm_ms={t_llm_ms:.1f}"
-        )
-        
-        # Parse JSON response
-        try:
-            # Handle potential code fences
-            json_content = content
-            json_match = content.find('```')
-            if json_match != -1:
-                # Extract JSON from code fence
-                start = content.find('{')
-                end = content.rfind('}') + 1
-                if start != -1 and end > start:
-                    json_content = content[start:end]
-            
-            parsed = json.loads(json_content)
-            
-            # Validate word count
-            word_count = len(parsed.get('answer', '').split())
-            min_words = 900 if style == 'detailed' else 350
-            logger.info(f"Generated answer: {word_count} words (min: {min_words})")
-            
-            if word_count < min_words * 0.5:
-                logger.warning(f"Answer is severely short: {word_count} words")
-                parsed['notes'] = (parsed.get('notes') or '') + f" [Warning: Only {word_count} words]"
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse OpenAI response as JSON: {content[:500]}")
-            # Fallback: return raw content as answer
-            parsed = {
-                "answer": content,
-                "citations_used": [],
-                "confidence": 0.7,
-                "notes": "Response was not valid JSON, returning raw text"
-            }
-        
-        # Build structured citations from citations_used indices
-        citations_used = parsed.get('citations_used', [])
-        structured_citations = []
-        
-        # Create a lookup dict for source chunks by index
-        chunks_by_index = {chunk['index']: chunk for chunk in source_chunks}
-        
-        for citation_idx in citations_used:
-            if citation_idx in chunks_by_index:
-                chunk = chunks_by_index[citation_idx]
-                structured_citations.append({
-                    "index": citation_idx,
-                    "video_id": chunk['video_id'],
-                    "title": chunk.get('title') or 'Untitled Video',
-                    "t_start_s": chunk['start_time'],
-                    "clip_time": chunk['timestamp'],
-                    "published_at": chunk.get('published_at') or None
-                })
-        
-        # Log total latency metrics
-        t_total_ms = (time.perf_counter() - t_start) * 1000
-        logger.info(
-            f"{log_prefix()} AnswerComplete: citations={len(structured_citations)} cost=${cost:.4f} "
-            f"llm_ms={t_llm_ms:.1f} total_ms={t_total_ms:.1f} profile={profile_meta.get('name', 'unknown')}"
-        )
-        
-        # Log request for daily summaries (fire-and-forget)
-        log_rag_request(
-            request_type='answer',
-            query_text=request.query,
-            request_id=get_request_id(),
-            session_id=get_session_id(),
-            style=style,
-            results_count=len(structured_citations),
-            input_tokens=input_tokens,
-            output_tokens=output_tokens,
-            cost_usd=cost,
-            latency_ms=t_total_ms,
-            success=True,
-            rag_profile_id=profile_meta.get('id'),
-            rag_profile_name=profile_meta.get('name'),
-            source_app='main_app',
+        observe_stage_ms('llm', t_llm_ms)
+        
+        return await _complete_answer(
+            ctx,
+            response.choices[0].message.content,
+            response.usage.prompt_tokens,
+            response.usage.completion_tokens,
+            t_llm_ms,
         )
         
-        # Log AI request for feedback system (returns ai_request_id)
-        ai_request_id = log_ai_request(
-            request_type='qa',
-            input_text=request.query,
-            output_text=parsed.get('answer', ''),
-            model_name=model,
-            rag_profile_id=str(profile_meta.get('id')) if profile_meta.get('id') else None,
-            custom_instruction_id=resolved_instructions.instruction_id,
-            request_id=get_request_id(),
-            session_id=get_session_id(),
-            input_tokens=input_tokens,
-            output_tokens=output_tokens,
-            cost_usd=cost,
-            latency_ms=t_total_ms,
-            success=True,
-            metadata={
-                'style': style,
-                'citations_count': len(structured_citations),
-                'chunks_used': len(source_chunks),
-                'confidence': parsed.get('confidence', 0.8),
-            }
-        )
-        
-        return {
-            "answer": parsed.get('answer', ''),
-            "answer_md": parsed.get('answer', ''),  # Alias for frontend compatibility
-            "citations": structured_citations,
-            "confidence": parsed.get('confidence', 0.8),
-            "notes": parsed.get('notes'),
-            "sources": source_chunks,
-            "query": request.query,
-            "style": style,
-            "chunks_used": len(source_chunks),
-            "cost_usd": cost,
-            "used_chunk_ids": [chunks_by_index.get(idx, {}).get('id', '') for idx in citations_used if idx in chunks_by_index],
-            "rag_profile": {
-                "id": profile_meta.get('id'),
-                "name": profile_meta.get('name'),
-                "version": profile_meta.get('version')
-            },
-            "ai_request_id": ai_request_id,  # For feedback system
-        }
-        
     except HTTPException:
         raise
     except Exception as e:
-        t_total_ms = (time.perf_counter() - t_start) * 1000
-        logger.error(f"{log_prefix()} AnswerFailed: error={str(e)} total_ms={t_total_ms:.1f}", exc_info=True)
-        
-        # Log failed request for daily summaries
-        log_rag_request(
-            request_type='answer',
-            query_text=request.query,
-            request_id=get_request_id(),
-            session_id=get_session_id(),
-            style=style if 'style' in dir() else None,
-            latency_ms=t_total_ms,
-            success=False,
-            error_message=str(e)[:500],
-            source_app='main_app',
-        )
-        
+        await _log_answer_failure(request.query, getattr(request, 'style', None) or 'concise', t_start, e)
         raise HTTPException(status_code=500, detail=f"Answer generation failed: {str(e)}")
 
+
+def _sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class AnswerFieldStream:
+    """
+    Incrementally extracts the "answer" string from streamed JSON output.
+    
+    The summarizer answers in JSON mode ({"answer": "...", "citations_used": [...]}),
+    so raw deltas are JSON fragments. This decodes just the answer value as it
+    arrives, including escapes split across deltas, so it can be streamed as
+    plain text. The full content is still parsed when the stream ends.
+    """
+    
+    _ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+    _KEY_RE = re.compile(r'"answer"\s*:\s*"')
+    
+    def __init__(self):
+        self._buffer = ''
+        self._pos = 0
+        self._in_value = False
+        self._done = False
+    
+    def feed(self, delta: str) -> str:
+        """Add a content delta; return newly decoded answer text."""
+        if self._done or not delta:
+            return ''
+        self._buffer += delta
+        if not self._in_value:
+            match = self._KEY_RE.search(self._buffer)
+            if not match:
+                return ''
+            self._in_value = True
+            self._pos = match.end()
+        
+        out = []
+        buf = self._buffer
+        while self._pos < len(buf):
+            ch = buf[self._pos]
+            if ch == '"':
+                self._done = True
+                break
+            if ch != '\\':
+                out.append(ch)
+                self._pos += 1
+                continue
+            # Escape sequence - wait for the rest if it was split across deltas
+            if self._pos + 1 >= len(buf):
+                break
+            code = buf[self._pos + 1]
+            if code == 'u':
+                if self._pos + 6 > len(buf):
+                    break
+                out.append(chr(int(buf[self._pos + 2:self._pos + 6], 16)))
+                self._pos += 6
+            else:
+                out.append(self._ESCAPES.get(code, code))
+                self._pos += 2
+        return ''.join(out)
+
+
+@app.post("/api/answer/stream", dependencies=[Depends(verify_internal_api_key)])
+async def answer_question_stream(request: AnswerRequest):
+    """
+    Streaming variant of /api/answer (Server-Sent Events).
+    
+    Events, in order:
+    - sources: the numbered source clips used as context (before the LLM call)
+    - token: {"text": ...} answer text as it is generated
+    - citations: structured citations from citations_used
+    - done: the same payload /api/answer returns (answer, confidence, cost,
+      ai_request_id, ...)
+    - error: {"detail": ...} if generation fails mid-stream
+    
+    A client disconnect is logged as a failed answer.
+    Retrieval errors (404 no results, 503 config) are returned as normal HTTP
+    errors before the stream starts. AnswerComplete logging and the
+    rag_requests / ai_requests rows match /api/answer and are written when
+    the stream completes.
+    """
+    t_start = time.perf_counter()
+    
+    try:
+        ctx = await _prepare_answer(request, t_start)
+        client = _get_openai_client()
+    except HTTPException:
+        raise
+    except Exception as e:
+        await _log_answer_failure(request.query, getattr(request, 'style', None) or 'concise', t_start, e)
+        raise HTTPException(status_code=500, detail=f"Answer generation failed: {str(e)}")
+    
+    async def event_stream():
+        yield _sse_event("sources", {"sources": ctx.source_chunks, "query": ctx.query, "style": ctx.style})
+        
+        try:
+            t_llm_start = time.perf_counter()
+            stream = stream_chat_completion(
+                client,
+                model=ctx.model,
+                messages=[
+                    {"role": "system", "content": ctx.system_prompt},
+                    {"role": "user", "content": ctx.user_prompt}
+                ],
+                max_tokens=ctx.max_tokens,
+                temperature=ctx.temperature,
+                response_format={"type": "json_object"},
+                # Final chunk carries token usage (extra_body works on older SDKs too)
+                extra_body={"stream_options": {"include_usage": True}},
+            )
+            
+            parts = []
+            usage = None
+            answer_field = AnswerFieldStream()
+            t_first_token_ms = None
+            async for chunk in stream:
+                if getattr(chunk, 'usage', None) is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                text = answer_field.feed(delta)
+                if text:
+                    if t_first_token_ms is None:
+                        t_first_token_ms = (time.perf_counter() - t_start) * 1000
+                    yield _sse_event("token", {"text": text})
+            t_llm_ms = (time.perf_counter() - t_llm_start) * 1000
+            observe_stage_ms('llm', t_llm_ms)
+            
+            content = ''.join(parts)
+            if usage is not None:
+                input_tokens, output_tokens = usage.prompt_tokens, usage.completion_tokens
+            else:
+                # Rough estimate if the API didn't report usage
+                input_tokens = (len(ctx.system_prompt) + len(ctx.user_prompt)) // 4
+                output_tokens = len(content) // 4
+            
+            logger.info(
+                f"{log_prefix()} AnswerStream: first_token_ms={t_first_token_ms or 0:.1f} deltas={len(parts)}"
+            )
+            result = await _complete_answer(ctx, content, input_tokens, output_tokens, t_llm_ms)
+            yield _sse_event("citations", {"citations": result["citations"]})
+            yield _sse_event("done", result)
+        except (asyncio.CancelledError, GeneratorExit):
+            # Client disconnected mid-answer: still account for the request.
+            # Shielded so the cancellation doesn't also abort the log write.
+            await asyncio.shield(_log_answer_failure(
+                ctx.query, ctx.style, t_start, ConnectionError("client disconnected before the answer completed")
+            ))
+            raise
+        except Exception as e:
+            await _log_answer_failure(ctx.query, ctx.style, t_start, e)
+            yield _sse_event("error", {"detail": f"Answer generation failed: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/answer", dependencies=[Depends(verify_internal_api_key)])
 @app.get("/api/answer", dependencies=[Depends(verify_internal_api_key)])
 async def answer_get(query: str, top_k: int = 10, style: str = 'concise'):
@@ -1817,11 +2706,15 @@ class ChunksRequest(BaseModel):
 
 
 @app.post("/answer/cache/lookup", dependencies=[Depends(verify_internal_api_key)])
-async def answer_cache_lookup(request: CacheLookupRequest):
+def answer_cache_lookup(request: CacheLookupRequest):
     """
     Look up cached answer by semantic similarity.
     Returns cached answer if found, null otherwise.
     
+    Two tiers: an in-process exact-match tier (normalized query hash) is
+    checked before any embedding work, then the semantic similarity query.
+    Hits are counted in memory and written to answer_cache in bulk.
+    
     Feature flag: ANSWER_CACHE_ENABLED must be true for this to work.
     When disabled, returns {"cached": None} immediately.
     """
@@ -1831,24 +2724,30 @@ async def answer_cache_lookup(request: CacheLookupRequest):
         return {"cached": None}
     
     try:
-        # Generate embedding for the query
-        generator = get_embedding_generator()
-        embeddings = generator.generate_embeddings([request.query])
+        model_key = get_active_model_key()
         
-        if not embeddings or len(embeddings) == 0:
-            return {"cached": None}
+        # Tier 1: exact normalized query, no embedding or DB work
+        cached = lookup_hot_answer(model_key, request.style, request.query, request.similarity_threshold)
+        if cached is not None:
+            get_answer_cache_access_tracker().record(cached['id'])
+            record_lookup('hot')
+            logger.info(f"Answer cache HIT: query='{request.query[:50]}...' similarity={cached['similarity']:.2f} source=hot_tier")
+            return {"cached": cached}
         
-        query_embedding = embeddings[0]
-        embedding_list = query_embedding.tolist() if hasattr(query_embedding, 'tolist') else query_embedding
+        # Tier 2: embed the query (shared cache with /search and /answer/chunks)
+        query_embedding = embed_query(request.query)
         
-        # Get active model key
-        model_key = get_active_model_key()
+        if query_embedding is None:
+            return {"cached": None}
+        
+        query_vector = Vector(query_embedding)
         
         conn = get_db_connection()
         cur = conn.cursor()
         
         # Search for similar cached answers using normalized storage
         cur.execute("""
+            WITH q AS (SELECT %s::vector AS v)
             SELECT 
                 ac.id,
                 ac.query_text,
@@ -1860,51 +2759,46 @@ async def answer_cache_lookup(request: CacheLookupRequest):
                 ac.source_clips,
                 ac.created_at,
                 ac.access_count,
-                1 - (ace.embedding <=> %s::vector) as similarity
-            FROM answer_cache ac
+                1 - (ace.embedding <=> q.v) as similarity
+            FROM q
+            CROSS JOIN answer_cache ac
             JOIN answer_cache_embeddings ace ON ac.id = ace.answer_cache_id
             WHERE ace.model_key = %s
               AND ac.style = %s
-              AND 1 - (ace.embedding <=> %s::vector) >= %s
-            ORDER BY similarity DESC
+              AND ac.created_at + make_interval(hours => COALESCE(ac.ttl_hours, 336)) > NOW()
+              AND 1 - (ace.embedding <=> q.v) >= %s
+            ORDER BY ace.embedding <=> q.v
             LIMIT 1
-        """, [str(embedding_list), model_key, request.style, str(embedding_list), request.similarity_threshold])
+        """, [query_vector, model_key, request.style, request.similarity_threshold])
         
         result = cur.fetchone()
         
+        cur.close()
+        conn.close()
+        
         if result:
-            # Update access count
-            cur.execute("""
-                UPDATE answer_cache 
-                SET accessed_at = NOW(), access_count = access_count + 1
-                WHERE id = %s
-            """, [result['id']])
-            conn.commit()
-            
-            cur.close()
-            conn.close()
+            get_answer_cache_access_tracker().record(result['id'])
+            record_lookup('semantic')
             
             logger.info(f"Answer cache HIT: query='{request.query[:50]}...' similarity={result['similarity']:.2f} source=answer_cache_embeddings:{model_key}")
             
-            return {
-                "cached": {
-                    "id": result['id'],
-                    "query_text": result['query_text'],
-                    "answer_md": result['answer_md'],
-                    "citations": result['citations'],
-                    "confidence": result['confidence'],
-                    "notes": result['notes'],
-                    "used_chunk_ids": result['used_chunk_ids'],
-                    "source_clips": result['source_clips'],
-                    "created_at": result['created_at'].isoformat() if result['created_at'] else None,
-                    "access_count": result['access_count'],
-                    "similarity": float(result['similarity'])
-                }
+            cached = {
+                "id": result['id'],
+                "query_text": result['query_text'],
+                "answer_md": result['answer_md'],
+                "citations": result['citations'],
+                "confidence": result['confidence'],
+                "notes": result['notes'],
+                "used_chunk_ids": result['used_chunk_ids'],
+                "source_clips": result['source_clips'],
+                "created_at": result['created_at'].isoformat() if result['created_at'] else None,
+                "access_count": result['access_count'],
+                "similarity": float(result['similarity'])
             }
+            store_hot_answer(model_key, request.style, request.query, cached)
+            return {"cached": cached}
         
-        cur.close()
-        conn.close()
-        
+        record_lookup('miss')
         logger.info(f"Answer cache MISS: query='{request.query[:50]}...'")
         return {"cached": None}
         
@@ -1914,7 +2808,7 @@ async def answer_cache_lookup(request: CacheLookupRequest):
 
 
 @app.post("/answer/cache/save", dependencies=[Depends(verify_internal_api_key)])
-async def answer_cache_save(request: CacheSaveRequest):
+def answer_cache_save(request: CacheSaveRequest):
     """
     Save answer to cache with embedding for semantic lookup.
     
@@ -1927,15 +2821,13 @@ async def answer_cache_save(request: CacheSaveRequest):
         return {"success": True, "cache_id": None, "skipped": True}
     
     try:
-        # Generate embedding for the query
-        generator = get_embedding_generator()
-        embeddings = generator.generate_embeddings([request.query])
+        # Embed the query (usually a cache hit from the preceding lookup/search)
+        query_embedding = embed_query(request.query)
         
-        if not embeddings or len(embeddings) == 0:
+        if query_embedding is None:
             raise HTTPException(status_code=500, detail="Failed to generate embedding")
         
-        query_embedding = embeddings[0]
-        embedding_list = query_embedding.tolist() if hasattr(query_embedding, 'tolist') else query_embedding
+        query_vector = Vector(query_embedding)
         
         # Get active model key
         model_key = get_active_model_key()
@@ -1965,7 +2857,7 @@ async def answer_cache_save(request: CacheSaveRequest):
         cache_id = cur.fetchone()['id']
         
         # Insert embedding into answer_cache_embeddings table
-        dimensions = len(embedding_list)
+        dimensions = len(query_vector)
         cur.execute("""
             INSERT INTO answer_cache_embeddings (
                 answer_cache_id, model_key, dimensions, embedding
@@ -1973,12 +2865,27 @@ async def answer_cache_save(request: CacheSaveRequest):
             ON CONFLICT (answer_cache_id, model_key) DO UPDATE SET
                 embedding = EXCLUDED.embedding,
                 dimensions = EXCLUDED.dimensions
-        """, [cache_id, model_key, dimensions, str(embedding_list)])
+        """, [cache_id, model_key, dimensions, query_vector])
         
         conn.commit()
         cur.close()
         conn.close()
         
+        # An identical follow-up question is served without embedding it
+        store_hot_answer(model_key, request.style, request.query, {
+            "id": cache_id,
+            "query_text": request.query,
+            "answer_md": request.answer_md,
+            "citations": request.citations,
+            "confidence": request.confidence,
+            "notes": request.notes,
+            "used_chunk_ids": request.used_chunk_ids,
+            "source_clips": request.source_clips,
+            "created_at": datetime.now().isoformat(),
+            "access_count": 0,
+            "similarity": 1.0,
+        })
+        
         logger.info(f"Cached answer for query: {request.query[:50]}... (id: {cache_id})")
         
         return {"success": True, "cache_id": cache_id}
@@ -1989,7 +2896,7 @@ async def answer_cache_save(request: CacheSaveRequest):
 
 
 @app.post("/answer/chunks", dependencies=[Depends(verify_internal_api_key)])
-async def get_answer_chunks(request: ChunksRequest):
+def get_answer_chunks(request: ChunksRequest):
     """
     Get relevant chunks for RAG answer generation.
     Uses semantic search with normalized/legacy fallback, then text search.
@@ -2002,24 +2909,31 @@ async def get_answer_chunks(request: ChunksRequest):
         search_source = "none"
         
         if request.use_semantic:
-            # Generate embedding for the query
-            generator = get_embedding_generator()
-            embeddings = generator.generate_embeddings([request.query])
+            # Embed the query (shared cache with /search and the answer cache)
+            query_embedding = embed_query(request.query)
             
-            if embeddings and len(embeddings) > 0:
-                query_embedding = embeddings[0]
+            if query_embedding is not None:
                 model_key = get_active_model_key()
                 
                 # Use semantic search with fallback
                 chunks, search_source = semantic_search_with_fallback(
-                    cur, query_embedding, model_key, request.top_k
+                    cur, query_embedding, model_key, request.top_k,
+                    query_text=request.query,
                 )
                 
                 if search_source != "none":
                     logger.info(f"Semantic search source: {search_source}")
         
-        # Fallback to text search if no semantic results
+        # Fallback to full-text search if no semantic results
         if not chunks:
+            try:
+                chunks = lexical_search(cur, request.query, request.top_k)
+                search_source = "text_search"
+            except Exception as e:
+                logger.warning(f"Full-text search failed, falling back to ILIKE: {e}")
+        
+        # Databases without segments.text_tsv (migration 030)
+        if not chunks and search_source != "text_search":
             cur.execute("""
                 SELECT 
                     seg.id,
@@ -2077,7 +2991,7 @@ async def get_answer_chunks(request: ChunksRequest):
 # =============================================================================
 
 @app.get("/embeddings/models")
-async def list_embedding_models():
+def list_embedding_models():
     """List available embedding models in the database."""
     models = get_available_embedding_models()
     return {"models": models}
@@ -2238,6 +3152,11 @@ async def sync_new_videos(
 
 # Background processing functions
 
+def _on_ingestion_complete():
+    """Drop cached storage state so new embeddings are searchable immediately."""
+    invalidate_storage_catalog()
+    invalidate_embedding_stats()
+
 async def process_youtube_takeout(job_id: str, file: UploadFile):
     """Process YouTube Takeout ZIP file"""
     job = processing_jobs[job_id]
@@ -2288,6 +3207,7 @@ async def process_youtube_takeout(job_id: str, file: UploadFile):
                     job["failed_files"] += 1
                     job["errors"].append(f"Error processing {srt_path}: {str(e)}")
         
+        _on_ingestion_complete()
         job["status"] = "completed"
         job["completed_at"] = datetime.now()
         
@@ -2339,6 +3259,7 @@ async def process_zoom_transcripts(job_id: str, files: List[UploadFile]):
                 job["failed_files"] += 1
                 job["errors"].append(f"Error processing {file.filename}: {str(e)}")
         
+        _on_ingestion_complete()
         job["status"] = "completed"
         job["completed_at"] = datetime.now()
         
@@ -2383,7 +3304,8 @@ async def process_manual_transcripts(job_id: str, files: List[UploadFile], sourc
                 job["failed_files"] += 1
                 job["errors"].append(f"Error processing {file.filename}: {str(e)}")
         
-        job["status"] = "completed" 
+        _on_ingestion_complete()
+        job["status"] = "completed"
         job["completed_at"] = datetime.now()
         
     except Exception as e:
@@ -2413,6 +3335,7 @@ async def sync_youtube_videos(job_id: str, limit: int, use_proxy: bool):
         ingester = EnhancedYouTubeIngester(config)
         await ingester.run_async()  # Implement async version
         
+        _on_ingestion_complete()
         job["status"] = "completed"
         job["completed_at"] = datetime.now()
         job["processed_files"] = limit  # Approximate
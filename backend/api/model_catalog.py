@@ -36,6 +36,7 @@ DEFAULT_RAG_CATALOG = {
         "gpt-4.1": {
             "label": "GPT-4.1 (Best quality)",
             "max_tokens": 128000,
+            "tokenizer": "o200k_base",
             "recommended": True,
             "tags": ["high-quality", "json-mode", "128k"],
             "capabilities": {
@@ -47,6 +48,7 @@ DEFAULT_RAG_CATALOG = {
         "gpt-4o-mini": {
             "label": "GPT-4o Mini (Cheapest)",
             "max_tokens": 128000,
+            "tokenizer": "o200k_base",
             "recommended": True,
             "tags": ["fast", "cheap", "json-mode", "128k"],
             "capabilities": {
@@ -231,6 +233,21 @@ def model_max_context(model_key: str) -> int:
     return capabilities.get('max_context', 128000)
 
 
+def model_tokenizer(model_key: str) -> str:
+    """
+    Get the tiktoken encoding name for a model.
+    
+    Uses the catalog's 'tokenizer' field; models without one fall back by
+    name (gpt-4o / gpt-4.1 / o-series use o200k_base, older ones cl100k_base).
+    """
+    model = get_rag_model(model_key)
+    if model and model.get('tokenizer'):
+        return model['tokenizer']
+    if model_key.startswith(('gpt-4o', 'gpt-4.1', 'gpt-5', 'o1', 'o3', 'o4')):
+        return 'o200k_base'
+    return 'cl100k_base'
+
+
 def get_rag_model_definitions() -> List[Dict[str, Any]]:
     """
     Get all RAG model definitions as a list for frontend consumption.
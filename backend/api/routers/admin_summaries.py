@@ -119,7 +119,7 @@ def format_summary_detail(row: dict) -> SummaryDetail:
 # =============================================================================
 
 @router.get("", response_model=List[SummaryListItem])
-async def list_daily_summaries(
+def list_daily_summaries(
     limit: int = Query(30, ge=1, le=100, description="Number of summaries to return"),
 ):
     """
@@ -137,7 +137,7 @@ async def list_daily_summaries(
 
 
 @router.get("/{summary_date}", response_model=SummaryDetail)
-async def get_daily_summary(summary_date: str):
+def get_daily_summary(summary_date: str):
     """
     Get a specific daily summary by date.
 
@@ -165,7 +165,7 @@ async def get_daily_summary(summary_date: str):
 
 
 @router.post("/generate", response_model=SummaryDetail)
-async def generate_summary(request: GenerateRequest):
+def generate_summary(request: GenerateRequest):
     """
     Generate a daily summary for a specific date.
 
@@ -29,6 +29,7 @@ from ..services.auth_tokens import (
     clear_auth_cookies,
     ACCESS_TOKEN_LIFETIME_SECONDS,
 )
+from ..utils.db_pool import get_db_connection as get_pooled_connection
 
 logger = logging.getLogger(__name__)
 
@@ -40,18 +41,11 @@ router = APIRouter(prefix="/api/auth", tags=["auth"])
 # ============================================
 
 def _get_db_connection():
-    """Get database connection."""
-    import psycopg2
-    from psycopg2.extras import RealDictCursor
-    
-    database_url = os.getenv("DATABASE_URL", "")
-    if not database_url:
+    """Get a pooled database connection (close() returns it to the pool)."""
+    if not os.getenv("DATABASE_URL", ""):
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    if database_url.startswith("postgres://"):
-        database_url = database_url.replace("postgres://", "postgresql://", 1)
-    
-    return psycopg2.connect(database_url, cursor_factory=RealDictCursor)
+    return get_pooled_connection()
 
 
 def _get_user_by_id(user_id: int) -> Optional[dict]:
@@ -141,7 +135,7 @@ class PasswordLoginRequest(BaseModel):
 # ============================================
 
 @router.get("/me")
-async def get_current_user(
+def get_current_user(
     request: Request,
     response: Response,
     x_requested_with: Optional[str] = Header(None),
@@ -273,7 +267,7 @@ async def logout(
 
 
 @router.post("/login")
-async def password_login(
+def password_login(
     request: Request,
     response: Response,
     body: PasswordLoginRequest,
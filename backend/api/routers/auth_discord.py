@@ -29,9 +29,8 @@ from datetime import datetime
 from typing import Optional, Dict
 
 from fastapi import APIRouter, Request, Response, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import RedirectResponse
-import psycopg2
-from psycopg2.extras import RealDictCursor
 
 from ..services.discord_client import (
     get_discord_config,
@@ -54,6 +53,7 @@ from ..services.auth_tokens import (
     set_auth_cookies,
     decode_and_validate,
 )
+from ..utils.db_pool import get_db_connection as get_pooled_connection
 
 logger = logging.getLogger(__name__)
 
@@ -132,17 +132,11 @@ STATE_COOKIE_NAME = "discord_oauth_state"
 
 
 def get_db_connection():
-    """Get database connection."""
-    database_url = os.getenv("DATABASE_URL", "")
-    if not database_url:
+    """Get a pooled database connection (close() returns it to the pool)."""
+    if not os.getenv("DATABASE_URL", ""):
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    # Parse connection string
-    # Handle both postgres:// and postgresql:// schemes
-    if database_url.startswith("postgres://"):
-        database_url = database_url.replace("postgres://", "postgresql://", 1)
-    
-    return psycopg2.connect(database_url, cursor_factory=RealDictCursor)
+    return get_pooled_connection()
 
 
 # Legacy create_session_token removed - now using auth_tokens service
@@ -394,7 +388,8 @@ async def discord_callback(
     
     # All checks passed - upsert user in database
     try:
-        user_id = upsert_discord_user(
+        user_id = await run_in_threadpool(
+            upsert_discord_user,
             discord_id=discord_id,
             username=username,
             discriminator=discriminator,
@@ -469,7 +464,7 @@ async def discord_auth_status():
 
 
 @router.get("/me")
-async def get_current_discord_user(request: Request):
+def get_current_discord_user(request: Request):
     """
     Get current Discord user's information.
     
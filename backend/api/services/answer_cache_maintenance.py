@@ -0,0 +1,416 @@
+"""
+Answer Cache Maintenance
+
+answer_cache rows carry ttl_hours but nothing ever removed them, so the
+table and its ANN index over answer_cache_embeddings_{dim} grew forever and
+IVFFlat recall degraded as the index's `lists` fell behind the row count.
+
+compact_answer_cache():
+- Deletes, in batches of ANSWER_CACHE_COMPACT_BATCH, rows that are
+  - expired: created_at + ttl_hours in the past
+  - too old: older than ANSWER_CACHE_MAX_AGE_DAYS regardless of TTL
+  - low value: hit at most ANSWER_CACHE_MIN_ACCESS times and idle for
+    ANSWER_CACHE_MAX_IDLE_DAYS
+  Embeddings go with them (answer_cache_embeddings_{dim}.answer_cache_id is
+  ON DELETE CASCADE).
+- Re-plans the ANN index of every answer_cache_embeddings_{dim} table and
+  rebuilds it when IVFFlat `lists` has drifted from the plan by
+  ANSWER_CACHE_INDEX_DRIFT or more (or the index is missing)
+- Reports table sizes and hit stats
+
+Runs from scripts/compact_answer_cache.py and as a background task in the
+API every ANSWER_CACHE_COMPACT_INTERVAL_SECONDS. An advisory lock keeps
+concurrent runs (several workers, CLI + API) from overlapping.
+
+Environment variables:
+- ANSWER_CACHE_COMPACT_INTERVAL_SECONDS: Background interval, 0 disables (default: 3600)
+- ANSWER_CACHE_COMPACT_BATCH: Rows deleted per transaction (default: 1000)
+- ANSWER_CACHE_MAX_AGE_DAYS: Hard age limit (default: 90)
+- ANSWER_CACHE_MAX_IDLE_DAYS: Idle time before a rarely-hit row goes (default: 30)
+- ANSWER_CACHE_MIN_ACCESS: Hits at or below which a row counts as low value (default: 1)
+- ANSWER_CACHE_INDEX_DRIFT: lists ratio that triggers an index rebuild (default: 2.0)
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+ANSWER_CACHE_COMPACT_INTERVAL_SECONDS = float(os.getenv('ANSWER_CACHE_COMPACT_INTERVAL_SECONDS', '3600'))
+ANSWER_CACHE_COMPACT_BATCH = int(os.getenv('ANSWER_CACHE_COMPACT_BATCH', '1000'))
+ANSWER_CACHE_MAX_AGE_DAYS = int(os.getenv('ANSWER_CACHE_MAX_AGE_DAYS', '90'))
+ANSWER_CACHE_MAX_IDLE_DAYS = int(os.getenv('ANSWER_CACHE_MAX_IDLE_DAYS', '30'))
+ANSWER_CACHE_MIN_ACCESS = int(os.getenv('ANSWER_CACHE_MIN_ACCESS', '1'))
+ANSWER_CACHE_INDEX_DRIFT = float(os.getenv('ANSWER_CACHE_INDEX_DRIFT', '2.0'))
+
+DEFAULT_TTL_HOURS = 336
+ANSWER_CACHE_EMBEDDING_PREFIX = 'answer_cache_embeddings'
+_ADVISORY_LOCK_KEY = 'answer_cache_compaction'
+_LISTS_RE = re.compile(r"lists\s*=\s*'?(\d+)")
+
+# reason is evaluated in order: a row that is both expired and idle counts as expired
+_REASON_SQL = f"""
+    CASE
+        WHEN created_at + make_interval(hours => COALESCE(ttl_hours, {DEFAULT_TTL_HOURS})) < NOW() THEN 'expired'
+        WHEN created_at < NOW() - make_interval(days => %(max_age_days)s) THEN 'max_age'
+        WHEN COALESCE(access_count, 0) <= %(min_access)s
+             AND COALESCE(accessed_at, created_at) < NOW() - make_interval(days => %(max_idle_days)s)
+            THEN 'low_value'
+    END
+"""
+
+
+@dataclass
+class CompactionPolicy:
+    """Which rows compaction removes."""
+    max_age_days: int = ANSWER_CACHE_MAX_AGE_DAYS
+    max_idle_days: int = ANSWER_CACHE_MAX_IDLE_DAYS
+    min_access: int = ANSWER_CACHE_MIN_ACCESS
+    batch_size: int = ANSWER_CACHE_COMPACT_BATCH
+    index_drift: float = ANSWER_CACHE_INDEX_DRIFT
+
+    def params(self) -> Dict[str, Any]:
+        return {
+            'max_age_days': self.max_age_days,
+            'max_idle_days': self.max_idle_days,
+            'min_access': self.min_access,
+        }
+
+
+@dataclass
+class CompactionResult:
+    """Outcome of one compaction run."""
+    deleted: Dict[str, int] = field(default_factory=lambda: {'expired': 0, 'max_age': 0, 'low_value': 0})
+    batches: int = 0
+    dry_run: bool = False
+    skipped: Optional[str] = None
+    indexes: List[Dict[str, Any]] = field(default_factory=list)
+    stats: Dict[str, Any] = field(default_factory=dict)
+    duration_ms: float = 0.0
+
+    @property
+    def total_deleted(self) -> int:
+        return sum(self.deleted.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result['total_deleted'] = self.total_deleted
+        return result
+
+
+def _plain_cursor(conn):
+    return conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+
+
+# =============================================================================
+# Stats
+# =============================================================================
+
+def get_answer_cache_embedding_tables(conn) -> List[tuple]:
+    """(table, dimensions) for every answer_cache_embeddings_{dim} table."""
+    from scripts.embedding_storage import get_vector_columns
+    return [(t, d) for t, d in get_vector_columns(conn) if t.startswith(ANSWER_CACHE_EMBEDDING_PREFIX)]
+
+
+def collect_answer_cache_stats(conn, policy: Optional[CompactionPolicy] = None) -> Dict[str, Any]:
+    """
+    Row counts, eviction candidates, hit totals and on-disk size.
+
+    Args:
+        conn: Database connection
+        policy: Compaction policy used to count eviction candidates
+
+    Returns:
+        Dict of stats (see keys below)
+    """
+    policy = policy or CompactionPolicy()
+    with _plain_cursor(conn) as cur:
+        cur.execute(f"""
+            SELECT
+                COUNT(*),
+                COUNT(*) FILTER (WHERE ({_REASON_SQL}) = 'expired'),
+                COUNT(*) FILTER (WHERE ({_REASON_SQL}) IS NOT NULL),
+                COUNT(*) FILTER (WHERE COALESCE(access_count, 0) > 0),
+                COALESCE(SUM(access_count), 0),
+                MIN(created_at),
+                pg_total_relation_size('answer_cache')
+            FROM answer_cache
+        """, policy.params())
+        rows, expired, evictable, hit_rows, total_hits, oldest, size_bytes = cur.fetchone()
+
+        embedding_tables = {}
+        for table, dimensions in get_answer_cache_embedding_tables(conn):
+            cur.execute(f"SELECT COUNT(*), pg_total_relation_size(%s) FROM {table}", [table])
+            count, table_bytes = cur.fetchone()
+            embedding_tables[table] = {'dimensions': dimensions, 'rows': count, 'size_bytes': table_bytes}
+    conn.rollback()
+
+    return {
+        'rows': rows,
+        'expired_rows': expired,
+        'evictable_rows': evictable,
+        'rows_with_hits': hit_rows,
+        'total_hits': int(total_hits),
+        'reuse_rate': round(hit_rows / rows, 4) if rows else 0.0,
+        'oldest_created_at': oldest.isoformat() if oldest else None,
+        'size_bytes': size_bytes,
+        'embedding_tables': embedding_tables,
+    }
+
+
+# =============================================================================
+# Compaction
+# =============================================================================
+
+def _delete_batch(conn, policy: CompactionPolicy) -> Dict[str, int]:
+    with _plain_cursor(conn) as cur:
+        cur.execute(f"""
+            WITH doomed AS (
+                SELECT id, {_REASON_SQL} AS reason
+                FROM answer_cache
+                WHERE ({_REASON_SQL}) IS NOT NULL
+                ORDER BY id
+                LIMIT %(batch_size)s
+                FOR UPDATE SKIP LOCKED
+            )
+            DELETE FROM answer_cache ac
+            USING doomed
+            WHERE ac.id = doomed.id
+            RETURNING doomed.reason
+        """, {**policy.params(), 'batch_size': policy.batch_size})
+        counts: Dict[str, int] = {}
+        for (reason,) in cur.fetchall():
+            counts[reason] = counts.get(reason, 0) + 1
+    conn.commit()
+    return counts
+
+
+def _ivfflat_lists(definition: str) -> Optional[int]:
+    match = _LISTS_RE.search(definition)
+    return int(match.group(1)) if match else None
+
+
+def maintain_answer_cache_indexes(conn, drift: float = ANSWER_CACHE_INDEX_DRIFT,
+                                  dry_run: bool = False) -> List[Dict[str, Any]]:
+    """
+    Rebuild answer-cache ANN indexes whose parameters no longer fit the table.
+
+    Only IVFFlat drifts: its lists are fixed at build time, while HNSW
+    adapts to inserts and deletes.
+
+    Returns:
+        One dict per table: table, rows, current/planned lists, action
+    """
+    from scripts.embedding_storage import (
+        PGVECTOR_MAX_INDEX_DIMENSIONS,
+        ensure_cosine_ann_index,
+        estimate_row_count,
+        get_embedding_indexes,
+        get_maintenance_work_mem_bytes,
+        plan_ann_index,
+    )
+
+    reports = []
+    for table, dimensions in get_answer_cache_embedding_tables(conn):
+        report: Dict[str, Any] = {'table': table, 'action': 'kept'}
+        reports.append(report)
+        if dimensions > PGVECTOR_MAX_INDEX_DIMENSIONS:
+            report['action'] = 'unindexable'
+            continue
+
+        rows = estimate_row_count(conn, table)
+        indexes = get_embedding_indexes(conn, table)
+        mwm_bytes = get_maintenance_work_mem_bytes(conn)
+        plan = plan_ann_index(rows, dimensions, mwm_bytes)
+        report['rows'] = rows
+        report['planned'] = {'method': plan.method, **plan.params}
+
+        if not indexes:
+            report['action'] = 'create'
+        else:
+            current = indexes[0]
+            report['current'] = {'name': current['name'], 'method': current['method']}
+            if current['method'] != 'ivfflat':
+                continue
+            lists = _ivfflat_lists(current['definition'])
+            report['current']['lists'] = lists
+            ivf_plan = plan if plan.method == 'ivfflat' else plan_ann_index(rows, dimensions, mwm_bytes, 'ivfflat')
+            planned_lists = ivf_plan.params['lists']
+            if lists and max(lists, planned_lists) / min(lists, planned_lists) >= drift:
+                report['action'] = 'rebuild'
+
+        if report['action'] != 'kept' and not dry_run:
+            logger.info(f"Answer cache index {report['action']} on {table}: rows={rows:,} plan={report['planned']}")
+            ensure_cosine_ann_index(conn, table, dimensions, rebuild=report['action'] == 'rebuild')
+    return reports
+
+
+def compact_answer_cache(conn, policy: Optional[CompactionPolicy] = None,
+                         dry_run: bool = False) -> CompactionResult:
+    """
+    Delete expired and low-value answer_cache rows, then check ANN indexes.
+
+    Args:
+        conn: Database connection (plain or pooled psycopg2)
+        policy: Eviction thresholds (defaults from env)
+        dry_run: Only report what would be deleted/rebuilt
+
+    Returns:
+        CompactionResult
+    """
+    policy = policy or CompactionPolicy()
+    result = CompactionResult(dry_run=dry_run)
+    t_start = time.perf_counter()
+
+    with _plain_cursor(conn) as cur:
+        cur.execute("SELECT pg_try_advisory_lock(hashtext(%s))", [_ADVISORY_LOCK_KEY])
+        locked = cur.fetchone()[0]
+    conn.commit()
+    if not locked:
+        result.skipped = 'another compaction is running'
+        logger.info("Answer cache compaction skipped: another run holds the lock")
+        return result
+
+    try:
+        if dry_run:
+            result.stats = collect_answer_cache_stats(conn, policy)
+            result.indexes = maintain_answer_cache_indexes(conn, policy.index_drift, dry_run=True)
+            conn.rollback()
+            return result
+
+        while True:
+            counts = _delete_batch(conn, policy)
+            result.batches += 1
+            for reason, count in counts.items():
+                result.deleted[reason] = result.deleted.get(reason, 0) + count
+            if sum(counts.values()) < policy.batch_size:
+                break
+
+        if result.total_deleted:
+            # Fresh reltuples for the drift check and the planner
+            with _plain_cursor(conn) as cur:
+                cur.execute("ANALYZE answer_cache")
+                for table, _ in get_answer_cache_embedding_tables(conn):
+                    cur.execute(f"ANALYZE {table}")
+            conn.commit()
+
+        result.indexes = maintain_answer_cache_indexes(conn, policy.index_drift)
+        result.stats = collect_answer_cache_stats(conn, policy)
+    finally:
+        try:
+            # The lock is session-level on a pooled connection: clear any
+            # aborted transaction first or the unlock fails and the lock leaks
+            conn.rollback()
+            with _plain_cursor(conn) as cur:
+                cur.execute("SELECT pg_advisory_unlock(hashtext(%s))", [_ADVISORY_LOCK_KEY])
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Could not release answer cache compaction lock: {e}")
+        result.duration_ms = (time.perf_counter() - t_start) * 1000
+
+    logger.info(
+        f"Answer cache compaction: deleted={result.total_deleted} {result.deleted} "
+        f"batches={result.batches} rows_left={result.stats.get('rows')} ms={result.duration_ms:.0f}"
+    )
+    return result
+
+
+# =============================================================================
+# Background Task
+# =============================================================================
+
+class AnswerCacheCompactor:
+    """Runs compact_answer_cache periodically in the API process."""
+
+    def __init__(self, connect_fn: Callable[[], Any],
+                 interval_seconds: float = ANSWER_CACHE_COMPACT_INTERVAL_SECONDS,
+                 on_compacted: Optional[Callable[[CompactionResult], None]] = None):
+        """
+        Args:
+            connect_fn: Returns a DB connection (close() releases it)
+            interval_seconds: Time between runs (0 disables start())
+            on_compacted: Called after a run that deleted rows
+        """
+        self._connect_fn = connect_fn
+        self.interval_seconds = interval_seconds
+        self._on_compacted = on_compacted
+        self._task: Optional[asyncio.Task] = None
+        self._runs = 0
+        self._errors = 0
+        self._last: Optional[CompactionResult] = None
+
+    def run_once(self) -> Optional[CompactionResult]:
+        """Run one compaction. Blocking; errors are logged, not raised."""
+        try:
+            conn = self._connect_fn()
+            try:
+                result = compact_answer_cache(conn)
+            finally:
+                conn.close()
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"Answer cache compaction failed: {e}")
+            return None
+        self._runs += 1
+        self._last = result
+        if result.total_deleted and self._on_compacted is not None:
+            self._on_compacted(result)
+        return result
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await asyncio.to_thread(self.run_once)
+
+    async def start(self) -> None:
+        """Start the periodic task (no-op when the interval is 0)."""
+        if self.interval_seconds <= 0 or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        last = self._last
+        return {
+            "interval_seconds": self.interval_seconds,
+            "running": self._task is not None and not self._task.done(),
+            "runs": self._runs,
+            "errors": self._errors,
+            "last_deleted": last.deleted if last else None,
+            "last_rows_left": last.stats.get('rows') if last else None,
+        }
+
+
+def _default_connect():
+    from ..utils.db_pool import get_db_connection
+    return get_db_connection()
+
+
+def _on_compacted(_result: CompactionResult) -> None:
+    # Deleted rows may still sit in this process's hot tier
+    from ..utils.answer_cache import invalidate_hot_answers
+    invalidate_hot_answers()
+
+
+_compactor = AnswerCacheCompactor(_default_connect, on_compacted=_on_compacted)
+
+
+def get_answer_cache_compactor() -> AnswerCacheCompactor:
+    """Get the process-wide background compactor."""
+    return _compactor
@@ -0,0 +1,238 @@
+"""
+Context Packing for /api/answer
+
+The answer prompt used to carry exactly return_top_k clips, one numbered
+excerpt each, with context size estimated as characters / 4. Neighbouring
+segments of one video became separate excerpts that repeated the title and
+date headers.
+
+pack_context() instead:
+- Counts real tokens with the tiktoken encoding of the model (cached per
+  encoding; model -> encoding comes from model_catalog). Loading an
+  encoding may download its BPE file, so warm_token_encodings() runs in a
+  thread at startup and callers resolve counters off the event loop
+- Walks candidates in score order and merges each one into an excerpt of
+  the same video whose time range it touches (within
+  CONTEXT_MERGE_GAP_SECONDS), so one header covers the whole passage
+- Adds a candidate only if its marginal token cost fits the remaining
+  budget (the profile's max_context_tokens); the top candidate is always kept
+- Numbers excerpts [1], [2], ... by the rank of their best candidate, so
+  citation indices follow relevance no matter how segments merged
+
+Without tiktoken (or if the encoding can't be loaded) tokens fall back to
+the characters / 4 estimate; a failed load is retried on the next call.
+
+Environment variables:
+- CONTEXT_MERGE_GAP_SECONDS: Max gap between segments merged into one excerpt (default: 2)
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+from ..model_catalog import get_rag_model_keys, model_tokenizer
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_MERGE_GAP_SECONDS = float(os.getenv('CONTEXT_MERGE_GAP_SECONDS', '2'))
+
+EXCERPT_SEPARATOR = "\n\n"
+
+TokenCounter = Callable[[str], int]
+
+_encodings: Dict[str, Any] = {}
+_encodings_lock = threading.Lock()
+
+
+# =============================================================================
+# Token Counting
+# =============================================================================
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (characters / 4) used when no tokenizer is available."""
+    return (len(text) + 3) // 4
+
+
+def _get_encoding(name: str):
+    """Load an encoding once per process. Failures aren't cached, so a transient
+    error (e.g. the BPE download) doesn't disable token counting for good."""
+    encoding = _encodings.get(name)
+    if encoding is not None:
+        return encoding
+    if tiktoken is None:
+        logger.warning("tiktoken not installed, context tokens are estimated as chars/4")
+        return None
+    with _encodings_lock:
+        if name not in _encodings:
+            try:
+                _encodings[name] = tiktoken.get_encoding(name)
+            except Exception as e:
+                logger.warning(f"Could not load tokenizer '{name}', context tokens are estimated as chars/4: {e}")
+                return None
+        return _encodings[name]
+
+
+def warm_token_encodings(model_keys: Optional[Iterable[str]] = None) -> None:
+    """
+    Load the encodings of the catalog's RAG models (blocking - may download
+    BPE files; run in a thread at startup).
+    """
+    keys = get_rag_model_keys() if model_keys is None else model_keys
+    for name in sorted({model_tokenizer(key) for key in keys}):
+        _get_encoding(name)
+
+
+def get_token_counter(model_key: str) -> TokenCounter:
+    """
+    Token counter for a RAG model (encodings are loaded once per process).
+
+    Blocking on first use of an encoding - call via run_in_threadpool from
+    async handlers.
+    """
+    encoding = _get_encoding(model_tokenizer(model_key))
+    if encoding is None:
+        return estimate_tokens
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+# =============================================================================
+# Packing
+# =============================================================================
+
+@dataclass
+class Excerpt:
+    """Contiguous segments of one video sent as a single numbered excerpt."""
+    video_id: str
+    segments: List[Any]  # search results, in time order
+    ranks: Dict[Any, int]  # segment id -> position in the candidate list
+    index: int = 0
+    tokens: int = 0
+
+    @property
+    def rank(self) -> int:
+        return min(self.ranks.values())
+
+    @property
+    def best(self) -> Any:
+        """Highest-scoring segment."""
+        return min(self.segments, key=lambda s: self.ranks[s.id])
+
+    @property
+    def start(self) -> float:
+        return self.segments[0].start_time_seconds
+
+    @property
+    def end(self) -> float:
+        return max(s.end_time_seconds for s in self.segments)
+
+    @property
+    def text(self) -> str:
+        return " ".join(s.text.strip() for s in self.segments)
+
+    def touches(self, result: Any, gap_seconds: float) -> bool:
+        return (result.start_time_seconds <= self.end + gap_seconds
+                and result.end_time_seconds >= self.start - gap_seconds)
+
+
+@dataclass
+class PackedContext:
+    """Result of pack_context."""
+    excerpts: List[Excerpt]
+    text: str
+    tokens: int
+    budget_tokens: int
+    candidates: int
+    segments_used: int
+    dropped: int
+
+    @property
+    def merged(self) -> int:
+        """Segments that joined an existing excerpt instead of opening one."""
+        return self.segments_used - len(self.excerpts)
+
+
+def _merge(excerpts: List[Excerpt], result: Any, rank: int) -> Excerpt:
+    segments = sorted(
+        [s for e in excerpts for s in e.segments] + [result],
+        key=lambda s: (s.start_time_seconds, s.end_time_seconds),
+    )
+    ranks = {k: v for e in excerpts for k, v in e.ranks.items()}
+    ranks[result.id] = rank
+    return Excerpt(video_id=result.video_id, segments=segments, ranks=ranks)
+
+
+def pack_context(
+    results: List[Any],
+    render: Callable[[int, Excerpt], str],
+    count_tokens: TokenCounter,
+    budget_tokens: int,
+    max_segments: Optional[int] = None,
+    merge_gap_seconds: float = CONTEXT_MERGE_GAP_SECONDS,
+) -> PackedContext:
+    """
+    Pack search results into numbered excerpts within a token budget.
+
+    Args:
+        results: Search results in score order (need video_id, text,
+            start_time_seconds, end_time_seconds)
+        render: Formats one excerpt given its citation index
+        count_tokens: Token counter for the target model
+        budget_tokens: Max tokens for all excerpts together
+        max_segments: Max search results used (None: no limit)
+        merge_gap_seconds: Max gap between segments merged into one excerpt
+
+    Returns:
+        PackedContext with excerpts numbered from 1 by relevance
+    """
+    excerpts: List[Excerpt] = []
+    used_tokens = 0
+    segments_used = 0
+    dropped = 0
+    seen = set()
+    separator_tokens = count_tokens(EXCERPT_SEPARATOR)
+
+    for rank, result in enumerate(results):
+        if max_segments is not None and segments_used >= max_segments:
+            break
+        if result.id in seen:
+            continue
+        seen.add(result.id)
+
+        touching = [e for e in excerpts if e.video_id == result.video_id and e.touches(result, merge_gap_seconds)]
+        candidate = _merge(touching, result, rank)
+        # Index only affects the "[n]" prefix; a placeholder keeps costs comparable
+        candidate.tokens = count_tokens(render(len(excerpts) + 1, candidate))
+        removed = sum(e.tokens for e in touching) + separator_tokens * len(touching)
+        cost = candidate.tokens + separator_tokens - removed
+
+        if excerpts and used_tokens + cost > budget_tokens:
+            dropped += 1
+            continue
+
+        excerpts = [e for e in excerpts if not any(e is t for t in touching)] + [candidate]
+        used_tokens += cost
+        segments_used += 1
+
+    excerpts.sort(key=lambda e: e.rank)
+    parts = []
+    for index, excerpt in enumerate(excerpts, start=1):
+        excerpt.index = index
+        parts.append(render(index, excerpt))
+    text = EXCERPT_SEPARATOR.join(parts)
+
+    return PackedContext(
+        excerpts=excerpts,
+        text=text,
+        tokens=count_tokens(text),
+        budget_tokens=budget_tokens,
+        candidates=len(results),
+        segments_used=segments_used,
+        dropped=dropped,
+    )
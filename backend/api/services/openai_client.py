@@ -0,0 +1,228 @@
+"""
+Shared AsyncOpenAI Client
+
+/api/answer used to build a new synchronous OpenAI client per request and
+call it from the async handler, blocking the event loop for the whole
+completion and discarding the HTTP keep-alive pool every time.
+
+This module owns one process-wide AsyncOpenAI client (created at startup)
+backed by a tuned httpx connection pool, and wraps chat completions with:
+- Per-call timeouts (connect timeout kept short, read timeout per call)
+- Retry with exponential backoff and full jitter on connection errors,
+  timeouts, 429 and 5xx (Retry-After honoured when the API sends it)
+- A concurrency limit so a burst of answers queues here instead of
+  exhausting the pool or the rate limit
+
+Environment variables:
+- OPENAI_TIMEOUT_SECONDS: Read timeout per call (default: 60)
+- OPENAI_CONNECT_TIMEOUT_SECONDS: Connect timeout (default: 5)
+- OPENAI_MAX_RETRIES: Retries after the first attempt (default: 3)
+- OPENAI_RETRY_BASE_DELAY: First backoff step in seconds (default: 0.5)
+- OPENAI_RETRY_MAX_DELAY: Backoff cap in seconds (default: 8)
+- OPENAI_MAX_CONCURRENCY: Concurrent completions per worker (default: 16)
+- OPENAI_MAX_CONNECTIONS / OPENAI_MAX_KEEPALIVE: httpx pool limits (default: 32 / 16)
+"""
+
+import asyncio
+import logging
+import os
+import random
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+OPENAI_TIMEOUT_SECONDS = float(os.getenv('OPENAI_TIMEOUT_SECONDS', '60'))
+OPENAI_CONNECT_TIMEOUT_SECONDS = float(os.getenv('OPENAI_CONNECT_TIMEOUT_SECONDS', '5'))
+OPENAI_MAX_RETRIES = int(os.getenv('OPENAI_MAX_RETRIES', '3'))
+OPENAI_RETRY_BASE_DELAY = float(os.getenv('OPENAI_RETRY_BASE_DELAY', '0.5'))
+OPENAI_RETRY_MAX_DELAY = float(os.getenv('OPENAI_RETRY_MAX_DELAY', '8'))
+OPENAI_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', '16'))
+OPENAI_MAX_CONNECTIONS = int(os.getenv('OPENAI_MAX_CONNECTIONS', '32'))
+OPENAI_MAX_KEEPALIVE = int(os.getenv('OPENAI_MAX_KEEPALIVE', '16'))
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+_client = None
+_semaphore: Optional[asyncio.Semaphore] = None
+_stats = {"calls": 0, "retries": 0, "failures": 0, "in_flight": 0, "waiting": 0}
+
+
+# =============================================================================
+# Client Lifecycle
+# =============================================================================
+
+def init_openai_client():
+    """
+    Create the shared AsyncOpenAI client (idempotent).
+
+    Returns:
+        The client, or None if OPENAI_API_KEY is unset or openai isn't installed
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        return None
+
+    try:
+        import httpx
+        from openai import AsyncOpenAI
+    except ImportError as e:
+        logger.error(f"Failed to import OpenAI: {e}")
+        return None
+
+    timeout = httpx.Timeout(OPENAI_TIMEOUT_SECONDS, connect=OPENAI_CONNECT_TIMEOUT_SECONDS)
+    http_client = httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+            keepalive_expiry=60,
+        ),
+    )
+    # Retries are handled here (with jitter), not by the SDK
+    _client = AsyncOpenAI(api_key=api_key, http_client=http_client, timeout=timeout, max_retries=0)
+    logger.info(
+        f"OpenAI client initialized: max_concurrency={OPENAI_MAX_CONCURRENCY} "
+        f"max_connections={OPENAI_MAX_CONNECTIONS} timeout={OPENAI_TIMEOUT_SECONDS}s "
+        f"max_retries={OPENAI_MAX_RETRIES}"
+    )
+    return _client
+
+
+def get_openai_client():
+    """Get the shared client, creating it on first use. None if unavailable."""
+    return _client if _client is not None else init_openai_client()
+
+
+async def close_openai_client() -> None:
+    """Close the shared client and its connection pool (app shutdown)."""
+    global _client, _semaphore
+    if _client is not None:
+        try:
+            await _client.close()
+        except Exception as e:
+            logger.warning(f"Error closing OpenAI client: {e}")
+    _client = None
+    _semaphore = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+    return _semaphore
+
+
+# =============================================================================
+# Retry Policy
+# =============================================================================
+
+def _is_retryable(error: Exception) -> bool:
+    try:
+        import openai
+    except ImportError:
+        return False
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError, openai.RateLimitError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in _RETRYABLE_STATUS
+    return False
+
+
+def _retry_delay(attempt: int, error: Exception) -> float:
+    """Full-jitter exponential backoff, or the server's Retry-After if given."""
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), OPENAI_RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    return random.uniform(0, min(OPENAI_RETRY_MAX_DELAY, OPENAI_RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+async def _create_with_retry(client, timeout: Optional[float], **kwargs) -> Any:
+    for attempt in range(OPENAI_MAX_RETRIES + 1):
+        try:
+            return await client.chat.completions.create(timeout=timeout or OPENAI_TIMEOUT_SECONDS, **kwargs)
+        except Exception as e:
+            if attempt >= OPENAI_MAX_RETRIES or not _is_retryable(e):
+                _stats["failures"] += 1
+                raise
+            delay = _retry_delay(attempt, e)
+            _stats["retries"] += 1
+            logger.warning(
+                f"OpenAI call failed ({type(e).__name__}), retry {attempt + 1}/{OPENAI_MAX_RETRIES} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+
+# =============================================================================
+# Chat Completions
+# =============================================================================
+
+@asynccontextmanager
+async def _completion_slot() -> AsyncIterator[None]:
+    """Hold one concurrency slot, keeping the waiting/in-flight counters exact even on cancellation."""
+    semaphore = _get_semaphore()
+    _stats["waiting"] += 1
+    try:
+        await semaphore.acquire()
+    finally:
+        _stats["waiting"] -= 1
+    _stats["in_flight"] += 1
+    _stats["calls"] += 1
+    try:
+        yield
+    finally:
+        _stats["in_flight"] -= 1
+        semaphore.release()
+
+
+async def chat_completion(client, timeout: Optional[float] = None, **kwargs) -> Any:
+    """
+    Create a chat completion with retries, under the concurrency limit.
+
+    Args:
+        client: AsyncOpenAI client (from get_openai_client)
+        timeout: Read timeout for this call (default OPENAI_TIMEOUT_SECONDS)
+        **kwargs: Passed to client.chat.completions.create
+
+    Returns:
+        ChatCompletion
+    """
+    async with _completion_slot():
+        return await _create_with_retry(client, timeout, **kwargs)
+
+
+async def stream_chat_completion(client, timeout: Optional[float] = None, **kwargs) -> AsyncIterator[Any]:
+    """
+    Stream a chat completion, yielding chunks.
+
+    Opening the stream is retried; once chunks are flowing, errors propagate
+    (a partial answer can't be replayed). The concurrency slot is held until
+    the stream is exhausted or closed. The underlying HTTP response is always
+    closed, so a consumer that stops early (client disconnect) hands its
+    connection back to the pool. (AsyncStream.close() only exists in newer
+    SDKs; stream.response.aclose() works on every 1.x release.)
+    """
+    async with _completion_slot():
+        stream = await _create_with_retry(client, timeout, stream=True, **kwargs)
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.response.aclose()
+
+
+def get_openai_client_stats() -> Dict[str, Any]:
+    """Concurrency and retry counters for /health."""
+    return {
+        "initialized": _client is not None,
+        "max_concurrency": OPENAI_MAX_CONCURRENCY,
+        **_stats,
+    }
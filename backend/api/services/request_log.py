@@ -0,0 +1,290 @@
+"""
+Write-Behind Request Logging
+
+log_rag_request (rag_requests) and log_ai_request (ai_requests) are
+fire-and-forget, but each call used to check out a connection and INSERT
+one row inside the request. This module buffers rows in a bounded in-process
+queue; a background task writes them in bulk (one multi-row INSERT per table)
+every REQUEST_LOG_FLUSH_MS, or sooner once REQUEST_LOG_BATCH_SIZE rows are
+waiting.
+
+- submit() never blocks: when the queue is full the row is dropped and
+  counted (request logging must not add back-pressure to answers)
+- stop() flushes whatever is queued (app shutdown)
+- A missing table (migration not applied) drops that batch and is only
+  retried after MISSING_TABLE_RETRY_SECONDS
+- Callers that need a row's key up front generate it themselves
+  (log_ai_request pre-allocates the ai_requests UUID)
+
+When the writer isn't running (scripts, tests), callers write synchronously
+with insert_rows().
+
+Environment variables:
+- REQUEST_LOG_FLUSH_MS: Longest time a row waits before being written (default: 500)
+- REQUEST_LOG_BATCH_SIZE: Rows that trigger an early flush (default: 200)
+- REQUEST_LOG_MAX_QUEUE: Buffered rows before new rows are dropped (default: 10000)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import psycopg2
+import psycopg2.errors
+import psycopg2.extras
+
+logger = logging.getLogger(__name__)
+
+REQUEST_LOG_FLUSH_MS = float(os.getenv('REQUEST_LOG_FLUSH_MS', '500'))
+REQUEST_LOG_BATCH_SIZE = int(os.getenv('REQUEST_LOG_BATCH_SIZE', '200'))
+REQUEST_LOG_MAX_QUEUE = int(os.getenv('REQUEST_LOG_MAX_QUEUE', '10000'))
+MISSING_TABLE_RETRY_SECONDS = 300.0
+
+# (table, columns, row)
+LogRow = Tuple[str, Tuple[str, ...], Tuple[Any, ...]]
+
+
+def insert_rows(conn, table: str, columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> None:
+    """
+    Insert rows with one multi-row INSERT and commit.
+
+    Raises:
+        psycopg2.errors.UndefinedTable: If the table doesn't exist
+    """
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+    with conn.cursor() as cur:
+        if len(rows) == 1:
+            cur.execute(sql + f"({', '.join(['%s'] * len(columns))})", list(rows[0]))
+        else:
+            psycopg2.extras.execute_values(cur, sql + "%s", rows, page_size=len(rows))
+    conn.commit()
+
+
+class RequestLogWriter:
+    """Buffers request-log rows and writes them in bulk from a background task."""
+
+    def __init__(
+        self,
+        connect_fn: Callable[[], Any],
+        flush_interval_ms: float = REQUEST_LOG_FLUSH_MS,
+        batch_size: int = REQUEST_LOG_BATCH_SIZE,
+        max_queue_size: int = REQUEST_LOG_MAX_QUEUE,
+    ):
+        """
+        Args:
+            connect_fn: Returns a DB connection (close() releases it)
+            flush_interval_ms: Longest time a row waits before being written
+            batch_size: Queued rows that trigger an early flush
+            max_queue_size: Buffered rows before submit() starts dropping
+        """
+        self._connect_fn = connect_fn
+        self.flush_interval_ms = flush_interval_ms
+        self.batch_size = max(1, batch_size)
+        self.max_queue_size = max_queue_size
+
+        self._queue: Deque[LogRow] = deque()
+        # Rows taken off the queue but not yet committed (see pending_row)
+        self._inflight: List[LogRow] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._missing_tables: Dict[str, float] = {}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self._submitted = 0
+        self._written = 0
+        self._dropped = 0
+        self._flushes = 0
+        self._errors = 0
+        self._last_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # -------------------------------------------------------------------------
+    # Producer side (any thread)
+    # -------------------------------------------------------------------------
+
+    def submit(self, table: str, columns: Sequence[str], row: Sequence[Any]) -> bool:
+        """
+        Queue a row for writing. Never blocks.
+
+        Returns:
+            False if the queue was full and the row was dropped
+        """
+        with self._lock:
+            if len(self._queue) >= self.max_queue_size:
+                self._dropped += 1
+                if self._dropped == 1 or self._dropped % 1000 == 0:
+                    logger.warning(f"Request log queue full, dropped {self._dropped} rows so far")
+                return False
+            self._queue.append((table, tuple(columns), tuple(row)))
+            self._submitted += 1
+            wake = len(self._queue) >= self.batch_size
+
+        if wake and self._loop is not None and self._wake is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                pass  # Loop closed during shutdown; stop() flushes the rest
+        return True
+
+    def pending_row(self, table: str, column: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Find a queued or in-flight row by column value (read-your-writes)."""
+        with self._lock:
+            rows = list(self._inflight) + list(self._queue)
+        for row_table, columns, row in rows:
+            if row_table == table and column in columns and row[columns.index(column)] == value:
+                return dict(zip(columns, row))
+        return None
+
+    # -------------------------------------------------------------------------
+    # Consumer side
+    # -------------------------------------------------------------------------
+
+    def flush(self) -> int:
+        """
+        Write everything queued so far. Blocking.
+
+        Returns:
+            Number of rows written
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._queue:
+                    return 0
+                self._inflight = list(self._queue)
+                self._queue.clear()
+                batch = self._inflight
+
+            groups: Dict[Tuple[str, Tuple[str, ...]], List[Tuple[Any, ...]]] = {}
+            for table, columns, row in batch:
+                groups.setdefault((table, columns), []).append(row)
+
+            t_start = time.perf_counter()
+            written = 0
+            try:
+                conn = self._connect_fn()
+            except Exception as e:
+                with self._lock:
+                    self._inflight = []
+                self._fail(len(batch), f"Request log flush could not get a connection: {e}")
+                return 0
+            try:
+                for (table, columns), rows in groups.items():
+                    written += self._write_group(conn, table, columns, rows)
+            finally:
+                conn.close()
+                with self._lock:
+                    self._inflight = []
+
+            self._flushes += 1
+            self._written += written
+            self._last_flush_ms = (time.perf_counter() - t_start) * 1000
+            logger.debug(f"Request log flush: rows={written} groups={len(groups)} ms={self._last_flush_ms:.1f}")
+            return written
+
+    def _write_group(self, conn, table: str, columns: Tuple[str, ...], rows: List[Tuple[Any, ...]]) -> int:
+        retry_at = self._missing_tables.get(table)
+        if retry_at is not None and time.monotonic() < retry_at:
+            self._dropped += len(rows)
+            return 0
+        try:
+            insert_rows(conn, table, columns, rows)
+            self._missing_tables.pop(table, None)
+            return len(rows)
+        except psycopg2.errors.UndefinedTable:
+            conn.rollback()
+            self._missing_tables[table] = time.monotonic() + MISSING_TABLE_RETRY_SECONDS
+            self._dropped += len(rows)
+            logger.debug(f"{table} table does not exist, skipping request log rows")
+            return 0
+        except Exception as e:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            self._fail(len(rows), f"Request log flush to {table} failed: {e}")
+            return 0
+
+    def _fail(self, rows: int, message: str) -> None:
+        self._errors += 1
+        self._dropped += rows
+        logger.warning(f"{message} ({rows} rows dropped)")
+
+    async def _run(self) -> None:
+        interval = self.flush_interval_ms / 1000
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await asyncio.to_thread(self.flush)
+
+    async def start(self) -> None:
+        """Start the background flush task on the running loop (idempotent)."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Request log writer started: flush_ms={self.flush_interval_ms:.0f} "
+            f"batch_size={self.batch_size} max_queue={self.max_queue_size}"
+        )
+
+    async def stop(self) -> None:
+        """Stop the background task and flush remaining rows."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        self._loop = None
+        self._wake = None
+        written = await asyncio.to_thread(self.flush)
+        if written:
+            logger.info(f"Request log writer flushed {written} rows on shutdown")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and counters for /health."""
+        with self._lock:
+            queued = len(self._queue)
+        return {
+            "running": self.running,
+            "queued": queued,
+            "submitted": self._submitted,
+            "written": self._written,
+            "dropped": self._dropped,
+            "flushes": self._flushes,
+            "errors": self._errors,
+            "last_flush_ms": round(self._last_flush_ms, 1),
+        }
+
+
+# =============================================================================
+# Process-wide Writer
+# =============================================================================
+
+def _default_connect():
+    from ..utils.db_pool import get_db_connection
+    return get_db_connection()
+
+
+_writer = RequestLogWriter(_default_connect)
+
+
+def get_request_log_writer() -> RequestLogWriter:
+    """Get the process-wide request log writer."""
+    return _writer
@@ -0,0 +1,168 @@
+"""
+Rerank Stage for /api/search
+
+Reorders vector-search candidates with a cross-encoder, within a per-request
+time budget. Driven by search_config:
+- enable_reranker: run the stage at all
+- rerank_top_k: how many vector candidates are scored
+- return_top_k: how many results come back after reranking
+
+Graceful fallback: if the reranker is busy, slow (e.g. still loading its
+model) or fails, the request gets the vector-order results instead of a
+timeout. Work that overruns the budget keeps running in the background and
+fills the reranker's score cache for the next request.
+
+Rerankers are pluggable: register_reranker(name, fn) where fn maps
+(query, candidates) to one relevance score per candidate. RERANKER_BACKEND
+selects the active one (default: cross_encoder).
+
+Environment variables:
+- RERANKER_BACKEND: Registered reranker name (default: cross_encoder)
+- RERANK_TIME_BUDGET_MS: Per-request budget for the stage (default: 800)
+- RERANK_MAX_INFLIGHT: Concurrent rerank jobs before falling back (default: 2)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+RERANKER_BACKEND = os.getenv('RERANKER_BACKEND', 'cross_encoder')
+RERANK_TIME_BUDGET_MS = float(os.getenv('RERANK_TIME_BUDGET_MS', '800'))
+RERANK_MAX_INFLIGHT = int(os.getenv('RERANK_MAX_INFLIGHT', '2'))
+
+ScoreFn = Callable[[str, List[Dict[str, Any]]], Sequence[float]]
+
+# =============================================================================
+# Reranker Registry
+# =============================================================================
+
+def _cross_encoder_scores(query: str, candidates: List[Dict[str, Any]]) -> Sequence[float]:
+    from scripts.common.reranker import get_reranker
+    return get_reranker().score(query, candidates)
+
+
+def _bge_scores(query: str, candidates: List[Dict[str, Any]]) -> Sequence[float]:
+    # EmbeddingsService.rerank returns an ordering; convert it to scores
+    from services.embeddings_service import EmbeddingsService
+    order = EmbeddingsService.rerank(query, [c['text'] for c in candidates], top_k=len(candidates))
+    scores = [0.0] * len(candidates)
+    for rank, idx in enumerate(order):
+        scores[idx] = float(len(order) - rank)
+    return scores
+
+
+_rerankers: Dict[str, ScoreFn] = {
+    'cross_encoder': _cross_encoder_scores,
+    'bge': _bge_scores,
+}
+
+
+def register_reranker(name: str, score_fn: ScoreFn) -> None:
+    """Register a reranker selectable via RERANKER_BACKEND."""
+    _rerankers[name] = score_fn
+
+
+# =============================================================================
+# Stage
+# =============================================================================
+
+@dataclass
+class RerankOutcome:
+    """Result of the rerank stage."""
+    results: List[Dict[str, Any]]
+    status: str  # applied | off | empty | busy | timeout | error
+    rerank_ms: float = 0.0
+    candidates: int = 0
+
+
+# Scoring is serialized on the model anyway; one worker keeps a slow
+# rerank from occupying the shared threadpool
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rerank')
+_inflight = 0
+_inflight_lock = threading.Lock()
+
+
+def _score_job(score_fn: ScoreFn, query: str, candidates: List[Dict[str, Any]]) -> Sequence[float]:
+    global _inflight
+    try:
+        return score_fn(query, candidates)
+    finally:
+        with _inflight_lock:
+            _inflight -= 1
+
+
+async def rerank_results(
+    query: str,
+    results: List[Dict[str, Any]],
+    rerank_top_k: int,
+    return_top_k: int,
+    enabled: bool = True,
+    time_budget_ms: float = RERANK_TIME_BUDGET_MS,
+    backend: Optional[str] = None,
+) -> RerankOutcome:
+    """
+    Rerank the first rerank_top_k results and return the best return_top_k.
+
+    On fallback the first return_top_k results are returned in vector order.
+
+    Args:
+        query: Search query
+        results: Vector-search rows in similarity order (need 'text' and 'id')
+        rerank_top_k: Candidates to score
+        return_top_k: Results to return
+        enabled: search_config.enable_reranker (or request override)
+        time_budget_ms: Budget for the whole stage, including queueing
+        backend: Reranker name (defaults to RERANKER_BACKEND)
+
+    Returns:
+        RerankOutcome with results, status and timing
+    """
+    global _inflight
+    if not enabled:
+        return RerankOutcome(results=results, status='off')
+    if not results:
+        return RerankOutcome(results=results, status='empty')
+
+    fallback = results[:return_top_k]
+    candidates = results[:rerank_top_k]
+    score_fn = _rerankers.get(backend or RERANKER_BACKEND)
+    if score_fn is None:
+        logger.warning(f"Unknown reranker backend {backend or RERANKER_BACKEND!r}, using vector order")
+        return RerankOutcome(results=fallback, status='error', candidates=len(candidates))
+
+    with _inflight_lock:
+        if _inflight >= RERANK_MAX_INFLIGHT:
+            return RerankOutcome(results=fallback, status='busy', candidates=len(candidates))
+        _inflight += 1
+
+    t_start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    job = loop.run_in_executor(_executor, _score_job, score_fn, query, candidates)
+    try:
+        scores = await asyncio.wait_for(asyncio.shield(job), time_budget_ms / 1000)
+    except asyncio.TimeoutError:
+        rerank_ms = (time.perf_counter() - t_start) * 1000
+        logger.warning(f"Rerank exceeded {time_budget_ms:.0f}ms budget, using vector order")
+        job.add_done_callback(lambda f: f.exception())  # Retrieve late errors quietly
+        return RerankOutcome(results=fallback, status='timeout', rerank_ms=rerank_ms, candidates=len(candidates))
+    except Exception as e:
+        rerank_ms = (time.perf_counter() - t_start) * 1000
+        logger.error(f"Rerank failed, using vector order: {e}")
+        return RerankOutcome(results=fallback, status='error', rerank_ms=rerank_ms, candidates=len(candidates))
+
+    order = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+    reranked = []
+    for i in order[:return_top_k]:
+        row = dict(candidates[i])
+        row['rerank_score'] = float(scores[i])
+        reranked.append(row)
+
+    rerank_ms = (time.perf_counter() - t_start) * 1000
+    return RerankOutcome(results=reranked, status='applied', rerank_ms=rerank_ms, candidates=len(candidates))
@@ -38,6 +38,7 @@ from .model_catalog import (
 
 # Import caching utility
 from .utils.cache import TTLCache
+from .utils.db_pool import get_db_connection as get_pooled_connection
 
 logger = logging.getLogger(__name__)
 
@@ -64,11 +65,8 @@ class PasswordRequest(BaseModel):
 
 
 def get_db_connection():
-    """Get database connection"""
-    return psycopg2.connect(
-        os.getenv('DATABASE_URL'),
-        cursor_factory=RealDictCursor
-    )
+    """Get a pooled database connection (close() returns it to the pool)"""
+    return get_pooled_connection()
 
 
 class EmbeddingModelInfo(BaseModel):
@@ -778,7 +776,7 @@ async def list_summarizer_models(refresh: bool = False):
     response_model=List[TestSearchResult],
     dependencies=[Depends(require_tuning_auth)],
 )
-async def test_search(search_request: TestSearchRequest, request: Request):
+def test_search(search_request: TestSearchRequest, request: Request):
     """
     Test search with current or specified model.
     Uses normalized storage (segment_embeddings) with fallback to legacy (segments.embedding).
@@ -786,8 +784,7 @@ async def test_search(search_request: TestSearchRequest, request: Request):
     """
     from ..services.embeddings_service import EmbeddingsService
     from .embedding_config import get_active_model_key, use_normalized_storage, use_fallback_read
-    import psycopg2
-    from psycopg2.extras import RealDictCursor
+    from scripts.common.pgvector_adapter import Vector
     
     try:
         # Get active model or use override
@@ -800,10 +797,9 @@ async def test_search(search_request: TestSearchRequest, request: Request):
         
         # Search database
         top_k = search_request.top_k or int(os.getenv("ANSWER_TOPK", "20"))
-        embedding_list = query_embedding.tolist() if hasattr(query_embedding, 'tolist') else query_embedding
-        embedding_str = str(embedding_list)
+        query_vector = Vector(query_embedding)
         
-        conn = psycopg2.connect(os.getenv('DATABASE_URL'))
+        conn = get_db_connection()
         results = []
         search_source = "none"
         
@@ -831,21 +827,23 @@ async def test_search(search_request: TestSearchRequest, request: Request):
                             
                             if count > 0:
                                 cur.execute("""
+                                    WITH q AS (SELECT %s::vector AS v)
                                     SELECT 
                                         s.text,
-                                        1 - (se.embedding <=> %s::vector) as similarity,
+                                        1 - (se.embedding <=> q.v) as similarity,
                                         s.source_id,
                                         src.source_id as youtube_id,
                                         s.start_sec,
                                         s.end_sec,
                                         s.speaker_label
-                                    FROM segment_embeddings se
+                                    FROM q
+                                    CROSS JOIN segment_embeddings se
                                     JOIN segments s ON se.segment_id = s.id
                                     JOIN sources src ON s.source_id = src.id
                                     WHERE se.model_key = %s AND se.is_active = TRUE
-                                    ORDER BY se.embedding <=> %s::vector
+                                    ORDER BY se.embedding <=> q.v
                                     LIMIT %s
-                                """, (embedding_str, model_key, embedding_str, top_k))
+                                """, (query_vector, model_key, top_k))
                                 
                                 rows = cur.fetchall()
                                 if rows:
@@ -866,20 +864,22 @@ async def test_search(search_request: TestSearchRequest, request: Request):
                 # Fallback to legacy storage if needed
                 if not results and (use_fallback_read() or not use_normalized_storage()):
                     cur.execute("""
+                        WITH q AS (SELECT %s::vector AS v)
                         SELECT 
                             s.text,
-                            1 - (s.embedding <=> %s::vector) as similarity,
+                            1 - (s.embedding <=> q.v) as similarity,
                             s.source_id,
                             src.source_id as youtube_id,
                             s.start_sec,
                             s.end_sec,
                             s.speaker_label
-                        FROM segments s
+                        FROM q
+                        CROSS JOIN segments s
                         JOIN sources src ON s.source_id = src.id
                         WHERE s.embedding IS NOT NULL
-                        ORDER BY s.embedding <=> %s::vector
+                        ORDER BY s.embedding <=> q.v
                         LIMIT %s
-                    """, (embedding_str, embedding_str, top_k))
+                    """, (query_vector, top_k))
                     
                     rows = cur.fetchall()
                     search_source = "segments.embedding"
@@ -905,17 +905,17 @@ async def test_search(search_request: TestSearchRequest, request: Request):
 
 
 @router.get("/stats")
-async def get_stats():
+def get_stats():
     """
     Get ingestion and embedding statistics including normalized storage metrics
     """
     from .embedding_config import get_active_model_key, use_normalized_storage, load_embedding_config
-    import psycopg2
     
     try:
-        conn = psycopg2.connect(os.getenv('DATABASE_URL'))
+        conn = get_db_connection()
         try:
-            with conn.cursor() as cur:
+            # Tuple rows (pooled connections default to RealDictCursor)
+            with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
                 # Get segment counts
                 cur.execute("""
                     SELECT 
@@ -1063,7 +1063,7 @@ class InstructionPreview(BaseModel):
     response_model=List[CustomInstruction],
     dependencies=[Depends(require_tuning_auth)],
 )
-async def list_instructions(request: Request):
+def list_instructions(request: Request):
     """
     List all custom instruction sets.
     Protected: requires tuning_auth cookie.
@@ -1095,7 +1095,7 @@ async def list_instructions(request: Request):
     response_model=CustomInstruction,
     dependencies=[Depends(require_tuning_auth)],
 )
-async def get_active_instructions(request: Request):
+def get_active_instructions(request: Request):
     """
     Get the currently active instruction set.
     Protected: requires tuning_auth cookie.
@@ -1133,7 +1133,7 @@ async def get_active_instructions(request: Request):
     response_model=CustomInstruction,
     dependencies=[Depends(require_tuning_auth)],
 )
-async def create_instructions(instruction: CustomInstruction, request: Request):
+def create_instructions(instruction: CustomInstruction, request: Request):
     """
     Create a new custom instruction set.
     Protected: requires tuning_auth cookie.
@@ -1158,6 +1158,10 @@ async def create_instructions(instruction: CustomInstruction, request: Request):
         cur.close()
         conn.close()
         
+        # Invalidate cached prompt inputs so /answer picks up the change
+        from .utils.metadata_cache import invalidate_rag_prompt_cache
+        invalidate_rag_prompt_cache()
+        
         logger.info(f"Created custom instruction set: {instruction.name}")
         return CustomInstruction(**result)
         
@@ -1174,7 +1178,7 @@ async def create_instructions(instruction: CustomInstruction, request: Request):
     response_model=CustomInstruction,
     dependencies=[Depends(require_tuning_auth)],
 )
-async def update_instructions(instruction_id: int, instruction: CustomInstruction, request: Request):
+def update_instructions(instruction_id: int, instruction: CustomInstruction, request: Request):
     """
     Update an existing custom instruction set.
     Protected: requires tuning_auth cookie.
@@ -1207,6 +1211,10 @@ async def update_instructions(instruction_id: int, instruction: CustomInstructio
         cur.close()
         conn.close()
         
+        # Invalidate cached prompt inputs so /answer picks up the change
+        from .utils.metadata_cache import invalidate_rag_prompt_cache
+        invalidate_rag_prompt_cache()
+        
         logger.info(f"Updated custom instruction set: {instruction.name} (v{result['version']})")
         return CustomInstruction(**result)
         
@@ -1221,7 +1229,7 @@ async def update_instructions(instruction_id: int, instruction: CustomInstructio
     "/instructions/{instruction_id}",
     dependencies=[Depends(require_tuning_auth)],
 )
-async def delete_instructions(instruction_id: int, request: Request):
+def delete_instructions(instruction_id: int, request: Request):
     """
     Delete a custom instruction set.
     Protected: requires tuning_auth cookie.
@@ -1245,6 +1253,10 @@ async def delete_instructions(instruction_id: int, request: Request):
         cur.close()
         conn.close()
         
+        # Invalidate cached prompt inputs so /answer picks up the change
+        from .utils.metadata_cache import invalidate_rag_prompt_cache
+        invalidate_rag_prompt_cache()
+        
         logger.info(f"Deleted custom instruction set: {result['name']}")
         return {"success": True, "message": f"Deleted instruction set: {result['name']}"}
         
@@ -1259,7 +1271,7 @@ async def delete_instructions(instruction_id: int, request: Request):
     "/instructions/{instruction_id}/activate",
     dependencies=[Depends(require_tuning_auth)],
 )
-async def activate_instructions(instruction_id: int, request: Request):
+def activate_instructions(instruction_id: int, request: Request):
     """
     Activate a specific instruction set (deactivates all others).
     Protected: requires tuning_auth cookie.
@@ -1289,6 +1301,10 @@ async def activate_instructions(instruction_id: int, request: Request):
         cur.close()
         conn.close()
         
+        # Invalidate cached prompt inputs so /answer picks up the change
+        from .utils.metadata_cache import invalidate_rag_prompt_cache
+        invalidate_rag_prompt_cache()
+        
         logger.info(f"Activated instruction set: {result['name']}")
         return {"success": True, "message": f"Activated: {result['name']}"}
         
@@ -1304,7 +1320,7 @@ async def activate_instructions(instruction_id: int, request: Request):
     response_model=List[CustomInstructionHistory],
     dependencies=[Depends(require_tuning_auth)],
 )
-async def get_instruction_history(instruction_id: int, request: Request):
+def get_instruction_history(instruction_id: int, request: Request):
     """
     Get version history for an instruction set.
     Protected: requires tuning_auth cookie.
@@ -1335,7 +1351,7 @@ async def get_instruction_history(instruction_id: int, request: Request):
     "/instructions/{instruction_id}/rollback/{version}",
     dependencies=[Depends(require_tuning_auth)],
 )
-async def rollback_instructions(instruction_id: int, version: int, request: Request):
+def rollback_instructions(instruction_id: int, version: int, request: Request):
     """
     Rollback to a previous version of instructions.
     Protected: requires tuning_auth cookie.
@@ -1367,6 +1383,10 @@ async def rollback_instructions(instruction_id: int, version: int, request: Requ
         cur.close()
         conn.close()
         
+        # Invalidate cached prompt inputs so /answer picks up the change
+        from .utils.metadata_cache import invalidate_rag_prompt_cache
+        invalidate_rag_prompt_cache()
+        
         logger.info(f"Rolled back instruction set {instruction_id} to version {version}")
         return {"success": True, "message": f"Rolled back to version {version}"}
         
@@ -1429,6 +1449,12 @@ class SearchConfigDB(BaseModel):
     enable_reranker: bool = Field(default=False, description="Use reranking step")
     rerank_top_k: int = Field(default=200, ge=1, le=500, description="Candidates for reranking")
     return_top_k: int = Field(default=20, ge=1, le=100, description="Final results to return")
+    ivfflat_probes: int = Field(default=10, ge=1, le=1000, description="IVFFlat lists scanned per query (recall vs latency)")
+    hnsw_ef_search: int = Field(default=100, ge=10, le=1000, description="HNSW candidate list size per query (recall vs latency)")
+    hybrid_enabled: bool = Field(default=False, description="Fuse full-text matches with vector results")
+    hybrid_vector_weight: float = Field(default=1.0, ge=0.0, le=5.0, description="RRF weight of the vector ranking")
+    hybrid_lexical_weight: float = Field(default=0.5, ge=0.0, le=5.0, description="RRF weight of the full-text ranking")
+    rrf_k: int = Field(default=60, ge=1, le=1000, description="RRF rank constant (higher flattens rank differences)")
 
 
 class SearchConfigResponse(BaseModel):
@@ -1454,7 +1480,9 @@ def get_search_config_from_db() -> SearchConfigDB:
         cur = conn.cursor()
         
         cur.execute("""
-            SELECT top_k, min_similarity, enable_reranker, rerank_top_k, return_top_k
+            SELECT top_k, min_similarity, enable_reranker, rerank_top_k, return_top_k,
+                   ivfflat_probes, hnsw_ef_search,
+                   hybrid_enabled, hybrid_vector_weight, hybrid_lexical_weight, rrf_k
             FROM search_config
             WHERE id = 1
         """)
@@ -1468,7 +1496,13 @@ def get_search_config_from_db() -> SearchConfigDB:
                 min_similarity=row['min_similarity'],
                 enable_reranker=row['enable_reranker'],
                 rerank_top_k=row['rerank_top_k'],
-                return_top_k=row['return_top_k']
+                return_top_k=row['return_top_k'],
+                ivfflat_probes=row['ivfflat_probes'],
+                hnsw_ef_search=row['hnsw_ef_search'],
+                hybrid_enabled=row['hybrid_enabled'],
+                hybrid_vector_weight=row['hybrid_vector_weight'],
+                hybrid_lexical_weight=row['hybrid_lexical_weight'],
+                rrf_k=row['rrf_k']
             )
         else:
             # Table exists but no row - return defaults
@@ -1507,7 +1541,9 @@ def get_search_config_with_status() -> tuple[SearchConfigDB, Optional[str], Opti
         cur = conn.cursor()
         
         cur.execute("""
-            SELECT top_k, min_similarity, enable_reranker, rerank_top_k, return_top_k
+            SELECT top_k, min_similarity, enable_reranker, rerank_top_k, return_top_k,
+                   ivfflat_probes, hnsw_ef_search,
+                   hybrid_enabled, hybrid_vector_weight, hybrid_lexical_weight, rrf_k
             FROM search_config
             WHERE id = 1
         """)
@@ -1521,7 +1557,13 @@ def get_search_config_with_status() -> tuple[SearchConfigDB, Optional[str], Opti
                 min_similarity=row['min_similarity'],
                 enable_reranker=row['enable_reranker'],
                 rerank_top_k=row['rerank_top_k'],
-                return_top_k=row['return_top_k']
+                return_top_k=row['return_top_k'],
+                ivfflat_probes=row['ivfflat_probes'],
+                hnsw_ef_search=row['hnsw_ef_search'],
+                hybrid_enabled=row['hybrid_enabled'],
+                hybrid_vector_weight=row['hybrid_vector_weight'],
+                hybrid_lexical_weight=row['hybrid_lexical_weight'],
+                rrf_k=row['rrf_k']
             ), None, None
         else:
             # Table exists but no row - return defaults
@@ -1546,7 +1588,7 @@ def get_search_config_with_status() -> tuple[SearchConfigDB, Optional[str], Opti
     response_model=SearchConfigResponse,
     dependencies=[Depends(require_tuning_auth)],
 )
-async def get_search_config(request: Request, refresh: bool = False):
+def get_search_config(request: Request, refresh: bool = False):
     """
     Get current search configuration from database.
     Protected: requires tuning_auth cookie.
@@ -1569,7 +1611,7 @@ async def get_search_config(request: Request, refresh: bool = False):
     response_model=SearchConfigResponse,
     dependencies=[Depends(require_tuning_auth)],
 )
-async def update_search_config(config: SearchConfigDB, request: Request):
+def update_search_config(config: SearchConfigDB, request: Request):
     """
     Update search configuration in database.
     Protected: requires tuning_auth cookie.
@@ -1580,17 +1622,29 @@ async def update_search_config(config: SearchConfigDB, request: Request):
         
         # Upsert the config (insert or update)
         cur.execute("""
-            INSERT INTO search_config (id, top_k, min_similarity, enable_reranker, rerank_top_k, return_top_k)
-            VALUES (1, %s, %s, %s, %s, %s)
+            INSERT INTO search_config (id, top_k, min_similarity, enable_reranker, rerank_top_k, return_top_k,
+                                       ivfflat_probes, hnsw_ef_search,
+                                       hybrid_enabled, hybrid_vector_weight, hybrid_lexical_weight, rrf_k)
+            VALUES (1, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             ON CONFLICT (id) DO UPDATE SET
                 top_k = EXCLUDED.top_k,
                 min_similarity = EXCLUDED.min_similarity,
                 enable_reranker = EXCLUDED.enable_reranker,
                 rerank_top_k = EXCLUDED.rerank_top_k,
                 return_top_k = EXCLUDED.return_top_k,
+                ivfflat_probes = EXCLUDED.ivfflat_probes,
+                hnsw_ef_search = EXCLUDED.hnsw_ef_search,
+                hybrid_enabled = EXCLUDED.hybrid_enabled,
+                hybrid_vector_weight = EXCLUDED.hybrid_vector_weight,
+                hybrid_lexical_weight = EXCLUDED.hybrid_lexical_weight,
+                rrf_k = EXCLUDED.rrf_k,
                 updated_at = NOW()
-            RETURNING top_k, min_similarity, enable_reranker, rerank_top_k, return_top_k
-        """, (config.top_k, config.min_similarity, config.enable_reranker, config.rerank_top_k, config.return_top_k))
+            RETURNING top_k, min_similarity, enable_reranker, rerank_top_k, return_top_k,
+                      ivfflat_probes, hnsw_ef_search,
+                      hybrid_enabled, hybrid_vector_weight, hybrid_lexical_weight, rrf_k
+        """, (config.top_k, config.min_similarity, config.enable_reranker, config.rerank_top_k, config.return_top_k,
+              config.ivfflat_probes, config.hnsw_ef_search,
+              config.hybrid_enabled, config.hybrid_vector_weight, config.hybrid_lexical_weight, config.rrf_k))
         
         row = cur.fetchone()
         conn.commit()
@@ -1609,7 +1663,13 @@ async def update_search_config(config: SearchConfigDB, request: Request):
                 min_similarity=row['min_similarity'],
                 enable_reranker=row['enable_reranker'],
                 rerank_top_k=row['rerank_top_k'],
-                return_top_k=row['return_top_k']
+                return_top_k=row['return_top_k'],
+                ivfflat_probes=row['ivfflat_probes'],
+                hnsw_ef_search=row['hnsw_ef_search'],
+                hybrid_enabled=row['hybrid_enabled'],
+                hybrid_vector_weight=row['hybrid_vector_weight'],
+                hybrid_lexical_weight=row['hybrid_lexical_weight'],
+                rrf_k=row['rrf_k']
             )
         )
         
@@ -1859,7 +1919,7 @@ def _fetch_rag_profiles() -> List[RagProfile]:
     response_model=List[RagProfile],
     dependencies=[Depends(require_tuning_auth)],
 )
-async def list_rag_profiles(request: Request, refresh: bool = False):
+def list_rag_profiles(request: Request, refresh: bool = False):
     """
     List all RAG profiles.
     Protected: requires tuning_auth cookie.
@@ -1878,7 +1938,7 @@ async def list_rag_profiles(request: Request, refresh: bool = False):
     response_model=RagProfileResponse,
     dependencies=[Depends(require_tuning_auth)],
 )
-async def get_active_profile(request: Request):
+def get_active_profile(request: Request):
     """
     Get the currently active (default) RAG profile.
     Protected: requires tuning_auth cookie.
@@ -1900,7 +1960,7 @@ async def get_active_profile(request: Request):
     response_model=RagProfileResponse,
     dependencies=[Depends(require_tuning_auth)],
 )
-async def get_profile(profile_id: str, request: Request):
+def get_profile(profile_id: str, request: Request):
     """
     Get a specific RAG profile by ID.
     Protected: requires tuning_auth cookie.
@@ -1946,7 +2006,7 @@ async def get_profile(profile_id: str, request: Request):
     response_model=RagProfileResponse,
     dependencies=[Depends(require_tuning_auth)],
 )
-async def update_profile(profile_id: str, profile: RagProfile, request: Request):
+def update_profile(profile_id: str, profile: RagProfile, request: Request):
     """
     Update an existing RAG profile.
     Protected: requires tuning_auth cookie.
@@ -2018,6 +2078,10 @@ async def update_profile(profile_id: str, profile: RagProfile, request: Request)
         cur.close()
         conn.close()
         
+        # Invalidate cached prompt inputs so /answer picks up the change
+        from .utils.metadata_cache import invalidate_rag_prompt_cache
+        invalidate_rag_prompt_cache()
+        
         logger.info(f"Updated RAG profile: {profile.name} (v{row['version']})")
         
         return RagProfileResponse(profile=_row_to_rag_profile(row))
@@ -2034,7 +2098,7 @@ async def update_profile(profile_id: str, profile: RagProfile, request: Request)
     response_model=RagProfileResponse,
     dependencies=[Depends(require_tuning_auth)],
 )
-async def create_profile(profile: RagProfile, request: Request):
+def create_profile(profile: RagProfile, request: Request):
     """
     Create a new RAG profile.
     Protected: requires tuning_auth cookie.
@@ -2101,6 +2165,10 @@ async def create_profile(profile: RagProfile, request: Request):
         cur.close()
         conn.close()
         
+        # Invalidate cached prompt inputs so /answer picks up the change
+        from .utils.metadata_cache import invalidate_rag_prompt_cache
+        invalidate_rag_prompt_cache()
+        
         logger.info(f"Created RAG profile: {profile.name}")
         
         return RagProfileResponse(profile=_row_to_rag_profile(row))
@@ -2118,7 +2186,7 @@ async def create_profile(profile: RagProfile, request: Request):
     response_model=RagProfileResponse,
     dependencies=[Depends(require_tuning_auth)],
 )
-async def activate_profile(profile_id: str, request: Request):
+def activate_profile(profile_id: str, request: Request):
     """
     Set a profile as the default (active) profile.
     Protected: requires tuning_auth cookie.
@@ -2161,6 +2229,10 @@ async def activate_profile(profile_id: str, request: Request):
         cur.close()
         conn.close()
         
+        # Invalidate cached prompt inputs so /answer picks up the change
+        from .utils.metadata_cache import invalidate_rag_prompt_cache
+        invalidate_rag_prompt_cache()
+        
         logger.info(f"Activated RAG profile: {row['name']}")
         
         return RagProfileResponse(profile=_row_to_rag_profile(row))
@@ -2176,7 +2248,7 @@ async def activate_profile(profile_id: str, request: Request):
     "/profiles/{profile_id}",
     dependencies=[Depends(require_tuning_auth)],
 )
-async def delete_profile(profile_id: str, request: Request):
+def delete_profile(profile_id: str, request: Request):
     """
     Delete a RAG profile (cannot delete the default profile).
     Protected: requires tuning_auth cookie.
@@ -2204,6 +2276,10 @@ async def delete_profile(profile_id: str, request: Request):
         cur.close()
         conn.close()
         
+        # Invalidate cached prompt inputs so /answer picks up the change
+        from .utils.metadata_cache import invalidate_rag_prompt_cache
+        invalidate_rag_prompt_cache()
+        
         logger.info(f"Deleted RAG profile: {row['name']}")
         
         return {"success": True, "message": f"Profile '{row['name']}' deleted"}
@@ -0,0 +1,253 @@
+"""
+Answer Cache Hot Tier and Access Accounting
+
+/answer/cache/lookup embedded every query, ran a pgvector similarity query
+over answer_cache_embeddings and, on a hit, ran a synchronous
+`UPDATE answer_cache SET access_count = access_count + 1` plus commit.
+
+Two tiers:
+1. Hot tier: in-process LRU keyed on (model, style, hash of the normalized
+   query), checked before any embedding work. Filled by semantic hits and
+   by saves.
+2. Semantic tier: the existing answer_cache_embeddings similarity query.
+
+Access accounting is aggregated in memory (hits and last access per cache
+id) and written by a background task in one bulk UPDATE every
+ANSWER_CACHE_ACCESS_FLUSH_SECONDS, and on shutdown.
+
+Environment variables:
+- ANSWER_HOT_CACHE_SIZE: Entries in the hot tier (default: 1024)
+- ANSWER_HOT_CACHE_TTL_SECONDS: Hot-tier entry lifetime (default: 600)
+- ANSWER_CACHE_ACCESS_FLUSH_SECONDS: Access-count flush interval (default: 30)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .cache import LRUCache
+from .metrics import CACHE_EVENTS
+from .query_embedding_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+ANSWER_HOT_CACHE_SIZE = int(os.getenv('ANSWER_HOT_CACHE_SIZE', '1024'))
+ANSWER_HOT_CACHE_TTL_SECONDS = float(os.getenv('ANSWER_HOT_CACHE_TTL_SECONDS', '600'))
+ANSWER_CACHE_ACCESS_FLUSH_SECONDS = float(os.getenv('ANSWER_CACHE_ACCESS_FLUSH_SECONDS', '30'))
+
+_hot_answers = LRUCache(
+    max_size=ANSWER_HOT_CACHE_SIZE,
+    ttl_seconds=ANSWER_HOT_CACHE_TTL_SECONDS or None,
+)
+
+# Lookup outcomes across both tiers, for the /health hit rate
+_lookup_counts = {'hot': 0, 'semantic': 0, 'miss': 0}
+_lookup_lock = threading.Lock()
+
+
+# =============================================================================
+# Hot Tier
+# =============================================================================
+
+def hot_answer_key(model_key: str, style: str, query: str) -> Hashable:
+    """Hot-tier key: exact match on the normalized query."""
+    digest = hashlib.sha1(normalize_query(query).encode('utf-8')).hexdigest()
+    return (model_key, style, digest)
+
+
+def lookup_hot_answer(model_key: str, style: str, query: str,
+                      similarity_threshold: float) -> Optional[Dict[str, Any]]:
+    """
+    Get a cached answer from the hot tier.
+
+    Entries remember the similarity they were found with, so a stricter
+    threshold than the one that filled the entry falls through to tier 2.
+
+    Returns:
+        Copy of the cached answer dict, or None
+    """
+    cached = _hot_answers.get(hot_answer_key(model_key, style, query))
+    if cached is None or cached['similarity'] < similarity_threshold:
+        return None
+    result = dict(cached)
+    cached['access_count'] = (cached.get('access_count') or 0) + 1
+    return result
+
+
+def store_hot_answer(model_key: str, style: str, query: str, cached: Dict[str, Any]) -> None:
+    """Store an answer (as returned by /answer/cache/lookup) in the hot tier."""
+    _hot_answers.set(hot_answer_key(model_key, style, query), dict(cached))
+
+
+def record_lookup(outcome: str) -> None:
+    """Count a lookup outcome: 'hot', 'semantic' or 'miss'."""
+    with _lookup_lock:
+        _lookup_counts[outcome] += 1
+    CACHE_EVENTS.inc(cache='answer', outcome=outcome)
+
+
+def get_lookup_stats() -> Dict[str, Any]:
+    """Lookup counts per tier and the overall hit rate."""
+    with _lookup_lock:
+        counts = dict(_lookup_counts)
+    total = sum(counts.values())
+    hits = counts['hot'] + counts['semantic']
+    return {**counts, "lookups": total, "hit_rate": round(hits / total, 4) if total else 0.0}
+
+
+def invalidate_hot_answers() -> None:
+    """Clear the hot tier (call after deleting answer_cache rows)."""
+    _hot_answers.clear()
+    logger.info("Answer cache hot tier invalidated")
+
+
+# =============================================================================
+# Access Accounting
+# =============================================================================
+
+class AnswerCacheAccessTracker:
+    """Aggregates answer_cache hits in memory and writes them in bulk."""
+
+    def __init__(self, connect_fn: Callable[[], Any],
+                 flush_seconds: float = ANSWER_CACHE_ACCESS_FLUSH_SECONDS):
+        """
+        Args:
+            connect_fn: Returns a DB connection (close() releases it)
+            flush_seconds: Background flush interval
+        """
+        self._connect_fn = connect_fn
+        self.flush_seconds = flush_seconds
+        # cache id -> [hits, monotonic time of last hit]
+        self._pending: Dict[int, list] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._flushes = 0
+        self._rows_updated = 0
+        self._errors = 0
+
+    def record(self, cache_id: int) -> None:
+        """Count one hit on a cache row. Never touches the database."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._pending.get(cache_id)
+            if entry is None:
+                self._pending[cache_id] = [1, now]
+            else:
+                entry[0] += 1
+                entry[1] = now
+
+    def flush(self) -> int:
+        """
+        Write pending hits with one UPDATE. Blocking.
+
+        accessed_at is set relative to the database clock (NOW() minus the
+        time since the last hit), so app and DB clocks needn't agree.
+
+        Returns:
+            Number of cache rows updated
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            now = time.monotonic()
+            ids = list(pending)
+            hits = [pending[i][0] for i in ids]
+            ages = [max(0.0, now - pending[i][1]) for i in ids]
+            try:
+                conn = self._connect_fn()
+                try:
+                    with conn.cursor() as cur:
+                        cur.execute("""
+                            UPDATE answer_cache ac
+                            SET access_count = ac.access_count + v.hits,
+                                accessed_at = GREATEST(ac.accessed_at, NOW() - make_interval(secs => v.age))
+                            FROM unnest(%s::int[], %s::int[], %s::float8[]) AS v(id, hits, age)
+                            WHERE ac.id = v.id
+                        """, [ids, hits, ages])
+                    conn.commit()
+                finally:
+                    conn.close()
+            except Exception as e:
+                self._errors += 1
+                self._restore(pending)
+                logger.warning(f"Answer cache access flush failed ({len(ids)} rows kept for retry): {e}")
+                return 0
+
+            self._flushes += 1
+            self._rows_updated += len(ids)
+            logger.debug(f"Answer cache access flush: rows={len(ids)} hits={sum(hits)}")
+            return len(ids)
+
+    def _restore(self, pending: Dict[int, list]) -> None:
+        # Merge back so a transient DB error doesn't lose counts
+        with self._lock:
+            for cache_id, (hits, last) in pending.items():
+                entry = self._pending.get(cache_id)
+                if entry is None:
+                    self._pending[cache_id] = [hits, last]
+                else:
+                    entry[0] += hits
+                    entry[1] = max(entry[1], last)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await asyncio.to_thread(self.flush)
+
+    async def start(self) -> None:
+        """Start the background flush task (idempotent)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write pending hits."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "pending_rows": pending,
+            "flushes": self._flushes,
+            "rows_updated": self._rows_updated,
+            "errors": self._errors,
+        }
+
+
+def _default_connect():
+    from .db_pool import get_db_connection
+    return get_db_connection()
+
+
+_access_tracker = AnswerCacheAccessTracker(_default_connect)
+
+
+def get_answer_cache_access_tracker() -> AnswerCacheAccessTracker:
+    """Get the process-wide access tracker."""
+    return _access_tracker
+
+
+def get_answer_cache_stats() -> Dict[str, Any]:
+    """Hot-tier, hit-rate and access-accounting stats for /health."""
+    return {
+        "lookups": get_lookup_stats(),
+        "hot_tier": _hot_answers.stats(),
+        "access_tracking": _access_tracker.stats(),
+    }
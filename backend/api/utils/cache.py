@@ -1,13 +1,15 @@
 """
 Simple TTL Cache Utility
 
-Provides time-based caching for expensive operations.
+Provides time-based caching for expensive operations, plus a size-bounded
+LRU cache for high-cardinality keys (e.g. query embeddings).
 Thread-safe and suitable for FastAPI async handlers.
 """
 
 import time
 import threading
-from typing import Any, Callable, Dict, Optional, TypeVar
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
 from functools import wraps
 
 T = TypeVar('T')
@@ -100,6 +102,128 @@ class TTLCache:
             self._cache.clear()
 
 
+class LRUCache:
+    """
+    Size-bounded least-recently-used cache with optional TTL.
+    
+    Unlike TTLCache (a handful of fixed keys), this is meant for keys driven
+    by user input, so it evicts the least recently used entry once max_size
+    is reached and keeps hit/miss/eviction counters for monitoring.
+    
+    Usage:
+        cache = LRUCache(max_size=1024, ttl_seconds=3600)
+        
+        value = cache.get_or_compute(("model", "query"), lambda: compute())
+    """
+    
+    def __init__(self, max_size: int = 1024, ttl_seconds: Optional[float] = None):
+        """
+        Initialize cache.
+        
+        Args:
+            max_size: Maximum number of entries (0 disables caching)
+            ttl_seconds: Optional time-to-live per entry (None = no expiry)
+        """
+        self._cache: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, expiry_time)
+        self._lock = threading.Lock()
+        self._max_size = max(0, max_size)
+        self._ttl = ttl_seconds
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get cached value, marking it most recently used.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached value or None if expired/missing
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                value, expiry = entry
+                if expiry is None or time.time() < expiry:
+                    self._cache.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._cache[key]
+            self._misses += 1
+        return None
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Set cached value, evicting the least recently used entry if full.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self._max_size == 0:
+            return
+        expiry = time.time() + self._ttl if self._ttl else None
+        with self._lock:
+            self._cache[key] = (value, expiry)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+                self._evictions += 1
+    
+    def get_or_compute(self, key: Hashable, compute_fn: Callable[[], Any]) -> Any:
+        """
+        Get cached value or compute and cache it.
+        
+        The lock is not held while computing, so concurrent misses for the
+        same key may compute twice. None results are not cached.
+        
+        Args:
+            key: Cache key
+            compute_fn: Function to compute value if not cached
+            
+        Returns:
+            Cached or freshly computed value
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        
+        value = compute_fn()
+        if value is not None:
+            self.set(key, value)
+        return value
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a specific key from cache."""
+        with self._lock:
+            self._cache.pop(key, None)
+    
+    def clear(self) -> None:
+        """Clear all cached values (counters are kept)."""
+        with self._lock:
+            self._cache.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cache)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss counters for /health and monitoring."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._cache),
+                "max_size": self._max_size,
+                "ttl_seconds": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
 def ttl_cache(ttl_seconds: float = 5.0, key_fn: Optional[Callable] = None):
     """
     Decorator for caching function results with TTL.
@@ -0,0 +1,454 @@
+"""
+Shared Database Connection Pool
+
+Provides an app-lifetime pool of psycopg2 connections so request handlers
+stop paying a TCP + TLS + auth handshake on every call.
+
+Features:
+- Configurable min/max size (DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE)
+- Bounded wait for a free connection (DB_POOL_ACQUIRE_TIMEOUT)
+- Health check on checkout for connections idle longer than
+  DB_POOL_HEALTHCHECK_IDLE_SECONDS (broken connections are replaced)
+- Pool-wait metrics (acquisitions, wait time percentiles, timeouts)
+- Connection hooks run once per physical connection
+  (register_connection_hook, e.g. pgvector type registration)
+
+Connections are handed out wrapped in PooledConnection. Calling close()
+returns the connection to the pool instead of closing the socket, so
+existing code that does ``conn = get_db_connection() ... conn.close()``
+works unchanged.
+
+Usage:
+    # App startup / shutdown:
+    init_db_pool()
+    close_db_pool()
+
+    # In sync code (run from a threadpool when called from async handlers):
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+    finally:
+        conn.close()
+
+    # Or as a context manager:
+    with pooled_connection() as conn:
+        ...
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import RealDictCursor
+
+from .metrics import DB_POOL_TIMEOUTS, DB_POOL_WAITS, observe_stage_ms
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# Pool Configuration
+# =============================================================================
+
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+DB_POOL_ACQUIRE_TIMEOUT = float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', '10'))
+DB_POOL_HEALTHCHECK_IDLE_SECONDS = float(os.getenv('DB_POOL_HEALTHCHECK_IDLE_SECONDS', '30'))
+
+# Number of recent wait samples kept for percentile reporting
+_WAIT_SAMPLE_SIZE = 1024
+
+# Slot waits at or above this count as a pool wait in /metrics
+_WAIT_COUNT_THRESHOLD_MS = 1.0
+
+
+# Called with each new raw connection before it is first handed out
+_connection_hooks: List[Callable[[psycopg2.extensions.connection], Any]] = []
+
+
+def register_connection_hook(hook: Callable[[psycopg2.extensions.connection], Any]) -> None:
+    """
+    Run hook(conn) on every new physical connection (idempotent per hook).
+
+    Hooks apply to connections opened after registration, so register them
+    at import time, before init_db_pool(). A failing hook is logged and the
+    connection is still used.
+    """
+    if hook not in _connection_hooks:
+        _connection_hooks.append(hook)
+
+
+class PoolTimeoutError(psycopg2.OperationalError):
+    """Raised when no pooled connection becomes free within the acquire timeout."""
+
+
+def get_database_url() -> str:
+    """
+    Get DATABASE_URL normalized for psycopg2.
+
+    Handles the legacy postgres:// scheme used by some hosting providers.
+    """
+    database_url = os.getenv('DATABASE_URL', '')
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+    return database_url
+
+
+class PooledConnection:
+    """
+    Thin proxy around a psycopg2 connection checked out of a pool.
+
+    Everything except close() is delegated to the underlying connection.
+    close() hands the connection back to the pool (rolling back any open
+    transaction) and is idempotent.
+    """
+
+    def __init__(self, pool: 'DatabasePool', conn: psycopg2.extensions.connection):
+        self._pool = pool
+        self._conn = conn
+        self._released = False
+
+    @property
+    def raw(self) -> psycopg2.extensions.connection:
+        """The underlying psycopg2 connection (e.g. for type registration)."""
+        return self._conn
+
+    def close(self) -> None:
+        """Return the connection to the pool."""
+        if self._released:
+            return
+        self._released = True
+        self._pool.putconn(self._conn)
+
+    def __getattr__(self, name: str) -> Any:
+        if self.__dict__.get('_released', True):
+            raise psycopg2.InterfaceError("connection already returned to pool")
+        return getattr(self._conn, name)
+
+    # Dunder methods bypass __getattr__, so delegate transaction scoping explicitly
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def __del__(self):
+        # Safety net for callers that forget close() - never leak a slot
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class DatabasePool:
+    """
+    Thread-safe, bounded psycopg2 connection pool.
+
+    Unlike psycopg2.pool.ThreadedConnectionPool this pool waits (up to
+    acquire_timeout) for a free connection instead of raising immediately,
+    keeps up to max_size idle connections open, and records wait metrics.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = DB_POOL_MIN_SIZE,
+        max_size: int = DB_POOL_MAX_SIZE,
+        acquire_timeout: float = DB_POOL_ACQUIRE_TIMEOUT,
+        healthcheck_idle_seconds: float = DB_POOL_HEALTHCHECK_IDLE_SECONDS,
+        cursor_factory=RealDictCursor,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self.dsn = dsn
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.healthcheck_idle_seconds = healthcheck_idle_seconds
+        self.cursor_factory = cursor_factory
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle: Deque[tuple] = deque()  # (conn, last_used_monotonic)
+        self._in_use = 0
+        self._closed = False
+
+        # Metrics
+        self._acquisitions = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._healthcheck_failures = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._recent_waits: Deque[float] = deque(maxlen=_WAIT_SAMPLE_SIZE)
+
+    # -------------------------------------------------------------------------
+    # Connection lifecycle
+    # -------------------------------------------------------------------------
+
+    def _connect(self) -> psycopg2.extensions.connection:
+        conn = psycopg2.connect(self.dsn, cursor_factory=self.cursor_factory)
+        for hook in _connection_hooks:
+            try:
+                hook(conn)
+            except Exception as e:
+                logger.warning(f"Connection hook {getattr(hook, '__name__', hook)} failed: {e}")
+                if conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+                    conn.rollback()
+        with self._lock:
+            self._created += 1
+        return conn
+
+    def _discard(self, conn: psycopg2.extensions.connection) -> None:
+        with self._lock:
+            self._discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn: psycopg2.extensions.connection, idle_seconds: float) -> bool:
+        if conn.closed:
+            return False
+        if idle_seconds < self.healthcheck_idle_seconds:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled connection failed health check, replacing: {e}")
+            with self._lock:
+                self._healthcheck_failures += 1
+            return False
+
+    def warm(self) -> None:
+        """Open min_size connections up front so the first requests don't pay for it."""
+        opened = 0
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) + self._in_use >= self.min_size:
+                    break
+            conn = self._connect()
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+            opened += 1
+        if opened:
+            logger.info(f"DB pool warmed: {opened} connection(s) opened")
+
+    def getconn(self, timeout: Optional[float] = None) -> PooledConnection:
+        """
+        Check out a connection, waiting up to `timeout` seconds for a free slot.
+
+        Raises:
+            PoolTimeoutError: if the pool stays saturated for the whole timeout
+        """
+        if self._closed:
+            raise psycopg2.InterfaceError("connection pool is closed")
+
+        timeout = self.acquire_timeout if timeout is None else timeout
+        t_wait_start = time.perf_counter()
+        if not self._slots.acquire(timeout=timeout):
+            with self._lock:
+                self._timeouts += 1
+            DB_POOL_TIMEOUTS.inc()
+            raise PoolTimeoutError(
+                f"Timed out after {timeout:.1f}s waiting for a database connection "
+                f"(pool max_size={self.max_size})"
+            )
+        wait_ms = (time.perf_counter() - t_wait_start) * 1000
+
+        try:
+            conn = None
+            while conn is None:
+                with self._lock:
+                    candidate = self._idle.pop() if self._idle else None
+                if candidate is None:
+                    conn = self._connect()
+                    break
+                candidate_conn, last_used = candidate
+                if self._is_healthy(candidate_conn, time.monotonic() - last_used):
+                    conn = candidate_conn
+                else:
+                    self._discard(candidate_conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self._acquisitions += 1
+            self._total_wait_ms += wait_ms
+            self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+            self._recent_waits.append(wait_ms)
+
+        if wait_ms >= _WAIT_COUNT_THRESHOLD_MS:
+            DB_POOL_WAITS.inc()
+        # Slot wait plus health check / reconnect
+        observe_stage_ms('db_acquire', (time.perf_counter() - t_wait_start) * 1000)
+        return PooledConnection(self, conn)
+
+    def putconn(self, conn: psycopg2.extensions.connection) -> None:
+        """Return a raw connection to the pool (PooledConnection.close() calls this)."""
+        keep = not self._closed and not conn.closed
+        if keep:
+            try:
+                status = conn.info.transaction_status
+                if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                    keep = False
+                elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                keep = False
+
+        with self._lock:
+            self._in_use -= 1
+            if keep:
+                self._idle.append((conn, time.monotonic()))
+
+        if not keep:
+            self._discard(conn)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[PooledConnection]:
+        """Context manager that always returns the connection to the pool."""
+        conn = self.getconn(timeout=timeout)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def closeall(self) -> None:
+        """Close all idle connections and refuse new checkouts."""
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn, _ in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        logger.info(f"DB pool closed ({len(idle)} idle connection(s))")
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool size and wait metrics."""
+        with self._lock:
+            waits: List[float] = sorted(self._recent_waits)
+            acquisitions = self._acquisitions
+            result = {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "size": self._in_use + len(self._idle),
+                "saturation": round(self._in_use / self.max_size, 3),
+                "acquisitions": acquisitions,
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "discarded": self._discarded,
+                "healthcheck_failures": self._healthcheck_failures,
+                "avg_wait_ms": round(self._total_wait_ms / acquisitions, 2) if acquisitions else 0.0,
+                "max_wait_ms": round(self._max_wait_ms, 2),
+            }
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 2)
+
+        result["p50_wait_ms"] = percentile(0.50)
+        result["p95_wait_ms"] = percentile(0.95)
+        result["p99_wait_ms"] = percentile(0.99)
+        return result
+
+
+# =============================================================================
+# App-lifetime pool
+# =============================================================================
+
+_pool: Optional[DatabasePool] = None
+_pool_lock = threading.Lock()
+
+
+def init_db_pool(warm: bool = True) -> DatabasePool:
+    """
+    Create the shared pool (idempotent). Call from app startup.
+
+    Args:
+        warm: Open DB_POOL_MIN_SIZE connections immediately
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DatabasePool(get_database_url())
+            logger.info(
+                f"DB pool initialized: min_size={_pool.min_size} max_size={_pool.max_size} "
+                f"acquire_timeout={_pool.acquire_timeout}s"
+            )
+        pool = _pool
+
+    if warm:
+        try:
+            pool.warm()
+        except Exception as e:
+            # Don't block startup - connections are opened lazily on first use
+            logger.warning(f"DB pool warmup failed: {e}")
+    return pool
+
+
+def get_db_pool() -> DatabasePool:
+    """Get the shared pool, creating it lazily (e.g. in scripts and tests)."""
+    if _pool is None:
+        return init_db_pool(warm=False)
+    return _pool
+
+
+def close_db_pool() -> None:
+    """Close the shared pool. Call from app shutdown."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.closeall()
+
+
+def get_db_connection() -> PooledConnection:
+    """
+    Check out a connection from the shared pool.
+
+    The connection uses RealDictCursor by default. Call close() when done
+    to return it to the pool.
+
+    Raises:
+        psycopg2.OperationalError (PoolTimeoutError if the pool is saturated)
+    """
+    return get_db_pool().getconn()
+
+
+@contextmanager
+def pooled_connection(timeout: Optional[float] = None) -> Iterator[PooledConnection]:
+    """Context manager around the shared pool's connection()."""
+    with get_db_pool().connection(timeout=timeout) as conn:
+        yield conn
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Pool metrics for /health and monitoring (empty if not initialized)."""
+    if _pool is None:
+        return {"initialized": False}
+    return {"initialized": True, **_pool.stats()}
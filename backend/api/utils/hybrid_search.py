@@ -0,0 +1,141 @@
+"""
+Hybrid Lexical + Vector Search
+
+Full-text matching over segments.text_tsv (migration 030) and reciprocal-rank
+fusion (RRF) with the pgvector results. Vector search misses exact names and
+rare terms ("oxalates", "Stefansson"); the lexical ranking catches those,
+and RRF merges the two rankings without having to calibrate their scores.
+
+Lexical ranking is BM25-style: query terms are OR-ed (a natural-language
+question rarely matches as a whole), ts_rank_cd rewards more and closer
+term matches, normalization 1 divides by log(document length) and 32
+saturates the score to rank/(rank+1).
+
+Fusion (Cormack et al.): score(d) = sum_i weight_i / (k + rank_i(d)),
+with weights and k from search_config (tuning dashboard).
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# ts_rank_cd normalization: 1 = divide by 1 + log(length), 32 = rank / (rank + 1)
+TS_RANK_NORMALIZATION = 1 | 32
+
+_RESULT_COLUMNS = """
+    seg.id,
+    s.id as source_id,
+    s.source_id as video_id,
+    s.title,
+    seg.text,
+    seg.start_sec as start_time_seconds,
+    seg.end_sec as end_time_seconds,
+    s.published_at,
+    s.source_type,
+"""
+
+
+def lexical_search(cur, query: str, top_k: int, query_vector: Any = None,
+                   segment_table: Optional[str] = None,
+                   model_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Rank segments by full-text relevance to the query (GIN index on text_tsv).
+
+    Runs inside a savepoint, so a failure (e.g. migration 030 not applied)
+    leaves the caller's transaction usable; the error is re-raised.
+
+    Args:
+        cur: Database cursor (RealDictCursor)
+        query: Raw query text
+        top_k: Number of results to return
+        query_vector: Optional Vector; when given, rows also carry the
+            vector similarity so fused results stay comparable
+        segment_table: Normalized embedding table for similarity (else
+            segments.embedding is used)
+        model_key: Embedding model key (with segment_table)
+
+    Returns:
+        Rows in lexical rank order, with lexical_score and similarity
+    """
+    params: List[Any] = []
+    if query_vector is None:
+        vector_cte = ""
+        vector_join = ""
+        similarity = "NULL::float8"
+    elif segment_table:
+        vector_cte = "q AS (SELECT %s::vector AS v),"
+        params.append(query_vector)
+        vector_join = f"""
+            CROSS JOIN q
+            LEFT JOIN {segment_table} se ON se.segment_id = seg.id AND se.model_key = %s
+        """
+        similarity = "1 - (se.embedding <=> q.v)"
+    else:
+        vector_cte = "q AS (SELECT %s::vector AS v),"
+        params.append(query_vector)
+        vector_join = "CROSS JOIN q"
+        similarity = "1 - (seg.embedding <=> q.v)"
+
+    params.append(query)
+    if query_vector is not None and segment_table:
+        params.append(model_key)
+    params.append(top_k)
+
+    sql = f"""
+        WITH {vector_cte}
+             t AS (SELECT replace(plainto_tsquery('english', %s)::text, ' & ', ' | ')::tsquery AS tq)
+        SELECT {_RESULT_COLUMNS}
+            ts_rank_cd(seg.text_tsv, t.tq, {TS_RANK_NORMALIZATION}) as lexical_score,
+            {similarity} as similarity
+        FROM t
+        JOIN segments seg ON seg.text_tsv @@ t.tq
+        JOIN sources s ON seg.source_id = s.id
+        {vector_join}
+        ORDER BY lexical_score DESC
+        LIMIT %s
+    """
+    cur.execute("SAVEPOINT lexical_search")
+    try:
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+    except Exception:
+        cur.execute("ROLLBACK TO SAVEPOINT lexical_search")
+        raise
+    cur.execute("RELEASE SAVEPOINT lexical_search")
+    return rows
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Dict[str, Any]]],
+                           weights: Sequence[float], k: int = 60,
+                           top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Merge ranked result lists by weighted reciprocal rank.
+
+    Rows are matched on 'id'; the first list a row appears in supplies its
+    fields. Each fused row gets an 'rrf_score'.
+
+    Args:
+        rankings: Result lists, each in rank order
+        weights: One weight per list (0 ignores that list)
+        k: Rank constant; larger values flatten differences between ranks
+        top_k: Truncate the fused list
+
+    Returns:
+        Fused rows, best first
+    """
+    scores: Dict[Any, float] = {}
+    rows: Dict[Any, Dict[str, Any]] = {}
+    for ranking, weight in zip(rankings, weights):
+        if weight <= 0:
+            continue
+        for rank, row in enumerate(ranking, start=1):
+            key = row['id']
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+            if key not in rows:
+                rows[key] = dict(row)
+
+    fused = sorted(rows.values(), key=lambda r: scores[r['id']], reverse=True)
+    for row in fused:
+        row['rrf_score'] = scores[row['id']]
+    return fused[:top_k] if top_k is not None else fused
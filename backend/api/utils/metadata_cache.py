@@ -5,6 +5,8 @@ Caches:
 - Embedding model stats (from database)
 - Search configuration (from database)
 - Model catalogs (RAG and embedding)
+- RAG prompt inputs (default profile, active custom instructions) and
+  assembled system prompts
 
 All caches have TTL-based expiration and support manual refresh.
 This module is the single source of truth for cached metadata access
@@ -13,9 +15,9 @@ in both the main RAG pipeline and tuning endpoints.
 
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 
-from .cache import TTLCache
+from .cache import LRUCache, TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -27,14 +29,21 @@ logger = logging.getLogger(__name__)
 # - Embedding stats: 60s (DB query, changes rarely)
 # - Search config: 60s (DB query, changes via tuning dashboard)
 # - Model catalogs: 300s (file-based, changes on deploy)
+# - RAG prompt inputs: 60s (DB queries, invalidated by tuning endpoints;
+#   the TTL bounds staleness on other workers)
 EMBEDDING_STATS_TTL = 60.0
 SEARCH_CONFIG_TTL = 60.0
 MODEL_CATALOG_TTL = 300.0
+RAG_PROMPT_TTL = 60.0
 
 # Shared caches
 _embedding_stats_cache = TTLCache(ttl_seconds=EMBEDDING_STATS_TTL)
 _search_config_cache = TTLCache(ttl_seconds=SEARCH_CONFIG_TTL)
 _model_catalog_cache = TTLCache(ttl_seconds=MODEL_CATALOG_TTL)
+_rag_prompt_inputs_cache = TTLCache(ttl_seconds=RAG_PROMPT_TTL)
+# Assembled prompts are keyed on profile/instruction versions, so they never
+# go stale by themselves; the bound only limits old versions kept around
+_system_prompt_cache = LRUCache(max_size=64)
 
 
 # =============================================================================
@@ -184,6 +193,94 @@ def invalidate_model_catalogs():
     logger.info("Model catalogs cache invalidated")
 
 
+# =============================================================================
+# RAG Prompt Cache
+# =============================================================================
+
+def get_cached_rag_profile(refresh: bool = False):
+    """
+    Get the default RAG profile with caching.
+    
+    The built-in fallback profile (returned when the table is missing or
+    the DB errors) is not cached, so recovery is picked up immediately.
+    
+    Args:
+        refresh: If True, bypass cache and fetch fresh data
+        
+    Returns:
+        RagProfile object
+    """
+    cache_key = "rag_profile"
+    
+    if refresh:
+        _rag_prompt_inputs_cache.invalidate(cache_key)
+    
+    cached = _rag_prompt_inputs_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Import here to avoid circular imports
+    from ..tuning import get_rag_profile_from_db
+    profile = get_rag_profile_from_db()
+    if profile.id:
+        _rag_prompt_inputs_cache.set(cache_key, profile)
+    return profile
+
+
+def get_cached_custom_instructions(refresh: bool = False):
+    """
+    Get the active custom instructions with caching.
+    
+    Args:
+        refresh: If True, bypass cache and fetch fresh data
+        
+    Returns:
+        ResolvedCustomInstructions (empty if none are active)
+    """
+    cache_key = "custom_instructions"
+    
+    if refresh:
+        _rag_prompt_inputs_cache.invalidate(cache_key)
+    
+    def fetch_instructions():
+        # Import here to avoid circular imports
+        from ..main import resolve_custom_instructions
+        return resolve_custom_instructions()
+    
+    return _rag_prompt_inputs_cache.get_or_compute(cache_key, fetch_instructions)
+
+
+def get_cached_system_prompt(key: Hashable, build_fn: Callable[[], str]) -> Tuple[str, bool]:
+    """
+    Get an assembled system prompt, building it on a miss.
+    
+    Args:
+        key: (profile id, profile version, instruction id, style, ...)
+        build_fn: Assembles the prompt string
+        
+    Returns:
+        Tuple of (prompt, True if served from cache)
+    """
+    cached = _system_prompt_cache.get(key)
+    if cached is not None:
+        return cached, True
+    prompt = build_fn()
+    _system_prompt_cache.set(key, prompt)
+    return prompt, False
+
+
+def invalidate_rag_prompt_cache():
+    """
+    Invalidate cached RAG profile, custom instructions and assembled prompts.
+    
+    Call this after creating, updating, activating or deleting a RAG profile
+    or custom instruction set via the tuning dashboard.
+    """
+    _rag_prompt_inputs_cache.clear()
+    _system_prompt_cache.clear()
+    logger.info("RAG prompt cache invalidated")
+
+
 # =============================================================================
 # Cache Status (for debugging/monitoring)
 # =============================================================================
@@ -207,5 +304,11 @@ def get_cache_status() -> Dict[str, Any]:
             "ttl_seconds": MODEL_CATALOG_TTL,
             "rag_cached": _model_catalog_cache.get("rag_catalog") is not None,
             "embedding_cached": _model_catalog_cache.get("embedding_catalog") is not None
+        },
+        "rag_prompt": {
+            "ttl_seconds": RAG_PROMPT_TTL,
+            "profile_cached": _rag_prompt_inputs_cache.get("rag_profile") is not None,
+            "instructions_cached": _rag_prompt_inputs_cache.get("custom_instructions") is not None,
+            "system_prompts": _system_prompt_cache.stats(),
         }
     }
@@ -0,0 +1,263 @@
+"""
+Prometheus Metrics
+
+Search and answer latencies used to exist only as free-text log lines
+(embed_ms, search_ms, llm_ms, total_ms), so per-stage p50/p95/p99 meant
+scraping logs. This module keeps in-process counters and histograms and
+renders them in the Prometheus text format for GET /metrics.
+
+Histogram buckets remember the last observation's request ID as an
+exemplar (OpenMetrics format only), so a slow bucket links straight to the
+request's log lines.
+
+Kept dependency-free on purpose: a handful of metrics doesn't need
+prometheus_client, and the registry lives in one process per worker like
+the other in-process caches.
+
+Usage:
+    from api.utils.metrics import observe_stage_ms, CACHE_EVENTS
+
+    observe_stage_ms('embed', t_embed_ms)
+    CACHE_EVENTS.inc(cache='query_embedding', outcome='hit')
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; the upper buckets cover LLM completions
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+_registry: List['_Metric'] = []
+_registry_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _current_request_id() -> str:
+    # Imported lazily: request_id's middleware records into this module
+    from .request_id import get_request_id
+    return get_request_id()
+
+
+class _Metric:
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def render(self, openmetrics: bool) -> List[str]:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter; rendered as <name>_total."""
+    type_name = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self, openmetrics: bool) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}_total{_format_labels(list(zip(self.labelnames, key)))} {_format_value(v)}"
+            for key, v in values
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class _HistogramSeries:
+    __slots__ = ('counts', 'sum', 'exemplars')
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * (buckets + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.exemplars: List[Optional[Tuple[str, float, float]]] = [None] * (buckets + 1)
+
+
+class Histogram(_Metric):
+    """Latency histogram in seconds with per-bucket request-ID exemplars."""
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, seconds: float, exemplar: Optional[str] = None, **labels: str) -> None:
+        """
+        Record one observation.
+
+        Args:
+            seconds: Observed duration
+            exemplar: Request ID to attach (defaults to the current request's)
+            **labels: Label values
+        """
+        key = self._key(labels)
+        if exemplar is None:
+            exemplar = _current_request_id()
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets))
+            series.counts[index] += 1
+            series.sum += seconds
+            if exemplar:
+                series.exemplars[index] = (exemplar, seconds, time.time())
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of a with-block."""
+        t_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t_start, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series.counts) if series else 0
+
+    def render(self, openmetrics: bool) -> List[str]:
+        lines = []
+        with self._lock:
+            snapshot = [
+                (key, list(s.counts), s.sum, list(s.exemplars))
+                for key, s in sorted(self._series.items())
+            ]
+        for key, counts, total, exemplars in snapshot:
+            base = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count, exemplar in zip(self.buckets + (math.inf,), counts, exemplars):
+                cumulative += count
+                line = f"{self.name}_bucket{_format_labels(base + [('le', _format_value(bound))])} {cumulative}"
+                if openmetrics and exemplar is not None:
+                    request_id, value, ts = exemplar
+                    line += f' # {{request_id="{_escape(request_id)}"}} {_format_value(value)} {ts:.3f}'
+                lines.append(line)
+            lines.append(f"{self.name}_sum{_format_labels(base)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(base)} {cumulative}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+def render_metrics(openmetrics: bool = False) -> str:
+    """Render every registered metric (Prometheus text 0.0.4, or OpenMetrics with exemplars)."""
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+        lines.extend(metric.render(openmetrics))
+    if openmetrics:
+        lines.append("# EOF")
+    return '\n'.join(lines) + '\n'
+
+
+def reset_metrics() -> None:
+    """Clear all recorded values (tests)."""
+    with _registry_lock:
+        metrics = list(_registry)
+    for metric in metrics:
+        metric.clear()
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'Time from request start to response start, by route template',
+    ['method', 'route', 'status'],
+)
+
+STAGE_DURATION = Histogram(
+    'rag_stage_duration_seconds',
+    'Search/answer pipeline stage latency '
+    '(embed, db_acquire, vector_query, rerank, prompt_build, llm, serialize)',
+    ['stage'],
+)
+
+CACHE_EVENTS = Counter(
+    'rag_cache_events',
+    'Cache lookups by cache and outcome',
+    ['cache', 'outcome'],
+)
+
+SEARCH_503 = Counter(
+    'search_503',
+    'Search requests failed with 503, by search_503_reason',
+    ['reason'],
+)
+
+DB_POOL_WAITS = Counter(
+    'db_pool_waits',
+    'Connection checkouts that had to wait for a free pool slot',
+)
+
+DB_POOL_TIMEOUTS = Counter(
+    'db_pool_timeouts',
+    'Connection checkouts that gave up after DB_POOL_ACQUIRE_TIMEOUT',
+)
+
+
+def observe_stage_ms(stage: str, ms: float) -> None:
+    """Record a pipeline stage latency measured in milliseconds."""
+    STAGE_DURATION.observe(ms / 1000, stage=stage)
@@ -0,0 +1,110 @@
+"""
+Query Embedding Cache
+
+The same questions arrive repeatedly from the frontend and the Discord bot,
+and a single /answer flow used to embed the same string in several places.
+This module keeps recent query embeddings in a bounded in-process LRU cache
+keyed on (model_key, normalized query text).
+
+Normalization collapses whitespace and case, so "What is  Keto?" and
+"what is keto?" share one entry (the embedding of the first form seen).
+
+Cached embeddings are read-only float32 numpy arrays; callers that need to
+modify one must copy it.
+
+Invalidation:
+- Keys include the model key, so a model switch never returns stale vectors
+- embedding_config.clear_config_cache() clears this cache to free memory
+"""
+
+import logging
+import os
+import re
+import unicodedata
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from .cache import LRUCache
+from .metrics import CACHE_EVENTS
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# Cache Configuration
+# =============================================================================
+
+# Entries are small (384 dims * 4 bytes = 1.5KB for BGE-small)
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv('QUERY_EMBEDDING_CACHE_SIZE', '2048'))
+QUERY_EMBEDDING_CACHE_TTL = float(os.getenv('QUERY_EMBEDDING_CACHE_TTL_SECONDS', '3600'))
+
+_query_embedding_cache = LRUCache(
+    max_size=QUERY_EMBEDDING_CACHE_SIZE,
+    ttl_seconds=QUERY_EMBEDDING_CACHE_TTL or None,
+)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text for cache keys (unicode NFKC, whitespace, case)."""
+    query = unicodedata.normalize('NFKC', query)
+    return _WHITESPACE_RE.sub(' ', query).strip().casefold()
+
+
+def get_cached_query_embedding(
+    model_key: str,
+    query: str,
+    embed_fn: Callable[[str], Optional[Sequence[float]]],
+) -> Optional[np.ndarray]:
+    """
+    Get the embedding for a query, computing it with embed_fn on a miss.
+
+    Blocking on a miss - call via run_in_threadpool from async handlers.
+
+    Args:
+        model_key: Embedding model the vector belongs to
+        query: Raw query text (passed to embed_fn unchanged)
+        embed_fn: Computes one embedding for a query; may return None/empty
+
+    Returns:
+        Read-only float32 embedding, or None if embed_fn produced nothing
+    """
+    cached = lookup_query_embedding(model_key, query)
+    if cached is not None:
+        return cached
+    return store_query_embedding(model_key, query, embed_fn(query))
+
+
+def lookup_query_embedding(model_key: str, query: str) -> Optional[np.ndarray]:
+    """Return the cached embedding for a query, or None (counts a hit/miss)."""
+    cached = _query_embedding_cache.get((model_key, normalize_query(query)))
+    CACHE_EVENTS.inc(cache='query_embedding', outcome='miss' if cached is None else 'hit')
+    return cached
+
+
+def store_query_embedding(model_key: str, query: str,
+                          embedding: Optional[Sequence[float]]) -> Optional[np.ndarray]:
+    """
+    Cache an embedding computed elsewhere (e.g. by the async micro-batcher).
+
+    Returns:
+        The read-only float32 array that was cached, or None for empty input
+    """
+    if embedding is None or len(embedding) == 0:
+        return None
+    arr = np.asarray(embedding, dtype=np.float32)
+    arr.setflags(write=False)
+    _query_embedding_cache.set((model_key, normalize_query(query)), arr)
+    return arr
+
+
+def clear_query_embedding_cache() -> None:
+    """Drop all cached query embeddings (e.g. after an embedding model switch)."""
+    _query_embedding_cache.clear()
+    logger.debug("Query embedding cache cleared")
+
+
+def get_query_embedding_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and size for /health."""
+    return _query_embedding_cache.stats()
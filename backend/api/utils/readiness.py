@@ -0,0 +1,212 @@
+"""
+Readiness State - cheap /livez, /readyz and /health probes
+
+/health used to open a database connection and run
+generate_embeddings(["health check"]) on every probe. Render and Docker poll
+it constantly, so probes burned CPU, queued behind real embedding work on
+the model lock, and failed exactly when the service was busiest.
+
+Probes now only read state that is maintained elsewhere:
+- Model: set when the startup warmup (or any real encode) succeeds
+- Database: a background prober runs SELECT 1 every READYZ_DB_PING_SECONDS
+  and remembers the last success
+- Pool: saturation from the shared pool's counters
+
+Ready means the model isn't still loading, the last successful DB ping is at
+most READYZ_DB_MAX_AGE_SECONDS old, and pool saturation is below
+READYZ_MAX_POOL_SATURATION.
+
+Environment variables:
+- READYZ_DB_PING_SECONDS: Background DB ping interval (default: 10)
+- READYZ_DB_PING_TIMEOUT: Pool checkout / statement timeout for the ping (default: 2)
+- READYZ_DB_MAX_AGE_SECONDS: Oldest acceptable successful ping (default: 30)
+- READYZ_MAX_POOL_SATURATION: Pool in_use / max_size at which the instance is not ready (default: 1.0)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+READYZ_DB_PING_SECONDS = float(os.getenv('READYZ_DB_PING_SECONDS', '10'))
+READYZ_DB_PING_TIMEOUT = float(os.getenv('READYZ_DB_PING_TIMEOUT', '2'))
+READYZ_DB_MAX_AGE_SECONDS = float(os.getenv('READYZ_DB_MAX_AGE_SECONDS', '30'))
+READYZ_MAX_POOL_SATURATION = float(os.getenv('READYZ_MAX_POOL_SATURATION', '1.0'))
+
+# Model states; only 'loading' blocks readiness. 'lazy' (SKIP_WARMUP) and
+# 'failed' (warmup error) load on the first request, as before.
+MODEL_LOADING = 'loading'
+MODEL_LOADED = 'loaded'
+MODEL_LAZY = 'lazy'
+MODEL_FAILED = 'failed'
+
+_model_state = MODEL_LOADING
+
+
+def set_model_state(state: str) -> None:
+    """Record the embedding model state (startup warmup)."""
+    global _model_state
+    _model_state = state
+
+
+def mark_model_loaded() -> None:
+    """Called after a successful encode; a plain flag write, safe on the hot path."""
+    global _model_state
+    if _model_state != MODEL_LOADED:
+        _model_state = MODEL_LOADED
+
+
+def get_model_state() -> str:
+    return _model_state
+
+
+# =============================================================================
+# Database Prober
+# =============================================================================
+
+class DatabaseProber:
+    """Pings the database in the background and remembers the last success."""
+
+    def __init__(self, connect_fn: Callable[[], Any],
+                 interval_seconds: float = READYZ_DB_PING_SECONDS):
+        """
+        Args:
+            connect_fn: Returns a DB connection (close() releases it)
+            interval_seconds: Time between pings
+        """
+        self._connect_fn = connect_fn
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._last_ok: Optional[float] = None  # monotonic
+        self._last_latency_ms: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._consecutive_failures = 0
+        self._pings = 0
+
+    def ping(self) -> bool:
+        """Run one SELECT 1. Blocking; never raises."""
+        t_start = time.perf_counter()
+        try:
+            conn = self._connect_fn()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SET LOCAL statement_timeout = %s", [int(READYZ_DB_PING_TIMEOUT * 1000)])
+                    cur.execute("SELECT 1")
+                    cur.fetchone()
+                conn.rollback()
+            finally:
+                conn.close()
+        except Exception as e:
+            with self._lock:
+                self._pings += 1
+                self._consecutive_failures += 1
+                self._last_error = str(e)[:200]
+            if self._consecutive_failures == 1:
+                logger.warning(f"Database readiness ping failed: {e}")
+            return False
+
+        with self._lock:
+            if self._consecutive_failures:
+                logger.info(f"Database readiness ping recovered after {self._consecutive_failures} failure(s)")
+            self._pings += 1
+            self._consecutive_failures = 0
+            self._last_ok = time.monotonic()
+            self._last_latency_ms = (time.perf_counter() - t_start) * 1000
+        return True
+
+    def last_ok_age(self) -> Optional[float]:
+        """Seconds since the last successful ping, or None if there was none."""
+        with self._lock:
+            return None if self._last_ok is None else time.monotonic() - self._last_ok
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.to_thread(self.ping)
+            await asyncio.sleep(self.interval_seconds)
+
+    async def start(self) -> None:
+        """Start the background prober (first ping runs immediately)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        age = self.last_ok_age()
+        with self._lock:
+            return {
+                "running": self._task is not None and not self._task.done(),
+                "last_ok_age_seconds": None if age is None else round(age, 1),
+                "last_latency_ms": None if self._last_latency_ms is None else round(self._last_latency_ms, 1),
+                "consecutive_failures": self._consecutive_failures,
+                "last_error": self._last_error,
+                "pings": self._pings,
+            }
+
+
+def _default_connect():
+    from .db_pool import get_db_pool
+    return get_db_pool().getconn(timeout=READYZ_DB_PING_TIMEOUT)
+
+
+_db_prober = DatabaseProber(_default_connect)
+
+
+def get_db_prober() -> DatabaseProber:
+    """Get the process-wide database prober."""
+    return _db_prober
+
+
+# =============================================================================
+# Readiness
+# =============================================================================
+
+def check_readiness(pool_stats: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Evaluate readiness from cached state only (no I/O).
+
+    Args:
+        pool_stats: get_pool_stats() snapshot
+
+    Returns:
+        Dict with 'ready' and per-check details
+    """
+    model_state = get_model_state()
+    model_ok = model_state != MODEL_LOADING
+
+    db_age = _db_prober.last_ok_age()
+    db_ok = db_age is not None and db_age <= READYZ_DB_MAX_AGE_SECONDS
+
+    saturation = pool_stats.get("saturation", 0.0) if pool_stats.get("initialized") else None
+    pool_ok = saturation is not None and saturation < READYZ_MAX_POOL_SATURATION
+
+    return {
+        "ready": model_ok and db_ok and pool_ok,
+        "checks": {
+            "model": {"ok": model_ok, "state": model_state},
+            "database": {
+                "ok": db_ok,
+                "last_ok_age_seconds": None if db_age is None else round(db_age, 1),
+                "max_age_seconds": READYZ_DB_MAX_AGE_SECONDS,
+            },
+            "pool": {
+                "ok": pool_ok,
+                "saturation": saturation,
+                "max_saturation": READYZ_MAX_POOL_SATURATION,
+            },
+        },
+    }
@@ -17,6 +17,7 @@ Usage:
     logger.info("Processing request", extra=log_context())
 """
 
+import time
 import uuid
 import logging
 import contextvars
@@ -26,6 +27,8 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
+from .metrics import HTTP_REQUEST_DURATION
+
 # Context variables for request-scoped values
 request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar('request_id', default='')
 session_id_var: contextvars.ContextVar[str] = contextvars.ContextVar('session_id', default='')
@@ -83,6 +86,7 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
     - Extracts session ID from X-Session-ID header (if provided)
     - Stores both in context variables for logging
     - Adds X-Request-ID to response headers
+    - Records http_request_duration_seconds with the request ID as exemplar
     
     Usage:
         app.add_middleware(RequestIDMiddleware)
@@ -103,15 +107,29 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         request_id_token = request_id_var.set(request_id)
         session_id_token = session_id_var.set(session_id)
         
+        t_start = time.perf_counter()
+        status = 500
         try:
             # Process request
             response = await call_next(request)
+            status = response.status_code
             
             # Add request ID to response headers
             response.headers['X-Request-ID'] = request_id
             
             return response
         finally:
+            # Route template, not the raw path, to keep label cardinality bounded;
+            # the request ID rides along as the bucket exemplar
+            route = request.scope.get('route')
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - t_start,
+                exemplar=request_id,
+                method=request.method,
+                route=getattr(route, 'path', 'unmatched'),
+                status=str(status),
+            )
+            
             # Reset context variables
             request_id_var.reset(request_id_token)
             session_id_var.reset(session_id_token)
@@ -0,0 +1,85 @@
+"""
+Single-Flight Request Coalescing
+
+When a question trends, dozens of identical /api/answer requests arrive
+within seconds and each one used to run embedding, vector search and a full
+LLM completion. A SingleFlight group runs one computation per key at a time;
+concurrent callers with the same key await that computation and share its
+result (or its exception). Nothing is cached once the computation finishes,
+so sequential requests behave exactly as before.
+
+The computation runs as its own task, so a disconnecting first caller does
+not cancel it for the others.
+
+Environment variables:
+- SINGLE_FLIGHT_ENABLED: Coalesce identical in-flight requests (default: true)
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SINGLE_FLIGHT_ENABLED = os.getenv('SINGLE_FLIGHT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+
+class SingleFlight:
+    """Deduplicates concurrent async calls by key."""
+
+    def __init__(self, name: str, enabled: bool = SINGLE_FLIGHT_ENABLED):
+        self.name = name
+        self.enabled = enabled
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._leaders = 0
+        self._shared = 0
+        self._max_waiters = 0
+        self._waiters: Dict[Hashable, int] = {}
+
+    async def do(self, key: Optional[Hashable], fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run fn() unless an identical call is in flight, then share its result.
+
+        Args:
+            key: Identity of the call; None bypasses coalescing
+            fn: Coroutine factory computing the result
+
+        Returns:
+            Tuple of (result, True if another caller's computation was shared)
+        """
+        if not self.enabled or key is None:
+            return await fn(), False
+
+        task = self._inflight.get(key)
+        shared = task is not None
+        if shared:
+            self._shared += 1
+            self._waiters[key] = self._waiters.get(key, 1) + 1
+            self._max_waiters = max(self._max_waiters, self._waiters[key])
+        else:
+            self._leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self._waiters[key] = 1
+            task.add_done_callback(lambda _t, key=key: self._forget(key, _t))
+
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._waiters.pop(key, None)
+        # Mark the exception retrieved in case every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Coalescing counters for /health."""
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._inflight),
+            "leaders": self._leaders,
+            "shared": self._shared,
+            "max_waiters": self._max_waiters,
+        }
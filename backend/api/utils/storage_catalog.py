@@ -0,0 +1,232 @@
+"""
+Storage Catalog - cached existence and size of per-model embedding tables
+
+semantic_search_with_fallback used to check information_schema.tables and run
+`SELECT COUNT(*) FROM segment_embeddings_{dim} WHERE model_key = %s` before
+every vector search; on a large table the COUNT alone cost more than the ANN
+query itself.
+
+This module keeps one in-process entry per model key, built from
+embedding_storage.get_storage_status (tables from resolve_tables_for_model,
+row counts approximated from pg_class.reltuples). The search path only reads
+the catalog, so the vector query (with its ANN settings prepended) is the
+only round trip it makes.
+
+Freshness:
+- A background task refreshes every known model every
+  STORAGE_CATALOG_REFRESH_SECONDS (picks up ingestion in other processes)
+- invalidate_storage_catalog() drops entries after in-process ingestion; the
+  next lookup rebuilds them on a separate pooled connection
+
+Environment variables:
+- STORAGE_CATALOG_REFRESH_SECONDS: Background refresh interval (default: 60)
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+STORAGE_CATALOG_REFRESH_SECONDS = float(os.getenv('STORAGE_CATALOG_REFRESH_SECONDS', '60'))
+
+
+@dataclass(frozen=True)
+class StorageCatalogEntry:
+    """Storage state for one embedding model."""
+    model_key: str
+    segment_table: str
+    segment_table_exists: bool
+    segment_row_count: int
+    answer_cache_table: str
+    answer_cache_table_exists: bool
+    answer_cache_row_count: int
+    refreshed_at: float
+
+    @property
+    def has_segment_embeddings(self) -> bool:
+        return self.segment_table_exists and self.segment_row_count > 0
+
+
+class StorageCatalog:
+    """
+    Thread-safe cache of StorageCatalogEntry by model key.
+
+    Args:
+        connect_fn: Returns a DB connection (close() releases it)
+        refresh_seconds: Background refresh interval
+    """
+
+    def __init__(self, connect_fn: Callable[[], Any],
+                 refresh_seconds: float = STORAGE_CATALOG_REFRESH_SECONDS):
+        self._connect_fn = connect_fn
+        self.refresh_seconds = refresh_seconds
+        self._entries: Dict[str, StorageCatalogEntry] = {}
+        self._lock = threading.Lock()
+        # Serializes rebuilds so concurrent misses don't stampede the DB
+        self._build_lock = threading.Lock()
+        # Bumped by invalidate() so an in-flight refresh can't restore old state
+        self._generation = 0
+        self._task: Optional[asyncio.Task] = None
+        self._hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._errors = 0
+
+    def _build(self, model_key: str) -> StorageCatalogEntry:
+        from scripts.embedding_storage import get_storage_status
+
+        conn = self._connect_fn()
+        try:
+            status = get_storage_status(conn, model_key, approximate=True)
+        finally:
+            conn.close()
+        self._refreshes += 1
+        return StorageCatalogEntry(
+            model_key=model_key,
+            segment_table=status['segment_table'],
+            segment_table_exists=status['segment_table_exists'],
+            segment_row_count=status['segment_row_count'],
+            answer_cache_table=status['answer_cache_table'],
+            answer_cache_table_exists=status['answer_cache_table_exists'],
+            answer_cache_row_count=status['answer_cache_row_count'],
+            refreshed_at=time.time(),
+        )
+
+    def get(self, model_key: str) -> Optional[StorageCatalogEntry]:
+        """
+        Get the catalog entry for a model, building it on a miss.
+
+        Returns:
+            StorageCatalogEntry, or None if it could not be built
+        """
+        with self._lock:
+            entry = self._entries.get(model_key)
+            if entry is not None:
+                self._hits += 1
+                return entry
+            self._misses += 1
+
+        with self._build_lock:
+            # Another thread may have built it while we waited
+            with self._lock:
+                entry = self._entries.get(model_key)
+            if entry is not None:
+                return entry
+            try:
+                entry = self._build(model_key)
+            except Exception as e:
+                self._errors += 1
+                logger.warning(f"Storage catalog build failed for {model_key}: {e}")
+                return None
+            with self._lock:
+                self._entries[model_key] = entry
+            logger.info(
+                f"storage_catalog: model={model_key} table={entry.segment_table} "
+                f"exists={entry.segment_table_exists} rows~{entry.segment_row_count}"
+            )
+            return entry
+
+    def refresh(self, model_keys: Optional[Iterable[str]] = None) -> None:
+        """
+        Rebuild entries (default: every known model). Blocking.
+
+        Entries that fail to rebuild keep their previous value.
+        """
+        with self._lock:
+            keys = list(model_keys) if model_keys is not None else list(self._entries)
+        for model_key in keys:
+            with self._build_lock:
+                generation = self._generation
+                try:
+                    entry = self._build(model_key)
+                except Exception as e:
+                    self._errors += 1
+                    logger.warning(f"Storage catalog refresh failed for {model_key}: {e}")
+                    continue
+                with self._lock:
+                    if generation == self._generation:
+                        self._entries[model_key] = entry
+
+    def invalidate(self, model_key: Optional[str] = None) -> None:
+        """Drop one entry, or all of them (call after ingestion)."""
+        with self._lock:
+            self._generation += 1
+            if model_key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(model_key, None)
+        logger.debug(f"Storage catalog invalidated: {model_key or 'all'}")
+
+    async def _refresh_loop(self, initial_models: Iterable[str]) -> None:
+        models = list(initial_models)
+        if models:
+            await asyncio.to_thread(self.refresh, models)
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            await asyncio.to_thread(self.refresh)
+
+    async def start(self, initial_models: Iterable[str] = ()) -> None:
+        """Start the background refresh task, warming initial_models first."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._refresh_loop(initial_models))
+
+    async def stop(self) -> None:
+        """Cancel the background refresh task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Catalog contents and counters for /health."""
+        with self._lock:
+            entries = {
+                key: {
+                    "segment_table": e.segment_table,
+                    "exists": e.segment_table_exists,
+                    "rows_estimate": e.segment_row_count,
+                    "age_seconds": round(time.time() - e.refreshed_at, 1),
+                }
+                for key, e in self._entries.items()
+            }
+        return {
+            "refresh_seconds": self.refresh_seconds,
+            "running": self._task is not None and not self._task.done(),
+            "hits": self._hits,
+            "misses": self._misses,
+            "refreshes": self._refreshes,
+            "errors": self._errors,
+            "entries": entries,
+        }
+
+
+# =============================================================================
+# Process-wide Catalog
+# =============================================================================
+
+def _default_connect():
+    from .db_pool import get_db_connection
+    return get_db_connection()
+
+
+_storage_catalog = StorageCatalog(_default_connect)
+
+
+def get_storage_catalog() -> StorageCatalog:
+    """Get the process-wide storage catalog."""
+    return _storage_catalog
+
+
+def invalidate_storage_catalog(model_key: Optional[str] = None) -> None:
+    """Invalidate the process-wide catalog (call after ingestion)."""
+    _storage_catalog.invalidate(model_key)
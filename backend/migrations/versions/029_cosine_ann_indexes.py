@@ -0,0 +1,174 @@
+"""Cosine-opclass ANN indexes for all embedding tables + per-query ANN settings
+
+Revision ID: 029
+Revises: 028
+Create Date: 2026-10-16
+
+Every search query orders by the cosine distance operator (<=>), which can
+only use pgvector indexes built with vector_cosine_ops. Migrations 001/003
+created segments_embedding_idx with vector_l2_ops; databases that never ran
+015/016 still carry that index, so search silently falls back to exact scans
+while every insert pays to maintain a useless index.
+
+This migration:
+- Drops ivfflat/hnsw indexes on any `embedding VECTOR(N)` column whose opclass
+  is not vector_cosine_ops (segments, segment_embeddings_{dim},
+  answer_cache_embeddings*)
+- Creates a cosine index where none exists, choosing HNSW when its graph fits
+  in maintenance_work_mem and IVFFlat (lists sized from row count) otherwise
+- Adds ivfflat_probes / hnsw_ef_search to search_config so recall can be
+  tuned from the tuning dashboard and applied per query
+
+Indexes can be re-planned later without a migration:
+    python backend/scripts/common/db_optimization.py --ensure-vector-indexes
+    python backend/scripts/common/db_optimization.py --explain-vector-search
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+import math
+
+
+# revision identifiers, used by Alembic.
+revision = '029'
+down_revision = '028'
+branch_labels = None
+depends_on = None
+
+COSINE_OPCLASS = 'vector_cosine_ops'
+PGVECTOR_MAX_INDEX_DIMENSIONS = 2000
+
+
+# -----------------------------------------------------------------------------
+# Frozen copy of scripts/embedding_storage.parse_pg_memory / plan_ann_index
+# (method='auto') as of this revision. Deliberately not imported: a migration
+# must build the same indexes whenever it is replayed, even after the live
+# planner is retuned, and alembic's env.py doesn't put backend/scripts on
+# sys.path. Do not update this copy; re-plan existing indexes with
+# `db_optimization.py --ensure-vector-indexes --rebuild` instead.
+# -----------------------------------------------------------------------------
+
+def _parse_memory_bytes(value: str) -> int:
+    units = {'kB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'TB': 1024 ** 4, 'B': 1}
+    value = value.strip()
+    for suffix, multiplier in units.items():
+        if value.endswith(suffix):
+            return int(float(value[:-len(suffix)].strip()) * multiplier)
+    return int(value) * 1024
+
+
+def _hnsw_graph_bytes(row_count: int, dimensions: int, m: int) -> int:
+    return row_count * (dimensions * 4 + 2 * m * 8 + m * 8 // 4 + 64)
+
+
+def _plan_index(row_count: int, dimensions: int, memory_bytes: int):
+    budget = int(memory_bytes * 0.9)
+    if _hnsw_graph_bytes(row_count, dimensions, 16) <= budget:
+        m = 24 if row_count >= 1_000_000 and _hnsw_graph_bytes(row_count, dimensions, 24) <= budget else 16
+        ef_construction = 128 if _hnsw_graph_bytes(row_count, dimensions, m) * 2 <= budget else 64
+        return 'hnsw', f"m = {m}, ef_construction = {ef_construction}"
+
+    lists = row_count // 1000 if row_count <= 1_000_000 else int(math.sqrt(row_count))
+    memory_lists = budget // ((dimensions * 4 + 8) * 51)
+    lists = max(1, min(max(lists, 10), memory_lists, 32768))
+    return 'ivfflat', f"lists = {lists}"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    print("=" * 60)
+    print("🔧 Migration 029: Cosine ANN indexes for embedding tables")
+    print("=" * 60)
+
+    mem_str = conn.execute(text("SHOW maintenance_work_mem")).scalar() or "64MB"
+    memory_bytes = _parse_memory_bytes(mem_str)
+    print(f"📊 maintenance_work_mem: {mem_str}")
+
+    vector_columns = conn.execute(text("""
+        SELECT c.relname, a.atttypmod
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_type t ON t.oid = a.atttypid
+        WHERE n.nspname = 'public'
+          AND c.relkind = 'r'
+          AND t.typname = 'vector'
+          AND a.attname = 'embedding'
+          AND NOT a.attisdropped
+          AND a.atttypmod > 0
+        ORDER BY c.relname
+    """)).fetchall()
+
+    for table_name, dimensions in vector_columns:
+        print(f"\n📦 {table_name} (VECTOR({dimensions}))")
+
+        indexes = conn.execute(text("""
+            SELECT ic.relname, am.amname, opc.opcname
+            FROM pg_index i
+            JOIN pg_class ic ON ic.oid = i.indexrelid
+            JOIN pg_am am ON am.oid = ic.relam
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+            JOIN pg_opclass opc ON opc.oid = i.indclass[0]
+            WHERE i.indrelid = CAST(:table_name AS regclass)
+              AND a.attname = 'embedding'
+              AND am.amname IN ('ivfflat', 'hnsw')
+        """).bindparams(table_name=table_name)).fetchall()
+
+        has_cosine = False
+        for index_name, method, opclass in indexes:
+            if opclass == COSINE_OPCLASS:
+                has_cosine = True
+                print(f"   ✅ Keeping {method} index {index_name} ({opclass})")
+            else:
+                print(f"   🗑️  Dropping {method} index {index_name} ({opclass} is unusable for <=> queries)")
+                conn.execute(text(f'DROP INDEX IF EXISTS "{index_name}"'))
+
+        if has_cosine:
+            continue
+
+        if dimensions > PGVECTOR_MAX_INDEX_DIMENSIONS:
+            print(f"   ⚠️  {dimensions} dims exceeds pgvector's index limit, leaving unindexed")
+            continue
+
+        row_count = conn.execute(text(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)"
+        ).bindparams(table_name=table_name)).scalar() or 0
+        if row_count <= 0:
+            row_count = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar() or 0
+
+        method, with_clause = _plan_index(row_count, dimensions, memory_bytes)
+        index_name = f"idx_{table_name}_embedding_{method}"
+        print(f"   🔨 Creating {method} index {index_name} WITH ({with_clause}) for {row_count:,} rows")
+        conn.execute(text(f"""
+            CREATE INDEX IF NOT EXISTS {index_name}
+            ON {table_name}
+            USING {method} (embedding {COSINE_OPCLASS})
+            WITH ({with_clause})
+        """))
+
+    # Per-query recall settings, editable from the tuning dashboard
+    inspector = sa.inspect(conn)
+    if 'search_config' in inspector.get_table_names():
+        existing = {col['name'] for col in inspector.get_columns('search_config')}
+        if 'ivfflat_probes' not in existing:
+            op.add_column('search_config', sa.Column('ivfflat_probes', sa.Integer(), nullable=False, server_default='10'))
+        if 'hnsw_ef_search' not in existing:
+            op.add_column('search_config', sa.Column('hnsw_ef_search', sa.Integer(), nullable=False, server_default='100'))
+        print("\n✅ search_config has ivfflat_probes / hnsw_ef_search")
+
+    print("\n✅ Migration 029 complete")
+
+
+def downgrade() -> None:
+    """Remove per-query ANN settings. Cosine indexes are kept (valid for every revision)."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'search_config' in inspector.get_table_names():
+        existing = {col['name'] for col in inspector.get_columns('search_config')}
+        if 'hnsw_ef_search' in existing:
+            op.drop_column('search_config', 'hnsw_ef_search')
+        if 'ivfflat_probes' in existing:
+            op.drop_column('search_config', 'ivfflat_probes')
+
+    print("[OK] Removed ANN settings from search_config (cosine indexes left in place)")
@@ -0,0 +1,87 @@
+"""Full-text index on segments + hybrid search settings
+
+Revision ID: 030
+Revises: 029
+Create Date: 2026-10-16
+
+The /answer/chunks text fallback used `seg.text ILIKE '%query%'`: a full
+table scan that only matches when the whole question appears verbatim.
+
+This migration:
+- Adds segments.text_tsv, a stored generated tsvector (english config), so
+  ingestion needs no changes and the column never drifts from text
+- Indexes it with GIN for the lexical half of hybrid search
+- Adds hybrid_enabled / hybrid_vector_weight / hybrid_lexical_weight / rrf_k
+  to search_config so reciprocal-rank fusion can be tuned from the dashboard
+
+Adding a stored generated column rewrites segments once; expect the upgrade
+to take a while on large databases.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '030'
+down_revision = '029'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    print("=" * 60)
+    print("🔧 Migration 030: Full-text index on segments")
+    print("=" * 60)
+
+    existing = {col['name'] for col in inspector.get_columns('segments')}
+    if 'text_tsv' not in existing:
+        print("🔨 Adding segments.text_tsv (generated tsvector)...")
+        conn.execute(text("""
+            ALTER TABLE segments
+            ADD COLUMN text_tsv tsvector
+            GENERATED ALWAYS AS (to_tsvector('english', coalesce(text, ''))) STORED
+        """))
+    else:
+        print("✅ segments.text_tsv already exists")
+
+    print("🔨 Creating GIN index idx_segments_text_tsv...")
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_segments_text_tsv
+        ON segments USING gin (text_tsv)
+    """))
+    conn.execute(text("ANALYZE segments"))
+
+    # Fusion settings, editable from the tuning dashboard
+    if 'search_config' in inspector.get_table_names():
+        existing = {col['name'] for col in inspector.get_columns('search_config')}
+        if 'hybrid_enabled' not in existing:
+            op.add_column('search_config', sa.Column('hybrid_enabled', sa.Boolean(), nullable=False, server_default='false'))
+        if 'hybrid_vector_weight' not in existing:
+            op.add_column('search_config', sa.Column('hybrid_vector_weight', sa.Float(), nullable=False, server_default='1.0'))
+        if 'hybrid_lexical_weight' not in existing:
+            op.add_column('search_config', sa.Column('hybrid_lexical_weight', sa.Float(), nullable=False, server_default='0.5'))
+        if 'rrf_k' not in existing:
+            op.add_column('search_config', sa.Column('rrf_k', sa.Integer(), nullable=False, server_default='60'))
+        print("✅ search_config has hybrid search settings")
+
+    print("\n✅ Migration 030 complete")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if 'search_config' in inspector.get_table_names():
+        existing = {col['name'] for col in inspector.get_columns('search_config')}
+        for column in ('rrf_k', 'hybrid_lexical_weight', 'hybrid_vector_weight', 'hybrid_enabled'):
+            if column in existing:
+                op.drop_column('search_config', column)
+
+    conn.execute(text("DROP INDEX IF EXISTS idx_segments_text_tsv"))
+    conn.execute(text("ALTER TABLE segments DROP COLUMN IF EXISTS text_tsv"))
+
+    print("[OK] Removed segments.text_tsv and hybrid search settings")
@@ -0,0 +1,63 @@
+"""Durable deferred-embedding queue
+
+Revision ID: 031
+Revises: 030
+Create Date: 2026-10-16
+
+`ingest_youtube.py --embed-later` skipped embedding but had nowhere to put
+the work, so those segments were never embedded.
+
+This migration adds embedding_queue: one row per (segment_id, model_key)
+still waiting for an embedding. Ingestion enqueues a video's segments in the
+same transaction that inserts them; scripts/embedding_worker.py claims
+batches with FOR UPDATE SKIP LOCKED, writes the embeddings and deletes the
+rows in one transaction, so several workers can drain the queue and a
+crashed worker's claims simply become visible again.
+
+attempts / last_error let a worker park entries whose embedding keeps
+failing instead of retrying them forever.
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = '031'
+down_revision = '030'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    print("=" * 60)
+    print("🔧 Migration 031: Deferred-embedding queue")
+    print("=" * 60)
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS embedding_queue (
+            segment_id  INTEGER NOT NULL REFERENCES segments(id) ON DELETE CASCADE,
+            model_key   TEXT NOT NULL,
+            enqueued_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            attempts    INTEGER NOT NULL DEFAULT 0,
+            last_error  TEXT,
+            PRIMARY KEY (segment_id, model_key)
+        )
+    """))
+
+    # Workers claim the oldest entries for their model first
+    print("🔨 Creating index idx_embedding_queue_model_enqueued...")
+    conn.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_embedding_queue_model_enqueued
+        ON embedding_queue (model_key, enqueued_at)
+    """))
+
+    print("\n✅ Migration 031 complete")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(text("DROP TABLE IF EXISTS embedding_queue"))
+
+    print("[OK] Removed embedding_queue")
@@ -28,6 +28,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scripts.common.list_videos_api import YouTubeAPILister
 from scripts.common.list_videos_yt_dlp import YtDlpVideoLister, VideoInfo
 from scripts.common.database_upsert import DatabaseUpserter
+from scripts.common.segments_database import resolve_processed_videos
 from scripts.ingest_youtube_enhanced import EnhancedYouTubeIngester, IngestionConfig
 
 # Load environment variables
@@ -160,13 +161,15 @@ class BatchIngestionManager:
         # Skip videos that were already successfully processed
         videos_to_process = [v for v in videos if v.video_id not in processed]
         
-        # Check database for completed videos
-        for video in list(videos_to_process):
-            state = self.db.get_ingest_state(video.video_id)
-            if state and state['status'] in ('done', 'upserted'):
-                videos_to_process.remove(video)
-                if video.video_id not in processed:
-                    processed.append(video.video_id)
+        # Check database for completed videos (one query for the whole list)
+        processed_videos = resolve_processed_videos(
+            self.db.get_connection(), [v.video_id for v in videos_to_process]
+        )
+        done = [v for v in videos_to_process if processed_videos.is_processed(v.video_id)]
+        videos_to_process = [v for v in videos_to_process if not processed_videos.is_processed(v.video_id)]
+        for video in done:
+            if video.video_id not in processed:
+                processed.append(video.video_id)
         
         # Handle failed videos based on retry policy
         if self.config.retry_failed:
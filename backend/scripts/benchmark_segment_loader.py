@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Segment Loader Benchmark
+
+Compares the two SegmentsDatabase bulk loaders on synthetic videos:
+- values: execute_values upsert + per-segment dual-write pass (default)
+- copy:   binary COPY into a staging table + one merge statement
+
+Each loader runs two passes over the same data: a fresh insert, then a
+re-ingest (every row hits ON CONFLICT DO UPDATE, as in a backfill). The
+synthetic sources (source_type 'benchmark') are deleted afterwards; their
+segments and embeddings cascade.
+
+Usage:
+    # 20 videos x 400 segments with the active model's dimensions
+    python -m scripts.benchmark_segment_loader
+
+    # Bigger run, copy loader only
+    python -m scripts.benchmark_segment_loader --videos 100 --segments 800 --loaders copy
+
+Environment:
+    DATABASE_URL: PostgreSQL connection string (use a scratch database)
+"""
+
+import os
+import sys
+import time
+import uuid
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv()
+
+# Configure logging (loader INFO lines would swamp the report)
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+def _active_dimensions() -> int:
+    try:
+        from api.embedding_config import get_active_model_key, get_model_dimensions
+        return get_model_dimensions(get_active_model_key())
+    except ImportError:
+        return int(os.getenv('EMBEDDING_DIMENSIONS', '384'))
+
+
+def _synthetic_segments(count: int, dims: int, rng: np.random.Generator):
+    embeddings = rng.standard_normal((count, dims), dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return [
+        {
+            'start': i * 5.0,
+            'end': i * 5.0 + 5.0,
+            'text': f"benchmark segment {i} about carnivore diet and metabolic health",
+            'speaker_label': 'Chaffee',
+            'speaker_confidence': 0.95,
+            'avg_logprob': -0.2,
+            'compression_ratio': 1.4,
+            'no_speech_prob': 0.01,
+            'temperature_used': 0.0,
+            'embedding': embeddings[i],
+        }
+        for i in range(count)
+    ]
+
+
+def _run_pass(db, video_ids, segments) -> float:
+    t_start = time.perf_counter()
+    for video_id in video_ids:
+        with db.video_transaction(video_id):
+            db.upsert_source(video_id, f"Benchmark {video_id}", source_type='benchmark')
+            db.batch_insert_segments(segments, video_id)
+    return time.perf_counter() - t_start
+
+
+def _cleanup(db, run_id: str) -> int:
+    with db.pooled_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "DELETE FROM sources WHERE source_type = 'benchmark' AND source_id LIKE %s",
+                [f"bench-%-{run_id}"],
+            )
+            deleted = cur.rowcount
+        conn.commit()
+    return deleted
+
+
+def main():
+    from scripts.common.segments_database import BULK_LOADERS, SegmentsDatabase
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark the values vs COPY segment loaders',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--videos', type=int, default=20, help='Synthetic videos per pass (default: 20)')
+    parser.add_argument('--segments', type=int, default=400, help='Segments per video (default: 400)')
+    parser.add_argument('--dims', type=int, default=None, help='Embedding dimensions (default: active model)')
+    parser.add_argument('--loaders', default=','.join(BULK_LOADERS),
+                        help='Comma-separated loaders to run (default: values,copy)')
+    parser.add_argument('--keep', action='store_true', help='Keep the synthetic rows')
+    args = parser.parse_args()
+
+    db_url = os.getenv('DATABASE_URL')
+    if not db_url:
+        print("DATABASE_URL is not set")
+        return 1
+
+    dims = args.dims or _active_dimensions()
+    loaders = [name.strip() for name in args.loaders.split(',') if name.strip()]
+    segments = _synthetic_segments(args.segments, dims, np.random.default_rng(0))
+    run_id = uuid.uuid4().hex[:8]
+    total = args.videos * args.segments
+
+    print(f"Benchmark: {args.videos} videos x {args.segments} segments ({total} rows), {dims}-dim embeddings")
+    print(f"{'loader':<8} {'pass':<10} {'seconds':>9} {'segments/s':>11}")
+
+    results = {}
+    cleanup_db = None
+    try:
+        for loader in loaders:
+            db = SegmentsDatabase(db_url, pool_size=1, bulk_loader=loader)
+            cleanup_db = cleanup_db or db
+            video_ids = [f"bench-{loader}{i}-{run_id}" for i in range(args.videos)]
+            for pass_name in ('insert', 'reingest'):
+                seconds = _run_pass(db, video_ids, segments)
+                results[(loader, pass_name)] = seconds
+                print(f"{loader:<8} {pass_name:<10} {seconds:>9.2f} {total / seconds:>11.0f}")
+    finally:
+        if cleanup_db is not None and not args.keep:
+            print(f"Cleaned up {_cleanup(cleanup_db, run_id)} synthetic sources")
+
+    if ('values', 'insert') in results and ('copy', 'insert') in results:
+        for pass_name in ('insert', 'reingest'):
+            speedup = results[('values', pass_name)] / results[('copy', pass_name)]
+            print(f"copy vs values ({pass_name}): {speedup:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
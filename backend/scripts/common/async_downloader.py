@@ -15,6 +15,8 @@ from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor
 import time
 
+from .segments_database import ProcessedVideos, resolve_processed_videos
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -39,7 +41,8 @@ class AsyncAudioDownloader:
                  temp_dir: Optional[Path] = None,
                  db_connection=None,
                  skip_existing: bool = True,
-                 skip_members_only: bool = True):
+                 skip_members_only: bool = True,
+                 processed_videos: Optional[ProcessedVideos] = None):
         """
         Initialize async audio downloader
         
@@ -48,6 +51,8 @@ class AsyncAudioDownloader:
             max_concurrent_downloads: Maximum concurrent downloads
             storage_dir: Permanent storage directory (if None, uses temp)
             temp_dir: Temporary download directory
+            processed_videos: Skip map already resolved by the caller (else
+                resolved from db_connection in one query per batch)
         """
         self.yt_dlp_path = yt_dlp_path
         self.max_concurrent_downloads = max_concurrent_downloads
@@ -57,6 +62,7 @@ class AsyncAudioDownloader:
         self.db_connection = db_connection
         self.skip_existing = skip_existing
         self.skip_members_only = skip_members_only
+        self.processed_videos = processed_videos
         
         # Track downloads
         self.download_tasks: Dict[str, DownloadTask] = {}
@@ -74,21 +80,29 @@ class AsyncAudioDownloader:
         
         logger.info(f"AsyncAudioDownloader initialized: {max_concurrent_downloads} concurrent, storage: {storage_dir}")
     
-    def check_video_exists_in_db(self, video_id: str) -> bool:
-        """Check if video already exists in database"""
-        if not self.db_connection:
-            return False
+    def resolve_processed_videos(self, video_ids: List[str]) -> Optional[ProcessedVideos]:
+        """Resolve already-processed videos for a batch in one query (reuses a shared map)"""
+        known = self.processed_videos or ProcessedVideos()
+        missing = [v for v in video_ids if not known.covers(v)]
+        if not missing or not self.db_connection:
+            return self.processed_videos
         
         try:
-            with self.db_connection.cursor() as cur:
-                cur.execute(
-                    "SELECT 1 FROM sources WHERE source_id = %s LIMIT 1",
-                    (video_id,)
-                )
-                return cur.fetchone() is not None
+            self.processed_videos = known.merged(
+                resolve_processed_videos(self.db_connection, missing, source_type=None)
+            )
         except Exception as e:
-            logger.warning(f"DB check failed for {video_id}: {e}")
-            return False
+            logger.warning(f"Bulk DB check failed for {len(video_ids)} videos: {e}")
+            try:
+                self.db_connection.rollback()
+            except Exception:
+                pass
+        return self.processed_videos
+    
+    def check_video_exists_in_db(self, video_id: str) -> bool:
+        """Check if video is already processed in the database"""
+        processed = self.resolve_processed_videos([video_id])
+        return processed is not None and processed.is_processed(video_id)
     
     def check_audio_exists_locally(self, video_id: str) -> Optional[Path]:
         """Check if audio file already exists locally"""
@@ -159,6 +173,9 @@ class AsyncAudioDownloader:
         to_download = []
         already_exist = []
         
+        # One query for the whole list instead of one per video
+        self.resolve_processed_videos([v['video_id'] for v in video_list])
+        
         for video_info in video_list:
             video_id = video_info['video_id']
             
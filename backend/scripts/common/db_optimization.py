@@ -4,7 +4,7 @@ Database optimization utilities for large-scale ingestion.
 
 This module provides functions to optimize PostgreSQL for handling
 large-scale ingestion workloads, including:
-- Index maintenance
+- Index maintenance (including cosine pgvector ANN indexes)
 - Vacuum operations
 - Table statistics updates
 - Connection pooling
@@ -199,36 +199,64 @@ class DatabaseOptimizer:
             'index_stats': index_stats
         }
     
-    def create_pgvector_index(self, recreate: bool = False):
-        """Create or recreate pgvector index for similarity search"""
+    def _embedding_storage(self):
+        """Import the ANN index helpers (lives one level up in scripts/)"""
+        import sys
+        from pathlib import Path
+        backend_dir = Path(__file__).parent.parent.parent
+        if str(backend_dir) not in sys.path:
+            sys.path.insert(0, str(backend_dir))
+        from scripts import embedding_storage
+        return embedding_storage
+    
+    def _vector_tables(self, tables: Optional[List[str]] = None) -> List[tuple]:
+        """(table, dimensions) for the requested tables, or every embedding table"""
+        storage = self._embedding_storage()
+        columns = storage.get_vector_columns(self.get_connection())
+        if tables:
+            columns = [(table, dims) for table, dims in columns if table in tables]
+        return columns
+    
+    def ensure_vector_indexes(self, method: str = 'auto', rebuild: bool = False,
+                              tables: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Ensure every embedding table has a cosine-opclass ANN index.
+        
+        Drops indexes built with other opclasses (unusable by <=> queries) and
+        sizes new HNSW/IVFFlat indexes from row count and maintenance_work_mem.
+        """
+        storage = self._embedding_storage()
         conn = self.get_connection()
+        results = []
         
-        with conn.cursor() as cur:
-            if recreate:
-                logger.info("Dropping existing pgvector index...")
-                try:
-                    cur.execute("DROP INDEX IF EXISTS idx_chunks_embedding")
-                except Exception as e:
-                    logger.error(f"Error dropping index: {e}")
-            
-            logger.info("Creating pgvector index (this may take a while)...")
-            try:
-                # Create IVFFlat index for faster similarity search
-                # Lists parameter should be sqrt(row_count)
-                cur.execute("SELECT COUNT(*) FROM chunks")
-                row_count = cur.fetchone()[0]
-                lists = max(100, int(row_count ** 0.5))
-                
-                logger.info(f"Creating IVFFlat index with {lists} lists for {row_count} rows")
-                cur.execute(f"""
-                    CREATE INDEX IF NOT EXISTS idx_chunks_embedding 
-                    ON chunks USING ivfflat (embedding vector_cosine_ops) 
-                    WITH (lists = {lists})
-                """)
-                logger.info("pgvector index created successfully")
-            except Exception as e:
-                logger.error(f"Error creating pgvector index: {e}")
-                raise
+        for table, dims in self._vector_tables(tables):
+            logger.info(f"Checking vector index on {table} ({dims} dims)")
+            results.append(storage.ensure_cosine_ann_index(conn, table, dims, method=method, rebuild=rebuild))
+        
+        return results
+    
+    def explain_vector_search(self, tables: Optional[List[str]] = None, probes: Optional[int] = None,
+                              ef_search: Optional[int] = None, top_k: int = 10) -> List[Dict[str, Any]]:
+        """EXPLAIN a top-k cosine query per embedding table and report ANN index usage"""
+        storage = self._embedding_storage()
+        conn = self.get_connection()
+        results = []
+        
+        for table, dims in self._vector_tables(tables):
+            if dims > storage.PGVECTOR_MAX_INDEX_DIMENSIONS:
+                continue
+            result = storage.explain_ann_search(conn, table, dims, top_k=top_k,
+                                                probes=probes, ef_search=ef_search)
+            status = "ANN index" if result['uses_ann_index'] else "NO ANN INDEX"
+            logger.info(f"  {table}: {status} ({result['node_type']}, index={result['index_name']})")
+            results.append(result)
+        
+        return results
+    
+    def create_pgvector_index(self, recreate: bool = False):
+        """Create or recreate the cosine pgvector indexes for similarity search"""
+        logger.info("Ensuring cosine pgvector indexes (this may take a while)...")
+        return self.ensure_vector_indexes(rebuild=recreate)
 
 def main():
     """CLI for database optimization"""
@@ -238,7 +266,17 @@ def main():
     parser.add_argument('--vacuum-full', action='store_true', help='Run VACUUM FULL (locks tables)')
     parser.add_argument('--analyze', action='store_true', help='Update table statistics')
     parser.add_argument('--reindex', action='store_true', help='Rebuild indexes')
-    parser.add_argument('--rebuild-vector-index', action='store_true', help='Rebuild pgvector index')
+    parser.add_argument('--rebuild-vector-index', action='store_true', help='Rebuild pgvector indexes')
+    parser.add_argument('--ensure-vector-indexes', action='store_true',
+                        help='Replace non-cosine ANN indexes and create missing cosine indexes')
+    parser.add_argument('--vector-index-method', choices=['auto', 'hnsw', 'ivfflat'], default='auto',
+                        help='ANN index method (auto picks HNSW when the graph fits maintenance_work_mem)')
+    parser.add_argument('--vector-table', action='append', dest='vector_tables',
+                        help='Limit vector index operations to this table (repeatable)')
+    parser.add_argument('--explain-vector-search', action='store_true',
+                        help='Verify via EXPLAIN that top-k cosine queries use an ANN index')
+    parser.add_argument('--probes', type=int, help='ivfflat.probes to apply for --explain-vector-search')
+    parser.add_argument('--ef-search', type=int, help='hnsw.ef_search to apply for --explain-vector-search')
     parser.add_argument('--all', action='store_true', help='Run all optimization steps')
     
     args = parser.parse_args()
@@ -259,8 +297,20 @@ def main():
                 optimizer.analyze_tables()
             if args.reindex:
                 optimizer.reindex_tables()
-            if args.rebuild_vector_index:
-                optimizer.create_pgvector_index(recreate=True)
+            if args.rebuild_vector_index or args.ensure_vector_indexes:
+                optimizer.ensure_vector_indexes(
+                    method=args.vector_index_method,
+                    rebuild=args.rebuild_vector_index,
+                    tables=args.vector_tables,
+                )
+            if args.explain_vector_search:
+                logger.info("Vector search plans:")
+                results = optimizer.explain_vector_search(
+                    tables=args.vector_tables, probes=args.probes, ef_search=args.ef_search
+                )
+                if any(not r['uses_ann_index'] for r in results):
+                    logger.warning("Some embedding tables are not using an ANN index - "
+                                   "run with --ensure-vector-indexes")
         
         # Always show table sizes
         sizes = optimizer.get_table_sizes()
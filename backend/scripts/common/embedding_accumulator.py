@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Cross-video embedding batch accumulator for the Tier C (DB) workers.
+
+A video typically yields a few dozen optimized segments, so embedding each
+video on its own leaves the embedding model running far below its batch
+size. The DB workers share one accumulator instead: each finished video is
+added with the number of texts it will embed, and once the pending texts
+reach the target (or the oldest video has waited max_latency_s) one worker
+drains the whole batch, runs a single generate_embeddings call and inserts
+the videos one by one, each in its own transaction.
+
+The latency bound keeps segments from sitting unsearchable in memory when
+ASR output trickles in; drain() on shutdown flushes whatever is left.
+"""
+
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+
+class EmbeddingBatchAccumulator:
+    """Thread-safe buffer of per-video work items, flushed by text count or age"""
+
+    def __init__(self, target_texts: int, max_latency_s: float,
+                 clock: Callable[[], float] = time.monotonic):
+        if target_texts < 1:
+            raise ValueError(f"target_texts must be >= 1, got {target_texts}")
+        self.target_texts = target_texts
+        self.max_latency_s = max(0.0, max_latency_s)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._items: List[Any] = []
+        self._pending_texts = 0
+        self._oldest_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    @property
+    def pending_texts(self) -> int:
+        with self._lock:
+            return self._pending_texts
+
+    def add(self, item: Any, text_count: int) -> Optional[List[Any]]:
+        """
+        Add a video's work item.
+
+        Returns:
+            The drained batch if this item filled it (the caller flushes it),
+            otherwise None
+        """
+        with self._lock:
+            if not self._items:
+                self._oldest_at = self._clock()
+            self._items.append(item)
+            self._pending_texts += text_count
+            if self._pending_texts >= self.target_texts:
+                return self._drain_locked()
+            return None
+
+    def take_due(self) -> Optional[List[Any]]:
+        """Drain the batch if its oldest item has waited max_latency_s, else None"""
+        with self._lock:
+            if self._items and self._clock() - self._oldest_at >= self.max_latency_s:
+                return self._drain_locked()
+            return None
+
+    def seconds_until_due(self) -> Optional[float]:
+        """Time left before take_due() would flush (None when empty)"""
+        with self._lock:
+            if not self._items:
+                return None
+            return max(0.0, self.max_latency_s - (self._clock() - self._oldest_at))
+
+    def drain(self) -> List[Any]:
+        """Take everything pending regardless of size or age"""
+        with self._lock:
+            return self._drain_locked()
+
+    def _drain_locked(self) -> List[Any]:
+        items = self._items
+        self._items = []
+        self._pending_texts = 0
+        self._oldest_at = None
+        return items
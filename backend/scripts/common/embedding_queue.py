@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Durable deferred-embedding queue (embedding_queue, migration 031).
+
+`ingest_youtube.py --embed-later` stores segments without embeddings and
+enqueues their ids per model_key in the same transaction, so an ASR-heavy
+run never waits on the embedding model. scripts/embedding_worker.py then
+drains the queue in large batches:
+
+    claim_batch()     SELECT ... FOR UPDATE OF q SKIP LOCKED (oldest first)
+    <generate_embeddings on the claimed texts>
+    complete_batch()  write segments.embedding + segment_embeddings_{dim},
+                      DELETE the claimed rows
+    COMMIT
+
+Claim, write and delete share one transaction: concurrent workers skip each
+other's locked rows, and a worker that dies mid-batch rolls back, leaving
+its rows to be claimed again. A batch whose embedding fails is rolled back
+and record_failure() bumps attempts; entries at EMBEDDING_QUEUE_MAX_ATTEMPTS
+are left in the table (with last_error) for inspection instead of retried.
+
+All helpers take a cursor and leave commit/rollback to the caller.
+
+Environment variables:
+- EMBEDDING_QUEUE_MAX_ATTEMPTS: Failed claims before an entry is parked (default: 5)
+"""
+
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import psycopg2.extras
+
+from .pgvector_adapter import Vector
+
+EMBEDDING_QUEUE_TABLE = 'embedding_queue'
+EMBEDDING_QUEUE_MAX_ATTEMPTS = int(os.getenv('EMBEDDING_QUEUE_MAX_ATTEMPTS', '5'))
+
+# Same speaker filter as the inline path (speaker ID disabled -> NULL label)
+_CHAFFEE_FILTER = "AND (s.speaker_label = 'Chaffee' OR s.speaker_label IS NULL)"
+
+
+def enqueue_source_segments(cur, source_id: int, model_key: str,
+                            embed_chaffee_only: bool = True) -> int:
+    """
+    Enqueue a source's segments that still lack an embedding.
+
+    Re-enqueueing resets attempts, so a re-ingested video gets a fresh try.
+
+    Returns:
+        Number of queue rows inserted or reset
+    """
+    cur.execute(f"""
+        INSERT INTO {EMBEDDING_QUEUE_TABLE} (segment_id, model_key)
+        SELECT s.id, %s FROM segments s
+        WHERE s.source_id = %s AND s.embedding IS NULL
+        {_CHAFFEE_FILTER if embed_chaffee_only else ''}
+        ON CONFLICT (segment_id, model_key) DO UPDATE SET
+            enqueued_at = now(),
+            attempts = 0,
+            last_error = NULL
+    """, [model_key, source_id])
+    return cur.rowcount
+
+
+def claim_batch(cur, model_key: str, limit: int,
+                max_attempts: int = EMBEDDING_QUEUE_MAX_ATTEMPTS) -> List[Tuple[int, str]]:
+    """
+    Lock up to `limit` pending entries for model_key, oldest first.
+
+    Rows locked by other workers are skipped, not waited on.
+
+    Returns:
+        (segment_id, text) pairs
+    """
+    cur.execute(f"""
+        SELECT q.segment_id, s.text
+        FROM {EMBEDDING_QUEUE_TABLE} q
+        JOIN segments s ON s.id = q.segment_id
+        WHERE q.model_key = %s AND q.attempts < %s
+        ORDER BY q.enqueued_at
+        LIMIT %s
+        FOR UPDATE OF q SKIP LOCKED
+    """, [model_key, max_attempts, limit])
+    return [(int(segment_id), text or '') for segment_id, text in cur.fetchall()]
+
+
+def complete_batch(cur, model_key: str, embeddings: Sequence[Tuple[int, Sequence[float]]],
+                   segment_table: Optional[str] = None,
+                   write_legacy: bool = True) -> int:
+    """
+    Store embeddings for claimed segments and remove them from the queue.
+
+    Args:
+        cur: Cursor in the claiming transaction
+        model_key: Model the embeddings came from
+        embeddings: (segment_id, embedding) pairs
+        segment_table: segment_embeddings_{dim} table to upsert into (None skips)
+        write_legacy: Also set segments.embedding (the active model's column)
+
+    Returns:
+        Number of queue entries completed
+    """
+    if not embeddings:
+        return 0
+    values = [(segment_id, Vector(embedding)) for segment_id, embedding in embeddings]
+    if write_legacy:
+        psycopg2.extras.execute_values(
+            cur,
+            """
+            UPDATE segments AS s SET embedding = v.embedding
+            FROM (VALUES %s) AS v(id, embedding)
+            WHERE s.id = v.id
+            """,
+            values,
+            template="(%s, %s::vector)"
+        )
+    if segment_table:
+        psycopg2.extras.execute_values(
+            cur,
+            f"""
+            INSERT INTO {segment_table} (segment_id, model_key, embedding)
+            VALUES %s
+            ON CONFLICT (segment_id, model_key) DO UPDATE SET
+                embedding = EXCLUDED.embedding,
+                created_at = now()
+            """,
+            [(segment_id, model_key, vector) for segment_id, vector in values],
+            template="(%s, %s, %s::vector)"
+        )
+    cur.execute(
+        f"DELETE FROM {EMBEDDING_QUEUE_TABLE} WHERE model_key = %s AND segment_id = ANY(%s)",
+        [model_key, [segment_id for segment_id, _ in values]]
+    )
+    return cur.rowcount
+
+
+def record_failure(cur, model_key: str, segment_ids: Sequence[int], error: str) -> int:
+    """Bump attempts for entries whose batch failed (run after rolling the claim back)"""
+    if not segment_ids:
+        return 0
+    cur.execute(f"""
+        UPDATE {EMBEDDING_QUEUE_TABLE}
+        SET attempts = attempts + 1, last_error = %s
+        WHERE model_key = %s AND segment_id = ANY(%s)
+    """, [error[:1000], model_key, list(segment_ids)])
+    return cur.rowcount
+
+
+def queue_depth(cur, max_attempts: int = EMBEDDING_QUEUE_MAX_ATTEMPTS) -> Dict[str, Dict[str, int]]:
+    """Pending and parked (attempts exhausted) entries per model_key"""
+    cur.execute(f"""
+        SELECT model_key,
+               count(*) FILTER (WHERE attempts < %s),
+               count(*) FILTER (WHERE attempts >= %s)
+        FROM {EMBEDDING_QUEUE_TABLE}
+        GROUP BY model_key
+    """, [max_attempts, max_attempts])
+    return {
+        model_key: {'pending': int(pending), 'parked': int(parked)}
+        for model_key, pending, parked in cur.fetchall()
+    }
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+pgvector parameter adaptation for psycopg2.
+
+Query and ingestion code used to send embeddings as str(list): 17-digit float
+reprs of every value, repeated for each %s placeholder, re-parsed by Postgres
+each time. This module registers a psycopg2 adapter so a Vector wrapper is
+sent as a compact, lossless pgvector literal, and a per-connection
+typecaster that reads vector columns back as float32 arrays.
+
+Only Vector is adapted: the registration is process-wide, and a plain
+ndarray parameter may be an id list or a float8[] rather than an embedding,
+so callers wrap embeddings explicitly.
+
+psycopg2 only speaks the text protocol, so "binary" here means float32
+precision: values are printed with 9 significant digits (exact float32
+round-trip), about half the size of a Python float repr.
+
+Usage:
+    from scripts.common.pgvector_adapter import Vector, register_vector
+
+    register_vector(conn)  # once per connection (pool hooks do this)
+    cur.execute(
+        "WITH q AS (SELECT %s::vector AS v) "
+        "SELECT id FROM t, q ORDER BY t.embedding <=> q.v LIMIT 10",
+        [Vector(query_embedding)],
+    )
+
+Pass the vector once through a CTE and reference q.v everywhere; Postgres 12+
+inlines single-reference CTEs, so the planner still sees a constant and can
+use the ANN index for ORDER BY.
+"""
+
+import logging
+import threading
+import weakref
+from typing import Any, Optional, Sequence
+
+import numpy as np
+import psycopg2
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+# 9 significant digits round-trips float32 exactly
+_FLOAT32_FORMAT = '%.9g'
+
+_adapters_registered = False
+_adapters_lock = threading.Lock()
+_registered_connections: 'weakref.WeakSet' = weakref.WeakSet()
+
+
+class Vector:
+    """A single embedding, adapted by psycopg2 to a pgvector literal."""
+
+    __slots__ = ('values',)
+
+    def __init__(self, values: Any):
+        if isinstance(values, Vector):
+            values = values.values
+        arr = np.asarray(values, dtype=np.float32)
+        if arr.ndim != 1:
+            raise ValueError(f"Vector must be 1-dimensional, got shape {arr.shape}")
+        self.values = arr
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def to_text(self) -> str:
+        return to_vector_literal(self.values)
+
+
+def to_vector_literal(values: Sequence[float]) -> str:
+    """Format an embedding as a pgvector text literal ('[v1,v2,...]')."""
+    arr = np.asarray(values, dtype=np.float32)
+    return '[' + ','.join([_FLOAT32_FORMAT % x for x in arr.tolist()]) + ']'
+
+
+def _adapt_vector(value: Vector) -> psycopg2.extensions.ISQLQuote:
+    return psycopg2.extensions.QuotedString(value.to_text())
+
+
+def _register_adapters() -> None:
+    """Register the Vector -> SQL adapter (process-wide, idempotent)."""
+    global _adapters_registered
+    if _adapters_registered:
+        return
+    with _adapters_lock:
+        if _adapters_registered:
+            return
+        psycopg2.extensions.register_adapter(Vector, _adapt_vector)
+        _adapters_registered = True
+
+
+def _cast_vector(value: Optional[str], cur) -> Optional[np.ndarray]:
+    if value is None:
+        return None
+    return np.array(value[1:-1].split(','), dtype=np.float32)
+
+
+def register_vector(conn) -> bool:
+    """
+    Register vector adapters for a connection (no-op if already registered).
+
+    The adapter for Vector parameters is process-wide; the
+    typecaster that returns vector columns as np.float32 arrays is scoped to
+    this connection, because the vector type's OID is per-database.
+
+    Args:
+        conn: psycopg2 connection (or pooled proxy exposing .raw)
+
+    Returns:
+        True if the vector type was found and registered
+    """
+    _register_adapters()
+    raw = getattr(conn, 'raw', conn)
+    if raw in _registered_connections:
+        return True
+
+    with raw.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+        cur.execute("SELECT to_regtype('vector')::oid")
+        row = cur.fetchone()
+    if raw.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+        raw.rollback()
+
+    if not row or not row[0]:
+        logger.debug("pgvector extension not installed, vector typecaster not registered")
+        return False
+
+    vector_type = psycopg2.extensions.new_type((row[0],), 'VECTOR', _cast_vector)
+    psycopg2.extensions.register_type(vector_type, raw)
+    _registered_connections.add(raw)
+    return True
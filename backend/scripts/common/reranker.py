@@ -1,93 +1,298 @@
 """
 Cross-encoder reranker for improving search result quality.
 Uses ms-marco-MiniLM model to rerank top vector search results.
+
+Scoring is batched: candidate pairs are sorted by length, tokenized as padded
+batches of RERANK_BATCH_SIZE and scored with one forward pass per batch.
+Scores are cached per (query hash, segment id), so a repeated query only
+scores segments it hasn't seen before.
+
+Backends (RERANK_BACKEND):
+- 'torch' (default): transformers model on CUDA if available, else CPU
+- 'onnx': onnxruntime via optimum, exported on first load; with
+  RERANK_ONNX_QUANTIZE=true the model is dynamically quantized to int8,
+  the fastest option on CPU. Falls back to torch if optimum isn't installed.
 """
+import hashlib
+import logging
 import os
-from typing import List, Tuple, Dict, Any
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import torch
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RERANK_BACKEND = os.getenv('RERANK_BACKEND', 'torch').lower()
+RERANK_BATCH_SIZE = int(os.getenv('RERANK_BATCH_SIZE', '32'))
+RERANK_MAX_LENGTH = int(os.getenv('RERANK_MAX_LENGTH', '512'))
+RERANK_CACHE_SIZE = int(os.getenv('RERANK_CACHE_SIZE', '20000'))
+RERANK_ONNX_QUANTIZE = os.getenv('RERANK_ONNX_QUANTIZE', 'true').lower() == 'true'
+RERANK_ONNX_DIR = os.getenv(
+    'RERANK_ONNX_DIR',
+    str(Path.home() / '.cache' / 'dr-chaffee' / 'reranker-onnx'),
+)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
 
 
 class CrossEncoderReranker:
     """Cross-encoder reranker using ms-marco-MiniLM-L-6-v2"""
-    
-    def __init__(self, model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"):
+
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        backend: str = RERANK_BACKEND,
+        batch_size: int = RERANK_BATCH_SIZE,
+        max_length: int = RERANK_MAX_LENGTH,
+        cache_size: int = RERANK_CACHE_SIZE,
+    ):
         self.model_name = model_name
+        self.backend = backend
+        self.batch_size = max(1, batch_size)
+        self.max_length = max_length
         self.tokenizer = None
         self.model = None
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        
+        self.device = None
+
+        self._load_lock = threading.Lock()
+        self._cache_size = cache_size
+        self._score_cache: 'OrderedDict[Tuple[str, Any], float]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._forward_passes = 0
+
     def _load_model(self):
         """Lazy load the model and tokenizer"""
-        if self.tokenizer is None:
-            print(f"Loading reranker model: {self.model_name}")
+        if self.model is not None:
+            return
+        with self._load_lock:
+            if self.model is not None:
+                return
+            from transformers import AutoTokenizer
+
+            logger.info(f"Loading reranker model: {self.model_name} (backend={self.backend})")
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
-            self.model.to(self.device)
-            self.model.eval()
-    
-    def rerank(self, query: str, results: List[Dict[str, Any]], top_k: int = 5) -> List[Dict[str, Any]]:
+            if self.backend == 'onnx':
+                try:
+                    self.model = self._load_onnx_model()
+                    self.device = 'cpu'
+                    return
+                except ImportError:
+                    logger.warning("optimum[onnxruntime] not installed, falling back to torch reranker")
+                    self.backend = 'torch'
+
+            import torch
+            from transformers import AutoModelForSequenceClassification
+
+            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+            model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+            model.to(self.device)
+            model.eval()
+            self.model = model
+
+    def _load_onnx_model(self):
+        """Export (once) and load an onnxruntime model, int8-quantized if configured."""
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+
+        export_dir = Path(RERANK_ONNX_DIR) / self.model_name.replace('/', '__')
+        model_file = export_dir / 'model.onnx'
+        if not model_file.exists():
+            logger.info(f"Exporting reranker to ONNX: {export_dir}")
+            ORTModelForSequenceClassification.from_pretrained(
+                self.model_name, export=True
+            ).save_pretrained(export_dir)
+
+        if not RERANK_ONNX_QUANTIZE:
+            return ORTModelForSequenceClassification.from_pretrained(export_dir)
+
+        quantized_file = export_dir / 'model_quantized.onnx'
+        if not quantized_file.exists():
+            from optimum.onnxruntime import ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+            logger.info("Quantizing reranker to int8 (dynamic)")
+            quantizer = ORTQuantizer.from_pretrained(export_dir, file_name='model.onnx')
+            quantizer.quantize(
+                save_dir=export_dir,
+                quantization_config=AutoQuantizationConfig.avx2(is_static=False, per_channel=False),
+            )
+        return ORTModelForSequenceClassification.from_pretrained(
+            export_dir, file_name='model_quantized.onnx'
+        )
+
+    def _score_batch(self, query: str, docs: Sequence[str]) -> np.ndarray:
+        """Score one padded batch of (query, doc) pairs in a single forward pass."""
+        self._forward_passes += 1
+        return_tensors = 'np' if self.backend == 'onnx' else 'pt'
+        inputs = self.tokenizer(
+            [query] * len(docs),
+            list(docs),
+            padding=True,
+            truncation='only_second',
+            max_length=self.max_length,
+            return_tensors=return_tensors,
+        )
+
+        if self.backend == 'onnx':
+            logits = np.asarray(self.model(**inputs).logits)
+        else:
+            import torch
+
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            with torch.inference_mode():
+                logits = self.model(**inputs).logits.float().cpu().numpy()
+
+        # ms-marco cross-encoders emit one relevance logit per pair
+        if logits.ndim == 2 and logits.shape[1] > 1:
+            logits = logits[:, -1]
+        return _sigmoid(logits.reshape(-1))
+
+    @staticmethod
+    def _query_hash(query: str) -> str:
+        return hashlib.sha1(' '.join(query.split()).casefold().encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _cache_id(result: Dict[str, Any]) -> Any:
+        segment_id = result.get('id')
+        if segment_id is not None:
+            return segment_id
+        return hashlib.sha1(result.get('text', '').encode('utf-8')).hexdigest()
+
+    def score(self, query: str, results: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Cross-encoder relevance (0-1) for each result, in input order.
+
+        Cached scores are reused; the rest are scored in padded batches,
+        shortest texts first so each batch pads to a similar length.
+        """
+        scores = np.zeros(len(results), dtype=np.float32)
+        if not results:
+            return scores
+
+        query_hash = self._query_hash(query)
+        keys = [(query_hash, self._cache_id(r)) for r in results]
+        missing = []
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = self._score_cache.get(key)
+                if cached is None:
+                    missing.append(i)
+                else:
+                    self._score_cache.move_to_end(key)
+                    scores[i] = cached
+            self._cache_hits += len(results) - len(missing)
+            self._cache_misses += len(missing)
+
+        if not missing:
+            return scores
+
+        self._load_model()
+        missing.sort(key=lambda i: len(results[i].get('text', '')))
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            batch_scores = self._score_batch(query, [results[i].get('text', '') for i in batch])
+            scores[batch] = batch_scores
+
+        with self._cache_lock:
+            for i in missing:
+                self._score_cache[keys[i]] = float(scores[i])
+                self._score_cache.move_to_end(keys[i])
+            while len(self._score_cache) > self._cache_size:
+                self._score_cache.popitem(last=False)
+        return scores
+
+    def rerank(
+        self,
+        query: str,
+        results: List[Dict[str, Any]],
+        top_k: int = 5,
+        max_candidates: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Rerank search results using cross-encoder.
-        
+
         Args:
             query: Search query string
             results: List of search result dictionaries with 'text' field
+                (and 'id', used as the score cache key)
             top_k: Number of top results to return
-            
+            max_candidates: Only score the first N results (in incoming order)
+            enabled: Override the RERANK_ENABLED env check
+
         Returns:
-            Reranked list of results with updated similarity scores
+            Top-k results by cross-encoder score, each copy carrying a float
+            'rerank_score' (0-1); 'similarity' keeps the vector similarity
         """
         if not results:
             return results
-            
+
         # Check if reranking is enabled
-        if not os.getenv('RERANK_ENABLED', 'false').lower() == 'true':
+        if enabled is None:
+            enabled = os.getenv('RERANK_ENABLED', 'false').lower() == 'true'
+        if not enabled:
             return results[:top_k]
-            
-        self._load_model()
-        
-        # Prepare input pairs
-        pairs = [(query, result['text']) for result in results]
-        
-        # Tokenize and score
-        scores = []
-        with torch.no_grad():
-            for query_text, doc_text in pairs:
-                # Truncate to avoid token limit issues
-                inputs = self.tokenizer(
-                    query_text, 
-                    doc_text, 
-                    truncation=True, 
-                    max_length=512, 
-                    return_tensors="pt"
-                )
-                inputs = {k: v.to(self.device) for k, v in inputs.items()}
-                
-                outputs = self.model(**inputs)
-                score = torch.sigmoid(outputs.logits).cpu().numpy()[0][0]
-                scores.append(float(score))
-        
-        # Combine results with scores and sort
-        scored_results = []
-        for result, score in zip(results, scores):
-            result_copy = result.copy()
-            result_copy['rerank_score'] = score
-            result_copy['similarity'] = f"{score * 100:.1f}"  # Convert to percentage string
-            scored_results.append(result_copy)
-        
-        # Sort by rerank score descending
-        scored_results.sort(key=lambda x: x['rerank_score'], reverse=True)
-        
-        return scored_results[:top_k]
+
+        candidates = results[:max_candidates] if max_candidates else results
+        start = time.perf_counter()
+        scores = self.score(query, candidates)
+
+        # Partial selection: only the top_k need ordering
+        top_k = min(top_k, len(candidates))
+        if top_k < len(candidates):
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        reranked = []
+        for i in top:
+            result_copy = candidates[i].copy()
+            result_copy['rerank_score'] = float(scores[i])
+            reranked.append(result_copy)
+
+        logger.debug(
+            f"Reranked {len(candidates)} candidates to top {top_k} "
+            f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+        return reranked
+
+    def stats(self) -> Dict[str, Any]:
+        """Score cache and forward-pass counters."""
+        with self._cache_lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {
+                "backend": self.backend,
+                "loaded": self.model is not None,
+                "batch_size": self.batch_size,
+                "forward_passes": self._forward_passes,
+                "cache_size": len(self._score_cache),
+                "cache_hits": self._cache_hits,
+                "cache_misses": self._cache_misses,
+                "cache_hit_rate": round(self._cache_hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._score_cache.clear()
 
 
 # Global reranker instance (lazy loaded)
 _reranker = None
+_reranker_lock = threading.Lock()
 
 def get_reranker() -> CrossEncoderReranker:
     """Get global reranker instance"""
     global _reranker
     if _reranker is None:
-        _reranker = CrossEncoderReranker()
+        with _reranker_lock:
+            if _reranker is None:
+                _reranker = CrossEncoderReranker()
     return _reranker
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Binary COPY bulk loader for segments and their embeddings.
+
+The default insert path builds a VALUES list with execute_values, upserts
+into segments, then _dual_write_embeddings looks every segment up again and
+writes its embedding to segment_embeddings_{dim} in a second pass. For
+backfills and re-ingests that dominates Tier C time.
+
+This loader streams a batch of segment rows (embeddings included, as binary
+float4 vectors) into a staging table with COPY ... (FORMAT binary), then
+merges it with one statement: an INSERT ... ON CONFLICT into segments whose
+RETURNING rows feed the upsert into segment_embeddings_{dim}.
+
+The staging table is a session TEMP table (ON COMMIT DELETE ROWS): like an
+UNLOGGED table it skips WAL, and being per-connection it lets every DB
+worker load concurrently without batch ids, cleanup DELETEs or a migration.
+
+Select it with SEGMENTS_BULK_LOADER=copy (or --bulk-loader copy).
+"""
+
+import io
+import struct
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+STAGING_TABLE = 'segments_copy_staging'
+
+# Staging columns in COPY order: (name, type). Types match segments' columns
+# so the merge needs no casts (vector is untyped; the insert applies the typmod).
+STAGING_COLUMNS: List[Tuple[str, str]] = [
+    ('ord', 'int4'),
+    ('source_id', 'int4'),
+    ('start_sec', 'float8'),
+    ('end_sec', 'float8'),
+    ('speaker_label', 'text'),
+    ('speaker_conf', 'float8'),
+    ('text', 'text'),
+    ('avg_logprob', 'float8'),
+    ('compression_ratio', 'float8'),
+    ('no_speech_prob', 'float8'),
+    ('temperature_used', 'float8'),
+    ('re_asr', 'bool'),
+    ('is_overlap', 'bool'),
+    ('needs_refinement', 'bool'),
+    ('embedding', 'vector'),
+]
+
+_PG_TYPES = {
+    'int4': 'integer',
+    'float8': 'double precision',
+    'text': 'text',
+    'bool': 'boolean',
+    'vector': 'vector',
+}
+
+_COPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+_COPY_TRAILER = struct.pack('!h', -1)
+_NULL = struct.pack('!i', -1)
+_INT4 = struct.Struct('!i')
+_FLOAT8 = struct.Struct('!d')
+
+
+def _encode_vector(value: Any) -> bytes:
+    # pgvector binary input: int16 dim, int16 unused, dim x float4 (big-endian)
+    arr = np.asarray(getattr(value, 'values', value), dtype='>f4')
+    return struct.pack('!hh', arr.shape[0], 0) + arr.tobytes()
+
+
+_ENCODERS = {
+    'int4': lambda v: _INT4.pack(int(v)),
+    'float8': lambda v: _FLOAT8.pack(float(v)),
+    'text': lambda v: str(v).encode('utf-8'),
+    'bool': lambda v: b'\x01' if v else b'\x00',
+    'vector': _encode_vector,
+}
+
+
+def encode_copy_binary(rows: Sequence[Sequence[Any]],
+                       columns: Sequence[Tuple[str, str]] = STAGING_COLUMNS) -> bytes:
+    """
+    Encode rows in PostgreSQL's binary COPY format.
+
+    Args:
+        rows: Tuples in `columns` order (None for NULL)
+        columns: (name, type) pairs; types from _ENCODERS
+
+    Returns:
+        Complete COPY payload (header, tuples, trailer)
+    """
+    encoders = [_ENCODERS[col_type] for _, col_type in columns]
+    field_count = struct.pack('!h', len(columns))
+    out = io.BytesIO()
+    out.write(_COPY_HEADER)
+    for row in rows:
+        out.write(field_count)
+        for encode, value in zip(encoders, row):
+            if value is None:
+                out.write(_NULL)
+            else:
+                data = encode(value)
+                out.write(_INT4.pack(len(data)))
+                out.write(data)
+    out.write(_COPY_TRAILER)
+    return out.getvalue()
+
+
+def _staging_ddl() -> str:
+    columns = ', '.join(f"{name} {_PG_TYPES[col_type]}" for name, col_type in STAGING_COLUMNS)
+    return f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} ({columns}) ON COMMIT DELETE ROWS"
+
+
+_MERGE_SEGMENTS_SQL = f"""
+    INSERT INTO segments (
+        source_id, start_sec, end_sec, speaker_label, speaker_conf,
+        text, avg_logprob, compression_ratio, no_speech_prob,
+        temperature_used, re_asr, is_overlap, needs_refinement,
+        embedding
+    )
+    SELECT DISTINCT ON (source_id, start_sec, end_sec, text)
+        source_id, start_sec, end_sec, speaker_label, speaker_conf,
+        text, avg_logprob, compression_ratio, no_speech_prob,
+        temperature_used, re_asr, is_overlap, needs_refinement,
+        embedding
+    FROM {STAGING_TABLE}
+    ORDER BY source_id, start_sec, end_sec, text, ord DESC
+    ON CONFLICT (source_id, start_sec, end_sec, text)
+    DO UPDATE SET
+        speaker_label = EXCLUDED.speaker_label,
+        speaker_conf = EXCLUDED.speaker_conf,
+        avg_logprob = EXCLUDED.avg_logprob,
+        compression_ratio = EXCLUDED.compression_ratio,
+        no_speech_prob = EXCLUDED.no_speech_prob,
+        temperature_used = EXCLUDED.temperature_used,
+        re_asr = EXCLUDED.re_asr,
+        is_overlap = EXCLUDED.is_overlap,
+        needs_refinement = EXCLUDED.needs_refinement,
+        embedding = EXCLUDED.embedding
+    RETURNING id, embedding
+"""
+
+
+def build_merge_sql(segment_table: Optional[str]) -> str:
+    """
+    One statement merging the staged batch into segments (and segment_table).
+
+    Returns (segments_upserted, embeddings_written) as a single row.
+    """
+    if not segment_table:
+        return f"""
+            WITH upserted AS ({_MERGE_SEGMENTS_SQL})
+            SELECT (SELECT count(*) FROM upserted), 0
+        """
+    return f"""
+        WITH upserted AS ({_MERGE_SEGMENTS_SQL}),
+        embedded AS (
+            INSERT INTO {segment_table} (segment_id, model_key, embedding)
+            SELECT id, %s, embedding FROM upserted WHERE embedding IS NOT NULL
+            ON CONFLICT (segment_id, model_key) DO UPDATE SET
+                embedding = EXCLUDED.embedding,
+                created_at = now()
+            RETURNING 1
+        )
+        SELECT (SELECT count(*) FROM upserted), (SELECT count(*) FROM embedded)
+    """
+
+
+def copy_load_segments(cur, rows: Sequence[Sequence[Any]],
+                       segment_table: Optional[str] = None,
+                       model_key: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Stream rows into the staging table with binary COPY and merge them.
+
+    Runs inside the caller's transaction (commit is the caller's job); the
+    staging rows are discarded on commit.
+
+    Args:
+        cur: Cursor on the loading connection
+        rows: Tuples in STAGING_COLUMNS order
+        segment_table: segment_embeddings_{dim} to write embeddings to (None skips)
+        model_key: Model key for segment_table rows
+
+    Returns:
+        (segments_upserted, embeddings_written)
+    """
+    if not rows:
+        return 0, 0
+    cur.execute(_staging_ddl())
+    cur.execute(f"TRUNCATE {STAGING_TABLE}")
+    columns = ', '.join(name for name, _ in STAGING_COLUMNS)
+    cur.copy_expert(
+        f"COPY {STAGING_TABLE} ({columns}) FROM STDIN WITH (FORMAT binary)",
+        io.BytesIO(encode_copy_binary(rows)),
+    )
+    cur.execute(build_merge_sql(segment_table), [model_key] if segment_table else None)
+    segments_upserted, embeddings_written = cur.fetchone()
+    return int(segments_upserted), int(embeddings_written)
@@ -6,27 +6,50 @@ Replaces the old chunks-based system with proper speaker attribution
 Supports dual-write architecture:
 - Legacy: segments.embedding column
 - Normalized: segment_embeddings table (multi-model support)
+
+Thread safety:
+The pipelined ingester calls into one SegmentsDatabase from many I/O and DB
+worker threads. Each call checks a connection out of a bounded pool (one
+per thread for the duration of the call), so workers no longer interleave
+transactions on a single psycopg2 connection. video_transaction() holds one
+connection for a whole video and commits upsert + segments + dual-write +
+classification together.
+
+Environment variables:
+- SEGMENTS_DB_POOL_SIZE: Max pooled connections (default: 4)
+- SEGMENTS_DB_ACQUIRE_TIMEOUT: Seconds to wait for a free connection (default: 60)
+- SEGMENTS_BULK_LOADER: 'values' (execute_values + dual-write pass, default)
+  or 'copy' (binary COPY + one merge statement, see segments_copy.py)
+
+Deferred embedding (--embed-later): enqueue_embeddings() adds a video's
+unembedded segments to embedding_queue inside its transaction; see
+embedding_queue.py and scripts/embedding_worker.py.
 """
 
 import os
-import uuid
-import json
+import time
 import logging
+import threading
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
-import numpy as np
-from typing import List, Dict, Any, Optional, Tuple
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, FrozenSet, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
 
+from .pgvector_adapter import Vector, register_vector
+from .segments_copy import copy_load_segments
+from .embedding_queue import enqueue_source_segments
+
 logger = logging.getLogger(__name__)
 
 # Import embedding config helpers (with fallback for standalone usage)
 try:
     from api.embedding_config import (
         get_active_model_key,
-        get_model_dimensions,
         use_dual_write,
-        use_normalized_storage,
         get_segment_table_for_model,
     )
     _HAS_EMBEDDING_CONFIG = True
@@ -57,6 +80,210 @@ def _get_embedding_config_fallback():
         'use_normalized': os.getenv('EMBEDDING_STORAGE_STRATEGY', 'normalized') == 'normalized',
     }
 
+
+def active_model_key() -> str:
+    """Model key new embeddings are stored (and enqueued) under"""
+    if _HAS_EMBEDDING_CONFIG:
+        return get_active_model_key()
+    return _get_embedding_config_fallback()['model_key']
+
+SEGMENTS_DB_POOL_SIZE = int(os.getenv('SEGMENTS_DB_POOL_SIZE', '4'))
+SEGMENTS_DB_ACQUIRE_TIMEOUT = float(os.getenv('SEGMENTS_DB_ACQUIRE_TIMEOUT', '60'))
+SEGMENTS_BULK_LOADER = os.getenv('SEGMENTS_BULK_LOADER', 'values').lower()
+
+BULK_LOADERS = ('values', 'copy')
+
+
+class SegmentsConnectionPool:
+    """
+    Bounded, thread-safe pool of raw psycopg2 connections.
+
+    Waits (up to acquire_timeout) for a free connection instead of raising
+    like psycopg2.pool.ThreadedConnectionPool, and records wait metrics for
+    ProcessingStats.
+    """
+
+    def __init__(self, connect_fn, max_size: int = SEGMENTS_DB_POOL_SIZE,
+                 acquire_timeout: float = SEGMENTS_DB_ACQUIRE_TIMEOUT):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self._connect_fn = connect_fn
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle = deque()
+        self._in_use = 0
+
+        # Metrics
+        self._acquisitions = 0
+        self._waits = 0  # checkouts that found every connection busy
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._peak_in_use = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+
+    def getconn(self) -> psycopg2.extensions.connection:
+        """Check out a connection, waiting for a free slot if necessary."""
+        t_wait_start = time.perf_counter()
+        waited = not self._slots.acquire(blocking=False)
+        if waited and not self._slots.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                self._timeouts += 1
+            raise psycopg2.OperationalError(
+                f"Timed out after {self.acquire_timeout:.0f}s waiting for a segments DB "
+                f"connection (pool max_size={self.max_size})"
+            )
+        wait_ms = (time.perf_counter() - t_wait_start) * 1000
+
+        try:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None or conn.closed:
+                conn = self._connect_fn()
+                with self._lock:
+                    self._created += 1
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self._acquisitions += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            if waited:
+                self._waits += 1
+                self._total_wait_ms += wait_ms
+                self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+        return conn
+
+    def putconn(self, conn: psycopg2.extensions.connection) -> None:
+        """Return a connection; broken or mid-transaction connections are rolled back or dropped."""
+        keep = not conn.closed
+        if keep:
+            try:
+                status = conn.get_transaction_status()
+                if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                    keep = False
+                elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                keep = False
+
+        with self._lock:
+            self._in_use -= 1
+            if keep:
+                self._idle.append(conn)
+            else:
+                self._discarded += 1
+        if not keep:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._slots.release()
+
+    def closeall(self) -> None:
+        """Close idle connections (the pool reconnects on the next checkout)."""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "peak_in_use": self._peak_in_use,
+                "acquisitions": self._acquisitions,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "discarded": self._discarded,
+                "avg_wait_ms": round(self._total_wait_ms / self._waits, 2) if self._waits else 0.0,
+                "max_wait_ms": round(self._max_wait_ms, 2),
+            }
+
+
+@dataclass
+class ProcessedVideos:
+    """
+    Skip map for a listed batch of videos, from resolve_processed_videos().
+
+    A video counts as processed when its source row has at least one segment
+    (a source without segments is a failed ingest and is retried).
+    """
+    checked: FrozenSet[str] = frozenset()
+    segment_counts: Dict[str, int] = field(default_factory=dict)  # Only ids with a sources row
+    
+    def covers(self, video_id: str) -> bool:
+        """True if video_id was part of the resolved batch."""
+        return video_id in self.checked
+    
+    def segment_count(self, video_id: str) -> int:
+        return self.segment_counts.get(video_id, 0)
+    
+    def is_processed(self, video_id: str) -> bool:
+        return self.segment_count(video_id) > 0
+    
+    @property
+    def processed_count(self) -> int:
+        return sum(1 for count in self.segment_counts.values() if count > 0)
+    
+    def merged(self, other: 'ProcessedVideos') -> 'ProcessedVideos':
+        """Combine with a map resolved for more ids (other wins on overlap)."""
+        return ProcessedVideos(
+            checked=self.checked | other.checked,
+            segment_counts={**self.segment_counts, **other.segment_counts},
+        )
+
+
+def resolve_processed_videos(conn, video_ids: Iterable[str],
+                             source_type: Optional[str] = 'youtube') -> ProcessedVideos:
+    """
+    Resolve which videos are already ingested in one round-trip.
+
+    Replaces per-video SELECT id FROM sources + SELECT COUNT(*) FROM segments
+    lookups (two queries per video before any work starts).
+
+    Args:
+        conn: psycopg2 connection (any cursor factory)
+        video_ids: YouTube IDs, e.g. [v.video_id for v in list_videos()]
+        source_type: Restrict to one sources.source_type (None = any)
+
+    Returns:
+        ProcessedVideos covering every id passed in
+    """
+    # Plain list of str: psycopg2 adapts lists (not tuples/ndarrays) to ARRAY
+    ids = list(dict.fromkeys(str(video_id) for video_id in video_ids))
+    if not ids:
+        return ProcessedVideos()
+    
+    with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+        cur.execute("""
+            SELECT s.source_id, COUNT(seg.id)
+            FROM sources s
+            LEFT JOIN segments seg ON seg.source_id = s.id
+            WHERE s.source_id = ANY(%s)
+              AND (%s::text IS NULL OR s.source_type = %s)
+            GROUP BY s.source_id
+        """, (ids, source_type, source_type))
+        rows = cur.fetchall()
+    
+    return ProcessedVideos(
+        checked=frozenset(ids),
+        segment_counts={video_id: int(count) for video_id, count in rows},
+    )
+
+
 class SegmentsDatabase:
     """Enhanced segments database with speaker attribution and pgvector support"""
     
@@ -68,14 +295,46 @@ class SegmentsDatabase:
         else:
             return getattr(segment, key, default)
     
-    def __init__(self, db_url: str):
+    def __init__(self, db_url: str, pool_size: Optional[int] = None,
+                 bulk_loader: Optional[str] = None):
+        """
+        Args:
+            db_url: PostgreSQL DSN
+            pool_size: Max pooled connections (default SEGMENTS_DB_POOL_SIZE);
+                size it to the number of threads writing concurrently
+            bulk_loader: 'values' or 'copy' (default SEGMENTS_BULK_LOADER)
+        """
+        bulk_loader = (bulk_loader or SEGMENTS_BULK_LOADER).lower()
+        if bulk_loader not in BULK_LOADERS:
+            raise ValueError(f"bulk_loader must be one of {BULK_LOADERS}, got {bulk_loader!r}")
         self.db_url = db_url
-        self.connection = None
+        self.bulk_loader = bulk_loader
+        self.connection = None  # get_connection() only (single-threaded callers)
+        self._pool = SegmentsConnectionPool(self._connect, max_size=pool_size or SEGMENTS_DB_POOL_SIZE)
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._video_transactions = 0
+        self._video_rollbacks = 0
         
+    def _connect(self):
+        """Open a new connection with pgvector types registered"""
+        conn = psycopg2.connect(self.db_url)
+        try:
+            register_vector(conn)
+        except Exception as e:
+            logger.warning(f"Could not register pgvector types: {e}")
+            conn.rollback()
+        return conn
+    
     def get_connection(self):
-        """Get database connection"""
+        """
+        Get the shared legacy connection.
+
+        Not thread-safe: kept for single-threaded scripts that manage their own
+        transactions. SegmentsDatabase methods use pooled connections instead.
+        """
         if not self.connection or self.connection.closed:
-            self.connection = psycopg2.connect(self.db_url)
+            self.connection = self._connect()
         else:
             # Check if connection is in a failed transaction state
             try:
@@ -91,9 +350,109 @@ class SegmentsDatabase:
                     self.connection.close()
                 except:
                     pass
-                self.connection = psycopg2.connect(self.db_url)
+                self.connection = self._connect()
         return self.connection
     
+    @contextmanager
+    def pooled_connection(self) -> Iterator[psycopg2.extensions.connection]:
+        """
+        Check out a pooled connection for the current thread.
+
+        Nested calls on the same thread (e.g. inside video_transaction) reuse
+        the connection already held instead of taking a second slot.
+        """
+        held = getattr(self._local, 'conn', None)
+        if held is not None:
+            yield held
+            return
+        conn = self._pool.getconn()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._pool.putconn(conn)
+    
+    @contextmanager
+    def video_transaction(self, video_id: str) -> Iterator[psycopg2.extensions.connection]:
+        """
+        Run all writes for one video in a single transaction on one connection.
+
+        upsert_source / batch_insert_segments called inside the block defer
+        their commits to the end of it; any exception rolls the whole video
+        back (non-fatal dual-write / classification failures only roll back
+        to their savepoint).
+        """
+        with self.pooled_connection() as conn:
+            if getattr(self._local, 'in_transaction', False):
+                yield conn
+                return
+            self._local.in_transaction = True
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                with self._stats_lock:
+                    self._video_rollbacks += 1
+                try:
+                    conn.rollback()
+                except Exception as rollback_error:
+                    logger.error(f"Failed to roll back transaction for {video_id}: {rollback_error}")
+                    conn.close()  # Dropped by the pool on return
+                raise
+            finally:
+                self._local.in_transaction = False
+                with self._stats_lock:
+                    self._video_transactions += 1
+    
+    def _in_transaction(self) -> bool:
+        return getattr(self._local, 'in_transaction', False)
+    
+    def _commit(self, conn) -> None:
+        """Commit unless a video_transaction owns the commit."""
+        if not self._in_transaction():
+            conn.commit()
+    
+    def _rollback(self, conn) -> None:
+        """Roll back a failed call (left to the enclosing video_transaction if any)."""
+        if self._in_transaction():
+            return
+        try:
+            conn.rollback()
+            logger.info("Transaction rolled back successfully")
+        except Exception as rollback_error:
+            logger.error(f"Failed to rollback transaction: {rollback_error}")
+            # Closed connections are dropped by the pool on return
+            try:
+                conn.close()
+            except:
+                pass
+    
+    def _savepoint(self, conn, name: str) -> None:
+        if self._in_transaction():
+            with conn.cursor() as cur:
+                cur.execute(f"SAVEPOINT {name}")
+    
+    def _rollback_to_savepoint(self, conn, name: str) -> None:
+        """Undo a non-fatal step without losing the rest of the video's transaction."""
+        try:
+            if self._in_transaction():
+                with conn.cursor() as cur:
+                    cur.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            else:
+                conn.rollback()
+        except:
+            pass
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool and per-video transaction metrics."""
+        with self._stats_lock:
+            return {
+                **self._pool.stats(),
+                "video_transactions": self._video_transactions,
+                "video_rollbacks": self._video_rollbacks,
+            }
+    
     # NOTE: get_cached_voice_embeddings was removed in Dec 2025.
     # Voice embedding / speaker ID feature is not wired end-to-end.
     # The segments.voice_embedding column was never created in production.
@@ -114,8 +473,15 @@ class SegmentsDatabase:
                      tags = None,
                      url = None) -> int:
         """Upsert video source and return source_id"""
+        with self.pooled_connection() as conn:
+            return self._upsert_source(conn, video_id, title, source_type, metadata, published_at,
+                                       duration_s, view_count, channel_name, channel_url, thumbnail_url,
+                                       like_count, comment_count, description, tags, url)
+    
+    def _upsert_source(self, conn, video_id, title, source_type, metadata, published_at,
+                       duration_s, view_count, channel_name, channel_url, thumbnail_url,
+                       like_count, comment_count, description, tags, url) -> int:
         try:
-            conn = self.get_connection()
             with conn.cursor() as cur:
                 import json
                 metadata_json = json.dumps(metadata or {})
@@ -151,7 +517,7 @@ class SegmentsDatabase:
                       description, thumbnail_url, tags_array, metadata_json, datetime.now()))
                 
                 source_id = cur.fetchone()[0]
-                conn.commit()
+                self._commit(conn)
                 logger.debug(f"Upserted source {video_id} with id {source_id}")
                 
                 return source_id
@@ -159,18 +525,7 @@ class SegmentsDatabase:
         except Exception as e:
             logger.error(f"Failed to upsert source {video_id}: {e}")
             logger.error(f"Error type: {type(e).__name__}")
-            if conn:
-                try:
-                    conn.rollback()
-                    logger.info("Transaction rolled back successfully")
-                except Exception as rollback_error:
-                    logger.error(f"Failed to rollback transaction: {rollback_error}")
-                    # Force reconnect on next call
-                    try:
-                        conn.close()
-                    except:
-                        pass
-                    self.connection = None
+            self._rollback(conn)
             raise
     
     def batch_insert_segments(self, segments: List[Dict[str, Any]], 
@@ -191,9 +546,12 @@ class SegmentsDatabase:
             logger.info("No segments to insert after filtering")
             return 0
         
+        with self.pooled_connection() as conn:
+            return self._batch_insert_segments(conn, segments, video_id, embed_chaffee_only)
+    
+    def _batch_insert_segments(self, conn, segments: List[Dict[str, Any]], video_id: str,
+                               embed_chaffee_only: bool) -> int:
         try:
-            conn = self.get_connection()
-            inserted_count = 0
             
             with conn.cursor() as cur:
                 # Get source_id from video_id (YouTube ID)
@@ -250,12 +608,14 @@ class SegmentsDatabase:
                 for segment in segments:
                     # Determine if this segment should get text embedding
                     embedding = None
-                    if self._get_segment_value(segment, 'embedding'):
+                    segment_embedding = self._get_segment_value(segment, 'embedding')
+                    if segment_embedding is not None and len(segment_embedding) > 0:
                         speaker_label = self._get_segment_value(segment, 'speaker_label', 'Guest')
                         # Only embed Chaffee segments if embed_chaffee_only is enabled
                         # CRITICAL: If speaker_label is None (speaker ID disabled), treat as Chaffee
                         if not embed_chaffee_only or speaker_label == 'Chaffee' or speaker_label is None:
-                            embedding = self._get_segment_value(segment, 'embedding')
+                            # Compact float32 literal instead of a numeric[] of Python floats
+                            embedding = Vector(segment_embedding)
                     
                     # Clamp speaker confidence to [0.0, 1.0] range
                     speaker_conf = to_native(self._get_segment_value(segment, 'speaker_confidence', None))
@@ -278,19 +638,30 @@ class SegmentsDatabase:
                         bool(self._get_segment_value(segment, 'needs_refinement', False)),
                         embedding
                     ))
-                # Execute batch insert/update
-                psycopg2.extras.execute_values(cur, insert_query, values)
-                affected_count = cur.rowcount  # Rows inserted or updated
                 total_segments = len(values)
                 
-                conn.commit()
-                if affected_count == total_segments:
-                    logger.info(f"Successfully inserted/updated {affected_count} segments for video {video_id}")
+                if self.bulk_loader == 'copy':
+                    # Segments and segment_embeddings_{dim} in one COPY + merge
+                    segment_table, model_key = self._dual_write_target(cur) or (None, None)
+                    affected_count, embeddings_written = copy_load_segments(
+                        cur, [(i,) + row for i, row in enumerate(values)], segment_table, model_key
+                    )
+                    self._commit(conn)
+                    logger.info(f"COPY-loaded {total_segments} segments for video {video_id} "
+                                f"({affected_count} upserted, {embeddings_written} embeddings to {segment_table or 'no table'})")
                 else:
-                    logger.info(f"Successfully processed {total_segments} segments for video {video_id} ({affected_count} new/changed)")
-                
-                # Dual-write to segment_embeddings table if enabled
-                self._dual_write_embeddings(cur, conn, source_id, segments, embed_chaffee_only)
+                    # Execute batch insert/update
+                    psycopg2.extras.execute_values(cur, insert_query, values)
+                    affected_count = cur.rowcount  # Rows inserted or updated
+                    
+                    self._commit(conn)
+                    if affected_count == total_segments:
+                        logger.info(f"Successfully inserted/updated {affected_count} segments for video {video_id}")
+                    else:
+                        logger.info(f"Successfully processed {total_segments} segments for video {video_id} ({affected_count} new/changed)")
+                    
+                    # Dual-write to segment_embeddings table if enabled
+                    self._dual_write_embeddings(cur, conn, source_id, segments, embed_chaffee_only)
                 
                 # Classify video type based on speaker distribution
                 self._classify_video_type(video_id, segments, conn)
@@ -300,18 +671,7 @@ class SegmentsDatabase:
         except Exception as e:
             logger.error(f"Failed to insert segments for {video_id}: {e}")
             logger.error(f"Error type: {type(e).__name__}")
-            if conn:
-                try:
-                    conn.rollback()
-                    logger.info("Transaction rolled back successfully")
-                except Exception as rollback_error:
-                    logger.error(f"Failed to rollback transaction: {rollback_error}")
-                    # Force reconnect on next call
-                    try:
-                        conn.close()
-                    except:
-                        pass
-                    self.connection = None
+            self._rollback(conn)
             raise
     
     def _dual_write_embeddings(self, cur, conn, source_id: int, segments: List[Dict[str, Any]], 
@@ -332,40 +692,10 @@ class SegmentsDatabase:
         Returns:
             Number of embeddings written to segment_embeddings_{dim}
         """
-        # Check if dual-write is enabled
-        if _HAS_EMBEDDING_CONFIG:
-            if not use_dual_write():
-                logger.debug("Dual-write disabled, skipping normalized storage")
-                return 0
-            model_key = get_active_model_key()
-            dimensions = get_model_dimensions(model_key)
-        else:
-            config = _get_embedding_config_fallback()
-            if not config['use_dual_write']:
-                logger.debug("Dual-write disabled, skipping normalized storage")
-                return 0
-            model_key = config['model_key']
-            dimensions = config['dimensions']
-        
-        # Get the table name for this model (table-per-dimension architecture)
-        segment_table = get_segment_table_for_model(model_key)
-        
-        # Check if the dimension-specific table exists
-        try:
-            cur.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_schema = 'public' 
-                    AND table_name = %s
-                )
-            """, [segment_table])
-            table_exists = cur.fetchone()[0]
-            if not table_exists:
-                logger.debug(f"{segment_table} table does not exist, skipping dual-write")
-                return 0
-        except Exception as e:
-            logger.warning(f"Could not check {segment_table} table: {e}")
+        target = self._dual_write_target(cur)
+        if target is None:
             return 0
+        segment_table, model_key = target
         
         # Collect embeddings to write
         embeddings_to_write = []
@@ -400,6 +730,7 @@ class SegmentsDatabase:
         
         # Batch insert into segment_embeddings
         try:
+            self._savepoint(conn, 'dual_write')
             # Use a single query to get segment IDs and insert embeddings
             insert_count = 0
             batch_size = 1000
@@ -420,13 +751,7 @@ class SegmentsDatabase:
                     result = cur.fetchone()
                     if result:
                         segment_id = result[0]
-                        embedding = emb_data['embedding']
-                        
-                        # Convert embedding to list if needed
-                        if hasattr(embedding, 'tolist'):
-                            embedding = embedding.tolist()
-                        
-                        values.append((segment_id, model_key, dimensions, embedding))
+                        values.append((segment_id, model_key, Vector(emb_data['embedding'])))
                 
                 if values:
                     # Batch insert with ON CONFLICT (table-per-dimension)
@@ -439,12 +764,12 @@ class SegmentsDatabase:
                             embedding = EXCLUDED.embedding,
                             created_at = now()
                         """,
-                        [(v[0], v[1], v[3]) for v in values],  # segment_id, model_key, embedding
+                        values,  # segment_id, model_key, embedding
                         template="(%s, %s, %s::vector)"
                     )
                     insert_count += len(values)
             
-            conn.commit()
+            self._commit(conn)
             
             if insert_count > 0:
                 logger.info(f"Dual-write: {insert_count} embeddings written to {segment_table} (model: {model_key})")
@@ -454,12 +779,75 @@ class SegmentsDatabase:
         except Exception as e:
             logger.warning(f"Dual-write to {segment_table} failed (non-fatal): {e}")
             # Don't raise - dual-write failure should not break ingestion
-            try:
-                conn.rollback()
-            except:
-                pass
+            self._rollback_to_savepoint(conn, 'dual_write')
             return 0
     
+    def _dual_write_target(self, cur) -> Optional[Tuple[str, str]]:
+        """(segment_embeddings_{dim} table, model_key) to dual-write to, or None if disabled/missing"""
+        # Check if dual-write is enabled
+        dual_write = use_dual_write() if _HAS_EMBEDDING_CONFIG else _get_embedding_config_fallback()['use_dual_write']
+        if not dual_write:
+            logger.debug("Dual-write disabled, skipping normalized storage")
+            return None
+        model_key = active_model_key()
+        segment_table = self.embedding_table_for(cur, model_key)
+        if segment_table is None:
+            return None
+        return segment_table, model_key
+    
+    def embedding_table_for(self, cur, model_key: str) -> Optional[str]:
+        """segment_embeddings_{dim} table for model_key, or None if it doesn't exist yet"""
+        # Get the table name for this model (table-per-dimension architecture)
+        segment_table = get_segment_table_for_model(model_key)
+        
+        # Check if the dimension-specific table exists
+        try:
+            cur.execute("""
+                SELECT EXISTS (
+                    SELECT FROM information_schema.tables 
+                    WHERE table_schema = 'public' 
+                    AND table_name = %s
+                )
+            """, [segment_table])
+            table_exists = cur.fetchone()[0]
+            if not table_exists:
+                logger.debug(f"{segment_table} table does not exist, skipping dual-write")
+                return None
+        except Exception as e:
+            logger.warning(f"Could not check {segment_table} table: {e}")
+            return None
+        
+        return segment_table
+    
+    def enqueue_embeddings(self, video_id: str, embed_chaffee_only: bool = True,
+                           model_key: Optional[str] = None) -> int:
+        """
+        Add a video's unembedded segments to embedding_queue (--embed-later).
+
+        Call inside the video's video_transaction so segments and their queue
+        entries commit together.
+
+        Returns:
+            Number of segments enqueued
+        """
+        model_key = model_key or active_model_key()
+        with self.pooled_connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT id FROM sources WHERE source_id = %s", (video_id,))
+                    result = cur.fetchone()
+                    if not result:
+                        logger.error(f"Source not found for video_id {video_id}, nothing to enqueue")
+                        return 0
+                    enqueued = enqueue_source_segments(cur, result[0], model_key, embed_chaffee_only)
+                self._commit(conn)
+                logger.info(f"Enqueued {enqueued} segments from {video_id} for embedding ({model_key})")
+                return enqueued
+            except Exception as e:
+                logger.error(f"Failed to enqueue embeddings for {video_id}: {e}")
+                self._rollback(conn)
+                raise
+    
     def _classify_video_type(self, video_id: str, segments: List[Dict[str, Any]], conn) -> None:
         """Classify video type based on speaker distribution and update all segments."""
         try:
@@ -491,6 +879,7 @@ class SegmentsDatabase:
                     video_type = 'monologue_with_clips'
             
             # Update all segments for this video using source_id FK
+            self._savepoint(conn, 'classify_video')
             with conn.cursor() as cur:
                 # Get source_id from video_id (YouTube ID)
                 cur.execute("SELECT id FROM sources WHERE source_id = %s", (video_id,))
@@ -502,7 +891,7 @@ class SegmentsDatabase:
                         SET video_type = %s 
                         WHERE source_id = %s
                     """, (video_type, source_id))
-                    conn.commit()
+                    self._commit(conn)
                     logger.info(f"Classified video {video_id} as '{video_type}' ({num_speakers} speaker(s), {guest_pct*100:.1f}% guest)")
                 else:
                     logger.warning(f"Source not found for video_id {video_id}, skipping video type classification")
@@ -510,11 +899,16 @@ class SegmentsDatabase:
         except Exception as e:
             logger.warning(f"Failed to classify video type for {video_id}: {e}")
             # Don't raise - classification is non-critical
+            if self._in_transaction():
+                self._rollback_to_savepoint(conn, 'classify_video')
     
     def check_video_exists(self, video_id: str) -> Tuple[Optional[int], int]:
         """Check if video exists and return source_id and segment count"""
+        with self.pooled_connection() as conn:
+            return self._check_video_exists(conn, video_id)
+    
+    def _check_video_exists(self, conn, video_id: str) -> Tuple[Optional[int], int]:
         try:
-            conn = self.get_connection()
             with conn.cursor() as cur:
                 # Check if source exists
                 cur.execute(
@@ -539,19 +933,22 @@ class SegmentsDatabase:
                 
         except Exception as e:
             logger.error(f"Failed to check video existence for {video_id}: {e}")
-            # Ensure rollback on error
-            try:
-                conn = self.get_connection()
-                if conn and not conn.closed:
-                    conn.rollback()
-            except:
-                pass
+            self._rollback(conn)
             return None, 0
     
+    def resolve_processed_videos(self, video_ids: Iterable[str],
+                                 source_type: Optional[str] = 'youtube') -> ProcessedVideos:
+        """Bulk already-processed lookup for a listed batch (see resolve_processed_videos)"""
+        with self.pooled_connection() as conn:
+            return resolve_processed_videos(conn, video_ids, source_type)
+    
     def get_video_stats(self, video_id: str) -> Dict[str, Any]:
         """Get comprehensive video statistics"""
+        with self.pooled_connection() as conn:
+            return self._get_video_stats(conn, video_id)
+    
+    def _get_video_stats(self, conn, video_id: str) -> Dict[str, Any]:
         try:
-            conn = self.get_connection()
             with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
                 # Get source_id from video_id (YouTube ID)
                 cur.execute("SELECT id FROM sources WHERE source_id = %s", (video_id,))
@@ -592,7 +989,7 @@ class SegmentsDatabase:
                     total_duration += float(row['total_duration'] or 0)
                 
                 # Calculate percentages
-                for speaker, stats in speaker_stats.items():
+                for stats in speaker_stats.values():
                     if total_duration > 0:
                         stats['percentage'] = (stats['duration'] / total_duration) * 100
                     else:
@@ -608,12 +1005,16 @@ class SegmentsDatabase:
                 
         except Exception as e:
             logger.error(f"Failed to get video stats for {video_id}: {e}")
+            self._rollback(conn)
             return {}
     
     def create_embedding_index(self):
         """Create pgvector index for embeddings (run after bulk loading)"""
+        with self.pooled_connection() as conn:
+            self._create_embedding_index(conn)
+    
+    def _create_embedding_index(self, conn) -> None:
         try:
-            conn = self.get_connection()
             with conn.cursor() as cur:
                 logger.info("Creating pgvector index for embeddings...")
                 cur.execute("""
@@ -625,14 +1026,16 @@ class SegmentsDatabase:
                 
         except Exception as e:
             logger.error(f"Failed to create embedding index: {e}")
-            if conn:
-                conn.rollback()
+            self._rollback(conn)
             raise
     
     def cleanup_old_segments(self, video_id: str):
         """Remove existing segments for a video (for re-processing)"""
+        with self.pooled_connection() as conn:
+            self._cleanup_old_segments(conn, video_id)
+    
+    def _cleanup_old_segments(self, conn, video_id: str) -> None:
         try:
-            conn = self.get_connection()
             with conn.cursor() as cur:
                 # Get source_id from video_id (YouTube ID)
                 cur.execute("SELECT id FROM sources WHERE source_id = %s", (video_id,))
@@ -644,19 +1047,19 @@ class SegmentsDatabase:
                 
                 cur.execute("DELETE FROM segments WHERE source_id = %s", (source_id,))
                 deleted_count = cur.rowcount
-                conn.commit()
+                self._commit(conn)
                 
                 if deleted_count > 0:
                     logger.info(f"Cleaned up {deleted_count} existing segments for {video_id}")
                 
         except Exception as e:
             logger.error(f"Failed to cleanup segments for {video_id}: {e}")
-            if conn:
-                conn.rollback()
+            self._rollback(conn)
             raise
     
     def close(self):
-        """Close database connection"""
+        """Close the legacy connection and all pooled connections"""
         if self.connection and not self.connection.closed:
             self.connection.close()
             self.connection = None
+        self._pool.closeall()
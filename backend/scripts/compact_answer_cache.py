@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Compact Answer Cache CLI
+
+Deletes expired and low-value answer_cache rows (embeddings cascade),
+rebuilds the answer-cache ANN index when its lists have drifted from the
+row count, and prints size and hit stats. The API runs the same compaction
+every ANSWER_CACHE_COMPACT_INTERVAL_SECONDS; use this for one-off runs or
+cron when the background task is disabled.
+
+Usage:
+    # Compact with thresholds from the environment
+    python -m scripts.compact_answer_cache
+
+    # Show what would be deleted/rebuilt
+    python -m scripts.compact_answer_cache --dry-run
+
+    # Stats only
+    python -m scripts.compact_answer_cache --stats
+
+Environment:
+    DATABASE_URL: PostgreSQL connection string
+    ANSWER_CACHE_MAX_AGE_DAYS, ANSWER_CACHE_MAX_IDLE_DAYS, ANSWER_CACHE_MIN_ACCESS,
+    ANSWER_CACHE_COMPACT_BATCH, ANSWER_CACHE_INDEX_DRIFT: default thresholds
+"""
+
+import os
+import sys
+import json
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    from api.services.answer_cache_maintenance import CompactionPolicy
+
+    defaults = CompactionPolicy()
+    parser = argparse.ArgumentParser(
+        description='Expire and compact the answer cache',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    # Compact with default thresholds
+    python -m scripts.compact_answer_cache
+
+    # Stricter policy, preview only
+    python -m scripts.compact_answer_cache --max-age-days 30 --max-idle-days 7 --dry-run
+
+    # JSON stats for monitoring
+    python -m scripts.compact_answer_cache --stats --json
+        """
+    )
+
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Report eviction candidates and index actions without changing anything.')
+    parser.add_argument('--stats', action='store_true',
+                        help='Only print cache stats.')
+    parser.add_argument('--json', action='store_true',
+                        help='Print the result as JSON.')
+    parser.add_argument('--batch-size', type=int, default=defaults.batch_size,
+                        help=f'Rows deleted per transaction (default: {defaults.batch_size}).')
+    parser.add_argument('--max-age-days', type=int, default=defaults.max_age_days,
+                        help=f'Delete rows older than this regardless of TTL (default: {defaults.max_age_days}).')
+    parser.add_argument('--max-idle-days', type=int, default=defaults.max_idle_days,
+                        help=f'Idle days before a rarely-hit row is deleted (default: {defaults.max_idle_days}).')
+    parser.add_argument('--min-access', type=int, default=defaults.min_access,
+                        help=f'Rows hit at most this often count as low value (default: {defaults.min_access}).')
+    parser.add_argument('--index-drift', type=float, default=defaults.index_drift,
+                        help=f'IVFFlat lists ratio that triggers a rebuild (default: {defaults.index_drift}).')
+
+    args = parser.parse_args()
+
+    # Validate environment
+    db_url = os.getenv('DATABASE_URL')
+    if not db_url:
+        logger.error("DATABASE_URL environment variable not set")
+        sys.exit(1)
+
+    if args.batch_size <= 0:
+        logger.error("--batch-size must be positive")
+        sys.exit(1)
+
+    policy = CompactionPolicy(
+        max_age_days=args.max_age_days,
+        max_idle_days=args.max_idle_days,
+        min_access=args.min_access,
+        batch_size=args.batch_size,
+        index_drift=args.index_drift,
+    )
+
+    try:
+        import psycopg2
+        from api.services.answer_cache_maintenance import collect_answer_cache_stats, compact_answer_cache
+
+        conn = psycopg2.connect(db_url)
+        try:
+            if args.stats:
+                output = collect_answer_cache_stats(conn, policy)
+            else:
+                result = compact_answer_cache(conn, policy, dry_run=args.dry_run)
+                if result.skipped:
+                    logger.warning(f"Skipped: {result.skipped}")
+                output = result.to_dict()
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.error(f"Answer cache compaction failed: {e}", exc_info=True)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(output, indent=2, default=str))
+        return
+
+    stats = output if args.stats else output['stats']
+    if not args.stats:
+        prefix = "[DRY RUN] " if args.dry_run else ""
+        logger.info(f"{prefix}Deleted: {output['total_deleted']} {output['deleted']} in {output['batches']} batches")
+        for index in output['indexes']:
+            logger.info(f"{prefix}Index {index['table']}: {index['action']} "
+                        f"current={index.get('current')} planned={index.get('planned')}")
+    if stats:
+        logger.info(f"Rows: {stats['rows']:,} (expired: {stats['expired_rows']:,}, "
+                    f"evictable: {stats['evictable_rows']:,})")
+        logger.info(f"Reuse rate: {stats['reuse_rate'] * 100:.1f}% of rows hit at least once, "
+                    f"{stats['total_hits']:,} hits total")
+        logger.info(f"Size: {stats['size_bytes'] / 1024 / 1024:.1f} MB")
+        for table, info in stats['embedding_tables'].items():
+            logger.info(f"  {table}: {info['rows']:,} rows, {info['size_bytes'] / 1024 / 1024:.1f} MB")
+
+    logger.info("Done!")
+
+
+if __name__ == '__main__':
+    main()
@@ -36,9 +36,19 @@ TABLE SCHEMA:
         UNIQUE(answer_cache_id, model_key)
 
 INDEXES:
-    - IVFFlat index on embedding column for ANN search
+    - HNSW or IVFFlat index (vector_cosine_ops) on embedding column for ANN search
     - B-tree index on model_key for filtering
 
+ANN INDEX MANAGEMENT:
+    All search queries order by the cosine distance operator (<=>), which can
+    only use indexes built with vector_cosine_ops. ensure_cosine_ann_index()
+    drops ANN indexes built with another opclass (e.g. the vector_l2_ops index
+    from migration 001) and creates a cosine index whose parameters are sized
+    from the table's row count and maintenance_work_mem. Builds and drops run
+    CONCURRENTLY, so live tables stay readable and writable throughout.
+    explain_ann_search()
+    verifies via EXPLAIN that the planner actually uses it.
+
 Usage:
     from backend.scripts.embedding_storage import ensure_storage_initialized
     
@@ -48,8 +58,14 @@ Usage:
 """
 
 import os
+import math
+import json
 import logging
-from typing import Optional, Tuple
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import psycopg2.extensions
 
 logger = logging.getLogger(__name__)
 
@@ -82,7 +98,7 @@ def table_exists(conn, table_name: str) -> bool:
         True if table exists, False otherwise
     """
     try:
-        cur = conn.cursor()
+        cur = _plain_cursor(conn)
         cur.execute("""
             SELECT EXISTS (
                 SELECT FROM information_schema.tables 
@@ -300,11 +316,11 @@ def ensure_storage_initialized(model_key: str, conn=None) -> Tuple[str, str]:
         
         if not segment_exists:
             create_segment_embedding_table(conn, segment_table, dimensions)
-            create_ivfflat_index(conn, segment_table, dimensions)
+            ensure_cosine_ann_index(conn, segment_table, dimensions)
         
         if not answer_cache_exists:
             create_answer_cache_embedding_table(conn, answer_cache_table, dimensions)
-            create_ivfflat_index(conn, answer_cache_table, dimensions)
+            ensure_cosine_ann_index(conn, answer_cache_table, dimensions)
         
         return (segment_table, answer_cache_table)
         
@@ -325,7 +341,7 @@ def get_table_row_count(conn, table_name: str) -> int:
         Number of rows in the table
     """
     try:
-        cur = conn.cursor()
+        cur = _plain_cursor(conn)
         cur.execute(f"SELECT COUNT(*) FROM {table_name}")
         result = cur.fetchone()
         return result[0] if result else 0
@@ -334,13 +350,15 @@ def get_table_row_count(conn, table_name: str) -> int:
         return 0
 
 
-def get_storage_status(conn, model_key: str) -> dict:
+def get_storage_status(conn, model_key: str, approximate: bool = False) -> dict:
     """
     Get storage status for a model.
     
     Args:
         conn: Database connection
         model_key: The embedding model key
+        approximate: Estimate row counts from pg_class.reltuples instead of
+            COUNT(*) (cheap on large tables; used by the API storage catalog)
         
     Returns:
         Dict with storage status information
@@ -351,6 +369,7 @@ def get_storage_status(conn, model_key: str) -> dict:
         from api.embedding_config import resolve_embedding_model_config
     
     cfg = resolve_embedding_model_config(model_key)
+    row_count = estimate_row_count if approximate else get_table_row_count
     
     segment_exists = table_exists(conn, cfg.segment_table)
     answer_cache_exists = table_exists(conn, cfg.answer_cache_table)
@@ -360,10 +379,462 @@ def get_storage_status(conn, model_key: str) -> dict:
         'dimensions': cfg.dimensions,
         'segment_table': cfg.segment_table,
         'segment_table_exists': segment_exists,
-        'segment_row_count': get_table_row_count(conn, cfg.segment_table) if segment_exists else 0,
+        'segment_row_count': row_count(conn, cfg.segment_table) if segment_exists else 0,
         'answer_cache_table': cfg.answer_cache_table,
         'answer_cache_table_exists': answer_cache_exists,
-        'answer_cache_row_count': get_table_row_count(conn, cfg.answer_cache_table) if answer_cache_exists else 0,
+        'answer_cache_row_count': row_count(conn, cfg.answer_cache_table) if answer_cache_exists else 0,
         'paid': cfg.paid,
         'auto_backfill': cfg.auto_backfill,
     }
+
+
+
+# =============================================================================
+# ANN INDEX MANAGEMENT (cosine opclass)
+# =============================================================================
+
+COSINE_OPCLASS = 'vector_cosine_ops'
+ANN_INDEX_METHODS = ('hnsw', 'ivfflat')
+
+# pgvector cannot index VECTOR columns wider than this
+PGVECTOR_MAX_INDEX_DIMENSIONS = 2000
+IVFFLAT_MAX_LISTS = 32768
+# IVFFlat trains its centroids on up to lists * 50 sampled rows
+IVFFLAT_SAMPLES_PER_LIST = 50
+HNSW_DEFAULT_M = 16
+HNSW_DEFAULT_EF_CONSTRUCTION = 64
+# Leave headroom below maintenance_work_mem for the build's own bookkeeping
+INDEX_BUILD_MEMORY_FRACTION = 0.9
+
+
+@dataclass
+class AnnIndexPlan:
+    """Index method and build parameters chosen for one embedding table."""
+    method: str
+    params: Dict[str, int]
+    reason: str
+    recommended_probes: Optional[int] = None
+    recommended_ef_search: Optional[int] = None
+    
+    def with_clause(self) -> str:
+        """Render the WITH (...) storage parameters for CREATE INDEX."""
+        return ", ".join(f"{key} = {value}" for key, value in self.params.items())
+
+
+def parse_pg_memory(value: str) -> int:
+    """
+    Parse a PostgreSQL memory setting (e.g. '64MB', '1GB', '65536kB') into bytes.
+    
+    Unitless values are interpreted as kB, matching maintenance_work_mem.
+    """
+    units = {'kB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'TB': 1024 ** 4, 'B': 1}
+    value = value.strip()
+    for suffix, multiplier in units.items():
+        if value.endswith(suffix):
+            return int(float(value[:-len(suffix)].strip()) * multiplier)
+    return int(value) * 1024
+
+
+def _plain_cursor(conn):
+    """Tuple-row cursor regardless of the connection's default cursor_factory."""
+    return conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+
+
+def get_maintenance_work_mem_bytes(conn) -> int:
+    """Return the session's maintenance_work_mem in bytes."""
+    with _plain_cursor(conn) as cur:
+        cur.execute("SHOW maintenance_work_mem")
+        return parse_pg_memory(cur.fetchone()[0])
+
+
+def estimate_row_count(conn, table_name: str) -> int:
+    """
+    Estimate a table's row count from pg_class.reltuples.
+    
+    Falls back to COUNT(*) when the table has never been analyzed
+    (reltuples is -1 on PostgreSQL 14+, 0 on older versions).
+    """
+    with _plain_cursor(conn) as cur:
+        cur.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table_name])
+        row = cur.fetchone()
+        if row and row[0] > 0:
+            return int(row[0])
+        cur.execute(f"SELECT COUNT(*) FROM {table_name}")
+        return int(cur.fetchone()[0])
+
+
+def _hnsw_graph_bytes(row_count: int, dimensions: int, m: int) -> int:
+    """Approximate in-memory size of an HNSW graph during the build."""
+    # vector payload + layer-0 neighbor list (2*m) + upper-layer share + element header
+    return row_count * (dimensions * 4 + 2 * m * 8 + m * 8 // 4 + 64)
+
+
+def plan_ann_index(row_count: int, dimensions: int, maintenance_work_mem_bytes: int,
+                   method: str = 'auto') -> AnnIndexPlan:
+    """
+    Choose an ANN index method and parameters for a table.
+    
+    HNSW is preferred while its graph fits in maintenance_work_mem (builds
+    that spill to disk are dramatically slower). Otherwise IVFFlat is used with
+    lists = rows/1000 (sqrt(rows) above 1M rows, per pgvector guidance), capped
+    so k-means training fits in maintenance_work_mem.
+    
+    Args:
+        row_count: Current (or estimated) number of rows
+        dimensions: Vector dimensions of the embedding column
+        maintenance_work_mem_bytes: Memory available to CREATE INDEX
+        method: 'hnsw', 'ivfflat', or 'auto'
+        
+    Returns:
+        AnnIndexPlan
+        
+    Raises:
+        ValueError: If the method is unknown or the dimensions can't be indexed
+    """
+    if method not in ANN_INDEX_METHODS + ('auto',):
+        raise ValueError(f"Unknown ANN index method '{method}'. Use one of: auto, {', '.join(ANN_INDEX_METHODS)}")
+    if dimensions > PGVECTOR_MAX_INDEX_DIMENSIONS:
+        raise ValueError(
+            f"pgvector cannot index {dimensions}-dim vectors (max {PGVECTOR_MAX_INDEX_DIMENSIONS}); "
+            f"searches on this table will use exact scans"
+        )
+    
+    budget = int(maintenance_work_mem_bytes * INDEX_BUILD_MEMORY_FRACTION)
+    row_count = max(0, row_count)
+    
+    if method == 'auto':
+        graph_bytes = _hnsw_graph_bytes(row_count, dimensions, HNSW_DEFAULT_M)
+        method = 'hnsw' if graph_bytes <= budget else 'ivfflat'
+    
+    if method == 'hnsw':
+        m = HNSW_DEFAULT_M
+        # Bigger graphs need more links per node to hold recall
+        if row_count >= 1_000_000 and _hnsw_graph_bytes(row_count, dimensions, 24) <= budget:
+            m = 24
+        graph_bytes = _hnsw_graph_bytes(row_count, dimensions, m)
+        # A graph that builds in memory can afford a wider candidate list
+        ef_construction = 128 if graph_bytes * 2 <= budget else HNSW_DEFAULT_EF_CONSTRUCTION
+        return AnnIndexPlan(
+            method='hnsw',
+            params={'m': m, 'ef_construction': ef_construction},
+            reason=(f"rows={row_count:,} dims={dimensions} graph~{graph_bytes // (1024 ** 2)}MB "
+                    f"maintenance_work_mem={maintenance_work_mem_bytes // (1024 ** 2)}MB"),
+            recommended_ef_search=max(40, ef_construction // 2),
+        )
+    
+    if row_count <= 1_000_000:
+        lists = row_count // 1000
+    else:
+        lists = int(math.sqrt(row_count))
+    
+    vector_bytes = dimensions * 4 + 8
+    memory_lists = budget // (vector_bytes * (IVFFLAT_SAMPLES_PER_LIST + 1))
+    lists = max(1, min(max(lists, 10), memory_lists, IVFFLAT_MAX_LISTS))
+    return AnnIndexPlan(
+        method='ivfflat',
+        params={'lists': lists},
+        reason=(f"rows={row_count:,} dims={dimensions} "
+                f"maintenance_work_mem={maintenance_work_mem_bytes // (1024 ** 2)}MB"),
+        recommended_probes=max(1, round(math.sqrt(lists))),
+    )
+
+
+def get_vector_columns(conn) -> List[Tuple[str, int]]:
+    """
+    List (table, dimensions) for every public table with a VECTOR embedding column.
+    
+    Covers segments (legacy), segment_embeddings_{dim} and answer_cache_embeddings*.
+    Columns declared without a fixed dimension are skipped (they can't be indexed).
+    """
+    with _plain_cursor(conn) as cur:
+        cur.execute("""
+            SELECT c.relname, a.atttypmod
+            FROM pg_attribute a
+            JOIN pg_class c ON c.oid = a.attrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            JOIN pg_type t ON t.oid = a.atttypid
+            WHERE n.nspname = 'public'
+              AND c.relkind = 'r'
+              AND t.typname = 'vector'
+              AND a.attname = 'embedding'
+              AND NOT a.attisdropped
+              AND a.atttypmod > 0
+            ORDER BY c.relname
+        """)
+        return [(row[0], int(row[1])) for row in cur.fetchall()]
+
+
+def get_embedding_indexes(conn, table_name: str) -> List[Dict[str, Any]]:
+    """
+    List ANN indexes on a table's embedding column with their access method and opclass.
+    """
+    with _plain_cursor(conn) as cur:
+        cur.execute("""
+            SELECT ic.relname, am.amname, opc.opcname, pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            JOIN pg_class ic ON ic.oid = i.indexrelid
+            JOIN pg_am am ON am.oid = ic.relam
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+            JOIN pg_opclass opc ON opc.oid = i.indclass[0]
+            WHERE i.indrelid = %s::regclass
+              AND a.attname = 'embedding'
+              AND am.amname IN ('ivfflat', 'hnsw')
+        """, [table_name])
+        return [
+            {'name': row[0], 'method': row[1], 'opclass': row[2], 'definition': row[3]}
+            for row in cur.fetchall()
+        ]
+
+
+def get_vector_column_dimensions(conn, table_name: str) -> int:
+    """Return the declared dimensions of a table's embedding column."""
+    with _plain_cursor(conn) as cur:
+        cur.execute("""
+            SELECT atttypmod FROM pg_attribute
+            WHERE attrelid = %s::regclass AND attname = 'embedding' AND NOT attisdropped
+        """, [table_name])
+        row = cur.fetchone()
+        if not row or row[0] <= 0:
+            raise EmbeddingStorageError(f"{table_name}.embedding has no fixed vector dimension")
+        return int(row[0])
+
+
+@contextmanager
+def _autocommit(conn):
+    """
+    Run a block in autocommit mode (needed for CREATE/DROP INDEX CONCURRENTLY).
+    
+    Commits any open transaction first. Works on pooled connections too: the
+    pool proxy only forwards attribute reads, so the flag is set on the raw
+    connection.
+    """
+    raw = getattr(conn, 'raw', conn)
+    conn.commit()
+    previous = raw.autocommit
+    raw.autocommit = True
+    try:
+        yield
+    finally:
+        raw.autocommit = previous
+
+
+def ensure_cosine_ann_index(conn, table_name: str, dimensions: Optional[int] = None,
+                            method: str = 'auto', rebuild: bool = False) -> Dict[str, Any]:
+    """
+    Make sure a table's embedding column has a vector_cosine_ops ANN index.
+    
+    ANN indexes with any other opclass are dropped: the planner can't use them for
+    ORDER BY embedding <=> query, so they only cost write amplification.
+    An existing cosine index is kept unless rebuild=True or it uses a different
+    method than the one explicitly requested.
+    
+    Indexes are built and dropped CONCURRENTLY in autocommit mode, and the
+    old index is only dropped once its replacement is valid, so reads and
+    writes on a live table (e.g. answer_cache_embeddings_* from the API's
+    compaction task) are never blocked for the length of a build.
+    
+    Args:
+        conn: Database connection
+        table_name: Table with an `embedding VECTOR(N)` column
+        dimensions: Vector dimensions (looked up from the catalog if omitted)
+        method: 'hnsw', 'ivfflat', or 'auto' (see plan_ann_index)
+        rebuild: Build a new cosine index and swap it in even if one exists
+        
+    Returns:
+        Dict describing what was dropped/created
+    """
+    if dimensions is None:
+        dimensions = get_vector_column_dimensions(conn, table_name)
+    
+    summary = {'table': table_name, 'dropped': [], 'created': None, 'kept': None, 'skipped': None}
+    if dimensions > PGVECTOR_MAX_INDEX_DIMENSIONS:
+        summary['skipped'] = f"{dimensions} dims exceeds pgvector index limit ({PGVECTOR_MAX_INDEX_DIMENSIONS})"
+        logger.warning(f"{table_name}: {summary['skipped']}, searches will use exact scans")
+        return summary
+    
+    indexes = get_embedding_indexes(conn, table_name)
+    unusable = [idx for idx in indexes if idx['opclass'] != COSINE_OPCLASS]
+    cosine = [idx for idx in indexes if idx['opclass'] == COSINE_OPCLASS]
+    keep = bool(cosine) and not rebuild and method in ('auto', cosine[0]['method'])
+    
+    plan = None
+    if not keep:
+        plan = plan_ann_index(
+            estimate_row_count(conn, table_name),
+            dimensions,
+            get_maintenance_work_mem_bytes(conn),
+            method,
+        )
+    
+    with _autocommit(conn), _plain_cursor(conn) as cur:
+        if keep:
+            summary['kept'] = cosine[0]['name']
+            logger.info(f"{table_name}: keeping cosine {cosine[0]['method']} index {cosine[0]['name']}")
+        else:
+            index_name = f"idx_{table_name}_embedding_{plan.method}"
+            replaced = {idx['name'] for idx in indexes}
+            # Build next to the index being replaced, then take over its name
+            build_name = f"{index_name}_new" if index_name in replaced else index_name
+            cur.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{build_name}"')
+            
+            logger.info(f"Creating {plan.method} index {index_name} ({plan.with_clause()}) - {plan.reason}")
+            try:
+                cur.execute(f"""
+                    CREATE INDEX CONCURRENTLY {build_name}
+                    ON {table_name}
+                    USING {plan.method} (embedding {COSINE_OPCLASS})
+                    WITH ({plan.with_clause()})
+                """)
+            except Exception:
+                # A failed concurrent build leaves an INVALID index behind
+                cur.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{build_name}"')
+                raise
+            
+            for idx in cosine:
+                if idx['name'] == build_name:
+                    continue  # leftover from an interrupted rebuild, already dropped
+                logger.info(f"Dropping {idx['name']} on {table_name}: replaced by {index_name}")
+                cur.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{idx["name"]}"')
+                summary['dropped'].append(idx['name'])
+        
+        for idx in unusable:
+            logger.info(f"Dropping {idx['name']} on {table_name}: opclass {idx['opclass']} "
+                        f"is unusable for cosine search")
+            cur.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{idx["name"]}"')
+            summary['dropped'].append(idx['name'])
+        
+        if keep:
+            return summary
+        
+        if build_name != index_name:
+            cur.execute(f"ALTER INDEX {build_name} RENAME TO {index_name}")
+        cur.execute(f"COMMENT ON INDEX {index_name} IS %s",
+                    [f"Cosine {plan.method} index ({plan.with_clause()}); {plan.reason}"])
+        cur.execute(f"ANALYZE {table_name}")
+    
+    summary['created'] = {
+        'name': index_name,
+        'method': plan.method,
+        'params': plan.params,
+        'recommended_probes': plan.recommended_probes,
+        'recommended_ef_search': plan.recommended_ef_search,
+    }
+    logger.info(f"✅ Created cosine {plan.method} index {index_name}")
+    return summary
+
+
+def ann_search_settings_sql(probes: Optional[int] = None, ef_search: Optional[int] = None,
+                            top_k: Optional[int] = None) -> Tuple[str, List[str]]:
+    """
+    Build one statement that sets pgvector's per-query recall knobs.
+    
+    Uses set_config(..., is_local=true), so values revert at commit/rollback and
+    never leak to the next user of a pooled connection. Only the setting for
+    the index method actually in use has any effect; setting both is harmless.
+    Search paths prepend the statement to their vector query ("<settings>;
+    <query>"), so it costs no extra round trip.
+    
+    Args:
+        probes: ivfflat.probes (lists scanned per query)
+        ef_search: hnsw.ef_search (candidate list size)
+        top_k: LIMIT of the upcoming query; HNSW can't return more than ef_search rows
+        
+    Returns:
+        (sql ending in ';', params), or ('', []) if there is nothing to set
+    """
+    calls, params = [], []
+    if probes:
+        calls.append("set_config('ivfflat.probes', %s, true)")
+        params.append(str(int(probes)))
+    if ef_search:
+        calls.append("set_config('hnsw.ef_search', %s, true)")
+        params.append(str(min(1000, max(int(ef_search), int(top_k or 0)))))
+    if not calls:
+        return '', []
+    return f"SELECT {', '.join(calls)};", params
+
+
+def apply_ann_search_settings(cur, probes: Optional[int] = None, ef_search: Optional[int] = None,
+                              top_k: Optional[int] = None) -> None:
+    """
+    Set pgvector's per-query recall knobs for the current transaction in one statement.
+    
+    See ann_search_settings_sql(); prefer prepending that to the query itself.
+    
+    Args:
+        cur: Cursor on a connection with an open transaction
+        probes: ivfflat.probes (lists scanned per query)
+        ef_search: hnsw.ef_search (candidate list size)
+        top_k: LIMIT of the upcoming query
+    """
+    sql, params = ann_search_settings_sql(probes, ef_search, top_k)
+    if sql:
+        cur.execute(sql, params)
+
+
+def _find_index_scan(node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Depth-first search of an EXPLAIN (FORMAT JSON) plan for an index scan node."""
+    if node.get('Index Name'):
+        return node
+    for child in node.get('Plans', []):
+        found = _find_index_scan(child)
+        if found:
+            return found
+    return None
+
+
+def explain_ann_search(conn, table_name: str, dimensions: Optional[int] = None,
+                       model_key: Optional[str] = None, top_k: int = 10,
+                       probes: Optional[int] = None, ef_search: Optional[int] = None) -> Dict[str, Any]:
+    """
+    EXPLAIN a representative top-k cosine query and report whether an ANN index is used.
+    
+    Args:
+        conn: Database connection
+        table_name: Embedding table to check
+        dimensions: Vector dimensions (looked up from the catalog if omitted)
+        model_key: Optional model_key filter, as used by the search endpoints
+        top_k: LIMIT for the probe query
+        probes / ef_search: Per-query settings to apply before EXPLAIN
+        
+    Returns:
+        Dict with uses_ann_index, index_name, node_type and the raw plan
+    """
+    if dimensions is None:
+        dimensions = get_vector_column_dimensions(conn, table_name)
+    
+    probe_vector = str([1.0 / math.sqrt(dimensions)] * dimensions)
+    where = "WHERE model_key = %s" if model_key else ""
+    params = [model_key] if model_key else []
+    ann_names = {idx['name'] for idx in get_embedding_indexes(conn, table_name)
+                 if idx['opclass'] == COSINE_OPCLASS}
+    
+    with _plain_cursor(conn) as cur:
+        if conn.autocommit:
+            cur.execute("BEGIN")
+        try:
+            apply_ann_search_settings(cur, probes, ef_search, top_k)
+            cur.execute(f"""
+                EXPLAIN (FORMAT JSON)
+                SELECT id FROM {table_name}
+                {where}
+                ORDER BY embedding <=> %s::vector
+                LIMIT %s
+            """, params + [probe_vector, top_k])
+            raw = cur.fetchone()[0]
+        finally:
+            if conn.autocommit:
+                cur.execute("ROLLBACK")
+            else:
+                conn.rollback()
+    
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]['Plan']
+    scan = _find_index_scan(plan)
+    index_name = scan.get('Index Name') if scan else None
+    return {
+        'table': table_name,
+        'uses_ann_index': index_name in ann_names,
+        'index_name': index_name,
+        'node_type': scan.get('Node Type') if scan else plan.get('Node Type'),
+        'plan': plan,
+    }
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Embedding Queue Worker
+
+Drains embedding_queue, filled by `ingest_youtube.py --embed-later`, in large
+batches: claim the oldest pending segments for the active model (FOR UPDATE
+SKIP LOCKED), embed their texts in one generate_embeddings call, write
+segments.embedding and segment_embeddings_{dim}, and delete the claimed
+entries, all in one transaction. See scripts/common/embedding_queue.py.
+
+Run several workers (processes or machines) against the same database to
+catch up faster; they never claim the same segment.
+
+Usage:
+    # Drain the queue and exit
+    python -m scripts.embedding_worker
+
+    # Keep polling for new work (e.g. alongside an --embed-later ingest)
+    python -m scripts.embedding_worker --follow
+
+    # Show pending / parked entries per model
+    python -m scripts.embedding_worker --status
+
+Environment:
+    DATABASE_URL: PostgreSQL connection string
+    EMBEDDING_WORKER_BATCH_SIZE: Segments per claim (default: BATCH_SIZE or 1024)
+    EMBEDDING_QUEUE_MAX_ATTEMPTS: Failed claims before an entry is parked (default: 5)
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv()
+
+from scripts.common.embedding_queue import claim_batch, complete_batch, queue_depth, record_failure
+from scripts.common.segments_database import SegmentsDatabase, active_model_key
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = int(os.getenv('EMBEDDING_WORKER_BATCH_SIZE', os.getenv('BATCH_SIZE', '1024')))
+
+
+class EmbeddingQueueWorker:
+    """Claims, embeds and completes embedding_queue batches for one model"""
+
+    def __init__(self, segments_db: SegmentsDatabase, embedder, model_key: str,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.segments_db = segments_db
+        self.embedder = embedder
+        self.model_key = model_key
+        self.batch_size = batch_size
+        self.embedded = 0
+        self.failed = 0
+        self.batches = 0
+        self._segment_table: Optional[str] = None
+        self._segment_table_checked = False
+
+    def run_batch(self) -> int:
+        """
+        Process one batch.
+
+        Returns:
+            Segments claimed (0 when nothing is pending for this model)
+        """
+        with self.segments_db.pooled_connection() as conn:
+            with conn.cursor() as cur:
+                if not self._segment_table_checked:
+                    self._segment_table = self.segments_db.embedding_table_for(cur, self.model_key)
+                    self._segment_table_checked = True
+                claimed = claim_batch(cur, self.model_key, self.batch_size)
+                if not claimed:
+                    conn.rollback()
+                    return 0
+                segment_ids = [segment_id for segment_id, _ in claimed]
+                try:
+                    start_time = time.time()
+                    embeddings = self.embedder.generate_embeddings([text for _, text in claimed])
+                    if len(embeddings) != len(claimed):
+                        raise ValueError(f"Embedder returned {len(embeddings)} embeddings for {len(claimed)} texts")
+                    completed = complete_batch(
+                        cur, self.model_key, list(zip(segment_ids, embeddings)), self._segment_table
+                    )
+                    conn.commit()
+                except Exception as e:
+                    logger.error(f"❌ Embedding batch of {len(claimed)} segments failed: {e}", exc_info=True)
+                    conn.rollback()
+                    record_failure(cur, self.model_key, segment_ids, f"{type(e).__name__}: {e}")
+                    conn.commit()
+                    self.failed += len(claimed)
+                    return len(claimed)
+
+        elapsed = time.time() - start_time
+        self.batches += 1
+        self.embedded += completed
+        logger.info(f"⚡ Embedded {completed} segments in {elapsed:.2f}s "
+                    f"({completed / elapsed if elapsed > 0 else 0:.1f} texts/sec, total {self.embedded})")
+        return len(claimed)
+
+    def run(self, follow: bool = False, poll_seconds: float = 10.0,
+            limit: Optional[int] = None) -> None:
+        """Drain the queue; with follow, keep polling once it is empty"""
+        while limit is None or self.embedded + self.failed < limit:
+            if self.run_batch():
+                continue
+            if not follow:
+                break
+            time.sleep(poll_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Embed segments queued by ingest_youtube.py --embed-later',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Segments per claim and embedding call (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--follow', action='store_true', help='Keep polling once the queue is empty')
+    parser.add_argument('--poll-seconds', type=float, default=10.0,
+                        help='Wait between polls with --follow (default: 10)')
+    parser.add_argument('--limit', type=int, default=None, help='Stop after this many segments')
+    parser.add_argument('--status', action='store_true', help='Print queue depth per model and exit')
+    args = parser.parse_args()
+
+    db_url = os.getenv('DATABASE_URL')
+    if not db_url:
+        print("DATABASE_URL is not set")
+        return 1
+
+    segments_db = SegmentsDatabase(db_url, pool_size=1)
+    try:
+        if args.status:
+            with segments_db.pooled_connection() as conn:
+                with conn.cursor() as cur:
+                    depth = queue_depth(cur)
+                conn.rollback()
+            if not depth:
+                print("embedding_queue is empty")
+            for model_key, counts in sorted(depth.items()):
+                print(f"{model_key:<24} pending={counts['pending']:<8} parked={counts['parked']}")
+            return 0
+
+        from scripts.common.embeddings import EmbeddingGenerator
+
+        model_key = active_model_key()
+        worker = EmbeddingQueueWorker(segments_db, EmbeddingGenerator(), model_key, args.batch_size)
+        logger.info(f"🚀 Embedding worker for {model_key} (batch size {args.batch_size})")
+        try:
+            worker.run(follow=args.follow, poll_seconds=args.poll_seconds, limit=args.limit)
+        except KeyboardInterrupt:
+            logger.info("⚠️ Interrupted; unfinished claims return to the queue")
+        logger.info(f"🏁 Embedded {worker.embedded} segments in {worker.batches} batches "
+                    f"({worker.failed} failed)")
+        return 0
+    finally:
+        segments_db.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -86,7 +86,8 @@ from scripts.common.local_file_lister import LocalFileLister
 from scripts.common.proxy_manager import ProxyConfig, ProxyManager
 from scripts.common.enhanced_transcript_fetch import EnhancedTranscriptFetcher  
 from scripts.common.database_upsert import DatabaseUpserter
-from scripts.common.segments_database import SegmentsDatabase
+from scripts.common.segments_database import ProcessedVideos, SegmentsDatabase
+from scripts.common.embedding_accumulator import EmbeddingBatchAccumulator
 from scripts.common.embeddings import EmbeddingGenerator
 # ChunkData not needed - using segments directly
 
@@ -231,6 +232,8 @@ class IngestionConfig:
     io_concurrency: int = 24   # I/O threads (will read from .env)
     asr_concurrency: int = 4   # ASR workers (will read from .env)
     db_concurrency: int = 12   # DB/embedding threads (will read from .env)
+    db_pool_size: Optional[int] = None  # Segments DB connections (default: db_concurrency + 2)
+    bulk_loader: Optional[str] = None  # 'values' or 'copy' (binary COPY + merge; SEGMENTS_BULK_LOADER)
     
     # Legacy concurrency (for backward compatibility)
     concurrency: int = 4
@@ -254,8 +257,10 @@ class IngestionConfig:
     use_ytdlp_nightly: bool = False  # Use nightly build from GitHub
     
     # RTX 5080 optimized embedding options for maximum throughput - FROM .ENV
-    embed_later: bool = False  # Enqueue IDs for separate embedding worker
+    embed_later: bool = False  # Store segments unembedded and enqueue them for scripts/embedding_worker.py
     embedding_batch_size: int = 1024  # Batch size (will read from .env in __post_init__)
+    embed_accumulate_texts: Optional[int] = None  # Texts gathered across videos per embedding call (default: embedding_batch_size)
+    embed_accumulate_max_latency_s: float = 5.0   # Flush a partial cross-video batch after this long
     
     # Audio storage configuration
     store_audio_locally: bool = False  # Store downloaded audio files locally (default: False to save disk space)
@@ -306,8 +311,21 @@ class IngestionConfig:
             self.asr_concurrency = int(os.getenv('ASR_WORKERS'))
         if os.getenv('DB_WORKERS'):
             self.db_concurrency = int(os.getenv('DB_WORKERS'))
+        if os.getenv('SEGMENTS_DB_POOL_SIZE'):
+            self.db_pool_size = int(os.getenv('SEGMENTS_DB_POOL_SIZE'))
+        if self.db_pool_size is None:
+            # One connection per DB worker, plus headroom for I/O workers' skip checks
+            self.db_pool_size = self.db_concurrency + 2
+        if self.bulk_loader is None:
+            self.bulk_loader = os.getenv('SEGMENTS_BULK_LOADER', 'values').lower()
         if os.getenv('BATCH_SIZE'):
             self.embedding_batch_size = int(os.getenv('BATCH_SIZE'))
+        if os.getenv('EMBED_ACCUMULATE_TEXTS'):
+            self.embed_accumulate_texts = int(os.getenv('EMBED_ACCUMULATE_TEXTS'))
+        if self.embed_accumulate_texts is None:
+            self.embed_accumulate_texts = self.embedding_batch_size
+        if os.getenv('EMBED_ACCUMULATE_MAX_LATENCY_S'):
+            self.embed_accumulate_max_latency_s = float(os.getenv('EMBED_ACCUMULATE_MAX_LATENCY_S'))
         
         # Processing settings
         if os.getenv('SKIP_SHORTS'):
@@ -478,6 +496,11 @@ class ProcessingStats:
     monologue_fast_path_used: int = 0
     content_hash_skips: int = 0
     embedding_batches: int = 0
+    embedding_batch_texts: int = 0     # Texts embedded across all cross-video batches
+    embedding_batch_videos: int = 0    # Videos folded into those batches
+    embedding_batch_capacity: int = 0  # Sum of batch targets (fill ratio denominator)
+    embedding_batches_timed_out: int = 0  # Flushed partial by max latency or shutdown
+    embeddings_enqueued: int = 0  # Segments left for scripts/embedding_worker.py (--embed-later)
     
     # Performance metrics for 1200h in 24h target
     total_audio_duration_s: float = 0.0  # Total audio processed in seconds
@@ -485,6 +508,42 @@ class ProcessingStats:
     asr_processing_time_s: float = 0.0   # Time spent in ASR processing
     embedding_processing_time_s: float = 0.0  # Time spent generating embeddings
     
+    # Segments DB connection pool (SegmentsDatabase.pool_stats())
+    db_pool_size: int = 0
+    db_pool_peak_in_use: int = 0
+    db_pool_acquisitions: int = 0
+    db_pool_waits: int = 0
+    db_pool_avg_wait_ms: float = 0.0
+    db_pool_max_wait_ms: float = 0.0
+    db_video_transactions: int = 0
+    db_video_rollbacks: int = 0
+    
+    def record_db_pool(self, pool_stats: Dict[str, Any]):
+        """Copy segments DB pool metrics into the summary"""
+        self.db_pool_size = pool_stats.get('max_size', 0)
+        self.db_pool_peak_in_use = pool_stats.get('peak_in_use', 0)
+        self.db_pool_acquisitions = pool_stats.get('acquisitions', 0)
+        self.db_pool_waits = pool_stats.get('waits', 0)
+        self.db_pool_avg_wait_ms = pool_stats.get('avg_wait_ms', 0.0)
+        self.db_pool_max_wait_ms = pool_stats.get('max_wait_ms', 0.0)
+        self.db_video_transactions = pool_stats.get('video_transactions', 0)
+        self.db_video_rollbacks = pool_stats.get('video_rollbacks', 0)
+    
+    def record_embedding_batch(self, texts: int, videos: int, target: int, full: bool):
+        """Count one cross-video embedding call and how full it was"""
+        self.embedding_batches += 1
+        self.embedding_batch_texts += texts
+        self.embedding_batch_videos += videos
+        self.embedding_batch_capacity += target
+        if not full:
+            self.embedding_batches_timed_out += 1
+    
+    def embedding_batch_fill_ratio(self) -> float:
+        """Average texts per embedding call relative to the target (can exceed 1.0)"""
+        if self.embedding_batch_capacity > 0:
+            return self.embedding_batch_texts / self.embedding_batch_capacity
+        return 0.0
+    
     def add_audio_duration(self, duration_s: float):
         """Add processed audio duration"""
         self.total_audio_duration_s += duration_s
@@ -561,9 +620,20 @@ class ProcessingStats:
         if self.content_hash_skips > 0:
             logger.info(f"   📦 Content hash skips: {self.content_hash_skips}")
         if self.embedding_batches > 0:
-            logger.info(f"   🔤 Embedding batches: {self.embedding_batches}")
+            logger.info(f"   🔤 Embedding batches: {self.embedding_batches} "
+                        f"({self.embedding_batch_texts} texts from {self.embedding_batch_videos} videos, "
+                        f"fill {self.embedding_batch_fill_ratio():.0%}, "
+                        f"{self.embedding_batches_timed_out} flushed partial)")
+        if self.embeddings_enqueued > 0:
+            logger.info(f"   📥 Segments queued for embedding: {self.embeddings_enqueued} "
+                        f"(run scripts/embedding_worker.py to embed them)")
         
         logger.info(f"   📊 Queue peaks: I/O={self.io_queue_peak}, ASR={self.asr_queue_peak}, DB={self.db_queue_peak}")
+        if self.db_pool_acquisitions > 0:
+            logger.info(f"   🔌 DB pool: peak {self.db_pool_peak_in_use}/{self.db_pool_size} connections, "
+                        f"{self.db_pool_waits}/{self.db_pool_acquisitions} checkouts waited "
+                        f"(avg {self.db_pool_avg_wait_ms:.1f}ms, max {self.db_pool_max_wait_ms:.1f}ms)")
+            logger.info(f"   💾 Video transactions: {self.db_video_transactions} ({self.db_video_rollbacks} rolled back)")
         
         if self.total > 0:
             success_rate = (self.processed / self.total) * 100
@@ -595,7 +665,16 @@ class EnhancedYouTubeIngester:
         
         # Initialize components
         self.db = DatabaseUpserter(config.db_url)  # Keep for ingest_state tracking
-        self.segments_db = SegmentsDatabase(config.db_url)  # Use for segments storage
+        # Use for segments storage
+        self.segments_db = SegmentsDatabase(
+            config.db_url, pool_size=config.db_pool_size, bulk_loader=config.bulk_loader
+        )
+        self._processed_videos: Optional[ProcessedVideos] = None  # Bulk skip map for the listed batch
+        # Shared by the Tier C workers so one embedding call spans several videos
+        self._embedding_accumulator = EmbeddingBatchAccumulator(
+            target_texts=config.embed_accumulate_texts or config.embedding_batch_size,
+            max_latency_s=config.embed_accumulate_max_latency_s
+        )
         
         # Setup proxy manager
         proxy_config = ProxyConfig(
@@ -671,7 +750,7 @@ class EnhancedYouTubeIngester:
                     else:
                         # Try YYYY-MM-DD format
                         since_published = datetime.strptime(self.config.since_published, '%Y-%m-%d').replace(tzinfo=timezone.utc)
-                except ValueError as e:
+                except ValueError:
                     logger.error(f"Invalid since_published format: {self.config.since_published}. Use ISO8601 or YYYY-MM-DD")
                     raise
             
@@ -712,12 +791,13 @@ class EnhancedYouTubeIngester:
                 logger.info(f"🔍 Searching for {self.config.limit} unprocessed videos...")
                 unprocessed_videos = []
                 checked_count = 0
+                self.prefetch_processed_videos(videos)
                 
                 for video in videos:
                     checked_count += 1
                     # Check if video is already processed
-                    source_id, segment_count = self.segments_db.check_video_exists(video.video_id)
-                    if not source_id or segment_count == 0:
+                    segment_count = self._existing_segment_count(video.video_id)
+                    if segment_count == 0:
                         # This video is unprocessed
                         unprocessed_videos.append(video)
                         logger.debug(f"   Found unprocessed: {video.video_id} ({len(unprocessed_videos)}/{self.config.limit})")
@@ -812,6 +892,36 @@ class EnhancedYouTubeIngester:
         logger.info(f"Found {len(videos)} local files to process")
         return videos
     
+    def prefetch_processed_videos(self, videos: List[VideoInfo]) -> Optional[ProcessedVideos]:
+        """
+        Resolve already-processed videos for the whole batch in one query.
+        
+        should_skip_video() and process_single_video() read the result instead
+        of querying per video from the I/O workers.
+        """
+        if self.config.force_reprocess or not self.config.skip_existing or not videos:
+            return None
+        
+        known = self._processed_videos or ProcessedVideos()
+        missing = [v.video_id for v in videos if not known.covers(v.video_id)]
+        if not missing:
+            return self._processed_videos
+        try:
+            self._processed_videos = known.merged(self.segments_db.resolve_processed_videos(missing))
+        except Exception as e:
+            logger.warning(f"Bulk processed-video lookup failed, falling back to per-video checks: {e}")
+            return self._processed_videos
+        processed = sum(1 for v in videos if self._processed_videos.is_processed(v.video_id))
+        logger.info(f"🔍 {processed}/{len(videos)} listed videos already processed")
+        return self._processed_videos
+    
+    def _existing_segment_count(self, video_id: str) -> int:
+        """Segments already stored for a video (prefetched skip map, else one lookup)"""
+        if self._processed_videos is not None and self._processed_videos.covers(video_id):
+            return self._processed_videos.segment_count(video_id)
+        source_id, segment_count = self.segments_db.check_video_exists(video_id)
+        return segment_count if source_id else 0
+    
     def should_skip_video(self, video: VideoInfo) -> Tuple[bool, str]:
         """Check if video should be skipped"""
         # Skip check if force_reprocess is enabled
@@ -820,8 +930,8 @@ class EnhancedYouTubeIngester:
         
         # Check existing processing state if skip_existing is enabled (default)
         if self.config.skip_existing:
-            source_id, segment_count = self.segments_db.check_video_exists(video.video_id)
-            if source_id and segment_count > 0:
+            segment_count = self._existing_segment_count(video.video_id)
+            if segment_count > 0:
                 return True, f"already processed ({segment_count} segments)"
         
         return False, ""
@@ -833,8 +943,8 @@ class EnhancedYouTubeIngester:
         try:
             # Check if video already exists in segments database (unless force_reprocess or skip_existing=False)
             if not self.config.force_reprocess and self.config.skip_existing:
-                source_id, segment_count = self.segments_db.check_video_exists(video_id)
-                if source_id and segment_count > 0:
+                segment_count = self._existing_segment_count(video_id)
+                if segment_count > 0:
                     logger.info(f"⚡ Skipping {video_id}: already processed ({segment_count} segments)")
                     self.stats.skipped += 1
                     return False
@@ -936,8 +1046,11 @@ class EnhancedYouTubeIngester:
             # Step 3: Generate embeddings (skip if disabled for speed testing)
             skip_embeddings = os.getenv('SKIP_TEXT_EMBEDDINGS', 'false').lower() == 'true'
             
-            if skip_embeddings:
-                logger.info(f"⚡ Skipping text embeddings for speed testing")
+            if skip_embeddings or self.config.embed_later:
+                if self.config.embed_later:
+                    logger.info(f"📥 Deferring text embeddings to the embedding queue")
+                else:
+                    logger.info(f"⚡ Skipping text embeddings for speed testing")
                 for segment in segments:
                     segment.embedding = None
             else:
@@ -959,75 +1072,82 @@ class EnhancedYouTubeIngester:
             else:
                 source_type = 'youtube'  # Default for yt-dlp
             
-            source_id = self.segments_db.upsert_source(
-                video_id, 
-                video.title,
-                source_type=source_type,
-                metadata={'provenance': provenance, **extra_metadata},
-                published_at=video.published_at,
-                duration_s=video.duration_s,
-                view_count=video.view_count,
-                channel_name=video.channel_name,
-                channel_url=video.channel_url,
-                thumbnail_url=video.thumbnail_url,
-                like_count=video.like_count,
-                comment_count=video.comment_count,
-                description=video.description,
-                tags=video.tags,
-                url=video.url
-            )
+            # One transaction per video: source, segments, dual-write and classification
+            with self.segments_db.video_transaction(video_id):
+                self.segments_db.upsert_source(
+                    video_id, 
+                    video.title,
+                    source_type=source_type,
+                    metadata={'provenance': provenance, **extra_metadata},
+                    published_at=video.published_at,
+                    duration_s=video.duration_s,
+                    view_count=video.view_count,
+                    channel_name=video.channel_name,
+                    channel_url=video.channel_url,
+                    thumbnail_url=video.thumbnail_url,
+                    like_count=video.like_count,
+                    comment_count=video.comment_count,
+                    description=video.description,
+                    tags=video.tags,
+                    url=video.url
+                )
             
-            # Convert TranscriptSegment objects to dictionaries for database insertion
-            def safe_float_convert(value, default=0.0):
-                """Convert numpy/other numeric types to Python float"""
-                if value is None:
-                    return default
-                try:
-                    return float(value)
-                except (ValueError, TypeError):
-                    return default
-            
-            segment_dicts = []
-            for segment in segments:
-                if hasattr(segment, '__dict__'):
-                    # Convert TranscriptSegment object to dictionary with proper type conversion
-                    segment_dict = {
-                        'start': safe_float_convert(segment.start),
-                        'end': safe_float_convert(segment.end),
-                        'text': str(segment.text),
-                        'speaker_label': str(segment.speaker_label or 'Guest'),  # Default to Guest
-                        'speaker_confidence': safe_float_convert(segment.speaker_confidence, None),
-                        'avg_logprob': safe_float_convert(segment.avg_logprob, None),
-                        'compression_ratio': safe_float_convert(segment.compression_ratio, None),
-                        'no_speech_prob': safe_float_convert(segment.no_speech_prob, None),
-                        'temperature_used': safe_float_convert(segment.temperature_used, 0.0),
-                        're_asr': bool(segment.re_asr),
-                        'is_overlap': bool(segment.is_overlap),
-                        'needs_refinement': bool(segment.needs_refinement),
-                        'embedding': getattr(segment, 'embedding', None),  # Text embedding (1536-dim)
-                        'voice_embedding': getattr(segment, 'voice_embedding', None)  # Voice embedding (192-dim)
-                    }
-                    segment_dicts.append(segment_dict)
-                else:
-                    # Already a dictionary
-                    segment_dicts.append(segment)
+                # Convert TranscriptSegment objects to dictionaries for database insertion
+                def safe_float_convert(value, default=0.0):
+                    """Convert numpy/other numeric types to Python float"""
+                    if value is None:
+                        return default
+                    try:
+                        return float(value)
+                    except (ValueError, TypeError):
+                        return default
             
-            # Insert segments with speaker attribution - RTX 5080 DEBUG
-            logger.info(f"🔍 DEBUG: Attempting to insert {len(segment_dicts)} segments for {video_id}")
-            logger.debug(f"🔍 Sample segment: {segment_dicts[0] if segment_dicts else 'None'}")
+                segment_dicts = []
+                for segment in segments:
+                    if hasattr(segment, '__dict__'):
+                        # Convert TranscriptSegment object to dictionary with proper type conversion
+                        segment_dict = {
+                            'start': safe_float_convert(segment.start),
+                            'end': safe_float_convert(segment.end),
+                            'text': str(segment.text),
+                            'speaker_label': str(segment.speaker_label or 'Guest'),  # Default to Guest
+                            'speaker_confidence': safe_float_convert(segment.speaker_confidence, None),
+                            'avg_logprob': safe_float_convert(segment.avg_logprob, None),
+                            'compression_ratio': safe_float_convert(segment.compression_ratio, None),
+                            'no_speech_prob': safe_float_convert(segment.no_speech_prob, None),
+                            'temperature_used': safe_float_convert(segment.temperature_used, 0.0),
+                            're_asr': bool(segment.re_asr),
+                            'is_overlap': bool(segment.is_overlap),
+                            'needs_refinement': bool(segment.needs_refinement),
+                            'embedding': getattr(segment, 'embedding', None),  # Text embedding (1536-dim)
+                            'voice_embedding': getattr(segment, 'voice_embedding', None)  # Voice embedding (192-dim)
+                        }
+                        segment_dicts.append(segment_dict)
+                    else:
+                        # Already a dictionary
+                        segment_dicts.append(segment)
             
-            try:
-                segment_count = self.segments_db.batch_insert_segments(
-                    segment_dicts, 
-                    video_id,
-                    chaffee_only_storage=self.config.chaffee_only_storage,
-                    embed_chaffee_only=self.config.embed_chaffee_only
-                )
-                logger.info(f"✅ Successfully inserted {segment_count} segments for {video_id}")
-            except Exception as e:
-                logger.error(f"❌ Segment insertion failed for {video_id}: {e}")
-                logger.debug(f"❌ Error details: {type(e).__name__}: {str(e)}")
-                raise
+                # Insert segments with speaker attribution - RTX 5080 DEBUG
+                logger.info(f"🔍 DEBUG: Attempting to insert {len(segment_dicts)} segments for {video_id}")
+                logger.debug(f"🔍 Sample segment: {segment_dicts[0] if segment_dicts else 'None'}")
+            
+                try:
+                    segment_count = self.segments_db.batch_insert_segments(
+                        segment_dicts, 
+                        video_id,
+                        chaffee_only_storage=self.config.chaffee_only_storage,
+                        embed_chaffee_only=self.config.embed_chaffee_only
+                    )
+                    logger.info(f"✅ Successfully inserted {segment_count} segments for {video_id}")
+                except Exception as e:
+                    logger.error(f"❌ Segment insertion failed for {video_id}: {e}")
+                    logger.debug(f"❌ Error details: {type(e).__name__}: {str(e)}")
+                    raise
+            
+                if self.config.embed_later:
+                    self.stats.embeddings_enqueued += self.segments_db.enqueue_embeddings(
+                        video_id, embed_chaffee_only=self.config.embed_chaffee_only
+                    )
             
             self.stats.processed += 1
             self.stats.segments_created += segment_count
@@ -1147,7 +1267,6 @@ class EnhancedYouTubeIngester:
         
         # Shared state for coordination
         stop_event = threading.Event()
-        active_threads = threading.active_count()
         stats_lock = threading.Lock()
         
         # Progress tracking
@@ -1434,17 +1553,20 @@ class EnhancedYouTubeIngester:
     def _db_worker(self, asr_queue: queue.Queue, stop_event: threading.Event,
                    stats_lock: threading.Lock, update_progress_func, progress_bar) -> None:
         """Tier C: DB/embedding worker with batched operations"""
-        embedding_batch = []
-        total_texts = 0  # FIXED: Count texts, not videos!
+        accumulator = self._embedding_accumulator
         
         while not stop_event.is_set():
             try:
-                # Get next item from ASR queue
+                # Get next item from ASR queue, waking up in time to flush a stale batch
+                wait_s = accumulator.seconds_until_due()
                 try:
-                    item = asr_queue.get(timeout=1.0)
+                    item = asr_queue.get(timeout=1.0 if wait_s is None else min(1.0, max(wait_s, 0.05)))
                     if item is None:  # Poison pill
                         break
                 except queue.Empty:
+                    due = accumulator.take_due()
+                    if due:
+                        self._flush_embedding_batch(due, False, stats_lock, update_progress_func, progress_bar)
                     continue
                 
                 try:
@@ -1476,44 +1598,95 @@ class EnhancedYouTubeIngester:
                             pass
                     continue
                 
-                # Process embeddings immediately (per-video for real-time insertion)
                 if self.config.embed_later:
-                    # Queue for later processing
-                    self._enqueue_for_embedding(video.video_id, segments)
-                else:
-                    # Process each video immediately to avoid DB insertion delays
-                    # Batching happens inside _process_embedding_batch for GPU efficiency
-                    embedding_batch = [(video, segments, method, metadata)]
-                    self._process_embedding_batch(embedding_batch, stats_lock)
-                    with stats_lock:
-                        self.stats.embedding_batches += 1
-                
-                # Cleanup audio if needed
-                if self.config.cleanup_audio and audio_path and os.path.exists(audio_path):
-                    try:
-                        os.unlink(audio_path)
-                    except Exception as e:
-                        logger.debug(f"Failed to cleanup audio {audio_path}: {e}")
-                
-                # CRITICAL: Clear GPU cache after each video to prevent CUDA OOM
-                try:
-                    import torch
-                    if torch.cuda.is_available():
-                        torch.cuda.empty_cache()
-                except:
-                    pass
+                    # Store now; segments are enqueued in the same transaction
+                    # and embedded later by scripts/embedding_worker.py
+                    inserted = self._batch_insert_video_segments(
+                        video, segments, method, metadata, stats_lock, enqueue_embeddings=True
+                    )
+                    if inserted:
+                        self._count_speakers(video, segments, stats_lock)
+                        self._finish_video(audio_path, stats_lock, update_progress_func, progress_bar)
+                    else:
+                        self._fail_video(audio_path, stats_lock, update_progress_func, progress_bar)
+                    continue
                 
-                with stats_lock:
-                    self.stats.processed += 1
-                progress_bar.update(1)
-                update_progress_func()
+                # Gather videos until the batch reaches its text target; whichever
+                # worker fills it embeds and inserts the whole batch
+                full = accumulator.add(
+                    (video, segments, method, metadata, audio_path), self._embed_text_count(segments)
+                )
+                if full:
+                    self._flush_embedding_batch(full, True, stats_lock, update_progress_func, progress_bar)
+                else:
+                    due = accumulator.take_due()
+                    if due:
+                        self._flush_embedding_batch(due, False, stats_lock, update_progress_func, progress_bar)
                 
             except Exception as e:
                 logger.error(f"❌ DB worker error: {e}", exc_info=True)
                 with stats_lock:
                     self.stats.errors += 1
         
-        # No remaining batch to process - we process each video immediately
+        # Flush whatever is still buffered (the last worker out drains the rest)
+        remaining = accumulator.drain()
+        if remaining:
+            try:
+                self._flush_embedding_batch(remaining, False, stats_lock, update_progress_func, progress_bar)
+            except Exception as e:
+                logger.error(f"❌ DB worker error flushing final embedding batch: {e}", exc_info=True)
+                with stats_lock:
+                    self.stats.errors += 1
+    
+    def _flush_embedding_batch(self, items: List[Tuple], full: bool, stats_lock: threading.Lock,
+                               update_progress_func, progress_bar) -> None:
+        """Embed a cross-video batch in one call, insert per video, then finish or fail each video"""
+        batch = [(video, segments, method, metadata) for video, segments, method, metadata, _ in items]
+        texts = sum(self._embed_text_count(segments) for _, segments, _, _ in batch)
+        inserted = self._process_embedding_batch(batch, stats_lock)
+        with stats_lock:
+            self.stats.record_embedding_batch(
+                texts, len(batch), self._embedding_accumulator.target_texts, full
+            )
+        
+        # CRITICAL: Clear GPU cache after each batch to prevent CUDA OOM
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except:
+            pass
+        
+        for (*_, audio_path), ok in zip(items, inserted):
+            if ok:
+                self._finish_video(audio_path, stats_lock, update_progress_func, progress_bar)
+            else:
+                self._fail_video(audio_path, stats_lock, update_progress_func, progress_bar)
+    
+    def _finish_video(self, audio_path: Optional[str], stats_lock: threading.Lock,
+                      update_progress_func, progress_bar) -> None:
+        """Clean up a video's audio and count it as processed"""
+        if self.config.cleanup_audio and audio_path and os.path.exists(audio_path):
+            try:
+                os.unlink(audio_path)
+            except Exception as e:
+                logger.debug(f"Failed to cleanup audio {audio_path}: {e}")
+        
+        with stats_lock:
+            self.stats.processed += 1
+        progress_bar.update(1)
+        update_progress_func()
+    
+    def _fail_video(self, audio_path: Optional[str], stats_lock: threading.Lock,
+                    update_progress_func, progress_bar) -> None:
+        """Count a video whose segments were not inserted as an error, keeping its audio for a retry"""
+        if audio_path and os.path.exists(audio_path):
+            logger.warning(f"Keeping audio for failed video: {audio_path}")
+        
+        with stats_lock:
+            self.stats.errors += 1
+        progress_bar.update(1)
+        update_progress_func()
     
     def _download_and_prepare_audio(self, video: VideoInfo) -> Optional[str]:
         """Download audio-only and convert to 16kHz mono WAV"""
@@ -1753,8 +1926,29 @@ class EnhancedYouTubeIngester:
             logger.error(f"Whisper routing failed for {video.video_id}: {e}")
             return [], 'error', {'error': str(e)}
     
-    def _process_embedding_batch(self, batch: List[Tuple], stats_lock: threading.Lock) -> None:
-        """RTX 5080 optimized batch processing for embeddings (128-256 segments per batch)"""
+    def _should_embed_segment(self, segment) -> bool:
+        """Only embed Chaffee segments for search optimization (per spec)"""
+        speaker = segment.speaker_label if hasattr(segment, 'speaker_label') else segment.get('speaker_label', 'GUEST')
+        # CRITICAL: If speaker is None (speaker ID disabled), treat as Chaffee
+        return (
+            not self.config.embed_chaffee_only or
+            speaker in ['CH', 'CHAFFEE', 'Chaffee'] or
+            speaker is None
+        )
+    
+    def _embed_text_count(self, segments: List) -> int:
+        """Number of texts a video contributes to an embedding batch"""
+        return sum(1 for segment in segments if self._should_embed_segment(segment))
+    
+    def _process_embedding_batch(self, batch: List[Tuple], stats_lock: threading.Lock) -> List[bool]:
+        """
+        Embed a (possibly cross-video) batch in one call, then insert each video in its own transaction.
+        
+        Returns:
+            Per batch entry, whether that video's segments were inserted. A failed
+            embedding call fails every video in the batch.
+        """
+        inserted = [False] * len(batch)
         try:
             all_texts = []
             batch_info = []
@@ -1767,15 +1961,8 @@ class EnhancedYouTubeIngester:
                 
                 for segment in segments:
                     text = segment.text if hasattr(segment, 'text') else segment.get('text', '')
-                    speaker = segment.speaker_label if hasattr(segment, 'speaker_label') else segment.get('speaker_label', 'GUEST')
-                    
                     video_texts.append(text)
-                    
-                    # Only embed Chaffee segments for search optimization (per spec)
-                    # CRITICAL: If speaker is None (speaker ID disabled), treat as Chaffee
-                    if self.config.embed_chaffee_only and (speaker in ['CH', 'CHAFFEE', 'Chaffee'] or speaker is None):
-                        video_chaffee_texts.append(text)
-                    elif not self.config.embed_chaffee_only:
+                    if self._should_embed_segment(segment):
                         video_chaffee_texts.append(text)
                 
                 all_texts.extend(video_texts)
@@ -1785,7 +1972,8 @@ class EnhancedYouTubeIngester:
             # Generate embeddings in optimized batches (256 max for RTX 5080)
             embeddings = []
             if all_texts:
-                logger.info(f"💾 Processing embedding batch: {len(all_texts)} total texts, {len(chaffee_texts)} Chaffee texts")
+                logger.info(f"💾 Processing embedding batch: {len(batch)} videos, {len(all_texts)} total texts, "
+                            f"{len(chaffee_texts)} Chaffee texts")
                 start_time = time.time()
                 
                 # Use Chaffee-only texts for embedding if configured
@@ -1795,24 +1983,19 @@ class EnhancedYouTubeIngester:
                     embeddings = self.embedder.generate_embeddings(embed_texts)
                     
                     embedding_time = time.time() - start_time
+                    with stats_lock:
+                        self.stats.embedding_processing_time_s += embedding_time
                     texts_per_second = len(embed_texts) / embedding_time if embedding_time > 0 else 0
                     logger.info(f"⚡ Embedding generation: {len(embed_texts)} texts in {embedding_time:.2f}s "
                               f"({texts_per_second:.1f} texts/sec)")
                 
                 # Distribute embeddings back to segments and insert to DB
                 embedding_idx = 0
-                for video, segments, method, metadata, total_texts, chaffee_count in batch_info:
+                for i, (video, segments, method, metadata, _, _) in enumerate(batch_info):
                     # Attach embeddings to segments (only Chaffee if configured)
                     for segment in segments:
-                        speaker = segment.speaker_label if hasattr(segment, 'speaker_label') else segment.get('speaker_label', 'GUEST')
-                        
                         # Only assign embedding if this segment should be embedded
-                        # CRITICAL: If speaker is None (speaker ID disabled), treat as Chaffee
-                        should_embed = (
-                            not self.config.embed_chaffee_only or 
-                            speaker in ['CH', 'CHAFFEE', 'Chaffee'] or
-                            speaker is None
-                        )
+                        should_embed = self._should_embed_segment(segment)
                         
                         if should_embed and embedding_idx < len(embeddings):
                             if hasattr(segment, '__dict__'):
@@ -1828,71 +2011,91 @@ class EnhancedYouTubeIngester:
                                 segment['embedding'] = None
                     
                     # Insert to database using batch operations
-                    self._batch_insert_video_segments(video, segments, method, metadata, stats_lock)
-                    
-                    # Count speakers from OPTIMIZED segments only
-                    # Note: segments here are AFTER optimization (e.g., 77 not 669)
-                    chaffee_count = 0
-                    guest_count = 0
-                    unknown_count = 0
-                    
-                    for segment in segments:
-                        speaker = segment.get('speaker_label', 'Guest') if isinstance(segment, dict) else getattr(segment, 'speaker_label', 'Guest')
-                        
-                        # Skip counting if chaffee_only_storage filtered this segment out
-                        if self.config.chaffee_only_storage and speaker != 'Chaffee':
-                            continue
-                        
-                        if speaker == 'Chaffee':
-                            chaffee_count += 1
-                        elif speaker == 'Guest':
-                            guest_count += 1
-                        else:
-                            unknown_count += 1
-                    
-                    # Update stats atomically
-                    with stats_lock:
-                        self.stats.chaffee_segments += chaffee_count
-                        self.stats.guest_segments += guest_count
-                        self.stats.unknown_segments += unknown_count
-                    
-                    logger.info(f"📊 Speaker counts for {video.video_id}: {len(segments)} segments → Chaffee={chaffee_count}, Guest={guest_count}, Unknown={unknown_count}")
+                    inserted[i] = self._batch_insert_video_segments(video, segments, method, metadata, stats_lock)
+                    if inserted[i]:
+                        self._count_speakers(video, segments, stats_lock)
+            else:
+                # Nothing to embed or insert
+                inserted = [True] * len(batch)
             
         except Exception as e:
-            logger.error(f"❌ Batch embedding processing failed: {e}", exc_info=True)
+            video_ids = [video.video_id for video, *_ in batch]
+            logger.error(f"❌ Batch embedding processing failed for {len(batch)} videos {video_ids}: {e}",
+                         exc_info=True)
+        return inserted
+    
+    def _count_speakers(self, video: VideoInfo, segments: List, stats_lock: threading.Lock) -> None:
+        """Add a video's speaker counts to the stats"""
+        # Count speakers from OPTIMIZED segments only
+        # Note: segments here are AFTER optimization (e.g., 77 not 669)
+        chaffee_count = 0
+        guest_count = 0
+        unknown_count = 0
+        
+        for segment in segments:
+            speaker = segment.get('speaker_label', 'Guest') if isinstance(segment, dict) else getattr(segment, 'speaker_label', 'Guest')
+            
+            # Skip counting if chaffee_only_storage filtered this segment out
+            if self.config.chaffee_only_storage and speaker != 'Chaffee':
+                continue
+            
+            if speaker == 'Chaffee':
+                chaffee_count += 1
+            elif speaker == 'Guest':
+                guest_count += 1
+            else:
+                unknown_count += 1
+        
+        # Update stats atomically
+        with stats_lock:
+            self.stats.chaffee_segments += chaffee_count
+            self.stats.guest_segments += guest_count
+            self.stats.unknown_segments += unknown_count
+        
+        logger.info(f"📊 Speaker counts for {video.video_id}: {len(segments)} segments → Chaffee={chaffee_count}, Guest={guest_count}, Unknown={unknown_count}")
     
     def _batch_insert_video_segments(self, video: VideoInfo, segments: List, 
-                                    method: str, metadata: Dict, stats_lock: threading.Lock) -> None:
-        """Insert video segments using optimized batch operations"""
+                                    method: str, metadata: Dict, stats_lock: threading.Lock,
+                                    enqueue_embeddings: bool = False) -> bool:
+        """Insert video segments using optimized batch operations; returns False if the insert failed"""
+        enqueued = 0
         try:
-            # First, ensure the source exists in the database
-            self.segments_db.upsert_source(
-                video_id=video.video_id,
-                title=video.title,
-                source_type='youtube',
-                metadata=metadata,
-                published_at=getattr(video, 'published_at', None),
-                duration_s=getattr(video, 'duration_s', None),
-                view_count=getattr(video, 'view_count', None),
-                channel_name=getattr(video, 'channel_name', None),
-                channel_url=getattr(video, 'channel_url', None),
-                thumbnail_url=getattr(video, 'thumbnail_url', None),
-                like_count=getattr(video, 'like_count', None),
-                comment_count=getattr(video, 'comment_count', None),
-                description=getattr(video, 'description', None),
-                tags=getattr(video, 'tags', None),
-                url=getattr(video, 'url', None)
-            )
+            # Each DB worker holds its own pooled connection for the whole video
+            with self.segments_db.video_transaction(video.video_id):
+                # First, ensure the source exists in the database
+                self.segments_db.upsert_source(
+                    video_id=video.video_id,
+                    title=video.title,
+                    source_type='youtube',
+                    metadata=metadata,
+                    published_at=getattr(video, 'published_at', None),
+                    duration_s=getattr(video, 'duration_s', None),
+                    view_count=getattr(video, 'view_count', None),
+                    channel_name=getattr(video, 'channel_name', None),
+                    channel_url=getattr(video, 'channel_url', None),
+                    thumbnail_url=getattr(video, 'thumbnail_url', None),
+                    like_count=getattr(video, 'like_count', None),
+                    comment_count=getattr(video, 'comment_count', None),
+                    description=getattr(video, 'description', None),
+                    tags=getattr(video, 'tags', None),
+                    url=getattr(video, 'url', None)
+                )
             
-            # Then insert segments
-            segment_count = self.segments_db.batch_insert_segments(
-                segments,
-                video.video_id,
-                chaffee_only_storage=self.config.chaffee_only_storage,
-                embed_chaffee_only=self.config.embed_chaffee_only
-            )
+                # Then insert segments
+                segment_count = self.segments_db.batch_insert_segments(
+                    segments,
+                    video.video_id,
+                    chaffee_only_storage=self.config.chaffee_only_storage,
+                    embed_chaffee_only=self.config.embed_chaffee_only
+                )
+            
+                if enqueue_embeddings:
+                    enqueued = self.segments_db.enqueue_embeddings(
+                        video.video_id, embed_chaffee_only=self.config.embed_chaffee_only
+                    )
             
             with stats_lock:
+                self.stats.embeddings_enqueued += enqueued
                 # ONLY track segment_count - speaker counting happens elsewhere
                 # This prevents double-counting bug (645 segments > 245 total)
                 self.stats.segments_created += segment_count
@@ -1902,15 +2105,11 @@ class EnhancedYouTubeIngester:
                     self.stats.youtube_transcripts += 1
                 elif method in ('whisper', 'whisper_upgraded', 'enhanced_asr'):
                     self.stats.whisper_transcripts += 1
+            return True
             
         except Exception as e:
             logger.error(f"❌ Batch insert failed for {video.video_id}: {e}", exc_info=True)
-    
-    def _enqueue_for_embedding(self, video_id: str, segments: List) -> None:
-        """Enqueue segments for later embedding processing"""
-        # This would store segment IDs for later batch embedding
-        # Implementation depends on your embedding queue system
-        logger.debug(f"Enqueued {len(segments)} segments from {video_id} for later embedding")
+            return False
     
     async def check_video_accessibility(self, video: VideoInfo) -> bool:
         """Check if a video is members-only using yt-dlp. On any error, assume it's accessible."""
@@ -2017,6 +2216,9 @@ class EnhancedYouTubeIngester:
                 logger.warning("No videos found to process")
                 return
             
+            # One set-based lookup instead of two queries per video in the workers
+            self.prefetch_processed_videos(videos)
+            
             # Smart 3-Phase Pipeline for medium/large batches - lowered threshold for better optimization
             if len(videos) > 15 and self.config.source in ['api', 'yt-dlp']:
                 logger.info("📊 Using SMART 3-PHASE pipeline for large batch optimization")
@@ -2056,10 +2258,12 @@ class EnhancedYouTubeIngester:
             self.stats.total_processing_time_s = time.time() - pipeline_start_time
             
             logger.info(f"🏁 Pipeline completed in {duration} ({self.stats.total_processing_time_s:.1f}s)")
+            self.stats.record_db_pool(self.segments_db.pool_stats())
             self.stats.log_summary()
             
-            # Close database connection
+            # Close database connections
             self.db.close_connection()
+            self.segments_db.close()
     
     def setup_chaffee_profile(self, audio_sources: list, overwrite: bool = False, update: bool = False) -> bool:
         """Setup Chaffee voice profile for speaker identification from multiple sources"""
@@ -2077,9 +2281,7 @@ class EnhancedYouTubeIngester:
                     if 'youtube.com/watch?v=' in source or 'youtu.be/' in source:
                         video_id = source.split('v=')[1].split('&')[0] if 'v=' in source else source.split('/')[-1]
                         
-                        # Determine mode: first video overwrites, rest update
                         is_first = (i == 1)
-                        current_mode = overwrite if is_first else True  # Always update after first
                         
                         # For first video, use overwrite flag; for rest, always update
                         if is_first and not overwrite:
@@ -2088,7 +2290,6 @@ class EnhancedYouTubeIngester:
                             enrollment = VoiceEnrollment(voices_dir=self.config.voices_dir)
                             if enrollment.load_profile('chaffee'):
                                 logger.info("Profile exists, updating with first source")
-                                current_mode = True  # Update mode
                         
                         # Download and enroll
                         from backend.scripts.common.voice_enrollment_optimized import VoiceEnrollment
@@ -2229,7 +2430,9 @@ Examples:
     parser.add_argument('--db-concurrency', type=int, default=12,
                        help='DB/embedding worker threads (RTX 5080 optimized: 12)')
     parser.add_argument('--embed-later', action='store_true',
-                       help='Enqueue embeddings for separate processing')
+                       help='Store segments without embeddings and enqueue them for scripts/embedding_worker.py')
+    parser.add_argument('--bulk-loader', choices=['values', 'copy'], default=None,
+                       help='Segment writer: values (execute_values, default) or copy (binary COPY + one merge per video; faster for backfills)')
     parser.add_argument('--embedding-batch-size', type=int, default=256,
                        help='Batch size for embedding generation (RTX 5080 optimized: 256)')
     parser.add_argument('--skip-shorts', action='store_true',
@@ -2450,6 +2653,7 @@ Examples:
         asr_concurrency=getattr(args, 'asr_concurrency', 2), 
         db_concurrency=getattr(args, 'db_concurrency', 12),
         embed_later=getattr(args, 'embed_later', False),
+        bulk_loader=getattr(args, 'bulk_loader', None),
         embedding_batch_size=getattr(args, 'embedding_batch_size', 256)
     )
     
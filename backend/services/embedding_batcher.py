@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Async micro-batcher for query embeddings.
+
+EmbeddingsService.encode_texts holds a class-wide lock for the whole
+model.encode call, so concurrent /search requests used to queue up and each
+encode a batch of one. The batcher collects concurrent requests into a
+single encode call and fans the rows back out to the waiting callers.
+
+Batching policy:
+- A lone request is encoded immediately (no added latency when idle)
+- While a batch is encoding, new requests queue up and go out together next
+- Once concurrent traffic is seen, the worker also waits up to
+  EMBED_BATCH_MAX_WAIT_MS for stragglers, up to EMBED_BATCH_MAX_SIZE items
+- Identical texts within a batch are encoded once
+
+Usage:
+    batcher = EmbeddingMicroBatcher(lambda texts: generator.generate_embeddings(texts))
+    await batcher.start()                 # app startup
+    vec = await batcher.embed("query")    # async handlers
+    vec = batcher.embed_sync("query")     # threadpool code while the loop runs
+    await batcher.stop()                  # app shutdown
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+EMBED_BATCH_ENABLED = os.getenv('EMBED_BATCH_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+EMBED_BATCH_MAX_SIZE = int(os.getenv('EMBED_BATCH_MAX_SIZE', '32'))
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv('EMBED_BATCH_MAX_WAIT_MS', '5'))
+EMBED_BATCH_MAX_QUEUE = int(os.getenv('EMBED_BATCH_MAX_QUEUE', '1024'))
+
+# Recent batch sizes kept for reporting
+_BATCH_SAMPLE_SIZE = 256
+
+
+class EmbeddingMicroBatcher:
+    """Collects concurrent embedding requests into batched encode calls."""
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], Sequence[Any]],
+        max_batch_size: int = EMBED_BATCH_MAX_SIZE,
+        max_wait_ms: float = EMBED_BATCH_MAX_WAIT_MS,
+        max_queue_size: int = EMBED_BATCH_MAX_QUEUE,
+    ):
+        """
+        Args:
+            encode_fn: Blocking function mapping a list of texts to one
+                embedding per text (run on a dedicated worker thread)
+            max_batch_size: Most texts per encode call
+            max_wait_ms: Longest time to hold a batch open for stragglers
+            max_queue_size: Pending requests before callers are back-pressured
+        """
+        self._encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+        self.max_queue_size = max_queue_size
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._last_batch_size = 0
+
+        # Metrics
+        self._metrics_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._deduplicated = 0
+        self._errors = 0
+        self._max_queue_depth = 0
+        self._max_batch_size_seen = 0
+        self._total_queue_wait_ms = 0.0
+        self._total_encode_ms = 0.0
+        self._recent_batch_sizes: Deque[int] = deque(maxlen=_BATCH_SAMPLE_SIZE)
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        """Start the batching worker on the running event loop (idempotent)."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='embed-batch')
+        self._worker = self._loop.create_task(self._run())
+        logger.info(
+            f"Embedding micro-batcher started: max_batch_size={self.max_batch_size} "
+            f"max_wait_ms={self.max_wait_ms}"
+        )
+
+    async def stop(self) -> None:
+        """Stop the worker and fail any requests still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future, _ = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("Embedding batcher stopped"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._loop = None
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    async def embed(self, text: str) -> Any:
+        """Embed one text, batched with any concurrent callers."""
+        if not self.running:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future, time.perf_counter()))
+        depth = self._queue.qsize()
+        with self._metrics_lock:
+            self._max_queue_depth = max(self._max_queue_depth, depth)
+        return await future
+
+    def embed_sync(self, text: str, timeout: Optional[float] = None) -> Any:
+        """
+        Embed one text from a worker thread via the running batcher.
+
+        Falls back to a direct encode when the batcher isn't running or when
+        called on the event loop thread itself (which would deadlock).
+        """
+        loop = self._loop
+        if loop is None or not self.running or not loop.is_running():
+            return self._encode_fn([text])[0]
+        try:
+            if asyncio.get_running_loop() is loop:
+                return self._encode_fn([text])[0]
+        except RuntimeError:
+            pass  # No loop in this thread - the normal case
+        return asyncio.run_coroutine_threadsafe(self.embed(text), loop).result(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and batch-size metrics for /health."""
+        with self._metrics_lock:
+            recent = list(self._recent_batch_sizes)
+            return {
+                "running": self.running,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+                "max_queue_depth": self._max_queue_depth,
+                "batches": self._batches,
+                "items": self._items,
+                "deduplicated": self._deduplicated,
+                "errors": self._errors,
+                "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+                "recent_avg_batch_size": round(sum(recent) / len(recent), 2) if recent else 0.0,
+                "max_batch_size_seen": self._max_batch_size_seen,
+                "avg_queue_wait_ms": round(self._total_queue_wait_ms / self._items, 2) if self._items else 0.0,
+                "avg_encode_ms": round(self._total_encode_ms / self._batches, 2) if self._batches else 0.0,
+            }
+
+    # -------------------------------------------------------------------------
+    # Worker
+    # -------------------------------------------------------------------------
+
+    async def _collect_batch(self) -> List[tuple]:
+        """Wait for one request, then gather more per the batching policy."""
+        batch = [await self._queue.get()]
+
+        # Everything that queued up while the previous batch was encoding
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        # Only hold the batch open when there is evidence of concurrent load,
+        # so an idle server answers single requests without added latency
+        concurrent = len(batch) > 1 or self._last_batch_size > 1
+        if concurrent and self.max_wait_ms > 0:
+            deadline = self._loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            live = [(text, future, queued) for text, future, queued in batch if not future.done()]
+            self._last_batch_size = len(batch)
+            if not live:
+                continue
+
+            # Encode each distinct text once
+            unique_texts = list(dict.fromkeys(text for text, _, _ in live))
+            t_start = time.perf_counter()
+            try:
+                embeddings = await self._loop.run_in_executor(self._executor, self._encode_fn, unique_texts)
+                if embeddings is None or len(embeddings) != len(unique_texts):
+                    got = 0 if embeddings is None else len(embeddings)
+                    raise RuntimeError(f"encode returned {got} embeddings for {len(unique_texts)} texts")
+            except Exception as e:
+                logger.error(f"Batched embedding failed for {len(unique_texts)} texts: {e}")
+                with self._metrics_lock:
+                    self._errors += 1
+                for _, future, _ in live:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            encode_ms = (time.perf_counter() - t_start) * 1000
+            by_text = dict(zip(unique_texts, embeddings))
+            for text, future, _ in live:
+                if not future.done():
+                    future.set_result(by_text[text])
+
+            with self._metrics_lock:
+                self._batches += 1
+                self._items += len(live)
+                self._deduplicated += len(live) - len(unique_texts)
+                self._max_batch_size_seen = max(self._max_batch_size_seen, len(live))
+                self._recent_batch_sizes.append(len(live))
+                self._total_encode_ms += encode_ms
+                self._total_queue_wait_ms += sum((t_start - queued) * 1000 for _, _, queued in live)
+
+            if len(live) > 1:
+                logger.debug(f"Embedded batch of {len(live)} ({len(unique_texts)} unique) in {encode_ms:.1f}ms")
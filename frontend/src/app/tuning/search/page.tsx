@@ -14,6 +14,12 @@ const DEFAULT_CONFIG: SearchConfig = {
   enable_reranker: false,
   rerank_top_k: 200,
   return_top_k: 20,
+  ivfflat_probes: 10,
+  hnsw_ef_search: 100,
+  hybrid_enabled: false,
+  hybrid_vector_weight: 1.0,
+  hybrid_lexical_weight: 0.5,
+  rrf_k: 60,
 };
 
 export default function SearchPage() {
@@ -291,6 +297,85 @@ export default function SearchPage() {
             />
           </div>
 
+          <div className="tuning-form-group">
+            <label className="tuning-label">Index search depth (IVFFlat probes)</label>
+            <input
+              type="number"
+              min="1"
+              max="1000"
+              value={config.ivfflat_probes}
+              onChange={(e) => setConfig({ ...config, ivfflat_probes: parseInt(e.target.value) || 10 })}
+              className="tuning-input"
+            />
+            <p className="tuning-hint">Clusters scanned per search on IVFFlat indexes. Higher finds more matches but is slower.</p>
+          </div>
+
+          <div className="tuning-form-group">
+            <label className="tuning-label">Index search depth (HNSW ef_search)</label>
+            <input
+              type="number"
+              min="10"
+              max="1000"
+              value={config.hnsw_ef_search}
+              onChange={(e) => setConfig({ ...config, hnsw_ef_search: parseInt(e.target.value) || 100 })}
+              className="tuning-input"
+            />
+            <p className="tuning-hint">Candidates kept per search on HNSW indexes. Raised automatically to at least the number of results.</p>
+          </div>
+
+          <div className="tuning-form-group">
+            <Checkbox
+              id="hybrid_enabled"
+              checked={config.hybrid_enabled}
+              onChange={(e) => setConfig({ ...config, hybrid_enabled: e.target.checked })}
+              label="Also match exact words (hybrid search)"
+              description="Blends keyword matches with meaning-based matches. Helps with names and specific terms."
+            />
+          </div>
+
+          {config.hybrid_enabled && (
+            <>
+              <div className="tuning-form-group">
+                <label className="tuning-label">Meaning match weight</label>
+                <input
+                  type="number"
+                  step="0.1"
+                  min="0"
+                  max="5"
+                  value={config.hybrid_vector_weight}
+                  onChange={(e) => setConfig({ ...config, hybrid_vector_weight: parseFloat(e.target.value) || 0 })}
+                  className="tuning-input"
+                />
+              </div>
+
+              <div className="tuning-form-group">
+                <label className="tuning-label">Keyword match weight</label>
+                <input
+                  type="number"
+                  step="0.1"
+                  min="0"
+                  max="5"
+                  value={config.hybrid_lexical_weight}
+                  onChange={(e) => setConfig({ ...config, hybrid_lexical_weight: parseFloat(e.target.value) || 0 })}
+                  className="tuning-input"
+                />
+              </div>
+
+              <div className="tuning-form-group">
+                <label className="tuning-label">Rank smoothing (RRF k)</label>
+                <input
+                  type="number"
+                  min="1"
+                  max="1000"
+                  value={config.rrf_k}
+                  onChange={(e) => setConfig({ ...config, rrf_k: parseInt(e.target.value) || 60 })}
+                  className="tuning-input"
+                />
+                <p className="tuning-hint">Higher values give lower-ranked matches more say. 60 is a good default.</p>
+              </div>
+            </>
+          )}
+
           <button
             onClick={handleSave}
             disabled={saving}
@@ -242,6 +242,12 @@ export interface SearchConfig {
   enable_reranker: boolean;
   rerank_top_k: number;
   return_top_k: number;
+  ivfflat_probes: number;
+  hnsw_ef_search: number;
+  hybrid_enabled: boolean;
+  hybrid_vector_weight: number;
+  hybrid_lexical_weight: number;
+  rrf_k: number;
 }
 
 export interface SearchConfigResponse {
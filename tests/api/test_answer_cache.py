@@ -0,0 +1,104 @@
+"""
+Tests for the two-tier answer cache.
+
+Tests cover:
+- Hot-tier hits skip embedding and the database entirely
+- Semantic hits fill the hot tier and are counted, not UPDATEd inline
+- Stricter thresholds fall through to the semantic tier
+- Access counts are aggregated and flushed in one UPDATE
+"""
+
+import os
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api import main
+from api.utils import answer_cache
+from api.utils.answer_cache import AnswerCacheAccessTracker
+
+
+def _row(similarity=0.95):
+    return {
+        'id': 7, 'query_text': 'what is keto?', 'answer_md': 'Eat meat.',
+        'citations': [], 'confidence': 0.9, 'notes': None, 'used_chunk_ids': [],
+        'source_clips': [], 'created_at': datetime(2026, 1, 1), 'access_count': 3,
+        'similarity': similarity,
+    }
+
+
+@pytest.fixture
+def tracker():
+    return AnswerCacheAccessTracker(connect_fn=MagicMock)
+
+
+@pytest.fixture
+def lookup_env(tracker):
+    answer_cache.invalidate_hot_answers()
+    conn = MagicMock()
+    cur = conn.cursor.return_value
+    with patch.object(main, 'is_answer_cache_enabled', return_value=True), \
+         patch.object(main, 'get_active_model_key', return_value='bge-small-en-v1.5'), \
+         patch.object(main, 'get_answer_cache_access_tracker', return_value=tracker), \
+         patch.object(main, 'embed_query', return_value=[0.1] * 384) as embed, \
+         patch.object(main, 'get_db_connection', return_value=conn):
+        yield embed, cur
+    answer_cache.invalidate_hot_answers()
+
+
+def test_semantic_hit_fills_hot_tier(lookup_env, tracker):
+    embed, cur = lookup_env
+    cur.fetchone.return_value = _row()
+
+    first = main.answer_cache_lookup(main.CacheLookupRequest(query='What is keto?'))
+    second = main.answer_cache_lookup(main.CacheLookupRequest(query='what is  KETO?'))
+
+    assert first['cached']['answer_md'] == second['cached']['answer_md'] == 'Eat meat.'
+    assert embed.call_count == 1
+    # Only the similarity query ran - no UPDATE on the request path
+    assert cur.execute.call_count == 1
+    assert 'UPDATE' not in cur.execute.call_args.args[0]
+    assert tracker._pending[7][0] == 2
+
+
+def test_stricter_threshold_falls_through(lookup_env):
+    embed, cur = lookup_env
+    cur.fetchone.return_value = _row(similarity=0.93)
+    main.answer_cache_lookup(main.CacheLookupRequest(query='What is keto?'))
+
+    cur.fetchone.return_value = None
+    result = main.answer_cache_lookup(main.CacheLookupRequest(query='What is keto?', similarity_threshold=0.99))
+
+    assert result == {'cached': None}
+    assert embed.call_count == 2
+
+
+def test_flush_aggregates_hits_in_one_update():
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    tracker = AnswerCacheAccessTracker(connect_fn=lambda: conn)
+    for cache_id in (1, 2, 1, 1):
+        tracker.record(cache_id)
+
+    assert tracker.flush() == 2
+
+    cur.execute.assert_called_once()
+    ids, hits, ages = cur.execute.call_args.args[1]
+    assert dict(zip(ids, hits)) == {1: 3, 2: 1}
+    assert all(age >= 0 for age in ages)
+    conn.commit.assert_called_once()
+    assert tracker.flush() == 0
+
+
+def test_failed_flush_keeps_counts():
+    tracker = AnswerCacheAccessTracker(connect_fn=MagicMock(side_effect=RuntimeError('db down')))
+    tracker.record(1)
+    assert tracker.flush() == 0
+    tracker.record(1)
+
+    assert tracker._pending[1][0] == 2
+    assert tracker.stats()['errors'] == 1
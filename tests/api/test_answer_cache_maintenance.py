@@ -0,0 +1,134 @@
+"""
+Tests for answer_cache expiry, compaction and index maintenance.
+
+Tests cover:
+- Deletes run in batches until a short batch, counted per reason
+- A run holding the advisory lock makes others skip
+- A failed batch still releases the lock
+- IVFFlat indexes are rebuilt only when lists drift past the threshold
+- The background compactor invalidates the hot tier after deleting rows
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api.services import answer_cache_maintenance as maintenance
+from api.services.answer_cache_maintenance import (
+    AnswerCacheCompactor,
+    CompactionPolicy,
+    CompactionResult,
+    compact_answer_cache,
+    maintain_answer_cache_indexes,
+)
+
+
+def _conn(locked=True):
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchone.return_value = (locked,)
+    return conn, cur
+
+
+@pytest.fixture
+def no_index_work():
+    with patch.object(maintenance, 'maintain_answer_cache_indexes', return_value=[]) as indexes, \
+         patch.object(maintenance, 'collect_answer_cache_stats', return_value={'rows': 5}), \
+         patch.object(maintenance, 'get_answer_cache_embedding_tables', return_value=[]):
+        yield indexes
+
+
+def test_deletes_in_batches_until_short_batch(no_index_work):
+    conn, cur = _conn()
+    batches = [{'expired': 2, 'low_value': 1}, {'max_age': 3}, {'expired': 1}]
+
+    with patch.object(maintenance, '_delete_batch', side_effect=batches) as delete:
+        result = compact_answer_cache(conn, CompactionPolicy(batch_size=3))
+
+    assert delete.call_count == 3
+    assert result.deleted == {'expired': 3, 'max_age': 3, 'low_value': 1}
+    assert result.total_deleted == 7
+    assert result.stats == {'rows': 5}
+    statements = [c.args[0] for c in cur.execute.call_args_list]
+    assert any('ANALYZE answer_cache' in s for s in statements)
+    assert 'pg_advisory_unlock' in statements[-1]
+
+
+def test_dry_run_deletes_nothing(no_index_work):
+    conn, _ = _conn()
+    with patch.object(maintenance, '_delete_batch') as delete:
+        result = compact_answer_cache(conn, dry_run=True)
+
+    delete.assert_not_called()
+    no_index_work.assert_called_once_with(conn, CompactionPolicy().index_drift, dry_run=True)
+    assert result.dry_run and result.total_deleted == 0
+
+
+def test_skips_when_another_run_holds_lock(no_index_work):
+    conn, _ = _conn(locked=False)
+    with patch.object(maintenance, '_delete_batch') as delete:
+        result = compact_answer_cache(conn)
+
+    delete.assert_not_called()
+    assert result.skipped
+
+
+def test_failed_batch_rolls_back_before_unlock(no_index_work):
+    conn, cur = _conn()
+    calls = MagicMock()
+    conn.rollback.side_effect = lambda: calls('rollback')
+    cur.execute.side_effect = lambda sql, *a: calls(sql)
+
+    with patch.object(maintenance, '_delete_batch', side_effect=RuntimeError('aborted')):
+        with pytest.raises(RuntimeError):
+            compact_answer_cache(conn)
+
+    names = [c.args[0] for c in calls.call_args_list]
+    assert 'pg_advisory_unlock' in names[-1]
+    assert names[-2] == 'rollback'
+
+
+@pytest.mark.parametrize('lists,rows,expected', [
+    (100, 100_000, 'kept'),      # plan: 100 lists
+    (100, 400_000, 'rebuild'),   # plan: 400 lists
+    (100, 30_000, 'rebuild'),    # plan: 30 lists
+])
+def test_index_rebuilt_only_on_drift(lists, rows, expected):
+    conn = MagicMock()
+    index = {
+        'name': 'idx_answer_cache_embeddings_384_ivfflat', 'method': 'ivfflat',
+        'opclass': 'vector_cosine_ops',
+        'definition': f"CREATE INDEX ... USING ivfflat (embedding vector_cosine_ops) WITH (lists='{lists}')",
+    }
+    with patch('scripts.embedding_storage.get_vector_columns',
+               return_value=[('answer_cache_embeddings_384', 384), ('segment_embeddings_384', 384)]), \
+         patch('scripts.embedding_storage.estimate_row_count', return_value=rows), \
+         patch('scripts.embedding_storage.get_embedding_indexes', return_value=[index]), \
+         patch('scripts.embedding_storage.get_maintenance_work_mem_bytes', return_value=64 * 1024 ** 2), \
+         patch('scripts.embedding_storage.ensure_cosine_ann_index') as ensure:
+        reports = maintain_answer_cache_indexes(conn, drift=2.0)
+
+    assert [r['table'] for r in reports] == ['answer_cache_embeddings_384']
+    assert reports[0]['action'] == expected
+    assert reports[0]['current']['lists'] == lists
+    assert ensure.called == (expected == 'rebuild')
+
+
+def test_compactor_invalidates_hot_tier_after_deletes():
+    compacted = MagicMock()
+    compactor = AnswerCacheCompactor(connect_fn=MagicMock, on_compacted=compacted)
+    result = CompactionResult(deleted={'expired': 4}, stats={'rows': 10})
+
+    with patch.object(maintenance, 'compact_answer_cache', return_value=result):
+        compactor.run_once()
+    with patch.object(maintenance, 'compact_answer_cache', side_effect=RuntimeError('db down')):
+        assert compactor.run_once() is None
+
+    compacted.assert_called_once_with(result)
+    stats = compactor.stats()
+    assert stats['runs'] == 1 and stats['errors'] == 1
+    assert stats['last_deleted'] == {'expired': 4}
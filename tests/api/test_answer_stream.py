@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming /api/answer/stream (Server-Sent Events).
+
+Tests cover:
+- Incremental extraction of the JSON "answer" field from deltas
+- Event order: sources, tokens, citations, done
+- Request accounting runs once the stream completes
+- A client disconnect mid-stream is logged as a failed answer
+"""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api import main
+from api.main import AnswerFieldStream, _AnswerContext, app
+
+client = TestClient(app)
+
+
+def _feed_all(deltas):
+    stream = AnswerFieldStream()
+    return ''.join(stream.feed(d) for d in deltas)
+
+
+class TestAnswerFieldStream:
+    """Test decoding the answer value from JSON fragments."""
+
+    def test_extracts_answer_across_deltas(self):
+        deltas = ['{"ans', 'wer": "Keto ', 'is great', '.", "citations_used": [1]}']
+
+        assert _feed_all(deltas) == 'Keto is great.'
+
+    def test_decodes_escapes_split_across_deltas(self):
+        deltas = ['{"answer": "Line one\\', 'nLine \\"two\\" \\u00', 'e9"}']
+
+        assert _feed_all(deltas) == 'Line one\nLine "two" é'
+
+    def test_ignores_text_after_answer(self):
+        stream = AnswerFieldStream()
+        stream.feed('{"answer": "done"')
+
+        assert stream.feed(', "notes": "ignored"}') == ''
+
+
+def _chunk(content=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=content))] if content is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+def _parse_events(body):
+    events = []
+    for block in body.strip().split('\n\n'):
+        event_line, data_line = block.split('\n')
+        events.append((event_line[len('event: '):], json.loads(data_line[len('data: '):])))
+    return events
+
+
+@pytest.fixture
+def answer_context():
+    return _AnswerContext(
+        query='is keto safe',
+        style='concise',
+        t_start=0.0,
+        model='gpt-4o-mini',
+        temperature=0.3,
+        max_tokens=1400,
+        system_prompt='system',
+        user_prompt='user',
+        source_chunks=[{
+            'index': 1, 'id': 11, 'video_id': 'abc', 'title': 'Keto', 'url': '',
+            'start_time': 5.0, 'timestamp': '0:05', 'similarity': 0.9, 'published_at': None,
+        }],
+        profile_meta={'id': None, 'name': 'default', 'version': 1},
+        resolved_instructions=SimpleNamespace(instruction_id=None),
+    )
+
+
+class TestAnswerStreamEndpoint:
+    """Test the SSE event sequence with a mocked OpenAI stream."""
+
+    def test_streams_sources_tokens_then_citations(self, answer_context):
+        content = ['{"answer": "Yes, ', 'it is [1].", ', '"citations_used": [1], "confidence": 0.9}']
+        stream = [_chunk(c) for c in content] + [_chunk(usage=SimpleNamespace(prompt_tokens=100, completion_tokens=20))]
+        create_kwargs = {}
+
+        async def fake_stream(client, **kwargs):
+            create_kwargs.update(kwargs)
+            for chunk in stream:
+                yield chunk
+
+        async def prepare(request, t_start):
+            return answer_context
+
+        with patch.object(main, '_prepare_answer', prepare), \
+             patch.object(main, '_get_openai_client', return_value=MagicMock()), \
+             patch.object(main, 'stream_chat_completion', fake_stream), \
+             patch.object(main, 'log_rag_request') as log_rag, \
+             patch.object(main, 'log_ai_request', return_value='req-1') as log_ai:
+            response = client.post('/api/answer/stream', json={'query': 'is keto safe'})
+
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('text/event-stream')
+        events = _parse_events(response.text)
+        names = [name for name, _ in events]
+        assert names[0] == 'sources'
+        assert names[-2:] == ['citations', 'done']
+        assert ''.join(data['text'] for name, data in events if name == 'token') == 'Yes, it is [1].'
+        assert events[-2][1]['citations'][0]['video_id'] == 'abc'
+        assert events[-1][1]['ai_request_id'] == 'req-1'
+        assert log_rag.call_args.kwargs['input_tokens'] == 100
+        log_ai.assert_called_once()
+        assert create_kwargs['response_format'] == {'type': 'json_object'}
+
+    @pytest.mark.asyncio
+    async def test_disconnect_logs_failed_answer(self, answer_context):
+        started = asyncio.Event()
+
+        async def hanging_stream(client, **kwargs):
+            started.set()
+            await asyncio.Event().wait()
+            yield _chunk('never')
+
+        async def prepare(request, t_start):
+            return answer_context
+
+        with patch.object(main, '_prepare_answer', prepare), \
+             patch.object(main, '_get_openai_client', return_value=MagicMock()), \
+             patch.object(main, 'stream_chat_completion', hanging_stream), \
+             patch.object(main, 'log_rag_request') as log_rag:
+            response = await main.answer_question_stream(main.AnswerRequest(query='is keto safe'))
+            body = response.body_iterator
+            assert (await body.__anext__()).startswith('event: sources')
+
+            pending = asyncio.ensure_future(body.__anext__())
+            await started.wait()
+            pending.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await pending
+
+        log_rag.assert_called_once()
+        assert log_rag.call_args.kwargs['success'] is False
+        assert 'disconnected' in log_rag.call_args.kwargs['error_message']
@@ -0,0 +1,130 @@
+"""
+Tests for token-budgeted context packing of the answer prompt.
+
+Tests cover:
+- Contiguous segments of one video merge into a single excerpt
+- Excerpts are numbered by relevance and source chunks follow the numbering
+- The token budget drops candidates that don't fit, but keeps the top one
+- Tokenizer selection from the model catalog
+- Encodings load once; a failed load is retried rather than cached
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api import main
+from api.model_catalog import model_tokenizer
+from api.services import context_packing
+from api.services.context_packing import estimate_tokens, pack_context, warm_token_encodings
+
+
+def _result(id, video, start, end, text='words ' * 20, similarity=0.8):
+    return main.SearchResult(
+        id=id, video_id=video, title=f'Video {video}', text=text.strip(),
+        url=f'https://www.youtube.com/watch?v={video}&t={int(start)}s',
+        start_time_seconds=start, end_time_seconds=end,
+        published_at='2025-01-02T00:00:00', source_type='youtube', similarity=similarity,
+    )
+
+
+def _pack(results, budget=10_000, max_segments=None):
+    return pack_context(results, render=main._render_excerpt, count_tokens=estimate_tokens,
+                        budget_tokens=budget, max_segments=max_segments)
+
+
+def test_contiguous_segments_share_one_excerpt():
+    results = [
+        _result(1, 'a', 60, 70, similarity=0.9),
+        _result(2, 'b', 0, 10, similarity=0.85),
+        _result(3, 'a', 70, 80, similarity=0.8),
+        _result(4, 'a', 200, 210, similarity=0.7),
+    ]
+    packed = _pack(results)
+
+    assert [len(e.segments) for e in packed.excerpts] == [2, 1, 1]
+    assert packed.merged == 1
+    assert packed.text.count('Video: Video a') == 2
+    assert '[1] Video: Video a' in packed.text and 'Time: 1:00-1:20' in packed.text
+
+
+def test_bridging_segment_joins_two_excerpts_and_keeps_best_rank():
+    results = [
+        _result(1, 'a', 100, 110, similarity=0.9),
+        _result(2, 'b', 0, 10, similarity=0.85),
+        _result(3, 'a', 120, 130, similarity=0.8),
+        _result(4, 'a', 110, 120, similarity=0.7),
+    ]
+    packed = _pack(results)
+
+    assert [e.index for e in packed.excerpts] == [1, 2]
+    assert [s.id for s in packed.excerpts[0].segments] == [1, 4, 3]
+    assert packed.excerpts[0].best.id == 1
+
+    chunks = [main._excerpt_source_chunk(e) for e in packed.excerpts]
+    assert [c['index'] for c in chunks] == [1, 2]
+    assert chunks[0]['segment_ids'] == [1, 4, 3]
+    assert chunks[0]['start_time'] == 100 and chunks[0]['video_id'] == 'a'
+    assert chunks[0]['similarity'] == 0.9
+
+
+def test_budget_drops_what_does_not_fit():
+    results = [_result(i, f'v{i}', 0, 10, text='word ' * (200 if i == 2 else 20)) for i in range(1, 5)]
+    one = estimate_tokens(main._render_excerpt(1, _pack(results[:1]).excerpts[0]))
+    packed = _pack(results, budget=one * 3 + 5)
+
+    assert [s.id for e in packed.excerpts for s in e.segments] == [1, 3, 4]
+    assert packed.dropped == 1
+    assert packed.tokens <= packed.budget_tokens
+
+
+def test_top_candidate_kept_even_over_budget_and_segment_cap():
+    results = [_result(i, f'v{i}', 0, 10) for i in range(1, 5)]
+
+    assert len(_pack(results, budget=1).excerpts) == 1
+    assert _pack(results, max_segments=2).segments_used == 2
+
+
+def test_model_tokenizer_from_catalog():
+    assert model_tokenizer('gpt-4.1') == 'o200k_base'
+    assert model_tokenizer('gpt-3.5-turbo') == 'cl100k_base'
+    assert model_tokenizer('gpt-4o-2024-11-20') == 'o200k_base'
+
+
+class FlakyTiktoken:
+    """tiktoken stand-in whose first load of each encoding fails."""
+
+    def __init__(self):
+        self.loads = []
+
+    def get_encoding(self, name):
+        self.loads.append(name)
+        if self.loads.count(name) == 1:
+            raise OSError('BPE download failed')
+        return SimpleNamespace(encode=lambda text, disallowed_special=(): text.split())
+
+
+def test_failed_encoding_load_is_retried(monkeypatch):
+    fake = FlakyTiktoken()
+    monkeypatch.setattr(context_packing, 'tiktoken', fake)
+    monkeypatch.setattr(context_packing, '_encodings', {})
+
+    assert context_packing.get_token_counter('gpt-4.1') is estimate_tokens
+    count = context_packing.get_token_counter('gpt-4.1')
+    assert count('one two three') == 3
+    context_packing.get_token_counter('gpt-4.1')
+    assert fake.loads == ['o200k_base', 'o200k_base']
+
+
+def test_warm_loads_each_encoding_once(monkeypatch):
+    fake = FlakyTiktoken()
+    monkeypatch.setattr(context_packing, 'tiktoken', fake)
+    monkeypatch.setattr(context_packing, '_encodings', {'cl100k_base': object()})
+
+    warm_token_encodings(['gpt-4.1', 'gpt-4o', 'gpt-3.5-turbo'])
+    warm_token_encodings(['gpt-4.1'])
+
+    assert fake.loads == ['o200k_base', 'o200k_base']
+    assert 'o200k_base' in context_packing._encodings
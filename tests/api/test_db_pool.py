@@ -0,0 +1,117 @@
+"""
+Tests for the shared database connection pool.
+
+Tests cover:
+- Connection reuse (close() returns to pool instead of disconnecting)
+- Bounded waiting and timeout metrics when the pool is saturated
+- Health check replacing broken idle connections
+- Rollback of open transactions on release
+"""
+
+import os
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import psycopg2.extensions
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api.utils.db_pool import DatabasePool, PoolTimeoutError
+
+
+def _fake_connection():
+    conn = MagicMock()
+    conn.closed = 0
+    conn.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    return conn
+
+
+@pytest.fixture
+def fake_connect():
+    with patch("api.utils.db_pool.psycopg2.connect", side_effect=lambda *a, **k: _fake_connection()) as mock:
+        yield mock
+
+
+class TestDatabasePool:
+    """Tests for DatabasePool."""
+
+    def test_close_returns_connection_for_reuse(self, fake_connect):
+        pool = DatabasePool("postgresql://test", min_size=0, max_size=2)
+
+        conn = pool.getconn()
+        raw = conn.raw
+        conn.close()
+        conn.close()  # idempotent
+
+        again = pool.getconn()
+        assert again.raw is raw
+        assert fake_connect.call_count == 1
+        raw.close.assert_not_called()
+
+        stats = pool.stats()
+        assert stats["acquisitions"] == 2
+        assert stats["in_use"] == 1
+        assert stats["created"] == 1
+
+    def test_released_proxy_rejects_use(self, fake_connect):
+        pool = DatabasePool("postgresql://test", min_size=0, max_size=1)
+        conn = pool.getconn()
+        conn.close()
+
+        with pytest.raises(psycopg2.InterfaceError):
+            conn.cursor()
+
+    def test_saturated_pool_times_out(self, fake_connect):
+        pool = DatabasePool("postgresql://test", min_size=0, max_size=1)
+        held = pool.getconn()
+
+        with pytest.raises(PoolTimeoutError):
+            pool.getconn(timeout=0.05)
+
+        assert pool.stats()["timeouts"] == 1
+        assert pool.stats()["saturation"] == 1.0
+        held.close()
+
+    def test_waiter_gets_connection_when_released(self, fake_connect):
+        pool = DatabasePool("postgresql://test", min_size=0, max_size=1)
+        held = pool.getconn()
+
+        threading.Timer(0.05, held.close).start()
+        conn = pool.getconn(timeout=2)
+
+        assert conn.raw is held.raw
+        assert pool.stats()["max_wait_ms"] >= 40
+        conn.close()
+
+    def test_unhealthy_idle_connection_is_replaced(self, fake_connect):
+        pool = DatabasePool("postgresql://test", min_size=0, max_size=1, healthcheck_idle_seconds=0)
+        conn = pool.getconn()
+        broken = conn.raw
+        broken.cursor.return_value.__enter__.return_value.execute.side_effect = psycopg2.OperationalError("gone")
+        conn.close()
+
+        fresh = pool.getconn()
+
+        assert fresh.raw is not broken
+        broken.close.assert_called_once()
+        stats = pool.stats()
+        assert stats["healthcheck_failures"] == 1
+        assert stats["discarded"] == 1
+
+    def test_open_transaction_rolled_back_on_release(self, fake_connect):
+        pool = DatabasePool("postgresql://test", min_size=0, max_size=1)
+        conn = pool.getconn()
+        conn.raw.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        conn.close()
+
+        conn.raw.rollback.assert_called_once()
+        assert pool.stats()["idle"] == 1
+
+    def test_warm_opens_min_size(self, fake_connect):
+        pool = DatabasePool("postgresql://test", min_size=3, max_size=5)
+        pool.warm()
+
+        assert fake_connect.call_count == 3
+        assert pool.stats()["idle"] == 3
@@ -0,0 +1,142 @@
+"""
+Tests for the query embedding micro-batcher.
+
+Tests cover:
+- A lone request is encoded immediately
+- Concurrent requests share one encode call, duplicates encoded once
+- Encode failures propagate to every waiting caller
+- embed_sync from a worker thread and direct fallback when stopped
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from services.embedding_batcher import EmbeddingMicroBatcher
+
+
+class RecordingEncoder:
+    """Encode fn that records each batch and can block until released."""
+
+    def __init__(self, block: bool = False):
+        self.calls = []
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        self.release.wait(5)
+        return [[float(len(t))] for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_lone_request_not_delayed():
+    encoder = RecordingEncoder()
+    batcher = EmbeddingMicroBatcher(encoder, max_wait_ms=500)
+    await batcher.start()
+    try:
+        t0 = time.perf_counter()
+        result = await batcher.embed("keto")
+        elapsed = time.perf_counter() - t0
+    finally:
+        await batcher.stop()
+
+    assert result == [4.0]
+    assert encoder.calls == [["keto"]]
+    assert elapsed < 0.4
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_batched_and_deduplicated():
+    encoder = RecordingEncoder(block=True)
+    batcher = EmbeddingMicroBatcher(encoder, max_wait_ms=0)
+    await batcher.start()
+    try:
+        # First request occupies the encoder; the rest queue behind it
+        first = asyncio.ensure_future(batcher.embed("a"))
+        await asyncio.sleep(0.05)
+        rest = [asyncio.ensure_future(batcher.embed(t)) for t in ("bb", "ccc", "bb")]
+        await asyncio.sleep(0.05)
+        encoder.release.set()
+        results = await asyncio.gather(first, *rest)
+        stats = batcher.stats()
+    finally:
+        await batcher.stop()
+
+    assert results == [[1.0], [2.0], [3.0], [2.0]]
+    assert encoder.calls == [["a"], ["bb", "ccc"]]
+    assert stats["batches"] == 2
+    assert stats["items"] == 4
+    assert stats["deduplicated"] == 1
+    assert stats["max_batch_size_seen"] == 3
+    assert stats["max_queue_depth"] >= 3
+
+
+@pytest.mark.asyncio
+async def test_batch_respects_max_size():
+    encoder = RecordingEncoder(block=True)
+    batcher = EmbeddingMicroBatcher(encoder, max_batch_size=2, max_wait_ms=0)
+    await batcher.start()
+    try:
+        first = asyncio.ensure_future(batcher.embed("x"))
+        await asyncio.sleep(0.05)
+        rest = [asyncio.ensure_future(batcher.embed(str(i))) for i in range(5)]
+        await asyncio.sleep(0.05)
+        encoder.release.set()
+        await asyncio.gather(first, *rest)
+    finally:
+        await batcher.stop()
+
+    assert all(len(call) <= 2 for call in encoder.calls)
+    assert sum(len(call) for call in encoder.calls) == 6
+
+
+@pytest.mark.asyncio
+async def test_encode_error_reaches_all_callers():
+    def failing(texts):
+        raise RuntimeError("model not loaded")
+
+    batcher = EmbeddingMicroBatcher(failing)
+    await batcher.start()
+    try:
+        results = await asyncio.gather(
+            batcher.embed("a"), batcher.embed("b"), return_exceptions=True
+        )
+        stats = batcher.stats()
+    finally:
+        await batcher.stop()
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert stats["errors"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_embed_sync_from_worker_thread():
+    encoder = RecordingEncoder()
+    batcher = EmbeddingMicroBatcher(encoder)
+    await batcher.start()
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, batcher.embed_sync, "hello")
+        stats = batcher.stats()
+    finally:
+        await batcher.stop()
+
+    assert result == [5.0]
+    assert stats["batches"] == 1
+
+
+def test_embed_sync_without_running_batcher_encodes_directly():
+    encoder = RecordingEncoder()
+    batcher = EmbeddingMicroBatcher(encoder)
+
+    assert batcher.embed_sync("abc") == [3.0]
+    assert batcher.stats()["running"] is False
+    assert batcher.stats()["batches"] == 0
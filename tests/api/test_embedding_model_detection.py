@@ -149,6 +149,42 @@ class TestEmbeddingModelDetection:
         assert models[0]['dimensions'] == 1536
 
 
+class TestDbEmbeddingConsistency:
+    """Test the startup dimension check against rows from the pgvector typecaster"""
+
+    def _check(self, sample_embedding, expected_dim=384):
+        import numpy as np
+        from api import main
+
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_cursor.fetchone.side_effect = [
+            {'count': 10},
+            {'embedding': np.asarray(sample_embedding, dtype=np.float32)},
+        ]
+        mock_conn.cursor.return_value = mock_cursor
+
+        config = {'dimensions': expected_dim, 'model': 'BAAI/bge-small-en-v1.5'}
+        with patch.object(main, '_db_embedding_check_done', False), \
+             patch.object(main, 'resolve_embedding_config', return_value=config), \
+             patch.object(main, 'get_db_connection', return_value=mock_conn):
+            return main.check_db_embedding_consistency()
+
+    def test_ndarray_row_matching_dimensions(self):
+        """An ndarray sample is measured, not skipped"""
+        is_consistent, message = self._check([0.1] * 384)
+
+        assert is_consistent
+        assert message == "Consistent: 384 dimensions"
+
+    def test_ndarray_row_dimension_mismatch(self):
+        """A mismatched ndarray sample fails the check"""
+        is_consistent, message = self._check([0.1] * 768)
+
+        assert not is_consistent
+        assert "768 dimensions" in message
+
+
 class TestSearchEndpointModelMatching:
     """Test the search endpoint's model matching logic"""
     
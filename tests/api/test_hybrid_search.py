@@ -0,0 +1,86 @@
+"""
+Tests for hybrid lexical + vector retrieval.
+
+Tests cover:
+- Weighted reciprocal-rank fusion
+- Lexical query parameter order per storage layout
+- Savepoint rollback when the full-text column is missing
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api.utils.hybrid_search import lexical_search, reciprocal_rank_fusion
+
+
+def _rows(*ids):
+    return [{'id': i, 'text': f'doc {i}'} for i in ids]
+
+
+class TestReciprocalRankFusion:
+    """Test fused ordering and weights."""
+
+    def test_rows_in_both_lists_rank_first(self):
+        fused = reciprocal_rank_fusion([_rows(1, 2, 3), _rows(3, 4)], [1.0, 0.9], k=60)
+
+        assert [r['id'] for r in fused] == [3, 1, 2, 4]
+        assert fused[0]['rrf_score'] == pytest.approx(1 / 63 + 0.9 / 61)
+
+    def test_zero_weight_ignores_list(self):
+        fused = reciprocal_rank_fusion([_rows(1, 2), _rows(9)], [1.0, 0.0])
+
+        assert [r['id'] for r in fused] == [1, 2]
+
+    def test_lexical_weight_can_dominate(self):
+        fused = reciprocal_rank_fusion([_rows(1, 2), _rows(2, 5)], [0.1, 2.0], k=1, top_k=2)
+
+        assert [r['id'] for r in fused] == [2, 5]
+
+    def test_first_list_supplies_fields(self):
+        vector = [{'id': 7, 'similarity': 0.8}]
+        lexical = [{'id': 7, 'similarity': 0.1, 'lexical_score': 0.5}]
+
+        fused = reciprocal_rank_fusion([vector, lexical], [1.0, 1.0])
+
+        assert fused[0]['similarity'] == 0.8
+
+
+class TestLexicalSearch:
+    """Test SQL construction against a mock cursor."""
+
+    def test_normalized_storage_params(self):
+        cur = MagicMock()
+        cur.fetchall.return_value = _rows(1)
+
+        rows = lexical_search(cur, 'oxalates', 10, query_vector='VEC',
+                              segment_table='segment_embeddings_384', model_key='bge-small')
+
+        sql, params = cur.execute.call_args_list[1].args
+        assert params == ['VEC', 'oxalates', 'bge-small', 10]
+        assert 'segment_embeddings_384' in sql
+        assert 'text_tsv @@' in sql
+        assert rows == _rows(1)
+        assert cur.execute.call_args_list[-1].args[0] == 'RELEASE SAVEPOINT lexical_search'
+
+    def test_text_only_params(self):
+        cur = MagicMock()
+
+        lexical_search(cur, 'oxalates', 5)
+
+        sql, params = cur.execute.call_args_list[1].args
+        assert params == ['oxalates', 5]
+        assert '::vector' not in sql
+
+    def test_failure_rolls_back_to_savepoint(self):
+        cur = MagicMock()
+        cur.execute.side_effect = [None, RuntimeError('column "text_tsv" does not exist'), None]
+
+        with pytest.raises(RuntimeError):
+            lexical_search(cur, 'oxalates', 5)
+
+        assert cur.execute.call_args_list[-1].args[0] == 'ROLLBACK TO SAVEPOINT lexical_search'
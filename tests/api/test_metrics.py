@@ -0,0 +1,99 @@
+"""
+Tests for Prometheus metrics and the /metrics endpoint.
+
+Tests cover:
+- Histogram buckets are cumulative and carry request-ID exemplars (OpenMetrics only)
+- Counters render with _total and escaped labels
+- /metrics requires the metrics (or admin) bearer token
+- RequestIDMiddleware records request duration by route template
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api import main
+from api.utils import metrics
+from api.utils.metrics import Counter, Histogram, render_metrics
+from api.utils.request_id import RequestIDMiddleware
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset_metrics()
+    yield
+    metrics.reset_metrics()
+
+
+def test_histogram_is_cumulative_with_exemplars():
+    hist = Histogram('test_latency_seconds', 'Test latency', ['stage'], buckets=(0.1, 1.0))
+    hist.observe(0.05, exemplar='req-a', stage='embed')
+    hist.observe(0.5, exemplar='req-b', stage='embed')
+    hist.observe(5.0, exemplar='req-c', stage='embed')
+
+    plain = hist.render(openmetrics=False)
+    assert plain[:3] == [
+        'test_latency_seconds_bucket{stage="embed",le="0.1"} 1',
+        'test_latency_seconds_bucket{stage="embed",le="1"} 2',
+        'test_latency_seconds_bucket{stage="embed",le="+Inf"} 3',
+    ]
+    assert plain[3] == 'test_latency_seconds_sum{stage="embed"} 5.55'
+    assert plain[4] == 'test_latency_seconds_count{stage="embed"} 3'
+
+    om = hist.render(openmetrics=True)
+    assert om[1].startswith('test_latency_seconds_bucket{stage="embed",le="1"} 2 # {request_id="req-b"} 0.5 ')
+
+
+def test_counter_renders_total_and_escapes_labels():
+    counter = Counter('test_events', 'Test events', ['reason'])
+    counter.inc(reason='dim "mismatch"')
+    counter.inc(2, reason='dim "mismatch"')
+
+    assert counter.render(openmetrics=False) == ['test_events_total{reason="dim \\"mismatch\\""} 3']
+    with pytest.raises(ValueError):
+        counter.inc(other='x')
+
+
+def test_render_includes_help_type_and_eof():
+    metrics.observe_stage_ms('llm', 1500)
+    text = render_metrics(openmetrics=True)
+
+    assert '# TYPE rag_stage_duration_seconds histogram' in text
+    assert 'rag_stage_duration_seconds_count{stage="llm"} 1' in text
+    assert text.endswith('# EOF\n')
+
+
+def test_metrics_endpoint_requires_token():
+    client = TestClient(main.app)
+    with patch.object(main, 'METRICS_API_KEY', 'scrape-me'):
+        assert client.get('/metrics').status_code == 401
+        assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+
+        metrics.SEARCH_503.inc(reason='no_embeddings')
+        response = client.get('/metrics', headers={'Authorization': 'Bearer scrape-me'})
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    assert 'search_503_total{reason="no_embeddings"} 1' in response.text
+
+
+def test_middleware_records_route_template_with_request_id():
+    app = FastAPI()
+    app.add_middleware(RequestIDMiddleware)
+
+    @app.get('/items/{item_id}')
+    def item(item_id: int):
+        return {'id': item_id}
+
+    TestClient(app).get('/items/42', headers={'X-Request-ID': 'abc123'})
+
+    labels = dict(method='GET', route='/items/{item_id}', status='200')
+    assert metrics.HTTP_REQUEST_DURATION.count(**labels) == 1
+    text = render_metrics(openmetrics=True)
+    assert 'route="/items/{item_id}"' in text and '{request_id="abc123"}' in text
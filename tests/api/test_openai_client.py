@@ -0,0 +1,178 @@
+"""
+Tests for the shared AsyncOpenAI client wrapper.
+
+Tests cover:
+- Retries with backoff on retryable errors, no retry on client errors
+- Concurrency limit on in-flight completions
+- Streaming holds its slot until the stream is consumed, and closes the
+  response even when the consumer stops early
+- Cancellation while waiting for a slot leaves the counters exact
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api.services import openai_client
+from api.services.openai_client import chat_completion, get_openai_client_stats, stream_chat_completion
+
+
+def _status_error(cls, status):
+    request = httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+    response = httpx.Response(status, request=request)
+    return cls(f'status {status}', response=response, body=None)
+
+
+class FakeClient:
+    """Minimal stand-in for AsyncOpenAI.chat.completions."""
+
+    def __init__(self, outcomes, delay=0.0):
+        self.outcomes = list(outcomes)
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            outcome = self.outcomes.pop(0) if self.outcomes else 'ok'
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(openai_client, 'OPENAI_RETRY_BASE_DELAY', 0.001)
+    monkeypatch.setattr(openai_client, '_semaphore', None)
+
+
+@pytest.mark.asyncio
+async def test_retries_rate_limit_then_succeeds():
+    client = FakeClient([_status_error(openai.RateLimitError, 429), 'done'])
+    retries_before = get_openai_client_stats()['retries']
+
+    result = await chat_completion(client, model='m', messages=[])
+
+    assert result == 'done'
+    assert len(client.calls) == 2
+    assert client.calls[0]['timeout'] == openai_client.OPENAI_TIMEOUT_SECONDS
+    assert get_openai_client_stats()['retries'] == retries_before + 1
+
+
+@pytest.mark.asyncio
+async def test_bad_request_not_retried():
+    client = FakeClient([_status_error(openai.BadRequestError, 400)])
+
+    with pytest.raises(openai.BadRequestError):
+        await chat_completion(client, model='m', messages=[])
+
+    assert len(client.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(openai_client, 'OPENAI_MAX_RETRIES', 2)
+    client = FakeClient([_status_error(openai.InternalServerError, 503)] * 5)
+
+    with pytest.raises(openai.InternalServerError):
+        await chat_completion(client, model='m', messages=[])
+
+    assert len(client.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_limited(monkeypatch):
+    monkeypatch.setattr(openai_client, 'OPENAI_MAX_CONCURRENCY', 2)
+    client = FakeClient([], delay=0.02)
+
+    await asyncio.gather(*(chat_completion(client, model='m', messages=[]) for _ in range(6)))
+
+    assert client.max_active == 2
+
+
+class FakeResponse:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeStream:
+    """
+    Minimal stand-in for openai.AsyncStream as of openai 1.3.0 (the
+    production pin): iterable, with the httpx response, but no close().
+    """
+
+    def __init__(self, count):
+        self.count = count
+        self.response = FakeResponse()
+
+    async def __aiter__(self):
+        for i in range(self.count):
+            yield i
+
+    @property
+    def closed(self):
+        return self.response.closed
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_chunks():
+    stream = FakeStream(3)
+    client = FakeClient([stream])
+
+    received = [c async for c in stream_chat_completion(client, model='m', messages=[])]
+
+    assert received == [0, 1, 2]
+    assert client.calls[0]['stream'] is True
+    assert stream.closed
+    assert get_openai_client_stats()['in_flight'] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_closed_when_consumer_stops_early():
+    stream = FakeStream(10)
+    client = FakeClient([stream])
+
+    chunks = stream_chat_completion(client, model='m', messages=[])
+    assert await chunks.__anext__() == 0
+    await chunks.aclose()
+
+    assert stream.closed
+    assert get_openai_client_stats()['in_flight'] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_while_waiting_keeps_counters(monkeypatch):
+    monkeypatch.setattr(openai_client, 'OPENAI_MAX_CONCURRENCY', 1)
+    client = FakeClient([], delay=0.05)
+    before = get_openai_client_stats()
+
+    running = asyncio.create_task(chat_completion(client, model='m', messages=[]))
+    waiting = asyncio.create_task(chat_completion(client, model='m', messages=[]))
+    await asyncio.sleep(0.01)
+    assert get_openai_client_stats()['waiting'] == before['waiting'] + 1
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    await running
+
+    stats = get_openai_client_stats()
+    assert stats['waiting'] == before['waiting']
+    assert stats['in_flight'] == before['in_flight']
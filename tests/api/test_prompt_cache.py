@@ -0,0 +1,83 @@
+"""
+Tests for cached system-prompt assembly on the answer path.
+
+Tests cover:
+- Warm calls make no profile/instruction DB lookups
+- Keys change with profile version and instruction text
+- invalidate_rag_prompt_cache() forces a reload
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api import main, tuning
+from api.main import ResolvedCustomInstructions, _build_chaffee_system_prompt
+from api.tuning import DEFAULT_RAG_PROFILE
+from api.utils.metadata_cache import invalidate_rag_prompt_cache
+
+
+def _profile(version=1, base='Speak plainly.'):
+    return DEFAULT_RAG_PROFILE.copy(update={'id': 'p-1', 'version': version, 'base_instructions': base})
+
+
+def _instructions(text='Cite studies.'):
+    return ResolvedCustomInstructions(instruction_id='7', name='default', text=text, length=len(text))
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    invalidate_rag_prompt_cache()
+    yield
+    invalidate_rag_prompt_cache()
+
+
+def test_warm_call_skips_db():
+    with patch.object(tuning, 'get_rag_profile_from_db', return_value=_profile()) as load_profile, \
+         patch.object(main, 'resolve_custom_instructions', return_value=_instructions()) as load_instructions:
+        first, meta, _ = _build_chaffee_system_prompt('concise')
+        second, _, _ = _build_chaffee_system_prompt('concise')
+
+    assert first == second
+    assert 'Speak plainly.' in first and 'Cite studies.' in first
+    assert meta['id'] == 'p-1'
+    assert load_profile.call_count == 1
+    assert load_instructions.call_count == 1
+
+
+def test_invalidation_picks_up_new_profile_version():
+    with patch.object(tuning, 'get_rag_profile_from_db', return_value=_profile()), \
+         patch.object(main, 'resolve_custom_instructions', return_value=_instructions()):
+        before, _, _ = _build_chaffee_system_prompt('concise')
+
+    invalidate_rag_prompt_cache()
+    with patch.object(tuning, 'get_rag_profile_from_db', return_value=_profile(2, 'Be brief.')), \
+         patch.object(main, 'resolve_custom_instructions', return_value=_instructions()):
+        after, meta, _ = _build_chaffee_system_prompt('concise')
+
+    assert 'Speak plainly.' in before
+    assert 'Be brief.' in after
+    assert meta['version'] == 2
+
+
+def test_edited_instructions_rebuild_prompt():
+    with patch.object(tuning, 'get_rag_profile_from_db', return_value=_profile()), \
+         patch.object(main, 'resolve_custom_instructions', side_effect=[_instructions('Old.'), _instructions('New.')]):
+        old, _, _ = _build_chaffee_system_prompt('concise')
+        invalidate_rag_prompt_cache()
+        new, _, _ = _build_chaffee_system_prompt('concise')
+
+    assert 'Old.' in old and 'New.' in new
+
+
+def test_fallback_profile_not_cached():
+    with patch.object(tuning, 'get_rag_profile_from_db', return_value=DEFAULT_RAG_PROFILE) as load_profile, \
+         patch.object(main, 'resolve_custom_instructions', return_value=_instructions()):
+        _build_chaffee_system_prompt('concise')
+        _build_chaffee_system_prompt('concise')
+
+    assert load_profile.call_count == 2
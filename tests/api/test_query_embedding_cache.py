@@ -0,0 +1,99 @@
+"""
+Tests for the query embedding cache.
+
+Tests cover:
+- LRU eviction and hit/miss counters
+- Normalized keys shared across whitespace/case variants
+- Per-model keys and invalidation via embedding_config.clear_config_cache()
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api.utils.cache import LRUCache
+from api.utils import query_embedding_cache
+from api.utils.query_embedding_cache import (
+    get_cached_query_embedding,
+    normalize_query,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(query_embedding_cache, '_query_embedding_cache', LRUCache(max_size=2))
+
+
+class TestLRUCache:
+    """Tests for LRUCache."""
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert cache.get('a') == 1  # 'a' is now most recent
+        cache.set('c', 3)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        stats = cache.stats()
+        assert stats['evictions'] == 1
+        assert stats['hits'] == 2
+        assert stats['misses'] == 1
+
+    def test_expired_entries_miss(self, monkeypatch):
+        cache = LRUCache(max_size=2, ttl_seconds=10)
+        monkeypatch.setattr('api.utils.cache.time.time', lambda: 1000.0)
+        cache.set('a', 1)
+        monkeypatch.setattr('api.utils.cache.time.time', lambda: 1011.0)
+
+        assert cache.get('a') is None
+        assert len(cache) == 0
+
+
+class TestQueryEmbeddingCache:
+    """Tests for get_cached_query_embedding."""
+
+    def test_normalize_query(self):
+        assert normalize_query('  What is   KETO?\n') == 'what is keto?'
+
+    def test_variants_share_one_embedding(self):
+        embed = MagicMock(return_value=[0.1, 0.2, 0.3])
+
+        first = get_cached_query_embedding('bge-small-en-v1.5', 'What is keto?', embed)
+        second = get_cached_query_embedding('bge-small-en-v1.5', 'what is  keto? ', embed)
+
+        embed.assert_called_once_with('What is keto?')
+        assert second is first
+        assert first.dtype == np.float32
+        assert not first.flags.writeable
+
+    def test_keys_are_per_model(self):
+        embed = MagicMock(return_value=[0.1, 0.2])
+
+        get_cached_query_embedding('model-a', 'q', embed)
+        get_cached_query_embedding('model-b', 'q', embed)
+
+        assert embed.call_count == 2
+
+    def test_empty_result_not_cached(self):
+        embed = MagicMock(return_value=[])
+
+        assert get_cached_query_embedding('model-a', 'q', embed) is None
+        assert get_cached_query_embedding('model-a', 'q', embed) is None
+        assert embed.call_count == 2
+
+    def test_clear_config_cache_clears_embeddings(self):
+        from api.embedding_config import clear_config_cache
+
+        embed = MagicMock(return_value=[0.1, 0.2])
+        get_cached_query_embedding('model-a', 'q', embed)
+        clear_config_cache()
+        get_cached_query_embedding('model-a', 'q', embed)
+
+        assert embed.call_count == 2
@@ -0,0 +1,84 @@
+"""
+Tests for the /livez, /readyz and /health probes.
+
+Tests cover:
+- Probes read cached state and never run an embedding or open a DB connection
+- Readiness requires a loaded (or lazy) model, a recent DB ping and a free pool slot
+- The background prober records successes and failures without raising
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api import main
+from api.utils import readiness
+from api.utils.readiness import DatabaseProber, check_readiness
+
+POOL_OK = {"initialized": True, "saturation": 0.5}
+
+
+@pytest.fixture
+def prober():
+    probe = DatabaseProber(MagicMock())
+    with patch.object(readiness, '_db_prober', probe), \
+         patch.object(readiness, '_model_state', readiness.MODEL_LOADED):
+        yield probe
+
+
+def test_prober_records_success_and_failure(prober):
+    assert prober.last_ok_age() is None
+    assert prober.ping() is True
+    assert prober.last_ok_age() is not None
+    prober._connect_fn.return_value.close.assert_called_once()
+
+    prober._connect_fn.side_effect = RuntimeError('pool timeout')
+    assert prober.ping() is False
+    stats = prober.stats()
+    assert stats['consecutive_failures'] == 1 and 'pool timeout' in stats['last_error']
+
+
+def test_readiness_checks(prober):
+    assert check_readiness(POOL_OK)['checks']['database']['ok'] is False
+
+    prober.ping()
+    assert check_readiness(POOL_OK)['ready'] is True
+    assert check_readiness({"initialized": True, "saturation": 1.0})['ready'] is False
+    assert check_readiness({"initialized": False})['ready'] is False
+
+    readiness.set_model_state(readiness.MODEL_LOADING)
+    assert check_readiness(POOL_OK)['checks']['model']['ok'] is False
+    readiness.set_model_state(readiness.MODEL_LAZY)
+    assert check_readiness(POOL_OK)['ready'] is True
+
+
+def test_probes_never_embed_or_connect(prober):
+    client = TestClient(main.app)
+    with patch.object(main, 'get_embedding_generator') as generator, \
+         patch.object(main, 'get_db_connection') as connect, \
+         patch.object(main, 'get_pool_stats', return_value=POOL_OK):
+        assert client.get('/livez').json() == {'status': 'ok'}
+        assert client.get('/readyz').status_code == 503
+
+        prober.ping()
+        ready = client.get('/readyz')
+        health = client.get('/health')
+
+    assert ready.status_code == 200 and ready.json()['status'] == 'ready'
+    assert health.status_code == 200
+    assert health.json()['checks'] == {'database': 'ok', 'embeddings': 'ok'}
+    generator.assert_not_called()
+    connect.assert_not_called()
+
+
+def test_successful_encode_marks_model_loaded(prober):
+    readiness.set_model_state(readiness.MODEL_FAILED)
+    with patch.object(main, 'get_embedding_generator') as generator:
+        generator.return_value.generate_embeddings.return_value = [[0.0]]
+        main._encode_batch(['hello'])
+    assert readiness.get_model_state() == readiness.MODEL_LOADED
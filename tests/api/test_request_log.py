@@ -0,0 +1,146 @@
+"""
+Tests for write-behind request logging (rag_requests / ai_requests).
+
+Tests cover:
+- Rows are queued while the writer runs and flushed in one INSERT per table
+- Full queue drops rows and counts them
+- stop() flushes queued rows
+- log_ai_request returns a pre-allocated id visible before the flush
+- Handlers only run the synchronous INSERT fallback off the event loop
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api import daily_summaries, feedback, main
+from api.services import request_log
+from api.services.request_log import RequestLogWriter
+
+
+@pytest.fixture
+def conn():
+    return MagicMock()
+
+
+def _writer(conn, **kwargs):
+    return RequestLogWriter(connect_fn=lambda: conn, **kwargs)
+
+
+def test_flush_groups_rows_by_table(conn):
+    writer = _writer(conn)
+    writer.submit('rag_requests', ('a', 'b'), (1, 2))
+    writer.submit('ai_requests', ('x',), ('id-1',))
+    writer.submit('rag_requests', ('a', 'b'), (3, 4))
+
+    with patch.object(request_log, 'insert_rows') as insert:
+        assert writer.flush() == 3
+
+    calls = {c.args[1]: c.args[3] for c in insert.call_args_list}
+    assert calls == {'rag_requests': [(1, 2), (3, 4)], 'ai_requests': [('id-1',)]}
+    conn.close.assert_called_once()
+    assert writer.stats()['queued'] == 0
+
+
+def test_full_queue_drops_rows(conn):
+    writer = _writer(conn, max_queue_size=2)
+    assert writer.submit('rag_requests', ('a',), (1,))
+    assert writer.submit('rag_requests', ('a',), (2,))
+    assert not writer.submit('rag_requests', ('a',), (3,))
+
+    stats = writer.stats()
+    assert stats['dropped'] == 1 and stats['queued'] == 2
+
+
+def test_failed_flush_counts_dropped_rows(conn):
+    writer = _writer(conn)
+    writer.submit('rag_requests', ('a',), (1,))
+
+    with patch.object(request_log, 'insert_rows', side_effect=RuntimeError('db down')):
+        assert writer.flush() == 0
+
+    stats = writer.stats()
+    assert stats['errors'] == 1 and stats['dropped'] == 1
+    conn.rollback.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_batch_size_wakes_writer_and_stop_flushes(conn):
+    writer = _writer(conn, flush_interval_ms=60_000, batch_size=2)
+    with patch.object(request_log, 'insert_rows') as insert:
+        await writer.start()
+        writer.submit('rag_requests', ('a',), (1,))
+        writer.submit('rag_requests', ('a',), (2,))
+        for _ in range(50):
+            if insert.called:
+                break
+            await asyncio.sleep(0.01)
+        assert insert.call_args.args[3] == [(1,), (2,)]
+
+        writer.submit('rag_requests', ('a',), (3,))
+        await writer.stop()
+
+    assert insert.call_args.args[3] == [(3,)]
+    assert not writer.running
+
+
+@pytest.mark.asyncio
+async def test_log_ai_request_returns_id_before_flush(conn):
+    writer = _writer(conn, flush_interval_ms=60_000)
+    with patch.object(feedback, 'get_request_log_writer', return_value=writer), \
+         patch.object(request_log, 'insert_rows') as insert:
+        await writer.start()
+        ai_request_id = feedback.log_ai_request(
+            request_type='qa', input_text='What is keto?', model_name='gpt-4o-mini',
+        )
+        uuid.UUID(ai_request_id)
+        insert.assert_not_called()
+
+        # Feedback submitted before the flush still finds the request
+        metadata = feedback.get_ai_request_metadata(ai_request_id)
+        assert metadata['model_name'] == 'gpt-4o-mini'
+        assert metadata['request_type'] == 'qa'
+
+        await writer.stop()
+
+    table, columns, rows = insert.call_args.args[1:]
+    assert table == 'ai_requests'
+    assert dict(zip(columns, rows[0]))['id'] == ai_request_id
+
+
+def test_log_rag_request_queues_without_db(conn):
+    writer = _writer(conn)
+    writer._task = MagicMock(done=MagicMock(return_value=False))  # Pretend running
+    with patch.object(daily_summaries, 'get_request_log_writer', return_value=writer), \
+         patch.object(daily_summaries, 'get_db_connection') as get_conn:
+        daily_summaries.log_rag_request(request_type='search', query_text='keto', results_count=3)
+
+    get_conn.assert_not_called()
+    row = writer.pending_row('rag_requests', 'request_type', 'search')
+    assert row['query_text'] == 'keto' and row['source_app'] == 'unknown'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('running', [True, False])
+async def test_handler_logging_leaves_event_loop_only_for_sync_insert(conn, running):
+    writer = _writer(conn)
+    if running:
+        writer._task = MagicMock(done=MagicMock(return_value=False))
+    threads = []
+
+    def log_fn(**kwargs):
+        threads.append(threading.get_ident())
+        return kwargs['query_text']
+
+    with patch.object(main, 'get_request_log_writer', return_value=writer):
+        result = await main._log_request(log_fn, query_text='keto')
+
+    assert result == 'keto'
+    assert (threads[0] == threading.get_ident()) is running
@@ -0,0 +1,91 @@
+"""
+Tests for the /api/search rerank stage.
+
+Tests cover:
+- Reranked order and return_top_k/rerank_top_k limits
+- Fallback to vector order on timeout, error and unknown backend
+- Disabled stage passes results through untouched
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api.services import rerank_stage
+from api.services.rerank_stage import rerank_results, register_reranker
+
+
+def _rows(n):
+    return [{'id': i, 'text': f'doc {i}', 'similarity': 1 - i / 100} for i in range(n)]
+
+
+register_reranker('reverse', lambda query, rows: [float(r['id']) for r in rows])
+register_reranker('slow', lambda query, rows: time.sleep(0.3) or [0.0] * len(rows))
+
+
+def _failing(query, rows):
+    raise RuntimeError("model not loaded")
+
+
+register_reranker('failing', _failing)
+
+
+@pytest.mark.asyncio
+async def test_reranks_candidates_and_limits_output():
+    outcome = await rerank_results('q', _rows(10), rerank_top_k=5, return_top_k=3, backend='reverse')
+
+    assert outcome.status == 'applied'
+    assert outcome.candidates == 5
+    assert [r['id'] for r in outcome.results] == [4, 3, 2]
+    assert outcome.results[0]['rerank_score'] == 4.0
+
+
+@pytest.mark.asyncio
+async def test_timeout_falls_back_to_vector_order():
+    outcome = await rerank_results(
+        'q', _rows(10), rerank_top_k=5, return_top_k=3, backend='slow', time_budget_ms=20
+    )
+
+    assert outcome.status == 'timeout'
+    assert [r['id'] for r in outcome.results] == [0, 1, 2]
+    assert 'rerank_score' not in outcome.results[0]
+
+
+@pytest.mark.asyncio
+async def test_error_falls_back_to_vector_order():
+    outcome = await rerank_results('q', _rows(4), rerank_top_k=4, return_top_k=2, backend='failing')
+
+    assert outcome.status == 'error'
+    assert [r['id'] for r in outcome.results] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_unknown_backend_falls_back():
+    outcome = await rerank_results('q', _rows(4), rerank_top_k=4, return_top_k=2, backend='missing')
+
+    assert outcome.status == 'error'
+    assert len(outcome.results) == 2
+
+
+@pytest.mark.asyncio
+async def test_busy_reranker_falls_back(monkeypatch):
+    monkeypatch.setattr(rerank_stage, '_inflight', rerank_stage.RERANK_MAX_INFLIGHT)
+
+    outcome = await rerank_results('q', _rows(4), rerank_top_k=4, return_top_k=2, backend='reverse')
+
+    assert outcome.status == 'busy'
+    assert [r['id'] for r in outcome.results] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_disabled_passes_results_through():
+    rows = _rows(6)
+
+    outcome = await rerank_results('q', rows, rerank_top_k=2, return_top_k=2, enabled=False)
+
+    assert outcome.status == 'off'
+    assert outcome.results is rows
@@ -0,0 +1,114 @@
+"""
+Tests for /api/search/batch.
+
+Tests cover:
+- Cache misses are embedded in one generate_embeddings call (deduplicated)
+- All queries go to the database in one statement and are split back by ordinal
+- With reranking on, an explicit top_k sets the result count; otherwise return_top_k caps it
+- Request validation
+"""
+
+import os
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api import main
+from api.tuning import SearchConfigDB
+from api.utils.query_embedding_cache import clear_query_embedding_cache
+
+
+def _row(ord, id, similarity):
+    return {
+        'ord': ord, 'id': id, 'video_id': f'v{id}', 'title': f'Video {id}', 'text': 'meat',
+        'start_time_seconds': 1.0, 'end_time_seconds': 5.0, 'published_at': datetime(2025, 1, 1),
+        'source_type': 'youtube', 'url': f'https://www.youtube.com/watch?v=v{id}',
+        'similarity': similarity,
+    }
+
+
+@pytest.fixture
+def encoder():
+    clear_query_embedding_cache()
+    encode = MagicMock(side_effect=lambda texts: [np.full(384, i + 1, dtype=np.float32) for i in range(len(texts))])
+    with patch.object(main, 'get_active_model_key', return_value='bge-small-en-v1.5'), \
+         patch.object(main, '_encode_batch', encode):
+        yield encode
+    clear_query_embedding_cache()
+
+
+def test_embed_queries_encodes_misses_once(encoder):
+    first = main.embed_queries(['What is keto?', 'carnivore diet'])
+    second = main.embed_queries(['what is  KETO?', 'carnivore diet', 'fasting', 'Fasting'])
+
+    assert [c.args[0] for c in encoder.call_args_list] == [['What is keto?', 'carnivore diet'], ['fasting']]
+    assert second[0] is first[0]
+    assert second[2] is second[3]
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_one_query_and_splits_results(encoder):
+    fetch = MagicMock(return_value=[_row(0, 1, 0.9), _row(0, 2, 0.8), _row(2, 3, 0.7)])
+    request = main.BatchSearchRequest(queries=['keto', 'fasting', 'steak'], rerank=False)
+
+    async def resolve():
+        return 'bge-small-en-v1.5', 384
+
+    with patch.object(main, 'get_cached_search_config', return_value=SearchConfigDB()), \
+         patch.object(main, '_resolve_search_model', new=resolve), \
+         patch.object(main, '_fetch_all', fetch), \
+         patch.object(main, 'log_rag_request') as log:
+        response = await main.semantic_search_batch(request)
+
+    fetch.assert_called_once()
+    sql, params = fetch.call_args.args[:2]
+    assert 'unnest' in sql and 'LATERAL' in sql
+    assert params[0] == [0, 1, 2] and len(params[1]) == 3
+    encoder.assert_called_once()
+
+    assert [r.query for r in response.results] == ['keto', 'fasting', 'steak']
+    assert [[hit.id for hit in r.results] for r in response.results] == [[1, 2], [], [3]]
+    assert response.total_queries == 3 and set(response.timings) == {'embed_ms', 'search_ms', 'rerank_ms', 'total_ms'}
+    assert log.call_count == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('request_top_k,config,expected', [
+    (3, SearchConfigDB(top_k=10, return_top_k=20), 3),
+    (None, SearchConfigDB(top_k=10, return_top_k=5), 5),
+    (None, SearchConfigDB(top_k=4, return_top_k=20), 4),
+])
+async def test_rerank_result_count_follows_top_k(encoder, request_top_k, config, expected):
+    request = main.BatchSearchRequest(queries=['keto'], top_k=request_top_k, rerank=True)
+    rerank = AsyncMock(return_value=SimpleNamespace(results=[], status='reranked', rerank_ms=1.0))
+
+    async def resolve():
+        return 'bge-small-en-v1.5', 384
+
+    with patch.object(main, 'get_cached_search_config', return_value=config), \
+         patch.object(main, '_resolve_search_model', new=resolve), \
+         patch.object(main, '_fetch_all', MagicMock(return_value=[])), \
+         patch.object(main, 'rerank_results', rerank), \
+         patch.object(main, 'log_rag_request'):
+        await main.semantic_search_batch(request)
+
+    assert rerank.call_args.kwargs['return_top_k'] == expected
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_empty_and_oversized_requests():
+    with pytest.raises(HTTPException) as empty:
+        await main.semantic_search_batch(main.BatchSearchRequest(queries=[]))
+    with pytest.raises(HTTPException) as oversized:
+        await main.semantic_search_batch(
+            main.BatchSearchRequest(queries=['q'] * (main.SEARCH_BATCH_MAX_QUERIES + 1))
+        )
+
+    assert empty.value.status_code == oversized.value.status_code == 400
@@ -0,0 +1,125 @@
+"""
+Tests for single-flight coalescing of /api/answer and /api/search.
+
+Tests cover:
+- Concurrent calls with the same key share one computation
+- Exceptions are shared; nothing is cached after completion
+- A cancelled first caller doesn't cancel the shared computation
+- answer_question coalesces on the full answer key
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api import main
+from api.tuning import DEFAULT_RAG_PROFILE, SearchConfigDB
+from api.utils.single_flight import SingleFlight
+
+
+def _counting(result='ok', delay=0.05, error=None):
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    return fn, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_result():
+    flights = SingleFlight('test', enabled=True)
+    fn, calls = _counting()
+
+    outcomes = await asyncio.gather(*(flights.do('k', fn) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert [r for r, _ in outcomes] == ['ok'] * 5
+    assert sum(shared for _, shared in outcomes) == 4
+    assert flights.stats()['in_flight'] == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_and_sequential_calls_run_separately():
+    flights = SingleFlight('test', enabled=True)
+    fn, calls = _counting()
+
+    await asyncio.gather(flights.do('a', fn), flights.do('b', fn))
+    await flights.do('a', fn)
+
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared():
+    flights = SingleFlight('test', enabled=True)
+    fn, calls = _counting(error=ValueError('boom'))
+
+    outcomes = await asyncio.gather(flights.do('k', fn), flights.do('k', fn), return_exceptions=True)
+
+    assert len(calls) == 1
+    assert all(isinstance(o, ValueError) for o in outcomes)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    flights = SingleFlight('test', enabled=True)
+    fn, calls = _counting(delay=0.1)
+
+    leader = asyncio.ensure_future(flights.do('k', fn))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flights.do('k', fn))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await follower == ('ok', True)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_none_key_bypasses_coalescing():
+    flights = SingleFlight('test', enabled=True)
+    fn, calls = _counting()
+
+    await asyncio.gather(flights.do(None, fn), flights.do(None, fn))
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_answer_question_coalesces_duplicates():
+    fn, calls = _counting(result={'answer': 'Eat meat.'})
+    request = main.AnswerRequest(query='What is keto?', style='concise')
+
+    with patch.object(main, '_answer_flights', SingleFlight('answer', enabled=True)), \
+         patch.object(main, '_answer_flight_key', return_value=('what is keto?', 'concise')), \
+         patch.object(main, '_answer_question', new=lambda _request: fn()):
+        results = await asyncio.gather(*(main.answer_question(request) for _ in range(3)))
+
+    assert len(calls) == 1
+    assert all(r == {'answer': 'Eat meat.'} for r in results)
+
+
+def test_answer_key_tracks_profile_and_style():
+    instructions = main.ResolvedCustomInstructions(instruction_id=None, name=None, text='', length=0)
+
+    def key(query, style, version):
+        request = main.AnswerRequest(query=query, style=style)
+        with patch.object(main, 'get_cached_rag_profile',
+                          return_value=DEFAULT_RAG_PROFILE.copy(update={'id': 'p', 'version': version})), \
+             patch.object(main, 'get_cached_custom_instructions', return_value=instructions), \
+             patch.object(main, 'get_cached_search_config', return_value=SearchConfigDB()):
+            return main._answer_flight_key(request)
+
+    assert key('What is  Keto?', 'concise', 1) == key('what is keto?', 'concise', 1)
+    assert key('what is keto?', 'concise', 1) != key('what is keto?', 'detailed', 1)
+    assert key('what is keto?', 'concise', 1) != key('what is keto?', 'concise', 2)
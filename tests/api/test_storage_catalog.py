@@ -0,0 +1,114 @@
+"""
+Tests for the storage catalog used by semantic_search_with_fallback.
+
+Tests cover:
+- Entries are built once and then served without SQL
+- invalidate() forces a rebuild; failed refreshes keep the old entry
+- The search path issues only the vector query when the catalog is warm
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from api import main
+from api.tuning import SearchConfigDB
+from api.utils.storage_catalog import StorageCatalog
+
+
+def _status(model_key='bge-small-en-v1.5', exists=True, rows=1000):
+    return {
+        'model_key': model_key,
+        'dimensions': 384,
+        'segment_table': 'segment_embeddings_384',
+        'segment_table_exists': exists,
+        'segment_row_count': rows,
+        'answer_cache_table': 'answer_cache_embeddings_384',
+        'answer_cache_table_exists': exists,
+        'answer_cache_row_count': 0,
+        'paid': False,
+        'auto_backfill': False,
+    }
+
+
+@pytest.fixture
+def catalog():
+    return StorageCatalog(connect_fn=MagicMock)
+
+
+def test_entry_built_once(catalog):
+    with patch('scripts.embedding_storage.get_storage_status', return_value=_status()) as status:
+        first = catalog.get('bge-small-en-v1.5')
+        second = catalog.get('bge-small-en-v1.5')
+
+    assert status.call_count == 1
+    assert status.call_args.kwargs == {'approximate': True}
+    assert first is second
+    assert first.has_segment_embeddings
+    stats = catalog.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1
+
+
+def test_invalidate_forces_rebuild(catalog):
+    with patch('scripts.embedding_storage.get_storage_status',
+               side_effect=[_status(rows=0), _status(rows=50)]):
+        assert not catalog.get('bge-small-en-v1.5').has_segment_embeddings
+        catalog.invalidate()
+        assert catalog.get('bge-small-en-v1.5').segment_row_count == 50
+
+
+def test_failed_refresh_keeps_entry(catalog):
+    with patch('scripts.embedding_storage.get_storage_status', return_value=_status()):
+        catalog.get('bge-small-en-v1.5')
+    with patch('scripts.embedding_storage.get_storage_status', side_effect=RuntimeError('db down')):
+        catalog.refresh()
+
+    assert catalog.get('bge-small-en-v1.5').segment_row_count == 1000
+    assert catalog.stats()['errors'] == 1
+
+
+def test_build_failure_returns_none(catalog):
+    with patch('scripts.embedding_storage.get_storage_status', side_effect=RuntimeError('db down')):
+        assert catalog.get('bge-small-en-v1.5') is None
+
+
+def _search(catalog, rows):
+    cur = MagicMock()
+    cur.fetchall.return_value = rows
+    with patch.object(main, 'get_storage_catalog', return_value=catalog), \
+         patch.object(main, 'get_cached_search_config', return_value=SearchConfigDB()), \
+         patch.object(main, 'use_normalized_storage', return_value=True), \
+         patch.object(main, 'use_fallback_read', return_value=False):
+        results, source = main.semantic_search_with_fallback(cur, [0.1] * 384, 'bge-small-en-v1.5', 5)
+    return cur, results, source
+
+
+def test_search_runs_only_vector_query(catalog):
+    with patch('scripts.embedding_storage.get_storage_status', return_value=_status()):
+        catalog.get('bge-small-en-v1.5')
+
+    cur, results, source = _search(catalog, [{'id': 1, 'text': 'keto', 'similarity': 0.9}])
+
+    # ANN settings ride along in the same execute
+    assert cur.execute.call_count == 1
+    sql, params = cur.execute.call_args.args
+    assert sql.startswith("SELECT set_config('ivfflat.probes'")
+    assert params[:2] == ['10', '100']
+    assert 'segment_embeddings_384' in sql
+    assert 'COUNT(*)' not in sql and 'information_schema' not in sql
+    assert source == 'segment_embeddings_384:bge-small-en-v1.5'
+    assert results[0]['id'] == 1
+
+
+def test_search_skips_missing_table(catalog):
+    with patch('scripts.embedding_storage.get_storage_status', return_value=_status(exists=False, rows=0)):
+        catalog.get('bge-small-en-v1.5')
+
+    cur, results, source = _search(catalog, [])
+
+    cur.execute.assert_not_called()
+    assert results == [] and source == 'none'
@@ -0,0 +1,141 @@
+"""Unit tests for cosine ANN index planning in embedding_storage.py."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.scripts.embedding_storage import (
+    COSINE_OPCLASS,
+    ann_search_settings_sql,
+    apply_ann_search_settings,
+    ensure_cosine_ann_index,
+    parse_pg_memory,
+    plan_ann_index,
+)
+
+MB = 1024 ** 2
+
+
+@pytest.mark.unit
+class TestPlanAnnIndex:
+    """Test index method/parameter selection."""
+
+    def test_parse_pg_memory_units(self):
+        assert parse_pg_memory('64MB') == 64 * MB
+        assert parse_pg_memory('1GB') == 1024 * MB
+        assert parse_pg_memory('65536kB') == 64 * MB
+        assert parse_pg_memory('1024') == 1024 * 1024
+
+    def test_small_table_gets_hnsw(self):
+        plan = plan_ann_index(50_000, 384, 256 * MB)
+
+        assert plan.method == 'hnsw'
+        assert plan.params['m'] == 16
+        assert plan.params['ef_construction'] == 128
+        assert plan.with_clause() == 'm = 16, ef_construction = 128'
+
+    def test_graph_exceeding_memory_falls_back_to_ivfflat(self):
+        plan = plan_ann_index(500_000, 1536, 64 * MB)
+
+        assert plan.method == 'ivfflat'
+        assert 1 <= plan.params['lists'] <= 500
+        assert plan.recommended_probes >= 1
+
+    def test_ivfflat_lists_scale_with_rows(self):
+        small = plan_ann_index(200_000, 384, 1024 * MB, method='ivfflat')
+        large = plan_ann_index(4_000_000, 384, 1024 * MB, method='ivfflat')
+
+        assert small.params['lists'] == 200
+        assert large.params['lists'] == 2000
+
+    def test_ivfflat_lists_capped_by_memory(self):
+        plan = plan_ann_index(4_000_000, 1536, 16 * MB, method='ivfflat')
+
+        # k-means sample (lists * 50 vectors) must fit in maintenance_work_mem
+        assert plan.params['lists'] * 51 * (1536 * 4 + 8) <= 16 * MB
+
+    def test_rejects_unindexable_dimensions(self):
+        with pytest.raises(ValueError):
+            plan_ann_index(1000, 3072, 256 * MB)
+
+    def test_rejects_unknown_method(self):
+        with pytest.raises(ValueError):
+            plan_ann_index(1000, 384, 256 * MB, method='diskann')
+
+
+@pytest.mark.unit
+class TestAnnSettings:
+    """Test per-query settings and index replacement."""
+
+    def test_ef_search_raised_to_top_k(self):
+        cur = MagicMock()
+        apply_ann_search_settings(cur, probes=10, ef_search=40, top_k=200)
+
+        cur.execute.assert_called_once_with(
+            "SELECT set_config('ivfflat.probes', %s, true), set_config('hnsw.ef_search', %s, true);",
+            ['10', '200'],
+        )
+
+    def test_settings_sql_empty_without_settings(self):
+        assert ann_search_settings_sql(None, None, 10) == ('', [])
+
+    def test_l2_index_replaced_with_cosine(self, monkeypatch):
+        import backend.scripts.embedding_storage as storage
+
+        monkeypatch.setattr(storage, 'get_embedding_indexes', lambda conn, table: [
+            {'name': 'segments_embedding_idx', 'method': 'ivfflat', 'opclass': 'vector_l2_ops', 'definition': ''},
+        ])
+        monkeypatch.setattr(storage, 'estimate_row_count', lambda conn, table: 10_000)
+        monkeypatch.setattr(storage, 'get_maintenance_work_mem_bytes', lambda conn: 256 * MB)
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+
+        summary = ensure_cosine_ann_index(conn, 'segments', 384)
+
+        statements = [' '.join(c.args[0].split()) for c in cur.execute.call_args_list]
+        create = next(i for i, s in enumerate(statements) if s.startswith('CREATE INDEX CONCURRENTLY'))
+        drop = statements.index('DROP INDEX CONCURRENTLY IF EXISTS "segments_embedding_idx"')
+        assert f'USING hnsw (embedding {COSINE_OPCLASS})' in statements[create]
+        assert create < drop
+        assert summary['dropped'] == ['segments_embedding_idx']
+        assert summary['created']['name'] == 'idx_segments_embedding_hnsw'
+
+    def test_rebuild_swaps_in_new_index_concurrently(self, monkeypatch):
+        import backend.scripts.embedding_storage as storage
+
+        name = 'idx_answer_cache_embeddings_384_embedding_ivfflat'
+        monkeypatch.setattr(storage, 'get_embedding_indexes', lambda conn, table: [
+            {'name': name, 'method': 'ivfflat', 'opclass': COSINE_OPCLASS, 'definition': ''},
+        ])
+        monkeypatch.setattr(storage, 'estimate_row_count', lambda conn, table: 10_000)
+        monkeypatch.setattr(storage, 'get_maintenance_work_mem_bytes', lambda conn: 256 * MB)
+        conn = MagicMock()
+        conn.raw.autocommit = False
+        cur = conn.cursor.return_value.__enter__.return_value
+        modes = []
+        cur.execute.side_effect = lambda sql, *a: modes.append(conn.raw.autocommit)
+
+        summary = ensure_cosine_ann_index(conn, 'answer_cache_embeddings_384', 384,
+                                          method='ivfflat', rebuild=True)
+
+        statements = [' '.join(c.args[0].split()) for c in cur.execute.call_args_list]
+        assert statements[1].startswith(f'CREATE INDEX CONCURRENTLY {name}_new ')
+        assert statements[2] == f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'
+        assert statements[3] == f'ALTER INDEX {name}_new RENAME TO {name}'
+        assert all(modes)
+        assert conn.raw.autocommit is False
+        assert summary['dropped'] == [name]
+        assert summary['created']['name'] == name
+
+    def test_existing_cosine_index_kept(self, monkeypatch):
+        import backend.scripts.embedding_storage as storage
+
+        monkeypatch.setattr(storage, 'get_embedding_indexes', lambda conn, table: [
+            {'name': 'idx_segment_embeddings_384_ivfflat', 'method': 'ivfflat', 'opclass': COSINE_OPCLASS, 'definition': ''},
+        ])
+        conn = MagicMock()
+
+        summary = ensure_cosine_ann_index(conn, 'segment_embeddings_384', 384)
+
+        assert summary['kept'] == 'idx_segment_embeddings_384_ivfflat'
+        assert summary['created'] is None
@@ -0,0 +1,128 @@
+"""
+Unit tests for the cross-video embedding batch accumulator.
+
+Tests cover:
+- Videos are gathered until the text target is reached, then drained together
+- A partial batch is released once its oldest video exceeds the max latency
+- drain() flushes everything left at shutdown
+- A failed embedding call or insert counts those videos as errors and keeps their audio
+"""
+
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'backend' / 'scripts'))
+
+from common.embedding_accumulator import EmbeddingBatchAccumulator
+from ingest_youtube import EnhancedYouTubeIngester, ProcessingStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fills_to_target_across_videos():
+    acc = EmbeddingBatchAccumulator(target_texts=100, max_latency_s=5.0)
+
+    assert acc.add('vid1', 40) is None
+    assert acc.add('vid2', 40) is None
+    batch = acc.add('vid3', 40)
+
+    assert batch == ['vid1', 'vid2', 'vid3']
+    assert len(acc) == 0 and acc.pending_texts == 0
+
+
+def test_partial_batch_released_after_max_latency():
+    clock = FakeClock()
+    acc = EmbeddingBatchAccumulator(target_texts=100, max_latency_s=5.0, clock=clock)
+
+    acc.add('vid1', 10)
+    clock.now += 3.0
+    acc.add('vid2', 10)
+    assert acc.take_due() is None
+    assert acc.seconds_until_due() == pytest.approx(2.0)
+
+    clock.now += 2.0  # Age is measured from the oldest video
+    assert acc.take_due() == ['vid1', 'vid2']
+    assert acc.seconds_until_due() is None
+
+
+def test_drain_and_concurrent_adds():
+    acc = EmbeddingBatchAccumulator(target_texts=1000, max_latency_s=60.0)
+    threads = [threading.Thread(target=acc.add, args=(i, 1)) for i in range(50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert acc.pending_texts == 50
+    assert sorted(acc.drain()) == list(range(50))
+    assert acc.drain() == []
+
+
+def test_rejects_empty_target():
+    with pytest.raises(ValueError):
+        EmbeddingBatchAccumulator(target_texts=0, max_latency_s=1.0)
+
+
+def _ingester():
+    ingester = EnhancedYouTubeIngester.__new__(EnhancedYouTubeIngester)
+    ingester.config = SimpleNamespace(cleanup_audio=True, embed_chaffee_only=False,
+                                      chaffee_only_storage=False)
+    ingester.stats = ProcessingStats()
+    ingester.embedder = MagicMock()
+    ingester.segments_db = MagicMock()
+    ingester.segments_db.batch_insert_segments.return_value = 1
+    ingester._embedding_accumulator = EmbeddingBatchAccumulator(target_texts=100, max_latency_s=5.0)
+    return ingester
+
+
+def _items(tmp_path, count):
+    items = []
+    for i in range(count):
+        audio = tmp_path / f'v{i}.wav'
+        audio.write_bytes(b'audio')
+        video = SimpleNamespace(video_id=f'v{i}', title=f'Video {i}')
+        segments = [{'text': f'text {i}', 'speaker_label': 'Chaffee'}]
+        items.append((video, segments, 'whisper', {}, str(audio)))
+    return items
+
+
+def _flush(ingester, items):
+    ingester._flush_embedding_batch(items, True, threading.Lock(), lambda: None, MagicMock())
+
+
+def test_failed_embedding_call_fails_whole_batch(tmp_path):
+    ingester = _ingester()
+    ingester.embedder.generate_embeddings.side_effect = RuntimeError('CUDA OOM')
+    items = _items(tmp_path, 3)
+
+    _flush(ingester, items)
+
+    assert ingester.stats.errors == 3
+    assert ingester.stats.processed == 0
+    assert all(Path(audio).exists() for *_, audio in items)
+    ingester.segments_db.batch_insert_segments.assert_not_called()
+
+
+def test_failed_insert_fails_only_that_video(tmp_path):
+    ingester = _ingester()
+    ingester.embedder.generate_embeddings.return_value = [[0.1], [0.2]]
+    ingester.segments_db.batch_insert_segments.side_effect = [RuntimeError('deadlock'), 1]
+    items = _items(tmp_path, 2)
+
+    _flush(ingester, items)
+
+    assert ingester.stats.errors == 1
+    assert ingester.stats.processed == 1
+    assert Path(items[0][4]).exists()
+    assert not Path(items[1][4]).exists()
@@ -0,0 +1,123 @@
+"""
+Unit tests for the deferred-embedding queue.
+
+Tests cover:
+- Enqueue applies the Chaffee-only filter and resets retried entries
+- Claims skip locked rows and parked entries
+- The worker completes a batch in one transaction, or rolls it back and
+  records the failure
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'backend'))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'backend' / 'scripts'))
+
+from common.embedding_queue import claim_batch, complete_batch, enqueue_source_segments, record_failure
+from common.segments_database import SegmentsDatabase
+from scripts.embedding_worker import EmbeddingQueueWorker
+
+
+def _cursor(rows=None):
+    cur = MagicMock()
+    cur.fetchall.return_value = rows or []
+    cur.rowcount = len(rows or [])
+    return cur
+
+
+def _executed(cur):
+    return [c.args[0] for c in cur.execute.call_args_list]
+
+
+def test_enqueue_filters_chaffee_and_resets_attempts():
+    cur = _cursor()
+    enqueue_source_segments(cur, 42, 'bge-small-en-v1.5', embed_chaffee_only=True)
+    sql, params = cur.execute.call_args.args
+    assert "s.speaker_label = 'Chaffee' OR s.speaker_label IS NULL" in sql
+    assert 's.embedding IS NULL' in sql and 'attempts = 0' in sql
+    assert params == ['bge-small-en-v1.5', 42]
+
+    enqueue_source_segments(cur, 42, 'bge-small-en-v1.5', embed_chaffee_only=False)
+    assert 'Chaffee' not in cur.execute.call_args.args[0]
+
+
+def test_claim_skips_locked_and_parked():
+    cur = _cursor([(1, 'fasting'), (2, None)])
+    assert claim_batch(cur, 'bge-small-en-v1.5', 500, max_attempts=3) == [(1, 'fasting'), (2, '')]
+    sql, params = cur.execute.call_args.args
+    assert 'FOR UPDATE OF q SKIP LOCKED' in sql and 'ORDER BY q.enqueued_at' in sql
+    assert params == ['bge-small-en-v1.5', 3, 500]
+
+
+def test_complete_writes_both_stores_then_deletes():
+    cur = _cursor()
+    with patch('common.embedding_queue.psycopg2.extras.execute_values') as execute_values:
+        complete_batch(cur, 'bge-small-en-v1.5', [(1, [0.1, 0.2]), (2, [0.3, 0.4])], 'segment_embeddings_384')
+
+    assert 'UPDATE segments' in execute_values.call_args_list[0].args[1]
+    assert 'INSERT INTO segment_embeddings_384' in execute_values.call_args_list[1].args[1]
+    sql, params = cur.execute.call_args.args
+    assert sql.startswith('DELETE FROM embedding_queue') and params == ['bge-small-en-v1.5', [1, 2]]
+
+
+def _worker(embedder, claimed):
+    db = MagicMock()
+    conn = db.pooled_connection.return_value.__enter__.return_value
+    db.embedding_table_for.return_value = 'segment_embeddings_384'
+    worker = EmbeddingQueueWorker(db, embedder, 'bge-small-en-v1.5', batch_size=2)
+    return worker, conn, patch('scripts.embedding_worker.claim_batch', side_effect=[claimed, []])
+
+
+def test_worker_completes_batch_in_one_transaction():
+    embedder = MagicMock()
+    embedder.generate_embeddings.return_value = [[0.1], [0.2]]
+    worker, conn, claim = _worker(embedder, [(1, 'a'), (2, 'b')])
+
+    with claim, patch('scripts.embedding_worker.complete_batch', return_value=2) as complete:
+        worker.run()
+
+    embedder.generate_embeddings.assert_called_once_with(['a', 'b'])
+    assert complete.call_args.args[2] == [(1, [0.1]), (2, [0.2])]
+    assert complete.call_args.args[3] == 'segment_embeddings_384'
+    conn.commit.assert_called_once()
+    assert worker.embedded == 2 and worker.batches == 1
+
+
+def test_worker_rolls_back_and_records_failure():
+    embedder = MagicMock()
+    embedder.generate_embeddings.side_effect = RuntimeError('CUDA out of memory')
+    worker, conn, claim = _worker(embedder, [(1, 'a')])
+
+    with claim, patch('scripts.embedding_worker.complete_batch') as complete, \
+         patch('scripts.embedding_worker.record_failure') as failure:
+        worker.run()
+
+    complete.assert_not_called()
+    assert failure.call_args.args[2] == [1] and 'CUDA out of memory' in failure.call_args.args[3]
+    assert conn.rollback.call_count == 2  # Failed batch, then the empty claim
+    assert worker.failed == 1 and worker.embedded == 0
+
+
+def test_segments_database_enqueue_embeddings():
+    conn = MagicMock()
+    conn.closed = False
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchone.return_value = (7,)
+    cursor.rowcount = 3
+
+    with patch('common.segments_database.psycopg2.connect', return_value=conn), \
+         patch('common.segments_database.register_vector'):
+        db = SegmentsDatabase("postgresql://test")
+        assert db.enqueue_embeddings('vid1', model_key='bge-small-en-v1.5') == 3
+
+    assert any('INSERT INTO embedding_queue' in sql for sql in _executed(cursor))
+    conn.commit.assert_called_once()
+
+
+def test_record_failure_truncates_error():
+    cur = _cursor()
+    record_failure(cur, 'bge-small-en-v1.5', [1, 2], 'x' * 5000)
+    params = cur.execute.call_args.args[1]
+    assert len(params[0]) == 1000 and params[2] == [1, 2]
@@ -0,0 +1,85 @@
+"""Unit tests for pgvector parameter adaptation (pgvector_adapter.py)."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import psycopg2
+import psycopg2.extensions
+import pytest
+
+from backend.scripts.common import pgvector_adapter
+from backend.scripts.common.pgvector_adapter import Vector, register_vector, to_vector_literal
+
+
+@pytest.mark.unit
+class TestVectorAdaptation:
+    """Test Python -> SQL vector literals."""
+
+    def test_literal_round_trips_float32(self):
+        values = np.random.default_rng(0).standard_normal(384).astype(np.float32)
+
+        literal = to_vector_literal(values)
+        parsed = np.array(literal[1:-1].split(','), dtype=np.float32)
+
+        assert literal.startswith('[') and literal.endswith(']')
+        np.testing.assert_array_equal(parsed, values)
+
+    def test_literal_smaller_than_str_list(self):
+        values = np.random.default_rng(1).standard_normal(384).astype(np.float32)
+        values /= np.linalg.norm(values)
+
+        assert len(to_vector_literal(values)) < 0.7 * len(str(values.tolist()))
+
+    def test_vector_adapts_to_quoted_literal(self):
+        pgvector_adapter._register_adapters()
+
+        quoted = psycopg2.extensions.adapt(Vector([0.5, -1.0, 2.0])).getquoted()
+
+        assert quoted == b"'[0.5,-1,2]'"
+
+    def test_plain_ndarray_is_not_adapted(self):
+        # Registration is process-wide; only explicit Vector values become vectors
+        pgvector_adapter._register_adapters()
+
+        with pytest.raises(psycopg2.ProgrammingError):
+            psycopg2.extensions.adapt(np.array([1, 2, 3]))
+
+    def test_rejects_2d_input(self):
+        with pytest.raises(ValueError):
+            Vector(np.zeros((2, 3)))
+
+
+@pytest.mark.unit
+class TestRegisterVector:
+    """Test per-connection typecaster registration."""
+
+    def _conn(self, oid):
+        conn = MagicMock()
+        conn.raw = conn
+        conn.cursor.return_value.__enter__.return_value.fetchone.return_value = (oid,)
+        conn.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        return conn
+
+    def test_registers_once_per_connection(self, monkeypatch):
+        register_type = MagicMock()
+        monkeypatch.setattr(pgvector_adapter.psycopg2.extensions, 'register_type', register_type)
+        monkeypatch.setattr(pgvector_adapter, '_registered_connections', set())
+        conn = self._conn(16385)
+
+        assert register_vector(conn) is True
+        assert register_vector(conn) is True
+
+        register_type.assert_called_once()
+        assert conn.cursor.call_count == 1
+        conn.rollback.assert_called_once()
+
+    def test_missing_extension_is_not_fatal(self, monkeypatch):
+        monkeypatch.setattr(pgvector_adapter, '_registered_connections', set())
+
+        assert register_vector(self._conn(None)) is False
+
+    def test_typecaster_returns_float32_array(self):
+        result = pgvector_adapter._cast_vector('[1,2.5,-3]', None)
+
+        assert result.dtype == np.float32
+        np.testing.assert_array_equal(result, [1.0, 2.5, -3.0])
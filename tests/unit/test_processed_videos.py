@@ -0,0 +1,65 @@
+"""
+Unit tests for the bulk already-processed video resolver.
+
+Tests cover:
+- One query with a plain list parameter for the whole batch
+- Sources without segments are not treated as processed
+- AsyncAudioDownloader filters a list with one query and reuses the map
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'backend' / 'scripts'))
+
+from common.async_downloader import AsyncAudioDownloader
+from common.segments_database import ProcessedVideos, resolve_processed_videos
+
+
+def _conn(rows):
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = rows
+    return conn, cursor
+
+
+def test_resolves_batch_in_one_query():
+    conn, cursor = _conn([('aaa', 12), ('bbb', 0)])
+
+    processed = resolve_processed_videos(conn, ['aaa', 'bbb', 'ccc', 'aaa'])
+
+    cursor.execute.assert_called_once()
+    sql, params = cursor.execute.call_args.args
+    assert '= ANY(%s)' in sql and 'GROUP BY s.source_id' in sql
+    assert params[0] == ['aaa', 'bbb', 'ccc'] and isinstance(params[0], list)
+    assert processed.is_processed('aaa')
+    assert not processed.is_processed('bbb')  # Source row without segments: retry
+    assert not processed.is_processed('ccc') and processed.covers('ccc')
+    assert processed.processed_count == 1
+
+
+def test_empty_batch_skips_query():
+    conn, cursor = _conn([])
+    assert resolve_processed_videos(conn, []).checked == frozenset()
+    cursor.execute.assert_not_called()
+
+
+def test_merged_keeps_both_batches():
+    first = ProcessedVideos(checked=frozenset({'a', 'b'}), segment_counts={'a': 3})
+    merged = first.merged(ProcessedVideos(checked=frozenset({'c'}), segment_counts={'c': 1}))
+    assert merged.covers('b') and merged.is_processed('a') and merged.is_processed('c')
+
+
+def test_downloader_filters_list_with_one_query(tmp_path):
+    conn, cursor = _conn([('aaa', 5)])
+    downloader = AsyncAudioDownloader(temp_dir=tmp_path, db_connection=conn, skip_members_only=False)
+
+    to_download, existing = downloader.filter_existing_videos(
+        [{'video_id': 'aaa', 'title': 'Old'}, {'video_id': 'bbb', 'title': 'New'}]
+    )
+
+    assert [v['video_id'] for v in to_download] == ['bbb']
+    assert [v['video_id'] for v in existing] == ['aaa']
+    assert downloader.check_video_exists_in_db('aaa')
+    cursor.execute.assert_called_once()
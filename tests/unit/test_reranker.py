@@ -0,0 +1,74 @@
+"""Unit tests for batched cross-encoder reranking (reranker.py)."""
+
+import numpy as np
+import pytest
+
+from backend.scripts.common.reranker import CrossEncoderReranker
+
+
+class FakeScoringReranker(CrossEncoderReranker):
+    """Scores a doc by its 'relevance' prefix digit; records each batch."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+
+    def _load_model(self):
+        self.model = object()
+
+    def _score_batch(self, query, docs):
+        self.batches.append(list(docs))
+        self._forward_passes += 1
+        return np.array([int(doc[0]) / 10 for doc in docs], dtype=np.float32)
+
+
+def _results(*texts):
+    return [{'id': i, 'text': t, 'similarity': 0.5} for i, t in enumerate(texts)]
+
+
+@pytest.mark.unit
+class TestCrossEncoderReranker:
+    """Test batching, caching and top-k selection."""
+
+    def test_scores_in_padded_batches(self):
+        reranker = FakeScoringReranker(batch_size=2)
+
+        reranker.rerank('q', _results('1a', '2bb', '3ccc', '4dddd', '5eeeee'), top_k=5, enabled=True)
+
+        assert [len(b) for b in reranker.batches] == [2, 2, 1]
+        # Shortest texts batched together to minimise padding
+        assert reranker.batches[0] == ['1a', '2bb']
+
+    def test_returns_top_k_by_score_with_numeric_fields(self):
+        reranker = FakeScoringReranker()
+
+        reranked = reranker.rerank('q', _results('2a', '9b', '5c', '7d'), top_k=2, enabled=True)
+
+        assert [r['text'] for r in reranked] == ['9b', '7d']
+        assert reranked[0]['rerank_score'] == pytest.approx(0.9)
+        assert reranked[0]['similarity'] == 0.5
+
+    def test_score_cache_skips_seen_segments(self):
+        reranker = FakeScoringReranker()
+        results = _results('3a', '6b')
+
+        reranker.rerank('What is keto?', results, enabled=True)
+        reranker.rerank('what is  keto?', results + [{'id': 9, 'text': '8c'}], enabled=True)
+
+        assert reranker.batches == [['3a', '6b'], ['8c']]
+        assert reranker.stats()['cache_hits'] == 2
+
+    def test_max_candidates_limits_scoring(self):
+        reranker = FakeScoringReranker()
+
+        reranked = reranker.rerank('q', _results('1a', '2b', '9c'), top_k=5, max_candidates=2, enabled=True)
+
+        assert [r['text'] for r in reranked] == ['2b', '1a']
+        assert reranker.batches == [['1a', '2b']]
+
+    def test_disabled_returns_original_order(self):
+        reranker = FakeScoringReranker()
+        results = _results('1a', '9b')
+
+        assert reranker.rerank('q', results, top_k=1, enabled=False) == results[:1]
+        assert reranker.batches == []
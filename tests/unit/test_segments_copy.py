@@ -0,0 +1,90 @@
+"""
+Unit tests for the binary COPY segment loader.
+
+Tests cover:
+- Binary COPY encoding (header, NULLs, pgvector float4 payload)
+- The merge writes segments and segment_embeddings_{dim} in one statement
+- SegmentsDatabase(bulk_loader='copy') skips execute_values and the dual-write pass
+"""
+
+import struct
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'backend' / 'scripts'))
+
+from common.pgvector_adapter import Vector
+from common.segments_copy import STAGING_COLUMNS, build_merge_sql, copy_load_segments, encode_copy_binary
+from common.segments_database import SegmentsDatabase
+
+
+def test_encode_copy_binary_layout():
+    payload = encode_copy_binary(
+        [(7, None, 'hé', True, Vector([1.0, -0.5]))],
+        columns=[('a', 'int4'), ('b', 'float8'), ('c', 'text'), ('d', 'bool'), ('e', 'vector')],
+    )
+
+    assert payload.startswith(b'PGCOPY\n\xff\r\n\x00' + b'\x00' * 8)
+    assert payload.endswith(b'\xff\xff')
+    body = payload[19:-2]
+    expected = (
+        struct.pack('!h', 5)
+        + struct.pack('!ii', 4, 7)
+        + struct.pack('!i', -1)
+        + struct.pack('!i', 3) + 'hé'.encode('utf-8')
+        + struct.pack('!i', 1) + b'\x01'
+        + struct.pack('!i', 12) + struct.pack('!hh', 2, 0) + np.array([1.0, -0.5], dtype='>f4').tobytes()
+    )
+    assert body == expected
+
+
+def test_merge_sql_chains_segment_embeddings():
+    sql = build_merge_sql('segment_embeddings_384')
+    assert sql.count('INSERT INTO') == 2
+    assert 'DISTINCT ON (source_id, start_sec, end_sec, text)' in sql
+    assert 'FROM upserted WHERE embedding IS NOT NULL' in sql
+    assert 'segment_embeddings' not in build_merge_sql(None)
+
+
+def test_copy_load_streams_then_merges():
+    cur = MagicMock()
+    cur.fetchone.return_value = (2, 2)
+    row = (0, 1, 0.0, 5.0, 'Chaffee', 0.9, 'hi', None, None, None, 0.0, False, False, False, Vector([0.1, 0.2]))
+
+    assert copy_load_segments(cur, [row, row], 'segment_embeddings_384', 'bge-small-en-v1.5') == (2, 2)
+    assert len(row) == len(STAGING_COLUMNS)
+    copy_sql, stream = cur.copy_expert.call_args.args
+    assert 'FORMAT binary' in copy_sql
+    assert stream.getvalue().startswith(b'PGCOPY')
+    assert cur.execute.call_args.args[1] == ['bge-small-en-v1.5']
+
+
+def test_segments_database_copy_loader_skips_values_path():
+    conn = MagicMock()
+    conn.closed = False
+    conn.get_transaction_status.return_value = 0
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchone.return_value = (1,)
+
+    with patch('common.segments_database.psycopg2.connect', return_value=conn), \
+         patch('common.segments_database.register_vector'), \
+         patch('common.segments_database.copy_load_segments', return_value=(1, 1)) as copy_load, \
+         patch('common.segments_database.psycopg2.extras.execute_values') as execute_values:
+        db = SegmentsDatabase("postgresql://test", bulk_loader='copy')
+        count = db.batch_insert_segments(
+            [{'start': 0.0, 'end': 5.0, 'text': 'hi', 'speaker_label': 'Chaffee', 'embedding': [0.1, 0.2]}], 'vid1'
+        )
+
+    assert count == 1
+    execute_values.assert_not_called()
+    rows = copy_load.call_args.args[1]
+    assert rows[0][:2] == (0, 1) and isinstance(rows[0][-1], Vector)
+
+
+def test_unknown_bulk_loader_rejected():
+    with pytest.raises(ValueError):
+        SegmentsDatabase("postgresql://test", bulk_loader='magic')
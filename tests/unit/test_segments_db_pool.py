@@ -0,0 +1,94 @@
+"""
+Unit tests for SegmentsDatabase's pooled, per-thread connections.
+
+Tests cover:
+- Concurrent threads get their own connections, bounded by the pool size
+- video_transaction keeps one connection and one commit per video
+- A failing video is rolled back without touching other threads' work
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import psycopg2.extensions
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'backend' / 'scripts'))
+
+from common.segments_database import SegmentsDatabase
+
+
+def _fake_connection():
+    conn = MagicMock()
+    conn.closed = False
+    conn.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchone.return_value = (1,)
+    cursor.rowcount = 1
+    return conn
+
+
+@pytest.fixture
+def connect():
+    with patch('common.segments_database.psycopg2.connect', side_effect=lambda *a, **k: _fake_connection()) as connect, \
+         patch('common.segments_database.register_vector'):
+        yield connect
+
+
+def test_threads_use_separate_connections_within_pool_size(connect):
+    db = SegmentsDatabase("postgresql://test", pool_size=2)
+    seen = []
+    barrier = threading.Barrier(2)
+
+    def worker():
+        with db.pooled_connection() as conn:
+            seen.append(conn)
+            barrier.wait(timeout=5)
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = db.pool_stats()
+    assert seen[0] is not seen[1]
+    assert connect.call_count == 2
+    assert stats['peak_in_use'] == 2 and stats['in_use'] == 0
+    assert stats['acquisitions'] == 4 and stats['waits'] >= 1
+
+
+def test_video_transaction_commits_once_on_one_connection(connect):
+    db = SegmentsDatabase("postgresql://test", pool_size=2)
+
+    with patch('common.segments_database.psycopg2.extras.execute_values'):
+        with db.video_transaction('vid1') as conn:
+            db.upsert_source('vid1', 'Title')
+            db.batch_insert_segments([{'start': 0.0, 'end': 1.0, 'text': 'hi', 'speaker_label': 'Chaffee'}], 'vid1')
+
+    assert connect.call_count == 1
+    conn.commit.assert_called_once()
+    executed = [c.args[0] for c in conn.cursor.return_value.__enter__.return_value.execute.call_args_list]
+    assert any('SAVEPOINT classify_video' in sql for sql in executed)
+    assert db.pool_stats()['video_transactions'] == 1
+
+
+def test_failed_video_rolls_back(connect):
+    db = SegmentsDatabase("postgresql://test", pool_size=1)
+
+    with pytest.raises(RuntimeError):
+        with db.video_transaction('vid1') as conn:
+            db.upsert_source('vid1', 'Title')
+            raise RuntimeError('ASR output invalid')
+
+    conn.commit.assert_not_called()
+    conn.rollback.assert_called_once()
+    assert db.pool_stats()['video_rollbacks'] == 1
+
+    # Connection went back to the pool
+    with db.pooled_connection() as again:
+        assert again is conn